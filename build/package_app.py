@@ -29,11 +29,26 @@ APP_FILES = [
     'api_client.py',
     'core/__init__.py',
     'core/kvm_device.py',
+    'core/kvm_telemetry.py',
     'core/kvm_manager.py',
+    'core/device_registry.py',
+    'core/fleet_executor.py',
+    'core/status_scheduler.py',
     'core/database.py',
     'core/discovery.py',
+    'core/discovery_qt.py',
     'core/hid_controller.py',
+    'core/hid_latency.py',
+    'core/hid_pool.py',
+    'core/hid_text.py',
+    'core/ssh_pool.py',
     'core/kvm_relay.py',
+    'core/relay_loop.py',
+    'core/relay_metrics.py',
+    'core/relay_cache.py',
+    'core/relay_fanout.py',
+    'core/relay_shaper.py',
+    'core/relay_process.py',
     'core/network_fixer.py',
     'ui/__init__.py',
     'ui/main_window.py',
@@ -145,6 +145,49 @@ class Settings:
         'graphics': {
             'software_rendering': False,
         },
+        'hid': {
+            'binary_stream': True,  # /dev/hidgN 장기 바이너리 채널 (False: 리포트마다 쉘 echo)
+            'report_rate': 0,  # 고정 주기 전송 (Hz, 125/250 — USB 폴링 주기). 0: 도착 즉시 연속 전송
+            'max_step': 127,  # 고정 주기 모드에서 틱당 최대 이동량 — 큰 이동은 여러 틱에 나눠 보간
+            'latency_overlay': False,  # LiveView에 HID 지연 오버레이 표시 (Ctrl+F3 토글)
+            'pool_idle_timeout': 120,  # 사용이 끝난 HID SSH 연결 유지 시간 (초) — 재오픈 시 즉시 입력
+            'text_interval_ms': 8,  # 텍스트 일괄 입력 시 리포트 간격 (ms)
+        },
+        'relay': {
+            'process': True,  # 릴레이를 별도 워커 프로세스로 실행 (UI 멈춤/크래시와 분리)
+            'worker_grace': 300,  # GUI 연결이 끊긴 뒤 워커가 릴레이/heartbeat를 유지하며 재접속을 기다리는 시간 (초)
+            'engine': 'thread',  # thread: 연결당 스레드 / selector: 단일 이벤트 루프
+            'mode': 'port',  # port: KVM마다 전용 포트 / mux: 포트 1개에서 Host/헤더/경로로 라우팅
+            'mux_port': 18000,
+            'zero_copy': True,  # Linux: os.splice 커널 내부 전달 (다른 OS는 무시)
+            'stream_fanout': True,  # MJPEG 스트림: 뷰어 수와 무관하게 KVM 업스트림 1개
+            'kvm_mbps': 0,  # KVM별 영상/대량 하향 상한 (Mbps, 0 = 무제한) — 입력 트래픽은 제외
+            'site_mbps': 0,  # 관제 PC 전체 하향 상한 (Tailscale 업링크보다 약간 낮게)
+            'max_connections': 64,  # KVM별 동시 TCP 연결 상한 (초과 시 503, 0 = 무제한)
+            'idle_timeout': 300,  # 영상/HTTP 연결 무전송 정리 (초, 0 = 사용 안 함)
+            'control_idle_timeout': 3600,  # WebSocket 입력 연결 무전송 정리 (초)
+            'keepalive_idle': 30,  # TCP keepalive 탐지 시작 (초) — half-open 연결 감지
+            'http_cache': False,  # KVM 웹 UI 정적 자산(JS/CSS/폰트) 캐시
+            'http_cache_memory_mb': 64,
+            'http_cache_disk_mb': 256,  # 0이면 메모리 캐시만
+        },
+        'fleet': {
+            'max_concurrency': 256,  # 전체 장치 일괄 작업 동시 실행 상한 (공유 스레드 풀 크기)
+            'per_site': 64,  # 같은 /24 서브넷(사이트) 동시 실행 상한
+            'per_relay': 16,  # 같은 릴레이(Tailscale 100.x) 경유 동시 실행 상한
+            'timeout': 60,  # 장치별 작업 제한 시간 (초, 0 = 무제한)
+        },
+        'monitor': {
+            'fast_interval': 5,  # 화면 표시 / 상태 변동 장치 조회 간격 (초)
+            'base_interval': 30,  # 온라인 안정 장치 시작 간격 — 변화 없으면 2배씩 늘림
+            'online_max': 120,
+            'offline_max': 600,  # 오프라인 유지 장치 지수 백오프 상한 (초)
+            'liveview_interval': 300,  # LiveView 중인 장치 (실시간 연결로 상태 확인됨)
+            'jitter': 0.2,  # 간격 ± 비율 무작위 (동시 조회 분산)
+            'flap_window': 300,  # 이 시간(초) 안에 flap_count번 이상 상태 전환 → flapping
+            'flap_count': 3,
+            'probe_lease': 120,  # 꺼낸 뒤 이 시간(초) 안에 결과가 없으면 조회 유실로 보고 다시 조회
+        },
         'vision': {
             'model_path': '',
             'confidence': 0.5,
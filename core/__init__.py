@@ -1,9 +1,28 @@
-from .kvm_device import KVMDevice
-from .kvm_manager import KVMManager
-from .database import Database
-from .discovery import NetworkScanner, DiscoveryThread, AutoDiscoveryManager, DiscoveredDevice
-
-__all__ = [
-    'KVMDevice', 'KVMManager', 'Database',
-    'NetworkScanner', 'DiscoveryThread', 'AutoDiscoveryManager', 'DiscoveredDevice'
-]
+"""
+core 패키지 — 이름은 처음 접근할 때 로드
+
+헤드리스 릴레이 서비스(relay_service.py)가 core.kvm_relay / core.discovery만 import할 때
+paramiko·PyQt6를 끌어오지 않도록 지연 로드 (from core import KVMManager 등은 그대로 동작).
+"""
+
+_EXPORTS = {
+    'KVMDevice': '.kvm_device',
+    'KVMManager': '.kvm_manager',
+    'Database': '.database',
+    'NetworkScanner': '.discovery',
+    'DiscoveryThread': '.discovery',
+    'AutoDiscoveryManager': '.discovery',
+    'DiscoveredDevice': '.discovery',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
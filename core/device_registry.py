@@ -0,0 +1,238 @@
+"""
+KVM 장치 레지스트리 (이름/IP/그룹/상태 인덱스)
+
+- 읽기: 불변 스냅샷 참조 1개만 읽음 → 락 없음, 쓰기 중에도 대기하지 않음, 조회 O(1)
+- 쓰기(추가/삭제/이름 변경/IP·그룹·상태 변경): 락 안에서 바뀐 인덱스 항목만 새로 만들어
+  새 스냅샷으로 교체 (copy-on-write — 바뀌지 않은 그룹/상태 맵은 이전 스냅샷과 공유)
+- IP/그룹/상태는 KVMInfo/KVMDevice 필드 감시자(_watcher)로 변경 즉시 반영
+  (UI가 device.status / device.info.ip 를 직접 바꾸는 경우 포함)
+- 같은 IP를 여러 장치가 쓸 수 있음 (릴레이 치환 후 100.x) → IP 인덱스는 IP → {이름: 장치}
+"""
+
+import functools
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping
+
+_EMPTY: Mapping = MappingProxyType({})
+
+
+class DeviceSnapshot:
+    """특정 시점의 장치 목록 + 인덱스 (읽기 전용)"""
+
+    __slots__ = ('by_name', 'by_ip', 'by_group', 'by_status', 'version')
+
+    def __init__(self, by_name: Mapping, by_ip: Mapping, by_group: Mapping, by_status: Mapping,
+                 version: int):
+        self.by_name = by_name      # 이름 → 장치
+        self.by_ip = by_ip          # IP → {이름: 장치}
+        self.by_group = by_group    # 그룹 → {이름: 장치}
+        self.by_status = by_status  # DeviceStatus → {이름: 장치}
+        self.version = version
+
+    def __len__(self):
+        return len(self.by_name)
+
+
+def _index_keys(device) -> tuple:
+    return device.info.ip, device.info.group, device.status
+
+
+def _freeze(index: dict) -> Mapping:
+    return MappingProxyType({k: MappingProxyType(v) for k, v in index.items()})
+
+
+def _moved(index: Mapping, old_key, new_key, name: str, device) -> Mapping:
+    """index에서 name을 old_key → new_key로 옮긴 새 인덱스 (None 키는 추가/삭제 없음)"""
+    outer = dict(index)
+    if old_key is not None:
+        inner = dict(outer.get(old_key, _EMPTY))
+        inner.pop(name, None)
+        if inner:
+            outer[old_key] = MappingProxyType(inner)
+        else:
+            outer.pop(old_key, None)
+    if new_key is not None:
+        inner = dict(outer.get(new_key, _EMPTY))
+        inner[name] = device
+        outer[new_key] = MappingProxyType(inner)
+    return MappingProxyType(outer)
+
+
+class DeviceRegistry:
+    """KVMManager 장치 저장소"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: Dict[str, tuple] = {}  # 이름 → 인덱스에 등록된 (ip, group, status)
+        self._snap = DeviceSnapshot(_EMPTY, _EMPTY, _EMPTY, _EMPTY, 0)
+
+    # ── 읽기 (락 없음) ──
+
+    def snapshot(self) -> DeviceSnapshot:
+        return self._snap
+
+    def get(self, name: str):
+        return self._snap.by_name.get(name)
+
+    def first_by_ip(self, ip: str):
+        for device in self._snap.by_ip.get(ip, _EMPTY).values():
+            return device
+        return None
+
+    def all(self) -> List[Any]:
+        return list(self._snap.by_name.values())
+
+    def in_group(self, group: str) -> List[Any]:
+        return list(self._snap.by_group.get(group, _EMPTY).values())
+
+    def with_status(self, *statuses) -> List[Any]:
+        by_status = self._snap.by_status
+        result = []
+        for status in statuses:
+            result.extend(by_status.get(status, _EMPTY).values())
+        return result
+
+    def __len__(self):
+        return len(self._snap.by_name)
+
+    def __contains__(self, name: str):
+        return name in self._snap.by_name
+
+    # ── 쓰기 ──
+
+    def _publish(self, by_name=None, by_ip=None, by_group=None, by_status=None):
+        snap = self._snap
+        self._snap = DeviceSnapshot(
+            snap.by_name if by_name is None else by_name,
+            snap.by_ip if by_ip is None else by_ip,
+            snap.by_group if by_group is None else by_group,
+            snap.by_status if by_status is None else by_status,
+            snap.version + 1,
+        )
+
+    def _attach(self, device):
+        watcher = functools.partial(self._on_field_change, device)
+        device._watcher = watcher
+        device.info._watcher = watcher
+
+    @staticmethod
+    def _detach(device):
+        device._watcher = None
+        device.info._watcher = None
+
+    def replace(self, devices: Iterable[Any]):
+        """전체 교체 (DB/서버 목록 재로드) — 스냅샷 1번만 생성"""
+        devices = list(devices)
+        by_name: Dict[str, Any] = {}
+        by_ip: Dict[Any, dict] = {}
+        by_group: Dict[Any, dict] = {}
+        by_status: Dict[Any, dict] = {}
+        keys = {}
+        with self._lock:
+            for device in self._snap.by_name.values():
+                self._detach(device)
+            for device in devices:
+                self._attach(device)  # 인덱싱 전에 연결 — 이후 변경은 감시자가 반영
+                name = device.name
+                ip, group, status = keys[name] = _index_keys(device)
+                by_name[name] = device
+                by_ip.setdefault(ip, {})[name] = device
+                by_group.setdefault(group, {})[name] = device
+                by_status.setdefault(status, {})[name] = device
+            self._keys = keys
+            self._publish(MappingProxyType(by_name), _freeze(by_ip), _freeze(by_group), _freeze(by_status))
+
+    def clear(self):
+        self.replace(())
+
+    def add(self, device):
+        """추가 (같은 이름이 있으면 교체)"""
+        with self._lock:
+            old = self._snap.by_name.get(device.name)
+            if old is not None:
+                self._remove_locked(device.name)
+            self._attach(device)
+            self._add_locked(device)
+
+    def add_many(self, devices: Iterable[Any]):
+        """병합 추가 (이미 있는 이름은 건너뜀) — 스냅샷 1번만 생성"""
+        with self._lock:
+            snap = self._snap
+            by_name = dict(snap.by_name)
+            by_ip = {k: dict(v) for k, v in snap.by_ip.items()}
+            by_group = {k: dict(v) for k, v in snap.by_group.items()}
+            by_status = {k: dict(v) for k, v in snap.by_status.items()}
+            for device in devices:
+                name = device.name
+                if name in by_name:
+                    continue
+                self._attach(device)
+                ip, group, status = self._keys[name] = _index_keys(device)
+                by_name[name] = device
+                by_ip.setdefault(ip, {})[name] = device
+                by_group.setdefault(group, {})[name] = device
+                by_status.setdefault(status, {})[name] = device
+            self._publish(MappingProxyType(by_name), _freeze(by_ip), _freeze(by_group), _freeze(by_status))
+
+    def _add_locked(self, device):
+        snap = self._snap
+        name = device.name
+        ip, group, status = self._keys[name] = _index_keys(device)
+        by_name = dict(snap.by_name)
+        by_name[name] = device
+        self._publish(MappingProxyType(by_name),
+                      _moved(snap.by_ip, None, ip, name, device),
+                      _moved(snap.by_group, None, group, name, device),
+                      _moved(snap.by_status, None, status, name, device))
+
+    def remove(self, name: str):
+        """삭제 → 삭제된 장치 (없으면 None)"""
+        with self._lock:
+            return self._remove_locked(name)
+
+    def _remove_locked(self, name: str):
+        snap = self._snap
+        device = snap.by_name.get(name)
+        if device is None:
+            return None
+        ip, group, status = self._keys.pop(name)
+        by_name = dict(snap.by_name)
+        del by_name[name]
+        self._publish(MappingProxyType(by_name),
+                      _moved(snap.by_ip, ip, None, name, device),
+                      _moved(snap.by_group, group, None, name, device),
+                      _moved(snap.by_status, status, None, name, device))
+        self._detach(device)
+        return device
+
+    def rename(self, old_name: str, new_name: str) -> bool:
+        """이름 변경 (새 이름이 이미 있으면 False) — device.info.name 도 함께 변경"""
+        with self._lock:
+            if new_name in self._snap.by_name:
+                return False
+            device = self._remove_locked(old_name)
+            if device is None:
+                return False
+            device.info.name = new_name
+            self._attach(device)
+            self._add_locked(device)
+            return True
+
+    def _on_field_change(self, device, key: str, old, new):
+        """감시 필드 변경 → 해당 인덱스만 갱신 (여러 스레드가 동시에 바꿔도 장치의 현재 값 기준)"""
+        with self._lock:
+            name = device.name
+            registered = self._keys.get(name)
+            if registered is None or self._snap.by_name.get(name) is not device:
+                return
+            current = _index_keys(device)
+            if current == registered:
+                return
+            self._keys[name] = current
+            snap = self._snap
+            indexes = [snap.by_ip, snap.by_group, snap.by_status]
+            for i, (before, after) in enumerate(zip(registered, current)):
+                if before != after:
+                    indexes[i] = _moved(indexes[i], before, after, name, device)
+            self._publish(None, *indexes)
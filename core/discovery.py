@@ -1,6 +1,10 @@
 """
 KVM 장치 자동 검색 모듈
 동일 내부망에서 Luckfox PicoKVM 장치를 자동으로 탐지
+
+NetworkScanner는 Qt 없이 동작 (헤드리스 릴레이 서비스에서 사용).
+Qt 스레드/시그널 기반 DiscoveryThread, AutoDiscoveryManager는 core/discovery_qt.py —
+이 모듈에서 처음 접근할 때 로드됨.
 """
 
 import socket
@@ -10,7 +14,6 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional, Callable
 from dataclasses import dataclass
 import requests
-from PyQt6.QtCore import QObject, pyqtSignal, QThread
 
 
 @dataclass
@@ -287,148 +290,9 @@ class NetworkScanner:
         return discovered
 
 
-class DiscoveryThread(QThread):
-    """Qt 스레드 기반 자동 검색"""
-
-    # 시그널 정의
-    device_found = pyqtSignal(object)  # DiscoveredDevice
-    progress_updated = pyqtSignal(int, int)  # current, total
-    scan_completed = pyqtSignal(list)  # List[DiscoveredDevice]
-    scan_error = pyqtSignal(str)  # error message
-
-    def __init__(self,
-                 ip_range: Optional[List[str]] = None,
-                 ports: Optional[List[int]] = None,
-                 parent=None):
-        super().__init__(parent)
-        self.ip_range = ip_range
-        self.ports = ports
-        self._is_running = True
-        self._executor = None
-
-    def run(self):
-        """스캔 실행"""
-        try:
-            if self.ip_range is None:
-                local_ip = NetworkScanner.get_local_ip()
-                self.ip_range = NetworkScanner.get_network_range(local_ip)
-
-            if self.ports is None:
-                self.ports = NetworkScanner.DEFAULT_PORTS
-
-            discovered = []
-            total = len(self.ip_range) * len(self.ports)
-            current = 0
-            found_ips = set()
-
-            self._executor = ThreadPoolExecutor(max_workers=50)
-            try:
-                futures = {}
-
-                for ip in self.ip_range:
-                    if not self._is_running:
-                        break
-                    for port in self.ports:
-                        future = self._executor.submit(
-                            NetworkScanner.check_kvm_device,
-                            ip, port,
-                            NetworkScanner.TIMEOUT
-                        )
-                        futures[future] = (ip, port)
-
-                for future in as_completed(futures):
-                    if not self._is_running:
-                        # 남은 future 모두 취소
-                        for f in futures:
-                            f.cancel()
-                        break
-
-                    current += 1
-                    self.progress_updated.emit(current, total)
-
-                    try:
-                        device = future.result(timeout=0.1)
-                        if device and device.ip not in found_ips:
-                            found_ips.add(device.ip)
-                            discovered.append(device)
-                            self.device_found.emit(device)
-                    except Exception:
-                        pass
-            finally:
-                self._executor.shutdown(wait=False, cancel_futures=True)
-                self._executor = None
-
-            if self._is_running:
-                self.scan_completed.emit(discovered)
-
-        except Exception as e:
-            if self._is_running:
-                self.scan_error.emit(str(e))
-
-    def stop(self):
-        """스캔 중지 - executor도 즉시 종료"""
-        self._is_running = False
-        if self._executor:
-            self._executor.shutdown(wait=False, cancel_futures=True)
-
-
-class AutoDiscoveryManager(QObject):
-    """자동 검색 관리자 - 주기적 스캔 및 장치 관리"""
-
-    # 시그널
-    new_device_found = pyqtSignal(object)  # DiscoveredDevice
-    device_lost = pyqtSignal(str)  # IP
-    scan_started = pyqtSignal()
-    scan_finished = pyqtSignal(int)  # 발견된 장치 수
-
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self._known_devices: Dict[str, DiscoveredDevice] = {}
-        self._scan_thread: Optional[DiscoveryThread] = None
-        self._auto_scan_enabled = False
-
-    @property
-    def known_devices(self) -> List[DiscoveredDevice]:
-        """알려진 장치 목록"""
-        return list(self._known_devices.values())
-
-    def start_scan(self,
-                   ip_range: Optional[List[str]] = None,
-                   ports: Optional[List[int]] = None):
-        """스캔 시작"""
-        if self._scan_thread and self._scan_thread.isRunning():
-            return  # 이미 스캔 중
-
-        self._scan_thread = DiscoveryThread(ip_range, ports, self)
-        self._scan_thread.device_found.connect(self._on_device_found)
-        self._scan_thread.scan_completed.connect(self._on_scan_completed)
-        self._scan_thread.start()
-
-        self.scan_started.emit()
-
-    def stop_scan(self):
-        """스캔 중지"""
-        if self._scan_thread:
-            self._scan_thread.stop()
-            self._scan_thread.wait()
-
-    def _on_device_found(self, device: DiscoveredDevice):
-        """장치 발견 시"""
-        if device.ip not in self._known_devices:
-            self._known_devices[device.ip] = device
-            self.new_device_found.emit(device)
-
-    def _on_scan_completed(self, devices: List[DiscoveredDevice]):
-        """스캔 완료 시"""
-        # 사라진 장치 감지
-        current_ips = {d.ip for d in devices}
-        for ip in list(self._known_devices.keys()):
-            if ip not in current_ips:
-                del self._known_devices[ip]
-                self.device_lost.emit(ip)
-
-        self.scan_finished.emit(len(devices))
-
-    def is_scanning(self) -> bool:
-        """스캔 중인지 확인"""
-        return self._scan_thread is not None and self._scan_thread.isRunning()
+def __getattr__(name):
+    """Qt 검색 클래스 지연 로드 (from core.discovery import DiscoveryThread 호환)"""
+    if name in ('DiscoveryThread', 'AutoDiscoveryManager'):
+        from . import discovery_qt
+        return getattr(discovery_qt, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
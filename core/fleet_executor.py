@@ -0,0 +1,216 @@
+"""
+KVM 전체(fleet) 일괄 작업 실행기
+
+asyncio 이벤트 루프 스레드 1개가 모든 장치 작업을 스케줄링.
+- 동시 실행 상한: 전체 / 사이트(/24 서브넷)별 / 릴레이(Tailscale 100.x IP)별 세마포어
+  → 한 사이트나 릴레이 박스에 SSH 핸드셰이크가 몰리지 않으면서 나머지는 한꺼번에 진행
+- 장치 작업(paramiko 등 블로킹 함수)은 공유 스레드 풀에서 실행 (호출마다 풀을 새로 만들지 않음,
+  스레드는 필요할 때만 생성). 코루틴 함수는 루프에서 바로 실행
+- 장치별 타임아웃: 대기 시간(세마포어, 스레드 풀 대기열) 제외, 작업 스레드가 시작한 뒤의 실행 시간만.
+  초과 시 {'error': 'timeout'}
+  (블로킹 호출 자체는 끊을 수 없으므로 해당 스레드는 SSH 타임아웃까지 남을 수 있음)
+- 결과는 완료되는 순서대로 FleetRun에서 꺼내거나 on_result 콜백(루프 스레드)으로 받음
+- FleetRun.cancel(): 끝나지 않은 장치는 {'error': 'cancelled'} 로 즉시 완료 처리
+"""
+
+import asyncio
+import functools
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+def _fleet_setting(key: str, default):
+    try:
+        from config import settings
+        return settings.get(f'fleet.{key}', default)
+    except Exception:
+        return default
+
+
+def limit_key(ip: str) -> str:
+    """동시 실행 제한 단위: 릴레이 접속(100.x)은 릴레이 IP, 로컬은 /24 사이트"""
+    if ip.startswith('100.'):
+        return f"relay:{ip}"
+    return "site:" + '.'.join(ip.split('.')[:3])
+
+
+class FleetRun:
+    """일괄 작업 1회의 핸들 — 완료 순서대로 결과 스트리밍"""
+
+    _DONE = object()
+
+    def __init__(self, total: int):
+        self.total = total
+        self.results: Dict[str, Any] = {}
+        self.timeouts = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._future = None  # concurrent.futures.Future (루프의 _run 코루틴)
+        self._finished = threading.Event()
+
+    def _put(self, name: str, result):
+        self.results[name] = result
+        self._queue.put((name, result))
+
+    def _finish(self):
+        self.elapsed = time.monotonic() - self.started
+        self._finished.set()
+        self._queue.put(self._DONE)
+
+    @property
+    def done(self) -> bool:
+        return self._finished.is_set()
+
+    def as_completed(self, timeout: Optional[float] = None) -> Iterator[Tuple[str, Any]]:
+        """(장치 이름, 결과) — 완료 순서. timeout(초)이 지나면 queue.Empty"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            item = self._queue.get(timeout=remaining)
+            if item is self._DONE:
+                return
+            yield item
+
+    __iter__ = as_completed
+
+    def wait(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """모든 장치 완료까지 대기 → {이름: 결과} (timeout 시 그때까지의 결과)"""
+        self._finished.wait(timeout)
+        return dict(self.results)
+
+    def cancel(self):
+        """남은 장치 작업 취소 (이미 실행 중인 블로킹 호출은 결과만 버리고 백그라운드에서 끝남)"""
+        if self._future is not None:
+            self._future.cancel()
+
+
+class FleetExecutor:
+    """공유 이벤트 루프 + 스레드 풀 기반 일괄 실행기"""
+
+    def __init__(self, max_concurrency: Optional[int] = None, per_site: Optional[int] = None,
+                 per_relay: Optional[int] = None):
+        self.max_concurrency = int(max_concurrency or _fleet_setting('max_concurrency', 256))
+        self.per_site = int(per_site or _fleet_setting('per_site', 64))
+        self.per_relay = int(per_relay or _fleet_setting('per_relay', 16))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._global: Optional[asyncio.Semaphore] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                thread_name_prefix="Fleet")
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, daemon=True, name="FleetLoop").start()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, devices: List[Any], func: Callable, args: tuple = (), kwargs: Optional[dict] = None,
+               timeout: Optional[float] = None,
+               on_result: Optional[Callable[[str, Any], None]] = None) -> FleetRun:
+        """devices 각각에 func(device, *args, **kwargs) 실행 → FleetRun (비차단)
+
+        timeout: 장치별 실행 제한 (초, None = 설정 fleet.timeout, 0 = 무제한)
+        on_result: 장치 하나가 끝날 때마다 루프 스레드에서 호출 (name, result)
+        """
+        if timeout is None:
+            timeout = float(_fleet_setting('timeout', 60))
+        run = FleetRun(len(devices))
+        if not devices:
+            run._finish()
+            return run
+        loop = self._ensure_loop()
+        coro = self._run(run, devices, func, args, kwargs or {}, timeout or None, on_result)
+        run._future = asyncio.run_coroutine_threadsafe(coro, loop)
+        return run
+
+    def _semaphore(self, key: str) -> asyncio.Semaphore:
+        sem = self._limits.get(key)
+        if sem is None:
+            sem = asyncio.Semaphore(self.per_relay if key.startswith('relay:') else self.per_site)
+            self._limits[key] = sem
+        return sem
+
+    async def _run(self, run: FleetRun, devices, func, args, kwargs, timeout, on_result):
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.max_concurrency)
+        tasks = [asyncio.ensure_future(self._one(run, d, func, args, kwargs, timeout, on_result))
+                 for d in devices]
+        try:
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for device in devices:
+                if device.name not in run.results:
+                    run._put(device.name, {'error': 'cancelled'})
+            raise
+        finally:
+            run._finish()
+
+    async def _one(self, run: FleetRun, device, func, args, kwargs, timeout, on_result):
+        async with self._semaphore(limit_key(device.ip)), self._global:
+            try:
+                if asyncio.iscoroutinefunction(func):
+                    result = await asyncio.wait_for(func(device, *args, **kwargs), timeout)
+                else:
+                    result = await self._in_pool(functools.partial(func, device, *args, **kwargs), timeout)
+            except asyncio.TimeoutError:
+                run.timeouts += 1
+                result = {'error': 'timeout'}
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                run.errors += 1
+                result = {'error': str(e)}
+        run._put(device.name, result)
+        if on_result is not None:
+            try:
+                on_result(device.name, result)
+            except Exception as e:
+                print(f"[Fleet] 결과 콜백 오류: {e}")
+
+    async def _in_pool(self, call: Callable, timeout: Optional[float]):
+        """스레드 풀에서 call 실행 — timeout은 작업 스레드가 call을 시작한 시점부터
+
+        앞서 타임아웃된 블로킹 호출이 풀 스레드를 붙잡고 있으면 새 작업은 풀 대기열에서 기다림
+        → 그 시간까지 타임아웃에 넣으면 실행도 못 해 보고 timeout 처리됨.
+        """
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+
+        def run():
+            loop.call_soon_threadsafe(started.set)
+            return call()
+
+        future = loop.run_in_executor(self._pool, run)
+        waiter = asyncio.ensure_future(started.wait())
+        try:
+            await asyncio.wait({future, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            future.cancel()  # 아직 풀 대기열이면 실행되지 않음
+            raise
+        finally:
+            waiter.cancel()
+        return await asyncio.wait_for(future, timeout)
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "per_site": self.per_site,
+            "per_relay": self.per_relay,
+            "limit_groups": len(self._limits),
+            "threads": len(getattr(self._pool, '_threads', ())) if self._pool else 0,
+        }
+
+
+fleet_executor = FleetExecutor()
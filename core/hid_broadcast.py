@@ -0,0 +1,128 @@
+"""
+다중 KVM 동시 입력 (부분제어 등)
+
+입력 이벤트 1개 → 리포트를 한 번만 인코딩 → 전용 디스패처 스레드 1개가 모든 장치의
+바이너리 스트림 채널에 연달아 write. 장치마다 executor 작업/워커 스레드 wake-up을
+거치지 않으므로 장치 간 도착 시각 차이(skew)가 채널 write 몇 번 수준으로 줄어듦.
+
+- 쓰기 순서는 이벤트마다 회전 → 특정 장치가 항상 마지막이 되지 않음
+- 스트림 채널이 없는 장치(쉘 경로)는 해당 컨트롤러 큐로 전달 (skew 측정 제외)
+- skew = 한 이벤트의 첫 리포트가 마지막 장치에 써진 시각 - 첫 장치에 써진 시각
+"""
+
+import collections
+import struct
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from .hid_controller import FastHIDController
+from .hid_latency import LatencyHistogram
+
+
+class HIDBroadcaster:
+    """여러 FastHIDController에 같은 입력을 저지연으로 동시 전송"""
+
+    def __init__(self, controllers: Sequence[FastHIDController]):
+        self.controllers: List[FastHIDController] = list(controllers)
+        self._events = collections.deque()
+        self._cond = threading.Condition()
+        self._running = True
+        self._rotate = 0
+        self.skew = LatencyHistogram()
+        self.events = 0
+        self.queued_fallback = 0  # 스트림 채널 없이 큐로 보낸 장치 수 (누적)
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="HIDBroadcast")
+        self._thread.start()
+
+    # ── 입력 API ──
+
+    def send_hid_code(self, hid_code: int, modifiers: int = 0):
+        """키 누름 → 놓음"""
+        dev = FastHIDController.KEYBOARD_DEV
+        self.broadcast([
+            (dev, struct.pack('BBBBBBBB', modifiers, 0, hid_code, 0, 0, 0, 0, 0)),
+            (dev, struct.pack('BBBBBBBB', 0, 0, 0, 0, 0, 0, 0, 0)),
+        ])
+
+    def send_key(self, key: str, modifiers: int = 0):
+        key_code = FastHIDController.KEY_CODES.get(key.lower(), 0)
+        if key_code:
+            self.send_hid_code(key_code, modifiers)
+
+    def send_mouse_click(self, button: str = 'left'):
+        btn = {'left': 1, 'right': 2, 'middle': 4}.get(button, 1)
+        dev = FastHIDController.MOUSE_DEV
+        self.broadcast([(dev, struct.pack('Bbb', btn, 0, 0)), (dev, struct.pack('Bbb', 0, 0, 0))])
+
+    def send_mouse_relative(self, dx: int, dy: int, buttons: int = 0):
+        dx = max(-127, min(127, dx))
+        dy = max(-127, min(127, dy))
+        self.broadcast([(FastHIDController.MOUSE_DEV, struct.pack('Bbb', buttons, dx, dy))])
+
+    def broadcast(self, reports: List[Tuple[str, bytes]]):
+        """인코딩된 리포트 묶음 [(dev, report)] 을 모든 장치에 전송 (비차단)"""
+        with self._cond:
+            self._events.append((time.perf_counter(), reports))
+            self._cond.notify()
+
+    # ── 디스패처 ──
+
+    def _loop(self):
+        while self._running:
+            with self._cond:
+                if not self._events and not self._cond.wait_for(lambda: self._events, 0.5):
+                    continue
+                t_event, reports = self._events.popleft()
+            try:
+                self._dispatch(t_event, reports)
+            except Exception as e:
+                print(f"[HIDBroadcast] 전송 오류: {e}")
+
+    def _dispatch(self, t_event: float, reports: List[Tuple[str, bytes]]):
+        n = len(self.controllers)
+        if not n:
+            return
+        start = self._rotate % n
+        self._rotate += 1
+        order = self.controllers[start:] + self.controllers[:start]
+        first_write: Optional[float] = None
+        last_write = 0.0
+        devs = {dev for dev, _ in reports}
+        for hid in order:
+            if not hid.is_connected():
+                continue
+            if not hid.can_write_now(devs):
+                # 쉘 경로 / 큐에 앞선 입력이 남아 있음 → 순서 유지를 위해 큐로
+                for dev, report in reports:
+                    hid.enqueue_report(dev, report)
+                self.queued_fallback += 1
+                continue
+            for i, (dev, report) in enumerate(reports):
+                if not hid.write_now(dev, report, t_event):
+                    # 전송 중 채널 끊김 → 나머지는 큐 (쉘 경로)로
+                    for rest_dev, rest in reports[i:]:
+                        hid.enqueue_report(rest_dev, rest)
+                    break
+                if i == 0:
+                    last_write = time.perf_counter()
+                    if first_write is None:
+                        first_write = last_write
+        self.events += 1
+        if first_write is not None:
+            self.skew.record((last_write - first_write) * 1000.0)
+
+    def get_stats(self) -> dict:
+        """이벤트 수 + 장치 간 skew p50/p95/p99 (ms)"""
+        return {
+            "devices": len(self.controllers),
+            "connected": sum(1 for hid in self.controllers if hid.is_connected()),
+            "events": self.events,
+            "queued_fallback": self.queued_fallback,
+            "skew": self.skew.to_dict(),
+        }
+
+    def close(self):
+        self._running = False
+        with self._cond:
+            self._cond.notify()
@@ -1,14 +1,169 @@
 """
 고속 HID 컨트롤러 - 지속적인 SSH 채널 사용
 자동 재연결 + 명령 큐 크기 제한
+
+전송 경로:
+- 바이너리 스트림 (기본): /dev/hidg0, /dev/hidg2마다 SSH exec 채널 1개를 열어 두고
+  ('dd of=/dev/hidgN bs=<리포트 크기>') 리포트 바이트를 그대로 흘려 보냄
+  → 리포트마다 장치에서 프로세스 fork + gadget 파일 재오픈이 없어짐
+- 쉘 (폴백): 인터랙티브 쉘에 "echo -ne '\\x..' > /dev/hidgN" 한 줄씩 전송
+  (스트림 채널을 열 수 없거나 전송 중 끊기면 자동으로 사용)
+
+전송 주기 (hid.report_rate):
+- 0 (기본): 큐에 들어오는 대로 연속 전송
+- 125/250 등: monotonic 고정 주기 틱마다 장치별 리포트 최대 1개 (USB 폴링과 동일)
+  → 이벤트 버스트가 일정한 속도로 펴지고, 큰 이동은 max_step씩 여러 틱에 보간
+
+리포트마다 enqueue/send/ack 시각을 기록 → 장치별 지연 히스토그램 (core/hid_latency.py)
 """
 
 import paramiko
+import socket
 import struct
 import threading
 import queue
 import time
-from typing import Optional
+import weakref
+from collections import deque
+from typing import Dict, List, Optional
+
+from .hid_latency import HIDLatencyStats
+
+# 생성된 컨트롤러 (mcp_debug /api/hid 조회용, 참조만 추적)
+_instances = weakref.WeakSet()
+
+
+class HIDReportQueue:
+    """이벤트 종류를 구분하는 HID 리포트 큐
+
+    - 이동: 버튼 상태가 같은 연속 상대 이동은 큐 꼬리 항목에 dx/dy를 합산 (coalescing)
+      → 꺼낼 때 ±127 리포트 한계로 다시 나눔 (누적 이동량 손실 없음)
+    - 전이: 키 리포트, 버튼 상태가 바뀌는 마우스 리포트 — 병합/폐기하지 않음
+    - 가득 차면 순수 이동 항목만 폐기, 전이는 한도를 넘어도 항상 넣음 (키/버튼 눌림 고착 방지)
+    - 꺼낸 리포트는 done() 전까지 전송 중(in_flight)으로 셈 → pending()이 0이어야 큐를 건너뛰어도 순서 유지
+    """
+
+    def __init__(self, mouse_dev: str, maxsize: int = 200):
+        self.mouse_dev = mouse_dev
+        self.maxsize = maxsize
+        # 항목: [dev, report, t] (전이) 또는 [dev, None, buttons, dx, dy, mergeable, t] (이동)
+        # t: 큐에 들어온 perf_counter 시각 (병합된 이동은 가장 오래된 이벤트)
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._buttons = 0  # 마지막으로 넣은 마우스 리포트의 버튼 상태
+        self._in_flight = 0  # get()으로 꺼냈지만 아직 done()되지 않은 리포트 수
+        self._stats = {
+            'enqueued': 0, 'sent': 0, 'coalesced': 0, 'split': 0,
+            'dropped_moves': 0, 'max_depth': 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def pending(self) -> int:
+        """대기 항목 + 전송 중 리포트 수"""
+        with self._cond:
+            return len(self._items) + self._in_flight
+
+    def done(self):
+        """get()으로 꺼낸 리포트 1개 전송 완료 (실패 포함)"""
+        with self._cond:
+            self._in_flight -= 1
+
+    def put_report(self, dev: str, report: bytes):
+        """원본 리포트 추가 (키보드/버튼 전이) — 폐기하지 않음"""
+        with self._cond:
+            if dev == self.mouse_dev and report:
+                self._buttons = report[0]
+            self._stats['enqueued'] += 1
+            self._items.append([dev, report, time.perf_counter()])
+            self._touch()
+
+    def put_move(self, dx: int, dy: int, buttons: int = 0):
+        """상대 이동 추가 — 버튼 상태 변화가 없으면 꼬리 이동 항목에 합산"""
+        with self._cond:
+            self._stats['enqueued'] += 1
+            transition = buttons != self._buttons
+            self._buttons = buttons
+            if not transition and self._items:
+                tail = self._items[-1]
+                if tail[1] is None and tail[5] and tail[2] == buttons:
+                    tail[3] += dx
+                    tail[4] += dy
+                    self._stats['coalesced'] += 1
+                    return
+            if not transition and len(self._items) >= self.maxsize:
+                # 가득 참 → 가장 오래된 순수 이동 폐기 (전이는 유지)
+                for item in self._items:
+                    if item[1] is None and item[5]:
+                        self._items.remove(item)
+                        self._stats['dropped_moves'] += 1
+                        break
+                else:
+                    self._stats['dropped_moves'] += 1
+                    return
+            self._items.append([self.mouse_dev, None, buttons, dx, dy, not transition, time.perf_counter()])
+            self._touch()
+
+    def _touch(self):
+        if len(self._items) > self._stats['max_depth']:
+            self._stats['max_depth'] = len(self._items)
+        self._cond.notify()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """항목이 생길 때까지 대기 → 항목 있음 여부"""
+        with self._cond:
+            return bool(self._items) or self._cond.wait_for(lambda: self._items, timeout)
+
+    def peek_dev(self) -> Optional[str]:
+        """다음 리포트의 장치 (없으면 None)"""
+        with self._cond:
+            return self._items[0][0] if self._items else None
+
+    def get(self, timeout: Optional[float] = None, max_step: int = 127):
+        """(dev, report, 큐 진입 시각) 1개 꺼내기 — 없으면 queue.Empty
+
+        max_step: 이동 리포트 1개의 축별 최대값 (≤127). 남은 이동량은 큐 앞에 유지
+        꺼낸 리포트는 전송 후 done() 호출
+        """
+        with self._cond:
+            if not self._items and not self._cond.wait_for(lambda: self._items, timeout):
+                raise queue.Empty
+            self._in_flight += 1
+            item = self._items[0]
+            if item[1] is not None:
+                self._items.popleft()
+                self._stats['sent'] += 1
+                return item[0], item[1], item[2]
+            buttons, dx, dy = item[2], item[3], item[4]
+            # 두 축을 같은 비율로 나눠 대각선 이동 방향 유지
+            steps = -(-max(abs(dx), abs(dy)) // max_step) or 1
+            sx = int(dx / steps)
+            sy = int(dy / steps)
+            if sx == dx and sy == dy:
+                self._items.popleft()
+            else:
+                # 한계 초과분은 같은 버튼 상태의 이동으로 남김
+                item[3], item[4], item[5] = dx - sx, dy - sy, True
+                self._stats['split'] += 1
+            self._stats['sent'] += 1
+            return item[0], struct.pack('Bbb', buttons, sx, sy), item[6]
+
+    def get_nowait(self, max_step: int = 127):
+        return self.get(timeout=0, max_step=max_step)
+
+    def clear(self):
+        with self._cond:
+            self._items.clear()
+
+    def stats(self) -> dict:
+        """큐 깊이 + coalescing 통계"""
+        with self._cond:
+            result = dict(self._stats)
+            result['depth'] = len(self._items)
+            result['in_flight'] = self._in_flight
+            result['pending_moves'] = sum(1 for item in self._items if item[1] is None)
+        return result
 
 
 class FastHIDController:
@@ -31,22 +186,56 @@ class FastHIDController:
 
     MAX_QUEUE_SIZE = 200  # 명령 큐 최대 크기
 
-    def __init__(self, ip: str, port: int = 22, username: str = "root", password: str = "luckfox"):
+    # HID gadget 장치 → 리포트 크기 (bytes)
+    KEYBOARD_DEV = '/dev/hidg0'
+    MOUSE_DEV = '/dev/hidg2'
+    REPORT_SIZES = {KEYBOARD_DEV: 8, MOUSE_DEV: 3}
+
+    def __init__(self, ip: str, port: int = 22, username: str = "root", password: str = "luckfox",
+                 binary_stream: Optional[bool] = None, report_rate: Optional[int] = None):
         self.ip = ip
         self.port = port
         self.username = username
         self.password = password
 
+        # 바이너리 스트림 사용 여부 (None = 설정값)
+        if binary_stream is None:
+            try:
+                from config import settings
+                binary_stream = bool(settings.get('hid.binary_stream', True))
+            except Exception:
+                binary_stream = True
+        self.binary_stream = binary_stream
+
+        # 고정 주기 전송 (None = 설정값, 0 = 연속 전송)
+        max_step = 127
+        try:
+            from config import settings
+            if report_rate is None:
+                report_rate = int(settings.get('hid.report_rate', 0) or 0)
+            max_step = int(settings.get('hid.max_step', 127) or 127)
+        except Exception:
+            report_rate = report_rate or 0
+        self.report_rate = max(0, int(report_rate))
+        self.max_step = max(1, min(127, max_step))
+
         self.ssh: Optional[paramiko.SSHClient] = None
         self.shell: Optional[paramiko.Channel] = None
+        # 장치별 바이너리 writer 채널 (key: gadget 경로)
+        self._streams: Dict[str, paramiko.Channel] = {}
         self._connected = False
         self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # 스트림 채널 write (워커 / HIDBroadcaster 공용)
 
-        # 명령 큐 (비동기 전송용) — 크기 제한
-        self._cmd_queue = queue.Queue(maxsize=self.MAX_QUEUE_SIZE)
+        # 명령 큐 (비동기 전송용) — 이동 coalescing, 가득 차면 이동만 폐기
+        self._cmd_queue = HIDReportQueue(self.MOUSE_DEV, maxsize=self.MAX_QUEUE_SIZE)
         self._worker_thread: Optional[threading.Thread] = None
         self._running = False
 
+        # 입력 지연 계측 (enqueue → send → ack)
+        self.latency = HIDLatencyStats({self.KEYBOARD_DEV: 'keyboard', self.MOUSE_DEV: 'mouse'})
+        _instances.add(self)
+
         # 자동 재연결
         self._reconnect_attempts = 0
         self._max_reconnect = 5
@@ -78,6 +267,7 @@ class FastHIDController:
                 while self.shell.recv_ready():
                     self.shell.recv(4096)
 
+                self._open_streams()
                 self._connected = True
                 self._reconnect_attempts = 0  # 성공 시 리셋
 
@@ -103,6 +293,7 @@ class FastHIDController:
         self._reconnecting = True
         try:
             # 기존 연결 정리
+            self._close_streams()
             try:
                 if self.shell:
                     self.shell.close()
@@ -140,6 +331,7 @@ class FastHIDController:
                     while self.shell.recv_ready():
                         self.shell.recv(4096)
 
+                    self._open_streams()
                     self._connected = True
                     self._reconnect_attempts = 0
                     print(f"[HID] 재연결 성공: {self.ip}")
@@ -160,6 +352,7 @@ class FastHIDController:
             self._worker_thread.join(timeout=2)
 
         with self._lock:
+            self._close_streams()
             if self.shell:
                 try:
                     self.shell.close()
@@ -177,17 +370,124 @@ class FastHIDController:
     def is_connected(self) -> bool:
         return self._connected
 
+    @property
+    def transport_mode(self) -> str:
+        """현재 전송 경로: 'stream' (모든 장치 바이너리 채널) / 'mixed' / 'shell'"""
+        if not self._streams:
+            return "shell"
+        return "stream" if len(self._streams) == len(self.REPORT_SIZES) else "mixed"
+
+    def _open_streams(self):
+        """장치별 바이너리 writer 채널 열기 (실패한 장치는 쉘 경로 사용)"""
+        self._streams = {}
+        if not self.binary_stream or not self.ssh:
+            return
+        transport = self.ssh.get_transport()
+        if transport is None:
+            return
+        # 작은 리포트가 Nagle 지연에 묶이지 않도록
+        try:
+            transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except Exception:
+            pass
+        for dev, size in self.REPORT_SIZES.items():
+            try:
+                ch = transport.open_session()
+                # iflag=fullblock: 파이프에서 리포트가 나뉘어 도착해도 정확히 size 바이트씩 write
+                ch.exec_command(f"exec dd of={dev} bs={size} iflag=fullblock 2>/dev/null")
+                self._streams[dev] = ch
+            except Exception as e:
+                print(f"[HID] {dev} 스트림 채널 실패: {e}")
+        # dd가 옵션/장치 문제로 바로 종료했는지 확인
+        time.sleep(0.1)
+        for dev, ch in list(self._streams.items()):
+            if ch.exit_status_ready() or ch.closed:
+                print(f"[HID] {dev} 스트림 사용 불가 (exit={ch.recv_exit_status()}) — 쉘 경로 사용")
+                self._close_stream(dev)
+        print(f"[HID] 전송 경로: {self.transport_mode} ({self.ip})")
+
+    def _close_stream(self, dev: str):
+        ch = self._streams.pop(dev, None)
+        if ch is not None:
+            try:
+                ch.close()
+            except Exception:
+                pass
+
+    def _close_streams(self):
+        for dev in list(self._streams):
+            self._close_stream(dev)
+
     def _worker_loop(self):
         """명령 큐 처리 워커"""
+        if self.report_rate > 0:
+            self._paced_loop(1.0 / self.report_rate)
+            return
+        while self._running:
+            try:
+                dev, report, t_enqueue = self._cmd_queue.get(timeout=0.01)
+                self._timed_send(dev, report, t_enqueue)
+            except queue.Empty:
+                pass
+            except Exception as e:
+                print(f"[HID] Worker error: {e}")
+
+    def _paced_loop(self, interval: float):
+        """고정 주기 워커 — 틱마다 장치별 리포트 최대 1개, 큐 순서 유지
+
+        다음 틱은 perf_counter(고해상도 monotonic) 기준 절대 시각으로 계산 (sleep 오차 누적 없음).
+        Windows의 time.monotonic은 Python 3.13 미만에서 ~15ms 해상도라 사용하지 않음.
+        유휴 후이거나 한 틱 이상 밀리면 몰아서 보내지 않고 현재 시각으로 재정렬.
+        """
+        q = self._cmd_queue
+        next_tick = time.perf_counter()
         while self._running:
             try:
-                cmd = self._cmd_queue.get(timeout=0.01)
-                self._send_raw(cmd)
+                now = time.perf_counter()
+                if now < next_tick:
+                    time.sleep(next_tick - now)
+                elif now - next_tick > interval:
+                    next_tick = now
+                if not q.wait(timeout=0.05):
+                    next_tick = time.perf_counter()
+                    continue
+                sent = set()
+                while self._running:
+                    dev = q.peek_dev()
+                    if dev is None or dev in sent:
+                        break
+                    dev, report, t_enqueue = q.get_nowait(self.max_step)
+                    self._timed_send(dev, report, t_enqueue)
+                    sent.add(dev)
+                self._drain_shell()
+                next_tick += interval
             except queue.Empty:
                 pass
             except Exception as e:
                 print(f"[HID] Worker error: {e}")
 
+    def _timed_send(self, dev: str, report: bytes, t_enqueue: float):
+        """큐에서 꺼낸 리포트 전송 — 끝나면 (실패해도) 전송 중 카운트 반환"""
+        t_send = time.perf_counter()
+        try:
+            self._send_report(dev, report)
+        finally:
+            self._cmd_queue.done()
+        self.latency.record(dev, t_enqueue, t_send, time.perf_counter())
+
+    def _send_report(self, dev: str, report: bytes):
+        """리포트 1개 전송 — 스트림 채널 우선, 실패 시 같은 리포트를 쉘 경로로"""
+        ch = self._streams.get(dev)
+        if ch is not None and self._connected:
+            try:
+                with self._write_lock:
+                    ch.sendall(report)
+                return
+            except Exception as e:
+                print(f"[HID] {dev} 스트림 전송 실패 → 쉘 경로: {e}")
+                self._close_stream(dev)
+        self._send_raw(f"echo -ne '{self._bytes_to_hex(report)}' > {dev}")
+
     def _send_raw(self, cmd: str):
         """쉘을 통해 명령 전송 — 실패 시 자동 재연결"""
         if not self._connected or not self.shell:
@@ -200,95 +500,120 @@ class FastHIDController:
 
         try:
             self.shell.send(cmd + "\n")
-            # 응답 읽기 (비차단)
-            time.sleep(0.001)
-            while self.shell.recv_ready():
-                self.shell.recv(1024)
+            if not self.report_rate:
+                # 응답 읽기 (비차단) — 고정 주기 모드는 틱마다 한 번 (_drain_shell)
+                time.sleep(0.001)
+                self._drain_shell()
         except Exception as e:
             print(f"[HID] Send error: {e}")
             self._connected = False
             # 워커 루프에서 다음 명령 시 자동 재연결 시도
 
+    def _drain_shell(self):
+        """쉘 에코 출력 버리기 (비차단)"""
+        shell = self.shell
+        if shell is None:
+            return
+        try:
+            while shell.recv_ready():
+                shell.recv(1024)
+        except Exception:
+            pass
+
     def _bytes_to_hex(self, data: bytes) -> str:
         """바이트를 16진수 문자열로 변환"""
         return ''.join(f'\\x{b:02x}' for b in data)
 
     def send_mouse_relative(self, dx: int, dy: int, buttons: int = 0):
-        """상대 마우스 이동 (큐에 추가)"""
-        dx = max(-127, min(127, dx))
-        dy = max(-127, min(127, dy))
-
-        report = struct.pack('Bbb', buttons, dx, dy)
-        cmd = f"echo -ne '{self._bytes_to_hex(report)}' > /dev/hidg2"
-        self._enqueue(cmd)
+        """상대 마우스 이동 (큐에 추가) — ±127을 넘는 이동은 전송 시 여러 리포트로 나뉨"""
+        self._cmd_queue.put_move(int(dx), int(dy), buttons)
 
     def send_mouse_click(self, button: str = 'left'):
         """마우스 클릭"""
         btn_map = {'left': 1, 'right': 2, 'middle': 4}
         btn = btn_map.get(button, 1)
 
-        # 버튼 누름
-        report_down = struct.pack('Bbb', btn, 0, 0)
-        cmd_down = f"echo -ne '{self._bytes_to_hex(report_down)}' > /dev/hidg2"
-        self._enqueue(cmd_down)
-
-        # 버튼 놓음
-        report_up = struct.pack('Bbb', 0, 0, 0)
-        cmd_up = f"echo -ne '{self._bytes_to_hex(report_up)}' > /dev/hidg2"
-        self._enqueue(cmd_up)
+        # 버튼 누름 → 놓음
+        self._enqueue(self.MOUSE_DEV, struct.pack('Bbb', btn, 0, 0))
+        self._enqueue(self.MOUSE_DEV, struct.pack('Bbb', 0, 0, 0))
 
     def send_key(self, key: str, modifiers: int = 0):
         """키 입력"""
         key_code = self.KEY_CODES.get(key.lower(), 0)
         if not key_code:
             return
-
-        # 키 누름
-        report_down = struct.pack('BBBBBBBB', modifiers, 0, key_code, 0, 0, 0, 0, 0)
-        cmd_down = f"echo -ne '{self._bytes_to_hex(report_down)}' > /dev/hidg0"
-        self._enqueue(cmd_down)
-
-        # 키 놓음
-        report_up = struct.pack('BBBBBBBB', 0, 0, 0, 0, 0, 0, 0, 0)
-        cmd_up = f"echo -ne '{self._bytes_to_hex(report_up)}' > /dev/hidg0"
-        self._enqueue(cmd_up)
+        self.send_hid_code(key_code, modifiers)
 
     def send_hid_code(self, hid_code: int, modifiers: int = 0):
         """HID 키코드 직접 전송 (KEY_CODES 매핑 없이)"""
-        # 키 누름
-        report_down = struct.pack('BBBBBBBB', modifiers, 0, hid_code, 0, 0, 0, 0, 0)
-        cmd_down = f"echo -ne '{self._bytes_to_hex(report_down)}' > /dev/hidg0"
-        self._enqueue(cmd_down)
-
-        # 키 놓음
-        report_up = struct.pack('BBBBBBBB', 0, 0, 0, 0, 0, 0, 0, 0)
-        cmd_up = f"echo -ne '{self._bytes_to_hex(report_up)}' > /dev/hidg0"
-        self._enqueue(cmd_up)
-
-    def _enqueue(self, cmd: str):
-        """명령을 큐에 추가 — 큐가 가득 차면 오래된 명령 버림"""
+        # 키 누름 → 놓음
+        self._enqueue(self.KEYBOARD_DEV, struct.pack('BBBBBBBB', modifiers, 0, hid_code, 0, 0, 0, 0, 0))
+        self._enqueue(self.KEYBOARD_DEV, struct.pack('BBBBBBBB', 0, 0, 0, 0, 0, 0, 0, 0))
+
+    def send_hid_code_hold(self, hid_code: int, modifiers: int = 0, hold: float = 0.15):
+        """키 누름 → hold초 후 놓음 (한/영 Right Alt처럼 짧게 누르면 인식 안 되는 키)"""
+        self._enqueue(self.KEYBOARD_DEV, struct.pack('BBBBBBBB', modifiers, 0, hid_code, 0, 0, 0, 0, 0))
+        release = threading.Timer(hold, self._enqueue,
+                                  args=(self.KEYBOARD_DEV, struct.pack('BBBBBBBB', 0, 0, 0, 0, 0, 0, 0, 0)))
+        release.daemon = True
+        release.start()
+
+    def can_write_now(self, devs) -> bool:
+        """큐를 거치지 않고 바로 써도 순서가 유지되는지
+        (연결됨 + 큐 비어 있음 + 워커가 꺼낸 리포트 전송 완료 + 스트림 채널 있음)"""
+        return (self._connected and not self._cmd_queue.pending()
+                and all(dev in self._streams for dev in devs))
+
+    def write_now(self, dev: str, report: bytes, t_enqueue: Optional[float] = None) -> bool:
+        """스트림 채널에 즉시 write (HIDBroadcaster용) — 실패 시 False (호출자가 큐로 전달)"""
+        ch = self._streams.get(dev)
+        if ch is None or not self._connected:
+            return False
+        t_send = time.perf_counter()
         try:
-            self._cmd_queue.put_nowait(cmd)
-        except queue.Full:
-            # 큐 가득 참 → 오래된 마우스 이동 명령 절반 버리고 새 명령 추가
-            dropped = 0
-            try:
-                for _ in range(self.MAX_QUEUE_SIZE // 2):
-                    self._cmd_queue.get_nowait()
-                    dropped += 1
-            except queue.Empty:
-                pass
-            if dropped > 0:
-                print(f"[HID] 큐 오버플로 → {dropped}개 명령 폐기")
-            try:
-                self._cmd_queue.put_nowait(cmd)
-            except queue.Full:
-                pass
+            with self._write_lock:
+                ch.sendall(report)
+        except Exception as e:
+            print(f"[HID] {dev} 스트림 전송 실패 → 쉘 경로: {e}")
+            self._close_stream(dev)
+            return False
+        self.latency.record(dev, t_send if t_enqueue is None else t_enqueue, t_send, time.perf_counter())
+        return True
+
+    def enqueue_report(self, dev: str, report: bytes):
+        """인코딩된 리포트를 큐에 추가 (키/버튼 전이로 취급 — 폐기되지 않음)"""
+        self._enqueue(dev, report)
+
+    def _enqueue(self, dev: str, report: bytes):
+        """리포트를 큐에 추가 (키/버튼 전이는 큐가 가득 차도 폐기하지 않음)"""
+        self._cmd_queue.put_report(dev, report)
+
+    def get_queue_stats(self) -> dict:
+        """큐 깊이 + coalescing 통계 (enqueued/sent/coalesced/split/dropped_moves/max_depth)"""
+        stats = self._cmd_queue.stats()
+        stats['transport'] = self.transport_mode
+        stats['report_rate'] = self.report_rate
+        return stats
+
+    def get_latency_stats(self) -> dict:
+        """장치별 queue/write/total 지연 히스토그램 요약 (p50/p95/p99)"""
+        return self.latency.to_dict()
 
     def flush(self):
         """큐 비우기"""
-        while not self._cmd_queue.empty():
-            try:
-                self._cmd_queue.get_nowait()
-            except queue.Empty:
-                break
+        self._cmd_queue.clear()
+
+
+def get_hid_report(reset: bool = False) -> List[dict]:
+    """생성된 모든 FastHIDController의 큐/지연 통계 (mcp_debug용)"""
+    report = []
+    for hid in list(_instances):
+        report.append({
+            "ip": hid.ip,
+            "connected": hid.is_connected(),
+            "queue": hid.get_queue_stats(),
+            "latency": hid.get_latency_stats(),
+        })
+        if reset:
+            hid.latency.reset()
+    return report
@@ -0,0 +1,113 @@
+"""
+HID 입력 지연 계측
+
+리포트 1개당 시각 3개 (time.perf_counter):
+- enqueue: send_* 호출로 큐에 들어온 시각 (coalescing된 이동은 가장 오래된 이벤트 기준)
+- send: 워커가 큐에서 꺼내 쓰기 시작한 시각
+- ack: 스트림 채널 sendall / 쉘 send 완료 시각
+  (gadget은 리포트별 응답이 없으므로 SSH 채널 쓰기 완료 = 확인. 원격 윈도가 차면 sendall이
+   막히므로 장치 쪽 적체도 write 구간에 나타남)
+
+구간별 히스토그램: queue (enqueue→send), write (send→ack), total (enqueue→ack).
+버킷 경계가 고정된 로그 스케일 히스토그램 → 기록 비용은 bisect 1회 + 정수 += (락 없음,
+RelayCounters와 같은 방식) 이라 운영 중 상시 켜 둠.
+"""
+
+import bisect
+import time
+from typing import Dict
+
+# 버킷 상한 (ms): 0.05ms ~ 약 10초, 1.5배 간격
+_BOUNDS_MS = []
+_b = 0.05
+while _b < 10000:
+    _BOUNDS_MS.append(round(_b, 3))
+    _b *= 1.5
+
+
+class LatencyHistogram:
+    """고정 로그 버킷 지연 히스토그램 (ms)"""
+
+    __slots__ = ('counts', 'count', 'total_ms', 'max_ms')
+
+    def __init__(self):
+        self.counts = [0] * (len(_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float):
+        self.counts[bisect.bisect_left(_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, p: float) -> float:
+        """p (0~100) 백분위 — 해당 버킷 상한 (최대값을 넘지 않음)"""
+        if not self.count:
+            return 0.0
+        rank = self.count * p / 100.0
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                bound = _BOUNDS_MS[i] if i < len(_BOUNDS_MS) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        avg = self.total_ms / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "avg_ms": round(avg, 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class HIDLatencyStats:
+    """장치별 (keyboard/mouse) 구간 히스토그램"""
+
+    STAGES = ('queue', 'write', 'total')
+
+    def __init__(self, device_names: Dict[str, str]):
+        """device_names: {gadget 경로: 표시 이름} (예: {'/dev/hidg0': 'keyboard'})"""
+        self._names = dict(device_names)
+        self._hists: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self.started = time.time()
+        self.reset()
+
+    def reset(self):
+        self._hists = {name: {stage: LatencyHistogram() for stage in self.STAGES}
+                       for name in self._names.values()}
+        self.started = time.time()
+
+    def record(self, dev: str, t_enqueue: float, t_send: float, t_ack: float):
+        """리포트 1개의 시각 3개 기록 (perf_counter 초)"""
+        hists = self._hists.get(self._names.get(dev, ''))
+        if hists is None:
+            return
+        hists['queue'].record((t_send - t_enqueue) * 1000.0)
+        hists['write'].record((t_ack - t_send) * 1000.0)
+        hists['total'].record((t_ack - t_enqueue) * 1000.0)
+
+    def to_dict(self) -> dict:
+        return {
+            "since": round(time.time() - self.started, 1),
+            "devices": {name: {stage: h.to_dict() for stage, h in stages.items()}
+                        for name, stages in self._hists.items()},
+        }
+
+    def summary(self) -> str:
+        """오버레이용 한 줄 요약 (장치별 total p50/p95/p99, queue p95)"""
+        parts = []
+        for name, stages in self._hists.items():
+            total = stages['total']
+            if not total.count:
+                continue
+            parts.append(f"{name} {total.percentile(50):.1f}/{total.percentile(95):.1f}/"
+                         f"{total.percentile(99):.1f}ms (큐 p95 {stages['queue'].percentile(95):.1f})")
+        return " | ".join(parts)
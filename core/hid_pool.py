@@ -0,0 +1,141 @@
+"""
+프로세스 공용 HID 컨트롤러 풀
+
+장치(ip, port, username)마다 FastHIDController 1개를 참조 카운트로 공유.
+- acquire: 연결된 컨트롤러를 바로 반환 (없거나 끊겼으면 백그라운드 연결 시작 — 연결 전 입력은 큐에 쌓임)
+- release: 참조가 0이 되면 hid.pool_idle_timeout 초 동안 연결 유지 후 종료
+  → LiveView를 닫았다 다시 열거나 부분제어로 전환해도 SSH 핸드셰이크를 다시 하지 않음
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from .hid_controller import FastHIDController
+
+
+class _PoolEntry:
+    __slots__ = ('hid', 'refs', 'idle_timer', 'connecting')
+
+    def __init__(self, hid: FastHIDController):
+        self.hid = hid
+        self.refs = 0
+        self.idle_timer: Optional[threading.Timer] = None
+        self.connecting = False
+
+
+class HIDControllerPool:
+    """참조 카운트 기반 FastHIDController 공유 풀"""
+
+    DEFAULT_IDLE_TIMEOUT = 120.0
+
+    def __init__(self, idle_timeout: Optional[float] = None):
+        self._idle_timeout = idle_timeout
+        self._entries: Dict[Tuple[str, int, str], _PoolEntry] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def idle_timeout(self) -> float:
+        if self._idle_timeout is not None:
+            return self._idle_timeout
+        try:
+            from config import settings
+            return float(settings.get('hid.pool_idle_timeout', self.DEFAULT_IDLE_TIMEOUT))
+        except Exception:
+            return self.DEFAULT_IDLE_TIMEOUT
+
+    def acquire(self, ip: str, port: int = 22, username: str = "root",
+                password: str = "luckfox") -> FastHIDController:
+        """장치의 공용 컨트롤러 (참조 +1). 사용 후 반드시 release"""
+        key = (ip, int(port), username)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _PoolEntry(FastHIDController(ip, port, username, password))
+                self._entries[key] = entry
+            else:
+                entry.hid.password = password
+            entry.refs += 1
+            if entry.idle_timer is not None:
+                entry.idle_timer.cancel()
+                entry.idle_timer = None
+            self._ensure_connected(entry)
+        return entry.hid
+
+    def warm(self, ip: str, port: int = 22, username: str = "root", password: str = "luckfox"):
+        """참조 없이 미리 연결 (유휴 타임아웃 후 자동 종료)"""
+        self.release(self.acquire(ip, port, username, password))
+
+    def release(self, hid: FastHIDController):
+        """참조 -1 — 0이 되면 유휴 타이머 시작"""
+        with self._lock:
+            entry = self._find(hid)
+            if entry is None:
+                return
+            entry.refs = max(0, entry.refs - 1)
+            if entry.refs or entry.idle_timer is not None:
+                return
+            timer = threading.Timer(self.idle_timeout, lambda: self._close_idle(entry, timer))
+            timer.daemon = True
+            entry.idle_timer = timer
+            timer.start()
+
+    def _find(self, hid: FastHIDController) -> Optional[_PoolEntry]:
+        for entry in self._entries.values():
+            if entry.hid is hid:
+                return entry
+        return None
+
+    def _ensure_connected(self, entry: _PoolEntry):
+        """끊긴 컨트롤러 백그라운드 연결 (self._lock 보유 상태에서 호출)"""
+        if entry.connecting or entry.hid.is_connected():
+            return
+        entry.connecting = True
+
+        def _connect():
+            try:
+                if not entry.hid.connect():
+                    # 연결 실패 → 쌓인 입력이 나중에 한꺼번에 나가지 않도록 비움
+                    entry.hid.flush()
+            finally:
+                entry.connecting = False
+
+        threading.Thread(target=_connect, daemon=True, name=f"HIDPool-{entry.hid.ip}").start()
+
+    def _close_idle(self, entry: _PoolEntry, timer: threading.Timer):
+        with self._lock:
+            if entry.refs or entry.idle_timer is not timer:
+                return  # 그 사이 다시 acquire됨
+            entry.idle_timer = None
+            key = next((k for k, e in self._entries.items() if e is entry), None)
+            if key is not None:
+                del self._entries[key]
+        print(f"[HIDPool] 유휴 연결 종료: {entry.hid.ip}")
+        entry.hid.disconnect()
+
+    def close_all(self):
+        """모든 컨트롤러 종료 (앱 종료 시)"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            if entry.idle_timer is not None:
+                entry.idle_timer.cancel()
+            try:
+                entry.hid.disconnect()
+            except Exception:
+                pass
+
+    def stats(self) -> list:
+        """풀 상태 (mcp_debug용)"""
+        with self._lock:
+            return [{
+                "ip": key[0],
+                "port": key[1],
+                "refs": entry.refs,
+                "connected": entry.hid.is_connected(),
+                "connecting": entry.connecting,
+                "idle": entry.idle_timer is not None,
+            } for key, entry in self._entries.items()]
+
+
+hid_pool = HIDControllerPool()
@@ -0,0 +1,107 @@
+"""
+문자열 → HID 키보드 리포트 시퀀스 (대량 텍스트 입력용)
+
+- US 배열 기준: 영문 대/소문자, 숫자, Shift 기호, 공백/탭/줄바꿈
+- 한글: 음절을 두벌식 자판 키로 분해 (겹모음/겹받침 포함), 한/영 전환(Right Alt)을 자동 삽입
+  (입력 시작 시 대상 PC가 영문 모드라고 가정하고, 끝나면 다시 영문 모드로 돌려 놓음)
+- 결과는 (8바이트 리포트, 최소 유지 시간) 목록 — 전송 쪽은 채널 1개로 그대로 흘려 보내면 됨
+"""
+
+import struct
+from typing import List, Tuple
+
+MOD_LSHIFT = 0x02
+MOD_RALT = 0x40
+
+RELEASE = struct.pack('BBBBBBBB', 0, 0, 0, 0, 0, 0, 0, 0)
+
+# 한/영 전환 키 (Right Alt 단독) — 짧게 누르면 IME가 인식하지 못해 유지 시간 필요
+HANGUL_TOGGLE_HOLD = 0.15
+
+# 문자 → (키코드, Shift 여부)
+_CHAR_KEYS = {}
+for _i, _c in enumerate('abcdefghijklmnopqrstuvwxyz'):
+    _CHAR_KEYS[_c] = (0x04 + _i, False)
+    _CHAR_KEYS[_c.upper()] = (0x04 + _i, True)
+for _i, _c in enumerate('1234567890'):
+    _CHAR_KEYS[_c] = (0x1E + _i, False)
+for _i, _c in enumerate('!@#$%^&*()'):
+    _CHAR_KEYS[_c] = (0x1E + _i, True)
+for _code, _plain, _shifted in (
+        (0x2D, '-', '_'), (0x2E, '=', '+'), (0x2F, '[', '{'), (0x30, ']', '}'),
+        (0x31, '\\', '|'), (0x33, ';', ':'), (0x34, "'", '"'), (0x35, '`', '~'),
+        (0x36, ',', '<'), (0x37, '.', '>'), (0x38, '/', '?')):
+    _CHAR_KEYS[_plain] = (_code, False)
+    _CHAR_KEYS[_shifted] = (_code, True)
+_CHAR_KEYS.update({' ': (0x2C, False), '\t': (0x2B, False), '\n': (0x28, False), '\r': (0x28, False)})
+
+# 두벌식: 자모 → 영문 키
+_JAMO_KEYS = {
+    'ㅂ': 'q', 'ㅈ': 'w', 'ㄷ': 'e', 'ㄱ': 'r', 'ㅅ': 't', 'ㅛ': 'y', 'ㅕ': 'u', 'ㅑ': 'i',
+    'ㅐ': 'o', 'ㅔ': 'p', 'ㅁ': 'a', 'ㄴ': 's', 'ㅇ': 'd', 'ㄹ': 'f', 'ㅎ': 'g', 'ㅗ': 'h',
+    'ㅓ': 'j', 'ㅏ': 'k', 'ㅣ': 'l', 'ㅋ': 'z', 'ㅌ': 'x', 'ㅊ': 'c', 'ㅍ': 'v', 'ㅠ': 'b',
+    'ㅜ': 'n', 'ㅡ': 'm', 'ㅃ': 'Q', 'ㅉ': 'W', 'ㄸ': 'E', 'ㄲ': 'R', 'ㅆ': 'T', 'ㅒ': 'O',
+    'ㅖ': 'P',
+}
+# 겹모음/겹받침 → 입력 순서
+_JAMO_COMPOUND = {
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+    'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+}
+_CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+_JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+_JONGSEONG = ('', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ',
+              'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ')
+
+
+def _hangul_keys(char: str) -> str:
+    """한글 음절/호환 자모 → 두벌식 영문 키 문자열 (한글이 아니면 '')"""
+    code = ord(char)
+    if 0xAC00 <= code <= 0xD7A3:
+        idx = code - 0xAC00
+        jamo = (_CHOSEONG[idx // 588] + _JUNGSEONG[(idx % 588) // 28] + _JONGSEONG[idx % 28])
+    elif char in _JAMO_KEYS or char in _JAMO_COMPOUND:
+        jamo = char
+    else:
+        return ''
+    return ''.join(_JAMO_KEYS[j] for j in ''.join(_JAMO_COMPOUND.get(j, j) for j in jamo))
+
+
+def _key(code: int, shift: bool) -> List[Tuple[bytes, float]]:
+    press = struct.pack('BBBBBBBB', MOD_LSHIFT if shift else 0, 0, code, 0, 0, 0, 0, 0)
+    return [(press, 0.0), (RELEASE, 0.0)]
+
+
+def _toggle() -> List[Tuple[bytes, float]]:
+    return [(struct.pack('BBBBBBBB', MOD_RALT, 0, 0, 0, 0, 0, 0, 0), HANGUL_TOGGLE_HOLD), (RELEASE, 0.0)]
+
+
+def text_to_reports(text: str) -> Tuple[List[Tuple[bytes, float]], str]:
+    """문자열 → ([(리포트, 최소 유지 초)], 입력할 수 없어 건너뛴 문자)
+
+    유지 시간 0은 전송 쪽 기본 간격을 사용한다는 뜻.
+    """
+    items: List[Tuple[bytes, float]] = []
+    skipped = []
+    korean = False
+    for char in text:
+        hangul = _hangul_keys(char)
+        if hangul:
+            if not korean:
+                items += _toggle()
+                korean = True
+            for key in hangul:
+                items += _key(*_CHAR_KEYS[key])
+            continue
+        key = _CHAR_KEYS.get(char)
+        if key is None:
+            skipped.append(char)
+            continue
+        if korean and char.isalpha():
+            items += _toggle()  # 영문자는 영문 모드에서
+            korean = False
+        items += _key(*key)
+    if korean:
+        items += _toggle()
+    return items, ''.join(skipped)
@@ -2,15 +2,19 @@
 Single KVM Device Controller
 """
 
-import paramiko
+import re
 import requests
 import struct
 import time
 import threading
-from typing import Optional, Callable
-from dataclasses import dataclass
+from typing import List, Optional, Callable, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
+from .hid_text import text_to_reports
+from .kvm_telemetry import TelemetryState, is_missing, parse_probe, probe_command
+from .ssh_pool import SSHSession, ssh_pool
+
 
 class DeviceStatus(Enum):
     ONLINE = "online"
@@ -26,7 +30,11 @@ class USBStatus(Enum):
     NOT_ATTACHED = "not_attached"
 
 
-@dataclass
+# 장치 레지스트리 인덱스 키 — 값이 바뀌면 _watcher로 알림 (core/device_registry.py)
+_WATCHED_INFO_FIELDS = frozenset({'ip', 'group'})
+
+
+@dataclass(slots=True)
 class KVMInfo:
     name: str
     ip: str
@@ -35,6 +43,22 @@ class KVMInfo:
     username: str = "root"
     password: str = "luckfox"
     group: str = "default"
+    # 릴레이 치환 정보 (MainWindow._apply_relay_substitution)
+    _udp_relay_port: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    _relay_route: str = field(default='', init=False, repr=False, compare=False)
+    _kvm_local_ip: str = field(default='', init=False, repr=False, compare=False)
+    _watcher: Optional[Callable] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, key, value):
+        if key in _WATCHED_INFO_FIELDS:
+            watcher = getattr(self, '_watcher', None)
+            if watcher is not None:
+                old = getattr(self, key)
+                object.__setattr__(self, key, value)
+                if old != value:
+                    watcher(key, old, value)
+                return
+        object.__setattr__(self, key, value)
 
 
 class KVMDevice:
@@ -65,173 +89,174 @@ class KVMDevice:
     MOD_RALT = 0x40
     MOD_RMETA = 0x80
 
+    # 장치 수천 대 기준 메모리 절감 + 속성 오타 방지
+    __slots__ = ('info', '_session', '_status', '_watcher', 'usb_status', 'version', 'system_version',
+                 'mac_address', 'hostname', 'telemetry', '_lock', '_connected', '__weakref__')
+
     def __init__(self, info: KVMInfo):
         self.info = info
-        self.ssh: Optional[paramiko.SSHClient] = None
-        self.status = DeviceStatus.UNKNOWN
+        # 장치별 공유 SSH 트랜스포트 (명령/SFTP마다 채널만 새로 염 — core/ssh_pool.py)
+        self._session: Optional[SSHSession] = None
+        self._watcher: Optional[Callable] = None  # 레지스트리 인덱스 갱신 (status 변경 시)
+        self._status = DeviceStatus.UNKNOWN
         self.usb_status = USBStatus.DISCONNECTED
         self.version = ""
         self.system_version = ""
         self.mac_address = ""
         self.hostname = ""
-        self._lock = threading.Lock()
+        self.telemetry = TelemetryState()  # 마지막 프로브 결과 (델타 누적 — core/kvm_telemetry.py)
+        self._lock = threading.Lock()  # 연결 상태 보호 (원격 명령 실행 중에는 잡지 않음)
         self._connected = False
 
     @property
     def name(self) -> str:
         return self.info.name
 
+    @property
+    def status(self) -> DeviceStatus:
+        return self._status
+
+    @status.setter
+    def status(self, value: DeviceStatus):
+        old, self._status = self._status, value
+        if old != value and self._watcher is not None:
+            self._watcher('status', old, value)
+
     @property
     def ip(self) -> str:
         return self.info.ip
 
+    def _pooled_session(self) -> SSHSession:
+        """풀의 장치 세션 (KVMInfo 변경 반영)"""
+        return ssh_pool.get(self.info.ip, self.info.port, self.info.username, self.info.password)
+
     def connect(self) -> bool:
         """Connect to KVM via SSH"""
         try:
             with self._lock:
-                if self._connected and self.ssh:
+                if self._connected and self._session:
                     return True
 
-                self.ssh = paramiko.SSHClient()
-                self.ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                self.ssh.connect(
-                    self.info.ip,
-                    port=self.info.port,
-                    username=self.info.username,
-                    password=self.info.password,
-                    timeout=10
-                )
+                # 새 세션을 먼저 보유한 뒤 이전 것을 반납 (같은 세션이면 트랜스포트 유지)
+                session = ssh_pool.acquire(self.info.ip, self.info.port, self.info.username,
+                                           self.info.password)
+                if self._session is not None:
+                    ssh_pool.release(self._session)
+                self._session = session
+                session.connect(timeout=10)
                 self._connected = True
                 self.status = DeviceStatus.ONLINE
-                self._update_device_info()
-                return True
         except Exception as e:
             self.status = DeviceStatus.OFFLINE
             self._connected = False
             print(f"[{self.name}] Connection failed: {e}")
             return False
+        self._update_device_info()
+        return True
 
     def disconnect(self):
-        """Disconnect SSH"""
+        """Disconnect SSH — 공유 세션은 반납만 (같은 트랜스포트를 쓰는 다른 장치는 영향 없음)"""
         with self._lock:
-            if self.ssh:
-                try:
-                    self.ssh.close()
-                except:
-                    pass
-                self.ssh = None
+            if self._session:
+                ssh_pool.release(self._session)
+                self._session = None
             self._connected = False
             self.status = DeviceStatus.OFFLINE
 
     def is_connected(self) -> bool:
         """Check connection status"""
-        return self._connected and self.ssh is not None
+        return self._connected and self._session is not None
 
     def _exec_command(self, cmd: str, timeout: int = 10) -> tuple:
-        """Execute SSH command (thread-safe with lock)"""
-        with self._lock:
-            if not self.is_connected():
-                if not self.connect():
-                    return "", "Not connected"
+        """Execute SSH command — 공유 트랜스포트에 채널을 열어 실행 (다른 명령과 동시 실행 가능)"""
+        if not self.is_connected():
+            if not self.connect():
+                return "", "Not connected"
 
-            try:
-                stdin, stdout, stderr = self.ssh.exec_command(cmd, timeout=timeout)
-                return stdout.read().decode().strip(), stderr.read().decode().strip()
-            except Exception as e:
-                self._connected = False
-                return "", str(e)
+        try:
+            return self._session.exec(cmd, timeout=timeout)
+        except Exception as e:
+            self._connected = False
+            return "", str(e)
 
     def _update_device_info(self):
-        """Update device version info + MAC/hostname"""
-        out, _ = self._exec_command("cat /version")
-        self.system_version = out
+        """Update device version info + MAC/hostname (전체 텔레메트리 1회)"""
+        if self.probe_telemetry(delta=False) is None:
+            return
 
-        # Get app version from web API
-        try:
-            resp = requests.get(f"http://{self.info.ip}:{self.info.web_port}/api/version", timeout=5)
-            if resp.ok:
-                data = resp.json()
-                self.version = data.get("app", "")
-        except:
-            pass
+        # 장치에 wget이 없으면 /api/version 원문이 비어 있음 → 웹 API 직접 조회
+        if not self.version:
+            try:
+                resp = requests.get(f"http://{self.info.ip}:{self.info.web_port}/api/version", timeout=5)
+                if resp.ok:
+                    self.version = resp.json().get("app", "")
+            except:
+                pass
 
-        # MAC address (eth0)
-        out, _ = self._exec_command("cat /sys/class/net/eth0/address 2>/dev/null")
-        if out and ':' in out:
-            self.mac_address = out.strip().upper()
+    def probe_telemetry(self, delta: bool = True) -> Optional[dict]:
+        """텔레메트리 프로브 1회 (SSH 왕복 1번) → 누적 필드 dict (실패 시 None)
 
-        # Hostname
-        out, _ = self._exec_command("hostname 2>/dev/null")
-        if out:
-            self.hostname = out.strip()
+        delta=True: 마지막 seq 이후 바뀐 필드만 전송받아 self.telemetry에 병합.
+        스크립트가 없으면 (첫 조회/재부팅) 같은 명령 안에서 설치 후 실행.
+        """
+        state = self.telemetry
+        if not delta:
+            state.reset()
+        out, err = self._exec_command(
+            probe_command(state.epoch, state.seq, self.info.web_port), timeout=5)
+        if is_missing(out):
+            state.reset()
+            out, err = self._exec_command(
+                probe_command(web_port=self.info.web_port, install=True), timeout=5)
+        doc = parse_probe(out)
+        if doc is None:
+            if out or err:
+                print(f"[{self.name}] 텔레메트리 응답 오류: {(err or out)[:200]}")
+            return None
+        state.apply(doc, len(out))
+
+        fields = state.fields
+        self.usb_status = self._parse_usb_state(fields.get('usb_state', ''))
+        self.system_version = fields.get('system_version', '') or self.system_version
+        self.version = state.app_version() or self.version
+        mac = fields.get('mac', '')
+        if mac and ':' in mac:
+            self.mac_address = mac.strip().upper()
+        if fields.get('hostname'):
+            self.hostname = fields['hostname'].strip()
+        return fields
+
+    @staticmethod
+    def _parse_usb_state(usb_str: str) -> USBStatus:
+        if "configured" in usb_str:
+            return USBStatus.CONFIGURED
+        elif "connected" in usb_str:
+            return USBStatus.CONNECTED
+        elif "not attached" in usb_str or not usb_str:
+            return USBStatus.NOT_ATTACHED
+        return USBStatus.DISCONNECTED
 
     def get_usb_status(self) -> USBStatus:
         """Get USB connection status"""
         out, _ = self._exec_command("cat /sys/class/udc/*/state 2>/dev/null")
-
-        if "configured" in out:
-            self.usb_status = USBStatus.CONFIGURED
-        elif "connected" in out:
-            self.usb_status = USBStatus.CONNECTED
-        elif "not attached" in out or not out:
-            self.usb_status = USBStatus.NOT_ATTACHED
-        else:
-            self.usb_status = USBStatus.DISCONNECTED
-
+        self.usb_status = self._parse_usb_state(out)
         return self.usb_status
 
     def get_system_info(self) -> dict:
-        """Get system information (단일 SSH 호출로 병합)"""
+        """Get system information (텔레메트리 델타 프로브 — 바뀐 필드만 전송, 결과는 전체 필드)"""
         info = {}
-
-        # 4개 명령을 단일 호출로 병합 (SSH 오버헤드 75% 감소)
-        combined_cmd = (
-            "echo '---UPTIME---' && uptime && "
-            "echo '---MEM---' && free -m | grep Mem && "
-            "echo '---TEMP---' && cat /sys/class/thermal/thermal_zone*/temp 2>/dev/null && "
-            "echo '---USB---' && cat /sys/class/udc/*/state 2>/dev/null"
-        )
-        out, _ = self._exec_command(combined_cmd, timeout=5)
-
-        if out:
-            sections = out.split('---')
-            for section in sections:
-                section = section.strip()
-                if section.startswith('UPTIME---'):
-                    info['uptime'] = section.replace('UPTIME---', '').strip()
-                elif section.startswith('MEM---'):
-                    mem_line = section.replace('MEM---', '').strip()
-                    if mem_line:
-                        parts = mem_line.split()
-                        if len(parts) >= 3:
-                            try:
-                                info['memory_total'] = int(parts[1])
-                                info['memory_used'] = int(parts[2])
-                            except (ValueError, IndexError):
-                                pass
-                elif section.startswith('TEMP---'):
-                    temp_str = section.replace('TEMP---', '').strip()
-                    if temp_str:
-                        try:
-                            info['temperature'] = int(temp_str.split('\n')[0]) / 1000
-                        except (ValueError, IndexError):
-                            pass
-                elif section.startswith('USB---'):
-                    usb_str = section.replace('USB---', '').strip()
-                    if "configured" in usb_str:
-                        self.usb_status = USBStatus.CONFIGURED
-                    elif "connected" in usb_str:
-                        self.usb_status = USBStatus.CONNECTED
-                    elif "not attached" in usb_str or not usb_str:
-                        self.usb_status = USBStatus.NOT_ATTACHED
-                    else:
-                        self.usb_status = USBStatus.DISCONNECTED
-                    info['usb_status'] = self.usb_status.value
-
-        if 'usb_status' not in info:
-            info['usb_status'] = self.usb_status.value
-
-        # MAC / Hostname (캐시됨, SSH 호출 불필요)
+        fields = self.probe_telemetry() or {}
+
+        if fields.get('uptime'):
+            info['uptime'] = fields['uptime'].strip()
+        if fields.get('memory_total') is not None and fields.get('memory_used') is not None:
+            info['memory_total'] = fields['memory_total']
+            info['memory_used'] = fields['memory_used']
+        if fields.get('temperature') is not None:
+            info['temperature'] = fields['temperature'] / 1000
+        info['usb_status'] = self.usb_status.value
+
+        # MAC / Hostname (캐시됨, 고정 필드는 델타 응답에 포함되지 않음)
         info['mac_address'] = self.mac_address
         info['hostname'] = self.hostname
 
@@ -268,18 +293,86 @@ class KVMDevice:
 
         return True
 
-    def send_text(self, text: str, delay: float = 0.05):
-        """Send text string"""
-        for char in text:
-            if char.isupper():
-                self.send_key(char.lower(), self.MOD_LSHIFT, delay)
-            elif char == ' ':
-                self.send_key('space', 0, delay)
-            elif char == '\n':
-                self.send_key('enter', 0, delay)
-            else:
-                self.send_key(char, 0, delay)
-            time.sleep(delay)
+    def send_text(self, text: str, interval: Optional[float] = None,
+                  verify: bool = False, retries: int = 2) -> bool:
+        """Send text string — 리포트 시퀀스를 미리 만들어 SSH 채널 1개로 연속 전송
+
+        Args:
+            text: 영문/숫자/기호/한글 (한/영 전환 자동, 대상 PC는 영문 모드에서 시작한다고 가정)
+            interval: 리포트 간격 (초, None = 설정 hid.text_interval_ms)
+            verify: dd가 gadget에 실제로 쓴 리포트 수를 확인하고, 모자라면 이어서 재전송
+            retries: verify 재전송 횟수
+        """
+        items, skipped = text_to_reports(text)
+        if skipped:
+            print(f"[{self.name}] 입력할 수 없는 문자 건너뜀: {skipped!r}")
+        if not items:
+            return True
+        if interval is None:
+            try:
+                from config import settings
+                interval = float(settings.get('hid.text_interval_ms', 8)) / 1000.0
+            except Exception:
+                interval = 0.008
+
+        start = 0
+        for attempt in range(retries + 1 if verify else 1):
+            written = self._stream_keyboard_reports(items[start:], interval)
+            if written is None:
+                return False  # 채널을 열 수 없음
+            start += written
+            if start >= len(items):
+                return True
+            if not verify:
+                print(f"[{self.name}] 텍스트 전송 불완전: {start}/{len(items)} 리포트")
+                return False
+            print(f"[{self.name}] 텍스트 전송 확인: {start}/{len(items)} 리포트 — 재전송 {attempt + 1}/{retries}")
+        return start >= len(items)
+
+    def _stream_keyboard_reports(self, items: List[Tuple[bytes, float]], interval: float) -> Optional[int]:
+        """키보드 리포트를 'dd of=/dev/hidg0' 채널 1개로 전송 → gadget에 써진 리포트 수 (실패 시 None)
+
+        dd가 0이 아닌 코드로 끝나면 출력된 기록 수까지만 써진 것으로 봄 (이어서 재전송 가능),
+        기록 수를 읽을 수 없으면 (dd 없음, 채널 끊김) 실패.
+        gadget write는 호스트가 이전 리포트를 가져갈 때까지 블록되므로 interval은 호스트 폴링보다
+        앱 쪽 키 누락을 막기 위한 최소 간격. 공유 트랜스포트에 채널만 추가로 염.
+        """
+        if not self.is_connected() and not self.connect():
+            return None
+        try:
+            ch = self._session.open_channel()
+            ch.exec_command("dd of=/dev/hidg0 bs=8 iflag=fullblock")
+            next_at = time.perf_counter()
+            for report, hold in items:
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                ch.sendall(report)
+                next_at += max(interval, hold)
+            ch.shutdown_write()  # EOF → dd 종료 후 기록 수 출력
+            ch.settimeout(10)
+            err = b''
+            while True:
+                chunk = ch.recv_stderr(4096)
+                if not chunk:
+                    break
+                err += chunk
+            status = ch.recv_exit_status()
+            ch.close()
+        except Exception as e:
+            print(f"[{self.name}] 텍스트 전송 실패: {e}")
+            self._connected = False
+            return None
+        # busybox/coreutils dd: "N+M records out"
+        m = re.search(rb'(\d+)\+(\d+) records out', err)
+        detail = err.decode(errors='replace').strip()
+        if m is None:
+            print(f"[{self.name}] 텍스트 전송 실패: dd 종료 코드 {status} {detail}")
+            return None
+        written = min(int(m.group(1)), len(items))
+        if status != 0:
+            print(f"[{self.name}] dd 종료 코드 {status} ({written}/{len(items)} 리포트): {detail}")
+        return written
 
     def send_mouse_relative(self, dx: int, dy: int, buttons: int = 0):
         """Send relative mouse movement"""
@@ -379,30 +472,20 @@ class KVMDevice:
             return {}
 
     # ───────────────────────────────────────────
-    # 파일 전송 (SFTP) - 별도 SSH 연결 사용
+    # 파일 전송 (SFTP) - 공유 트랜스포트의 별도 채널
     # ───────────────────────────────────────────
     def upload_file_sftp(self, local_path: str, remote_path: str,
                          progress_callback=None) -> bool:
-        """SFTP로 파일 업로드 (별도 SSH 연결, lock 간섭 없음)
+        """SFTP로 파일 업로드 (공유 트랜스포트에 SFTP 채널 추가 — 다른 명령과 동시 진행)
 
         Args:
             local_path: 로컬 파일 경로
             remote_path: KVM 장치의 대상 경로
             progress_callback: callable(bytes_transferred, total_bytes)
         """
-        ssh = None
         sftp = None
         try:
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            ssh.connect(
-                self.info.ip,
-                port=self.info.port,
-                username=self.info.username,
-                password=self.info.password,
-                timeout=10
-            )
-            sftp = ssh.open_sftp()
+            sftp = self._pooled_session().open_sftp()
             sftp.put(local_path, remote_path, callback=progress_callback)
             return True
         except Exception as e:
@@ -411,36 +494,20 @@ class KVMDevice:
         finally:
             if sftp:
                 sftp.close()
-            if ssh:
-                ssh.close()
 
     # ───────────────────────────────────────────
     # USB Mass Storage 마운트/해제
     # ───────────────────────────────────────────
-    def _ssh_exec_standalone(self, ssh, cmd: str, timeout: int = 10) -> tuple:
-        """별도 SSH 연결로 명령 실행 (lock 사용 안함)"""
+    def _session_exec(self, session: SSHSession, cmd: str, timeout: int = 10) -> tuple:
+        """세션 채널로 명령 실행 (실패는 stderr 문자열로)"""
         try:
-            stdin, stdout, stderr = ssh.exec_command(cmd, timeout=timeout)
-            return stdout.read().decode().strip(), stderr.read().decode().strip()
+            return session.exec(cmd, timeout=timeout)
         except Exception as e:
             return "", str(e)
 
-    def _create_standalone_ssh(self):
-        """독립 SSH 연결 생성 (lock 간섭 방지)"""
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh.connect(
-            self.info.ip,
-            port=self.info.port,
-            username=self.info.username,
-            password=self.info.password,
-            timeout=10
-        )
-        return ssh
-
     def mount_usb_mass_storage(self, file_path: str) -> tuple:
         """KVM 장치의 파일을 USB Mass Storage로 마운트
-        별도 SSH 연결 사용 (메인 스레드 lock 간섭 방지)
+        공유 트랜스포트의 별도 채널 사용 (다른 명령과 동시 진행)
 
         Args:
             file_path: KVM 장치 내 파일 경로 (예: /tmp/test.exe)
@@ -451,13 +518,13 @@ class KVMDevice:
         filename = _os.path.basename(file_path)
         img_path = "/tmp/usb_drive.img"
         mnt_path = "/tmp/usb_mnt"
-        ssh = None
 
         try:
-            ssh = self._create_standalone_ssh()
+            session = self._pooled_session()
+            session.connect()
 
             # 파일 크기 확인 (busybox stat 호환)
-            out, err = self._ssh_exec_standalone(ssh, f"ls -l {file_path}")
+            out, err = self._session_exec(session, f"ls -l {file_path}")
             if not out or file_path not in out:
                 return False, f"파일을 찾을 수 없습니다: {file_path}\n{err}"
 
@@ -467,7 +534,7 @@ class KVMDevice:
                 file_size = int(parts[4])
             except (IndexError, ValueError):
                 # fallback: wc -c 사용
-                out2, _ = self._ssh_exec_standalone(ssh, f"wc -c < {file_path}")
+                out2, _ = self._session_exec(session, f"wc -c < {file_path}")
                 file_size = int(out2.strip()) if out2.strip().isdigit() else 0
 
             if file_size == 0:
@@ -476,71 +543,65 @@ class KVMDevice:
             img_mb = max(4, (file_size // (1024 * 1024)) + 2)
 
             # gadget 경로 확인
-            gadget_out, _ = self._ssh_exec_standalone(
-                ssh, "ls -d /sys/kernel/config/usb_gadget/*/functions/mass_storage.usb0 2>/dev/null | head -1"
+            gadget_out, _ = self._session_exec(
+                session, "ls -d /sys/kernel/config/usb_gadget/*/functions/mass_storage.usb0 2>/dev/null | head -1"
             )
             gadget_path = gadget_out.strip()
             if not gadget_path:
                 return False, "USB Mass Storage를 지원하지 않는 장치입니다"
 
             # 이미지 생성 + 포맷 + 파일 복사
-            self._ssh_exec_standalone(ssh, f"umount {mnt_path} 2>/dev/null")
-            self._ssh_exec_standalone(ssh, f"echo '' > {gadget_path}/lun.0/file 2>/dev/null")
-            self._ssh_exec_standalone(ssh, f"dd if=/dev/zero of={img_path} bs=1M count={img_mb}", timeout=120)
-            self._ssh_exec_standalone(ssh, f"mkfs.vfat {img_path}")
-            self._ssh_exec_standalone(ssh, f"mkdir -p {mnt_path}")
+            self._session_exec(session, f"umount {mnt_path} 2>/dev/null")
+            self._session_exec(session, f"echo '' > {gadget_path}/lun.0/file 2>/dev/null")
+            self._session_exec(session, f"dd if=/dev/zero of={img_path} bs=1M count={img_mb}", timeout=120)
+            self._session_exec(session, f"mkfs.vfat {img_path}")
+            self._session_exec(session, f"mkdir -p {mnt_path}")
 
-            _, err = self._ssh_exec_standalone(ssh, f"mount -o loop {img_path} {mnt_path}")
+            _, err = self._session_exec(session, f"mount -o loop {img_path} {mnt_path}")
             if err and "failed" in err.lower():
                 return False, f"이미지 마운트 실패: {err}"
 
-            self._ssh_exec_standalone(ssh, f"cp {file_path} {mnt_path}/")
-            self._ssh_exec_standalone(ssh, "sync")
-            self._ssh_exec_standalone(ssh, f"umount {mnt_path}")
+            self._session_exec(session, f"cp {file_path} {mnt_path}/")
+            self._session_exec(session, "sync")
+            self._session_exec(session, f"umount {mnt_path}")
 
             # USB gadget에 연결
-            self._ssh_exec_standalone(ssh, f"echo 0 > {gadget_path}/lun.0/cdrom")
-            self._ssh_exec_standalone(ssh, f"echo 0 > {gadget_path}/lun.0/ro")
-            self._ssh_exec_standalone(ssh, f"echo {img_path} > {gadget_path}/lun.0/file")
+            self._session_exec(session, f"echo 0 > {gadget_path}/lun.0/cdrom")
+            self._session_exec(session, f"echo 0 > {gadget_path}/lun.0/ro")
+            self._session_exec(session, f"echo {img_path} > {gadget_path}/lun.0/file")
 
             return True, f"'{filename}' USB 드라이브로 마운트됨"
         except Exception as e:
             return False, f"USB 마운트 실패: {e}"
-        finally:
-            if ssh:
-                ssh.close()
 
     def unmount_usb_mass_storage(self) -> tuple:
         """USB Mass Storage 해제
-        별도 SSH 연결 사용 (메인 스레드 lock 간섭 방지)
+        공유 트랜스포트의 별도 채널 사용 (다른 명령과 동시 진행)
 
         Returns:
             (success: bool, message: str)
         """
-        ssh = None
         try:
-            ssh = self._create_standalone_ssh()
+            session = self._pooled_session()
+            session.connect()
 
-            gadget_out, _ = self._ssh_exec_standalone(
-                ssh, "ls -d /sys/kernel/config/usb_gadget/*/functions/mass_storage.usb0 2>/dev/null | head -1"
+            gadget_out, _ = self._session_exec(
+                session, "ls -d /sys/kernel/config/usb_gadget/*/functions/mass_storage.usb0 2>/dev/null | head -1"
             )
             gadget_path = gadget_out.strip()
             if not gadget_path:
                 return False, "USB Mass Storage를 지원하지 않는 장치입니다"
 
-            self._ssh_exec_standalone(ssh, f"echo '' > {gadget_path}/lun.0/file")
-            self._ssh_exec_standalone(ssh, "rm -f /tmp/usb_drive.img")
-            self._ssh_exec_standalone(ssh, "rm -rf /tmp/usb_mnt")
+            self._session_exec(session, f"echo '' > {gadget_path}/lun.0/file")
+            self._session_exec(session, "rm -f /tmp/usb_drive.img")
+            self._session_exec(session, "rm -rf /tmp/usb_mnt")
 
             return True, "USB 드라이브 해제됨"
         except Exception as e:
             return False, f"USB 해제 실패: {e}"
-        finally:
-            if ssh:
-                ssh.close()
 
     def download_from_url(self, url: str, dest_path: str, token: str = None) -> tuple:
-        """KVM 장치에서 URL로 파일 다운로드 (별도 SSH)
+        """KVM 장치에서 URL로 파일 다운로드 (공유 트랜스포트 채널)
 
         Args:
             url: 다운로드 URL
@@ -549,9 +610,9 @@ class KVMDevice:
         Returns:
             (success: bool, message: str)
         """
-        ssh = None
         try:
-            ssh = self._create_standalone_ssh()
+            session = self._pooled_session()
+            session.connect()
 
             # wget으로 다운로드 (curl이 있으면 curl 사용)
             if token:
@@ -560,19 +621,16 @@ class KVMDevice:
             else:
                 cmd = f'wget -q -O {dest_path} "{url}" 2>&1 || curl -s -o {dest_path} "{url}" 2>&1'
 
-            out, err = self._ssh_exec_standalone(ssh, cmd, timeout=120)
+            out, err = self._session_exec(session, cmd, timeout=120)
 
             # 파일 존재 확인
-            check_out, _ = self._ssh_exec_standalone(ssh, f"ls -l {dest_path}")
+            check_out, _ = self._session_exec(session, f"ls -l {dest_path}")
             if dest_path not in (check_out or ""):
                 return False, f"다운로드 실패: {out} {err}"
 
             return True, dest_path
         except Exception as e:
             return False, f"다운로드 실패: {e}"
-        finally:
-            if ssh:
-                ssh.close()
 
     def __repr__(self):
         return f"KVMDevice({self.name}, {self.ip}, {self.status.value})"
@@ -4,11 +4,14 @@ Multi-KVM Device Manager
 
 import threading
 import time
-from typing import Dict, List, Optional, Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Mapping, Optional, Callable
 
 from .kvm_device import KVMDevice, KVMInfo, DeviceStatus
 from .database import Database
+from .device_registry import DeviceRegistry, DeviceSnapshot
+from .fleet_executor import FleetRun, fleet_executor
+from .kvm_telemetry import VOLATILE_FIELDS
+from .status_scheduler import StatusScheduler
 
 
 class KVMManager:
@@ -16,18 +19,31 @@ class KVMManager:
 
     def __init__(self, max_workers: int = 10):
         self.db = Database()
-        self.devices: Dict[str, KVMDevice] = {}
+        # 이름/IP/그룹/상태 인덱스 — 조회는 락 없이 불변 스냅샷에서 (core/device_registry.py)
+        self._registry = DeviceRegistry()
         self._base_workers = max_workers
         self._monitor_thread: Optional[threading.Thread] = None
         self._monitor_running = False
+        self._monitor_wake = threading.Event()
+        self.scheduler: Optional[StatusScheduler] = None
+        self._visible_devices: set = set()
+        self._liveview_devices: set = set()
         self._status_callbacks: List[Callable] = []
         self._lock = threading.RLock()  # RLock: 동일 스레드에서 중첩 lock 허용
 
+    @property
+    def devices(self) -> Mapping[str, KVMDevice]:
+        """name → device (read-only view of the current snapshot)"""
+        return self._registry.snapshot().by_name
+
+    def snapshot(self) -> DeviceSnapshot:
+        """Immutable view of all devices and indexes — never blocks writers"""
+        return self._registry.snapshot()
+
     @property
     def max_workers(self) -> int:
         """장치 수에 따라 워커 수 동적 계산 (10~30)"""
-        with self._lock:
-            device_count = len(self.devices)
+        device_count = len(self._registry)
         if device_count <= 20:
             return self._base_workers
         elif device_count <= 50:
@@ -41,13 +57,13 @@ class KVMManager:
 
         with self._lock:
             # 기존 연결 해제 후 목록 초기화
-            for device in list(self.devices.values()):
+            for device in self._registry.all():
                 try:
                     device.disconnect()
                 except Exception as e:
                     print(f"[KVMManager] 기기 연결 해제 실패 ({device.name}): {e}")
-            self.devices.clear()
 
+            devices = []
             for record in device_records:
                 group = record.get('group_name') or 'default'
                 info = KVMInfo(
@@ -63,7 +79,8 @@ class KVMManager:
                 # 로컬 DB에 저장된 MAC 주소 복원
                 if record.get('mac_address'):
                     device.mac_address = record['mac_address']
-                self.devices[record['name']] = device
+                devices.append(device)
+            self._registry.replace(devices)
 
         print(f"Loaded {len(self.devices)} devices from database")
 
@@ -75,8 +92,8 @@ class KVMManager:
         - 서버에 없는 DB 장치: DB에서 삭제 (찌꺼기 정리)
         """
         server_names = set()
+        devices = []
         with self._lock:
-            self.devices.clear()
             for record in device_list:
                 name = record.get('name', '')
                 if not name:
@@ -90,7 +107,7 @@ class KVMManager:
                     password=record.get('password', 'luckfox'),
                     group=record.get('group_name') or 'default',
                 )
-                self.devices[name] = KVMDevice(info)
+                devices.append(KVMDevice(info))
                 server_names.add(name)
                 # 로컬 DB에도 동기화 (있으면 업데이트, 없으면 추가)
                 try:
@@ -111,6 +128,7 @@ class KVMManager:
                         )
                 except Exception as e:
                     print(f"[KVMManager] 로컬 DB 동기화 실패 ({name}): {e}")
+            self._registry.replace(devices)
 
         # DB 찌꺼기 정리: 서버에 없는 장치를 로컬 DB에서 삭제
         self._cleanup_db_orphans(server_names)
@@ -130,12 +148,14 @@ class KVMManager:
         # 서버 + 로컬 합산된 유효 이름 수집 (DB 정리용)
         valid_names = set()
 
+        new_devices: Dict[str, KVMDevice] = {}
         with self._lock:
+            snap = self._registry.snapshot()
             # 기존 장치의 IP 목록 (빠른 조회용)
-            existing_ips = {dev.ip for dev in self.devices.values()}
+            existing_ips = set(snap.by_ip)
 
             # 로컬 DB에서 로드된 장치는 유효
-            valid_names.update(self.devices.keys())
+            valid_names.update(snap.by_name)
 
             for record in device_list:
                 name = record.get('name', '')
@@ -144,7 +164,7 @@ class KVMManager:
                     continue
 
                 # 이름 중복 체크
-                if name in self.devices:
+                if name in snap.by_name or name in new_devices:
                     skipped_name += 1
                     valid_names.add(name)
                     continue
@@ -153,9 +173,9 @@ class KVMManager:
                 # (이름 변경 후 서버에 옛 이름이 남아있는 경우)
                 if ip and ip in existing_ips:
                     # 로컬에 이미 같은 IP 장치가 다른 이름으로 존재
-                    local_name = next(
-                        (n for n, d in self.devices.items() if d.ip == ip), None
-                    )
+                    local = self._registry.first_by_ip(ip) or next(
+                        (d for d in new_devices.values() if d.ip == ip), None)
+                    local_name = local.name if local else None
                     print(f"[KVMManager] 서버 병합 스킵: {name} ({ip}) "
                           f"— 같은 IP가 '{local_name}'으로 이미 존재")
                     skipped_ip += 1
@@ -170,7 +190,7 @@ class KVMManager:
                     password=record.get('password', 'luckfox'),
                     group=record.get('group_name') or 'default',
                 )
-                self.devices[name] = KVMDevice(info)
+                new_devices[name] = KVMDevice(info)
                 existing_ips.add(ip)  # 새로 추가된 IP도 추적
                 valid_names.add(name)
                 # 로컬 DB에도 저장
@@ -191,6 +211,7 @@ class KVMManager:
                 except Exception as e:
                     print(f"[KVMManager] 로컬 DB 병합 저장 실패 ({name}): {e}")
                 added += 1
+            self._registry.add_many(new_devices.values())
 
         # DB 찌꺼기 정리: 유효 목록에 없는 DB 레코드 삭제
         self._cleanup_db_orphans(valid_names)
@@ -230,8 +251,7 @@ class KVMManager:
         info = KVMInfo(name, ip, port, web_port, username, password, group)
         device = KVMDevice(info)
 
-        with self._lock:
-            self.devices[name] = device
+        self._registry.add(device)
 
         # 서버에도 동기화 (admin인 경우)
         self._sync_device_to_server(name, ip, port, web_port, username, password)
@@ -267,16 +287,15 @@ class KVMManager:
                 return {'synced': 0, 'skipped': 0, 'failed': 0, 'error': '관리자 로그인 필요'}
 
             device_list = []
-            with self._lock:
-                for device in list(self.devices.values()):
-                    device_list.append({
-                        'name': device.name,
-                        'ip': device.ip,
-                        'port': device.info.port,
-                        'web_port': device.info.web_port,
-                        'username': device.info.username,
-                        'password': device.info.password,
-                    })
+            for device in self._registry.all():
+                device_list.append({
+                    'name': device.name,
+                    'ip': device.ip,
+                    'port': device.info.port,
+                    'web_port': device.info.web_port,
+                    'username': device.info.username,
+                    'password': device.info.password,
+                })
 
             result = api_client.sync_devices_to_server(device_list)
             print(f"[KVMManager] 일괄 동기화 결과: {result}")
@@ -292,11 +311,9 @@ class KVMManager:
         if old_name == new_name:
             return True
         with self._lock:
-            if new_name in self.devices:
+            if new_name in self._registry:
                 return False  # 이름 중복
-
-        with self._lock:
-            device = self.devices.get(old_name)
+            device = self._registry.get(old_name)
             if not device:
                 return False
 
@@ -305,10 +322,8 @@ class KVMManager:
             if record:
                 self.db.update_device(record['id'], name=new_name)
 
-            # 2) 메모리 업데이트
-            device.info.name = new_name
-            del self.devices[old_name]
-            self.devices[new_name] = device
+            # 2) 메모리 업데이트 (이름 인덱스 + device.info.name)
+            self._registry.rename(old_name, new_name)
 
         # 3) 서버 동기화 (admin인 경우)
         try:
@@ -331,10 +346,9 @@ class KVMManager:
 
     def remove_device(self, name: str):
         """Remove KVM device"""
-        with self._lock:
-            if name in self.devices:
-                self.devices[name].disconnect()
-                del self.devices[name]
+        device = self._registry.remove(name)
+        if device:
+            device.disconnect()
 
         # Remove from database
         record = self.db.get_device_by_name(name)
@@ -343,56 +357,59 @@ class KVMManager:
 
     def get_device(self, name: str) -> Optional[KVMDevice]:
         """Get device by name"""
-        with self._lock:
-            return self.devices.get(name)
+        return self._registry.get(name)
 
     def get_device_by_ip(self, ip: str) -> Optional[KVMDevice]:
         """Get device by IP"""
-        with self._lock:
-            for device in list(self.devices.values()):
-                if device.ip == ip:
-                    return device
-        return None
+        return self._registry.first_by_ip(ip)
 
     def get_all_devices(self) -> List[KVMDevice]:
         """Get all devices"""
-        with self._lock:
-            return list(self.devices.values())
+        return self._registry.all()
+
+    def clear_devices(self):
+        """Remove all devices from memory (DB untouched)"""
+        self._registry.clear()
 
     def get_devices_by_group(self, group: str) -> List[KVMDevice]:
         """Get devices by group"""
-        with self._lock:
-            return [d for d in self.devices.values() if d.info.group == group]
+        return self._registry.in_group(group)
 
     def get_online_devices(self) -> List[KVMDevice]:
         """Get online devices"""
-        with self._lock:
-            return [d for d in self.devices.values() if d.status == DeviceStatus.ONLINE]
+        return self._registry.with_status(DeviceStatus.ONLINE)
 
     def get_offline_devices(self) -> List[KVMDevice]:
         """Get offline devices"""
-        with self._lock:
-            return [d for d in self.devices.values() if d.status == DeviceStatus.OFFLINE]
+        return self._registry.with_status(DeviceStatus.OFFLINE)
 
     # ==================== Batch Operations ====================
 
+    def run_batch(self, devices: List[KVMDevice], func: Callable, args: tuple = (),
+                  kwargs: Optional[dict] = None, timeout: Optional[float] = None,
+                  on_result: Optional[Callable[[str, any], None]] = None) -> FleetRun:
+        """Run func(device, *args, **kwargs) on devices without blocking.
+
+        Concurrency is bounded per site and per relay by the shared fleet executor.
+        Iterate the returned FleetRun to stream (name, result) as devices finish,
+        call wait() for the full dict, or cancel() to stop waiting on unfinished devices.
+        Failures and per-device timeouts are reported as {'error': ...}.
+        """
+        return fleet_executor.submit(devices, func, args, kwargs, timeout, on_result)
+
     def connect_all(self, parallel: bool = True) -> Dict[str, bool]:
         """Connect to all devices"""
         results = {}
 
-        with self._lock:
-            devices_snapshot = list(self.devices.values())
+        devices_snapshot = self._registry.all()
 
         if parallel:
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = {executor.submit(d.connect): d.name for d in devices_snapshot}
-                for future in as_completed(futures):
-                    name = futures[future]
-                    try:
-                        results[name] = future.result()
-                    except Exception as e:
-                        results[name] = False
-                        print(f"[{name}] Connection error: {e}")
+            run = self.run_batch(devices_snapshot, KVMDevice.connect)
+            for name, result in run:
+                if isinstance(result, dict):
+                    print(f"[{name}] Connection error: {result.get('error')}")
+                    result = False
+                results[name] = result
         else:
             for device in devices_snapshot:
                 results[device.name] = device.connect()
@@ -401,28 +418,15 @@ class KVMManager:
 
     def disconnect_all(self):
         """Disconnect all devices"""
-        with self._lock:
-            devices_snapshot = list(self.devices.values())
+        devices_snapshot = self._registry.all()
         for device in devices_snapshot:
             device.disconnect()
 
-    def refresh_status_all(self) -> Dict[str, dict]:
+    def refresh_status_all(self, on_result: Optional[Callable[[str, dict], None]] = None) -> Dict[str, dict]:
         """Refresh status of all devices"""
-        results = {}
-
-        with self._lock:
-            devices_snapshot = list(self.devices.values())
-
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {executor.submit(self._get_device_status, d): d.name for d in devices_snapshot}
-            for future in as_completed(futures):
-                name = futures[future]
-                try:
-                    results[name] = future.result()
-                except Exception as e:
-                    results[name] = {'error': str(e)}
+        devices_snapshot = self._registry.all()
 
-        return results
+        return self.run_batch(devices_snapshot, self._get_device_status, on_result=on_result).wait()
 
     def _get_device_status(self, device: KVMDevice) -> dict:
         """Get single device status"""
@@ -436,37 +440,14 @@ class KVMManager:
 
     def execute_on_all(self, func: Callable, *args, **kwargs) -> Dict[str, any]:
         """Execute function on all devices"""
-        results = {}
-
-        with self._lock:
-            devices_snapshot = list(self.devices.values())
-
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {executor.submit(func, d, *args, **kwargs): d.name for d in devices_snapshot}
-            for future in as_completed(futures):
-                name = futures[future]
-                try:
-                    results[name] = future.result()
-                except Exception as e:
-                    results[name] = {'error': str(e)}
+        devices_snapshot = self._registry.all()
 
-        return results
+        return self.run_batch(devices_snapshot, func, args, kwargs).wait()
 
     def execute_on_group(self, group: str, func: Callable, *args, **kwargs) -> Dict[str, any]:
         """Execute function on devices in group"""
         devices = self.get_devices_by_group(group)
-        results = {}
-
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {executor.submit(func, d, *args, **kwargs): d.name for d in devices}
-            for future in as_completed(futures):
-                name = futures[future]
-                try:
-                    results[name] = future.result()
-                except Exception as e:
-                    results[name] = {'error': str(e)}
-
-        return results
+        return self.run_batch(devices, func, args, kwargs).wait()
 
     # ==================== Monitoring ====================
 
@@ -479,39 +460,97 @@ class KVMManager:
         if callback in self._status_callbacks:
             self._status_callbacks.remove(callback)
 
+    def get_scheduler(self, interval: float = 5.0) -> StatusScheduler:
+        """Per-device probe scheduler shared by the monitor loop and the GUI status thread
+
+        Created on first use (interval = fastest per-device probe period); visible/LiveView
+        devices set before that are applied.
+        """
+        if self.scheduler is None:
+            scheduler = StatusScheduler(fast_interval=interval)
+            scheduler.set_visible(self._visible_devices)
+            scheduler.set_liveview(self._liveview_devices)
+            self.scheduler = scheduler
+        return self.scheduler
+
     def start_monitoring(self, interval: float = 5.0):
-        """Start background monitoring thread"""
+        """Start background monitoring thread (interval = fastest per-device probe period)"""
         if self._monitor_running:
             return
 
+        self.get_scheduler(interval)
         self._monitor_running = True
-        self._monitor_thread = threading.Thread(target=self._monitor_loop, args=(interval,), daemon=True)
+        self._monitor_wake.clear()
+        self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self._monitor_thread.start()
 
     def stop_monitoring(self):
         """Stop monitoring thread"""
         self._monitor_running = False
+        self._monitor_wake.set()
         if self._monitor_thread:
             self._monitor_thread.join(timeout=5)
             self._monitor_thread = None
 
-    def _monitor_loop(self, interval: float):
-        """Monitoring loop"""
+    def set_visible_devices(self, names):
+        """Devices currently shown on screen — probed at the fast interval"""
+        self._visible_devices = set(names)
+        if self.scheduler:
+            self.scheduler.set_visible(self._visible_devices)
+            self._monitor_wake.set()
+
+    def set_liveview_device(self, name: str, active: bool = True):
+        """Device under LiveView — probed least (the live session already shows its state)"""
+        if active:
+            self._liveview_devices.add(name)
+        else:
+            self._liveview_devices.discard(name)
+        if self.scheduler:
+            self.scheduler.set_liveview(self._liveview_devices)
+            if not active:
+                self.scheduler.touch(name)
+                self._monitor_wake.set()
+
+    def _monitor_loop(self):
+        """Monitoring loop — probes only devices whose schedule is due"""
+        scheduler = self.scheduler
         while self._monitor_running:
             try:
-                status_updates = self.refresh_status_all()
-
-                # Notify callbacks
-                for callback in self._status_callbacks:
-                    try:
-                        callback(status_updates)
-                    except Exception as e:
-                        print(f"Callback error: {e}")
+                snap = self._registry.snapshot()
+                scheduler.sync(snap.by_name)
+
+                # 곧 도래할 장치까지 묶어서 한 배치로 (콜백/UI 갱신 횟수 절감)
+                due = scheduler.pop_due(time.monotonic() + 0.25)
+                if due:
+                    devices = [snap.by_name[n] for n in due if n in snap.by_name]
+                    status_updates = self.run_batch(devices, self._probe_status).wait()
+
+                    # Notify callbacks (probed devices only)
+                    for callback in self._status_callbacks:
+                        try:
+                            callback(status_updates)
+                        except Exception as e:
+                            print(f"Callback error: {e}")
 
             except Exception as e:
                 print(f"Monitor error: {e}")
 
-            time.sleep(interval)
+            self._monitor_wake.wait(min(scheduler.next_wait(), 1.0))
+            self._monitor_wake.clear()
+
+    def _probe_status(self, device: KVMDevice) -> dict:
+        """Scheduled status probe — result feeds the device's next probe time (recorded even on error)"""
+        online = changed = False
+        try:
+            status = self._get_device_status(device)
+            online = device.is_connected() and 'error' not in status and status.get('status') != 'offline'
+            changed = bool(device.telemetry.changed - VOLATILE_FIELDS) if online else False
+        except Exception as e:
+            status = {'error': str(e)}
+        finally:
+            if self.scheduler:
+                self.scheduler.record(device.name, online, changed)
+        return status
 
     # ==================== Group Management ====================
 
@@ -524,10 +563,8 @@ class KVMManager:
         self.db.delete_group(name)
 
         # Update device instances
-        with self._lock:
-            for device in list(self.devices.values()):
-                if device.info.group == name:
-                    device.info.group = "default"
+        for device in self._registry.in_group(name):
+            device.info.group = "default"  # 그룹 인덱스는 감시자가 갱신
 
     def get_groups(self) -> List[dict]:
         """Get all groups"""
@@ -539,29 +576,27 @@ class KVMManager:
         if record:
             self.db.update_device(record['id'], group_name=group_name)
 
-        with self._lock:
-            if device_name in self.devices:
-                self.devices[device_name].info.group = group_name
+        device = self._registry.get(device_name)
+        if device:
+            device.info.group = group_name
 
     # ==================== Statistics ====================
 
     def get_statistics(self) -> dict:
         """Get overall statistics"""
-        with self._lock:
-            devices_snapshot = list(self.devices.values())
+        snap = self._registry.snapshot()
 
-        total = len(devices_snapshot)
-        online = len([d for d in devices_snapshot if d.status == DeviceStatus.ONLINE])
+        total = len(snap.by_name)
+        online_devices = snap.by_status.get(DeviceStatus.ONLINE, {})
+        online = len(online_devices)
         offline = total - online
 
         groups = {}
-        for device in devices_snapshot:
-            group = device.info.group
-            if group not in groups:
-                groups[group] = {'total': 0, 'online': 0}
-            groups[group]['total'] += 1
-            if device.status == DeviceStatus.ONLINE:
-                groups[group]['online'] += 1
+        for group, members in snap.by_group.items():
+            groups[group] = {
+                'total': len(members),
+                'online': sum(1 for name in members if name in online_devices),
+            }
 
         return {
             'total': total,
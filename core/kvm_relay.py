@@ -8,13 +8,25 @@ KVM Relay — 관제 PC에서 로컬 KVM을 Tailscale로 중계
 4. 주기적으로 heartbeat 전송
 """
 
+import collections
+import errno
 import os
+import selectors
 import socket
+import sys
 import threading
 import time
 import logging
+import urllib.parse
 from typing import Dict, List, Optional, Tuple
 
+from .relay_cache import AssetCache, HTTPAssetFrontend
+from .relay_fanout import StreamFanout
+from .relay_loop import RelayEventLoop, SPLICE_AVAILABLE, SPLICE_CHUNK
+from .relay_metrics import RelayCounters, RelayMetrics
+from .relay_shaper import (CLASS_CONTROL, CLASS_MEDIA, PrioritySendQueue, RelayLimiter, TrafficShaper,
+                           classify, enable_keepalive, tune_socket)
+
 
 def _tailscale_exe() -> str:
     """Tailscale CLI 경로 반환 (PATH에 없어도 동작)"""
@@ -29,11 +41,45 @@ def _tailscale_exe() -> str:
 logger = logging.getLogger(__name__)
 
 
+class _RelayConn:
+    """스레드 엔진의 릴레이 중인 연결 1쌍 — 유휴 정리(reaper)용"""
+
+    __slots__ = ('client', 'target', 'traffic_class', 'peer', 'started', 'last_active')
+
+    def __init__(self, client: socket.socket, target: socket.socket, traffic_class: str):
+        self.client = client
+        self.target = target
+        self.traffic_class = traffic_class
+        try:
+            self.peer = '%s:%s' % client.getpeername()[:2]
+        except OSError:
+            self.peer = '?'
+        self.started = self.last_active = time.monotonic()
+
+    def close(self):
+        """양쪽 소켓 shutdown → blocking recv 중인 _pipe 스레드가 깨어나 종료"""
+        for sock in (self.client, self.target):
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
 class TCPProxy:
     """단일 KVM에 대한 TCP 프록시 (Tailscale → 로컬 KVM)"""
 
+    _BUSY_RESPONSE = (b"HTTP/1.1 503 Service Unavailable\r\n"
+                      b"Retry-After: 2\r\n"
+                      b"Content-Length: 0\r\n"
+                      b"Connection: close\r\n\r\n")
+
     def __init__(self, listen_port: int, target_ip: str, target_port: int = 80,
-                 on_udp_port_detected: Optional[callable] = None):
+                 on_udp_port_detected: Optional[callable] = None,
+                 loop: Optional[RelayEventLoop] = None, zero_copy: bool = False,
+                 http_cache: Optional[HTTPAssetFrontend] = None, fanout: bool = False,
+                 limiter: Optional[RelayLimiter] = None, max_connections: int = 0,
+                 idle_timeout: float = 0.0, control_idle_timeout: float = 0.0,
+                 keepalive_idle: int = 30):
         self.listen_port = listen_port
         self.target_ip = target_ip
         self.target_port = target_port
@@ -42,6 +88,36 @@ class TCPProxy:
         self._thread: Optional[threading.Thread] = None
         # 콜백: ICE candidate에서 UDP 포트 추출 시 호출
         self._on_udp_port_detected = on_udp_port_detected
+        # 이벤트 루프 엔진 (None이면 연결당 스레드 방식)
+        self._loop = loop
+        # Linux splice 전달 (커널 내부 복사) — 미지원 플랫폼에서는 자동으로 recv/sendall
+        self.zero_copy = zero_copy and SPLICE_AVAILABLE
+        # 정적 자산 HTTP 캐시 (None이면 모든 요청을 그대로 전달)
+        self.http_cache = http_cache
+        # 멀티플렉스 모드 라우팅 ID (None이면 전용 포트 모드)
+        self.route: Optional[str] = None
+        # 트래픽/지연 카운터
+        self.stats = RelayCounters()
+        # media 하향 대역폭 상한 (KVM별 + 사이트) — None이면 무제한
+        self.limiter = limiter
+        # 스레드 엔진 방향별 송신 대기열 (control 우선, media 동시 전송량 상한)
+        self.up_queue = PrioritySendQueue()
+        self.down_queue = PrioritySendQueue()
+        # MJPEG/HTTP 스트림 fan-out (뷰어 수와 무관하게 KVM 업스트림 1개)
+        self.fanout: Optional[StreamFanout] = (
+            StreamFanout(target_ip, target_port, self.stats, limiter) if fanout else None)
+        # 수명 관리 — 동시 연결 상한 (0 = 무제한), 유휴 타임아웃 (초, 0 = 사용 안 함),
+        # TCP keepalive (half-open 감지)
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.control_idle_timeout = control_idle_timeout
+        self.keepalive_idle = keepalive_idle
+        # 동시 연결 상한용 슬롯 — stats.active(락 없는 통계)와 별도로 락 아래 증감.
+        # _admit에서 예약 → 연결을 끝내는 쪽(_relay finally / 루프 세션 close)에서 반납
+        self._slots = 0
+        self._slots_lock = threading.Lock()
+        self._conns = set()  # 스레드 엔진 릴레이 중인 _RelayConn
+        self.reaped_log: collections.deque = collections.deque(maxlen=20)
 
     def start(self):
         """프록시 서버 시작"""
@@ -53,11 +129,15 @@ class TCPProxy:
             self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self._server.bind(('0.0.0.0', self.listen_port))
             self._server.listen(5)
-            self._server.settimeout(1.0)
             self._running = True
 
-            self._thread = threading.Thread(target=self._accept_loop, daemon=True)
-            self._thread.start()
+            if self._loop is not None:
+                # selector 엔진: 공용 루프 스레드에서 accept/relay 처리
+                self._loop.add_listener(self)
+            else:
+                self._server.settimeout(1.0)
+                self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+                self._thread.start()
             logger.info(f"[Relay] :{self.listen_port} → {self.target_ip}:{self.target_port}")
         except Exception as e:
             logger.error(f"[Relay] 포트 {self.listen_port} 바인드 실패: {e}")
@@ -66,25 +146,41 @@ class TCPProxy:
     def stop(self):
         """프록시 서버 중지"""
         self._running = False
+        if self.fanout is not None:
+            self.fanout.close()
+        if self._server is None and self.route is not None and self._loop is not None:
+            self._loop.close_sessions(self)  # 멀티플렉스 라우트 — 리스닝 소켓 없음
+            return
         if self._server:
+            server, self._server = self._server, None
+            if self._loop is not None:
+                # 루프 스레드에서 unregister 후 close (selector에 닫힌 fd가 남지 않도록)
+                self._loop.remove_listener(self, server)
+                return
             try:
-                self._server.close()
+                server.close()
             except Exception:
                 pass
-            self._server = None
 
     def _accept_loop(self):
         """연결 수락 루프"""
         while self._running:
             try:
                 client_sock, addr = self._server.accept()
-                # 각 연결을 별도 스레드에서 처리
+                if not self._admit(client_sock):
+                    continue
+                # 각 연결을 별도 스레드에서 처리 (슬롯은 _relay가 반납)
                 t = threading.Thread(
                     target=self._relay,
                     args=(client_sock,),
                     daemon=True
                 )
-                t.start()
+                try:
+                    t.start()
+                except RuntimeError:
+                    self._release()
+                    client_sock.close()
+                    raise
             except socket.timeout:
                 continue
             except Exception:
@@ -92,52 +188,93 @@ class TCPProxy:
                     continue
                 break
 
-    def _relay(self, client_sock: socket.socket):
-        """양방향 데이터 릴레이"""
+    def _relay(self, client_sock: socket.socket, first_data: Optional[bytes] = None):
+        """양방향 데이터 릴레이
+
+        first_data: 이미 읽은 첫 데이터 (selector 엔진 hand-off / 멀티플렉스 라우터 —
+                    연결 수는 넘겨준 쪽에서 집계)
+        호출 전에 _admit으로 예약된 동시 연결 슬롯은 여기서 반납.
+        """
         target_sock = None
+        conn = None
+        stats = self.stats
+        stats.active += 1
+        if first_data is None:
+            stats.connections += 1
         try:
-            # 첫 번째 데이터를 먼저 읽어서 특수 경로 확인
-            client_sock.settimeout(10)
-            first_data = client_sock.recv(4096)
-            if not first_data:
-                return
+            if first_data is None:
+                # 첫 번째 데이터를 먼저 읽어서 특수 경로 확인
+                client_sock.settimeout(10)
+                first_data = client_sock.recv(4096)
+                if not first_data:
+                    return
 
             # /_wellcomland/ 특수 경로 처리 (UDP 포트 알림 등)
-            if self._handle_special_request(client_sock, first_data):
+            if b'/_wellcomland/' in first_data and self._handle_special_request(client_sock, first_data):
                 return
 
-            target_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            target_sock.settimeout(10)  # 연결 타임아웃
-            target_sock.connect((self.target_ip, self.target_port))
+            # 정적 자산 GET → 캐시에서 응답, 다른 요청이 오면 그 시점부터 KVM으로 전달
+            if self.http_cache is not None and self.http_cache.wants(first_data):
+                first_data = self.http_cache.handle(client_sock, first_data,
+                                                    self.target_ip, self.target_port)
+                if not first_data:
+                    return
+                client_sock.settimeout(10)
+
+            # 스트림 후보 GET → 공유 업스트림 구독 (스트림이 아니면 연결된 KVM 소켓을 받아 계속 릴레이)
+            if self.fanout is not None and self.fanout.wants(first_data):
+                target_sock = self.fanout.subscribe(client_sock, first_data)
+                if target_sock is None:
+                    return
+            else:
+                target_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                target_sock.settimeout(10)  # 연결 타임아웃
+                t0 = time.perf_counter()
+                target_sock.connect((self.target_ip, self.target_port))
+                stats.add_connect_latency((time.perf_counter() - t0) * 1000)
 
-            # 첫 번째 데이터를 KVM에 전달
-            target_sock.sendall(first_data)
+                # 첫 번째 데이터를 KVM에 전달
+                target_sock.sendall(first_data)
+                stats.add_up(len(first_data))
 
             # 연결 성공 후 blocking 모드로 전환 (장기 연결 지원: MJPEG/WebSocket)
             target_sock.settimeout(None)
             client_sock.settimeout(None)
 
-            # TCP_NODELAY — 입력 지연 최소화 (키보드/마우스 이벤트)
+            # 트래픽 분류 — control(WebSocket 입력)은 저지연, media는 송신 큐/대역폭 상한
+            traffic_class = classify(first_data)
             for s in (client_sock, target_sock):
-                try:
-                    s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-                except Exception:
-                    pass
+                tune_socket(s, traffic_class)
+                if self.keepalive_idle:
+                    enable_keepalive(s, self.keepalive_idle)
+            limiter = self.limiter if traffic_class == CLASS_MEDIA else None
+            if limiter is not None and not limiter.active:
+                limiter = None
+            conn = _RelayConn(client_sock, target_sock, traffic_class)
+            self._conns.add(conn)
 
             # 양방향 릴레이
+            pipe = self._pipe_splice if self.zero_copy else self._pipe
             t1 = threading.Thread(
-                target=self._pipe, args=(client_sock, target_sock), daemon=True
+                target=pipe, args=(client_sock, target_sock, stats, True, None, conn, self.up_queue),
+                daemon=True
             )
             t2 = threading.Thread(
-                target=self._pipe, args=(target_sock, client_sock), daemon=True
+                target=pipe, args=(target_sock, client_sock, stats, False, limiter, conn, self.down_queue),
+                daemon=True
             )
             t1.start()
             t2.start()
             t1.join()
             t2.join()
         except Exception as e:
+            stats.errors += 1
             logger.debug(f"[Relay] 릴레이 연결 실패 ({self.target_ip}:{self.target_port}): {e}")
         finally:
+            stats.active -= 1
+            self._release()
+            if conn is not None:
+                self._conns.discard(conn)
             try:
                 client_sock.close()
             except Exception:
@@ -148,6 +285,74 @@ class TCPProxy:
                 except Exception:
                     pass
 
+    # ── 수명 관리 ──
+
+    def _admit(self, client_sock: socket.socket) -> bool:
+        """동시 연결 슬롯 예약 — 상한 초과 시 503 응답 후 닫음
+
+        True면 슬롯 1개를 예약한 것 → 연결이 끝날 때 _release() (hand-off 시에는 슬롯도 함께 넘김)
+        """
+        with self._slots_lock:
+            if not self.max_connections or self._slots < self.max_connections:
+                self._slots += 1
+                return True
+        self.stats.rejected += 1
+        try:
+            client_sock.send(self._BUSY_RESPONSE)
+        except OSError:
+            pass
+        try:
+            client_sock.close()
+        except OSError:
+            pass
+        logger.warning(f"[Relay] :{self.listen_port} 동시 연결 상한({self.max_connections}) 초과 — 거절")
+        return False
+
+    def _release(self):
+        """_admit으로 예약한 슬롯 반납"""
+        with self._slots_lock:
+            self._slots -= 1
+
+    @property
+    def admitted(self) -> int:
+        """현재 예약된 동시 연결 슬롯 수"""
+        return self._slots
+
+    def idle_limit(self, traffic_class: str) -> float:
+        """트래픽 종류별 유휴 타임아웃 (control은 사용자가 입력하지 않아도 살아 있어야 하므로 길게)"""
+        return self.control_idle_timeout if traffic_class == CLASS_CONTROL else self.idle_timeout
+
+    def record_reaped(self, peer: str, traffic_class: str, idle: float, age: float):
+        self.stats.reaped += 1
+        self.reaped_log.append({
+            "peer": peer,
+            "class": traffic_class,
+            "idle_seconds": round(idle, 1),
+            "age_seconds": round(age, 1),
+            "at": time.strftime('%H:%M:%S'),
+        })
+        logger.info(f"[Relay] :{self.listen_port} 유휴 연결 정리 {peer} ({traffic_class}, {idle:.0f}초 무전송)")
+
+    def reap_idle(self, now: Optional[float] = None) -> int:
+        """유휴 타임아웃을 넘긴 스레드 엔진 연결 정리 → 정리한 수"""
+        now = now or time.monotonic()
+        reaped = 0
+        for conn in list(self._conns):
+            limit = self.idle_limit(conn.traffic_class)
+            idle = now - conn.last_active
+            if limit and idle > limit:
+                self._conns.discard(conn)
+                conn.close()
+                self.record_reaped(conn.peer, conn.traffic_class, idle, now - conn.started)
+                reaped += 1
+        return reaped
+
+    def _wants_thread(self, first_data: bytes) -> bool:
+        """selector 엔진용 — 이 요청을 _relay 스레드에서 처리해야 하는지 (캐시/스트림 fan-out)"""
+        if self.http_cache is not None and self.http_cache.wants(first_data):
+            return True
+        return self.fanout is not None and self.fanout.wants(first_data)
+
     def _handle_special_request(self, client_sock: socket.socket, data: bytes) -> bool:
         """/_wellcomland/ 특수 경로 처리
 
@@ -196,15 +401,42 @@ class TCPProxy:
         return False
 
     @staticmethod
-    def _pipe(src: socket.socket, dst: socket.socket):
-        """한 방향 데이터 전달 (MJPEG/WebSocket 장기 스트림 지원)"""
+    def _pipe(src: socket.socket, dst: socket.socket,
+              stats: Optional[RelayCounters] = None, upstream: bool = True,
+              limiter: Optional[RelayLimiter] = None, conn: Optional[_RelayConn] = None,
+              queue: Optional[PrioritySendQueue] = None):
+        """한 방향 데이터 전달 (MJPEG/WebSocket 장기 스트림 지원)
+
+        upstream: True면 클라이언트→KVM (stats.bytes_up), False면 KVM→클라이언트
+        limiter: 대역폭 상한 — 초과 시 다음 recv를 늦춤 (KVM 쪽 TCP 윈도우로 역압)
+        conn: 유휴 정리용 연결 기록 (전송 시각 갱신)
+        queue: 같은 방향 송신 대기열 — control 우선, media 동시 전송량 상한
+        """
+        count = None
+        if stats is not None:
+            count = stats.add_up if upstream else stats.add_down
+        traffic_class = conn.traffic_class if conn is not None else CLASS_MEDIA
         try:
             while True:
                 data = src.recv(65536)
                 if not data:
                     break
-                dst.sendall(data)
-        except (ConnectionResetError, ConnectionAbortedError, BrokenPipeError):
+                if queue is not None:
+                    queue.send(dst, data, traffic_class)
+                else:
+                    dst.sendall(data)
+                if count:
+                    count(len(data))
+                if conn is not None:
+                    conn.last_active = time.monotonic()
+                if limiter is not None:
+                    delay = limiter.consume(len(data))
+                    if delay:
+                        time.sleep(min(delay, 1.0))
+        except (ConnectionResetError, ConnectionAbortedError):
+            if stats is not None:
+                stats.resets += 1
+        except BrokenPipeError:
             pass  # 정상적인 연결 종료
         except OSError:
             pass  # 소켓 이미 닫힘
@@ -217,6 +449,304 @@ class TCPProxy:
             except Exception:
                 pass
 
+    @staticmethod
+    def _pipe_splice(src: socket.socket, dst: socket.socket,
+                     stats: Optional[RelayCounters] = None, upstream: bool = True,
+                     limiter: Optional[RelayLimiter] = None, conn: Optional[_RelayConn] = None,
+                     queue: Optional[PrioritySendQueue] = None):
+        """한 방향 데이터 전달 — Linux os.splice (소켓 → 파이프 → 소켓, 커널 내부 이동)
+
+        데이터가 파이썬 메모리를 거치지 않으므로 스트림 수와 무관하게 CPU 비용이 일정.
+        splice가 거부되면 (EINVAL 등 — 첫 호출에서만 발생) 기존 _pipe로 전환.
+        """
+        r_fd, w_fd = os.pipe()
+        moved = False
+        count = None
+        if stats is not None:
+            count = stats.add_up if upstream else stats.add_down
+        traffic_class = conn.traffic_class if conn is not None else CLASS_MEDIA
+        try:
+            src_fd, dst_fd = src.fileno(), dst.fileno()
+            while True:
+                n = os.splice(src_fd, w_fd, SPLICE_CHUNK, flags=os.SPLICE_F_MOVE)
+                if n == 0:
+                    break
+                moved = True
+                if count:
+                    count(n)
+                moved_n = n
+                if queue is not None:
+                    queue.enter(moved_n, traffic_class)
+                try:
+                    while n > 0:
+                        n -= os.splice(r_fd, dst_fd, n, flags=os.SPLICE_F_MOVE)
+                finally:
+                    if queue is not None:
+                        queue.leave(moved_n, traffic_class)
+                if conn is not None:
+                    conn.last_active = time.monotonic()
+                if limiter is not None:
+                    delay = limiter.consume(moved_n)
+                    if delay:
+                        time.sleep(min(delay, 1.0))
+        except (ConnectionResetError, ConnectionAbortedError):
+            if stats is not None:
+                stats.resets += 1
+        except BrokenPipeError:
+            pass  # 정상적인 연결 종료
+        except OSError as e:
+            if not moved and e.errno in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                os.close(r_fd)
+                os.close(w_fd)
+                r_fd = w_fd = -1
+                TCPProxy._pipe(src, dst, stats, upstream, limiter, conn, queue)  # shutdown(SHUT_WR)까지 처리
+                return
+        except Exception:
+            pass
+        finally:
+            for fd in (r_fd, w_fd):
+                if fd >= 0:
+                    try:
+                        os.close(fd)
+                    except OSError:
+                        pass
+        try:
+            dst.shutdown(socket.SHUT_WR)
+        except Exception:
+            pass
+
+
+def relay_route_id(kvm_ip: str, kvm_port: int = 80) -> str:
+    """멀티플렉스 라우팅 ID — 192.168.68.100:80 → 192-168-68-100, :8080 → 192-168-68-100-8080"""
+    route = kvm_ip.replace('.', '-').replace(':', '-')
+    return route if kvm_port == 80 else f"{route}-{kvm_port}"
+
+
+class MuxRelayProxy:
+    """단일 포트 멀티플렉스 릴레이 — 연결마다 대상 KVM을 찾아 해당 TCPProxy로 넘김
+
+    라우팅 우선순위:
+    1. 첫 바이트 토큰:  "WLKVM <route>\n" (HTTP가 아닌 클라이언트용, 토큰 줄은 제거)
+    2. 경로 접두어 /kvm/<route>/... → 접두어를 떼고 KVM에 전달 (브라우저 URL은 접두어 유지 —
+       상대 경로 자산/링크도 같은 라우트로 옴). 라우트 쿠키가 없으면 쿠키 설정 후 같은 URL로 리다이렉트
+    3. X-Wellcom-KVM 헤더 (앱 WebView가 요청마다 추가)
+    4. Host 헤더 첫 레이블: <route>.relay.example:18000
+    5. Referer 경로 접두어 /kvm/<route>/ (페이지가 절대 경로로 요청하는 자산/API)
+    6. 쿠키 wellcom_kvm=<route> (WebSocket 등 Referer 없는 요청)
+
+    출처(origin) 분리: 경로/헤더 라우팅은 모든 KVM이 같은 origin(릴레이:포트)이라
+    KVM 웹 UI의 쿠키/localStorage가 섞일 수 있음.
+    - 앱 WebView: 라우트마다 전용 QWebEngineProfile (ui.main_window.relay_profile)로 저장소 분리
+    - 브라우저에서 여러 KVM 동시 사용: Host 레이블 방식(와일드카드 DNS *.relay.example) 권장
+    """
+
+    TOKEN_PREFIX = b'WLKVM '
+    HEADER_NAME = 'x-wellcom-kvm'
+    COOKIE_NAME = 'wellcom_kvm'
+    PATH_PREFIX = '/kvm/'
+    MAX_HEADER_BYTES = 16 * 1024
+
+    def __init__(self, listen_port: int):
+        self.listen_port = listen_port
+        self._server: Optional[socket.socket] = None
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._routes: Dict[str, TCPProxy] = {}
+        self.unrouted = 0  # 라우트를 찾지 못한 연결 수
+
+    def add_route(self, proxy: TCPProxy):
+        self._routes[proxy.route] = proxy
+
+    def remove_route(self, route: str):
+        self._routes.pop(route, None)
+
+    @property
+    def routes(self) -> List[str]:
+        return list(self._routes)
+
+    def start(self):
+        """멀티플렉스 리스너 시작"""
+        if self._running:
+            return
+        try:
+            self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._server.bind(('0.0.0.0', self.listen_port))
+            self._server.listen(64)
+            self._server.settimeout(1.0)
+            self._running = True
+            self._thread = threading.Thread(target=self._accept_loop, daemon=True, name="RelayMux")
+            self._thread.start()
+            logger.info(f"[RelayMux] :{self.listen_port} 멀티플렉스 릴레이 시작")
+        except Exception as e:
+            logger.error(f"[RelayMux] 포트 {self.listen_port} 바인드 실패: {e}")
+            self._running = False
+
+    def stop(self):
+        self._running = False
+        if self._server:
+            try:
+                self._server.close()
+            except Exception:
+                pass
+            self._server = None
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                client_sock, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except Exception:
+                if self._running:
+                    continue
+                break
+            # 라우팅(첫 요청 헤더 수신)은 짧게 끝나므로 연결별 임시 스레드에서 처리
+            threading.Thread(target=self._dispatch, args=(client_sock,), daemon=True).start()
+
+    def _dispatch(self, client_sock: socket.socket):
+        proxy = None
+        try:
+            client_sock.settimeout(10)
+            data = client_sock.recv(4096)
+            if not data:
+                return
+            proxy, data = self._route(client_sock, data)
+        except Exception as e:
+            logger.debug(f"[RelayMux] 라우팅 오류: {e}")
+        if proxy is None:
+            try:
+                client_sock.close()
+            except Exception:
+                pass
+            return
+        if not proxy._admit(client_sock):
+            return
+
+        if proxy._loop is not None and proxy._loop.is_running:
+            proxy._loop.adopt(proxy, client_sock, data)  # 세션 생성 시 연결 수 집계
+        else:
+            proxy.stats.connections += 1
+            proxy._relay(client_sock, data)
+
+    def _route(self, client_sock: socket.socket, data: bytes) -> Tuple[Optional[TCPProxy], bytes]:
+        """(대상 TCPProxy, KVM에 보낼 첫 데이터) — 응답을 이미 보냈거나 실패면 (None, b'')"""
+        # 1. 토큰 줄
+        if data.startswith(self.TOKEN_PREFIX):
+            while b'\n' not in data and len(data) < 256:
+                more = client_sock.recv(4096)
+                if not more:
+                    return None, b''
+                data += more
+            line, _, rest = data.partition(b'\n')
+            route = line[len(self.TOKEN_PREFIX):].strip().decode('ascii', errors='ignore')
+            proxy = self._routes.get(route)
+            if proxy is None:
+                self.unrouted += 1
+            return proxy, rest
+
+        # 2~5. HTTP 요청 헤더
+        while b'\r\n\r\n' not in data:
+            if len(data) > self.MAX_HEADER_BYTES:
+                break
+            more = client_sock.recv(4096)
+            if not more:
+                break
+            data += more
+        head = data.split(b'\r\n\r\n', 1)[0].decode('latin-1')
+        lines = head.split('\r\n')
+        request_line = lines[0].split(' ')
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(':')
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+
+        route = None
+        cookie_route = ''
+        for part in headers.get('cookie', '').split(';'):
+            name, _, value = part.strip().partition('=')
+            if name == self.COOKIE_NAME:
+                cookie_route = value
+                break
+
+        path = request_line[1] if len(request_line) >= 2 else ''
+        prefixed = self._prefix_route(path)
+        if prefixed:
+            route, rest = prefixed
+            page_get = request_line[0] == 'GET' and 'upgrade' not in headers
+            if not rest.startswith('/') or (page_get and cookie_route != route):
+                # 접두어 뒤 '/' 보장 (상대 경로 기준) + Referer 없는 요청(WebSocket)용 라우트 쿠키
+                rest = rest if rest.startswith('/') else '/' + rest
+                self._redirect(client_sock, route, f"{self.PATH_PREFIX}{route}{rest}")
+                return None, b''
+            # 요청 줄에서 접두어 제거 → KVM은 원래 경로를 받음
+            data = data.replace(path.encode('latin-1'), rest.encode('latin-1'), 1)
+        if not route:
+            route = headers.get(self.HEADER_NAME)
+        if not route:
+            host = headers.get('host', '').split(':', 1)[0]
+            label = host.split('.', 1)[0]
+            if label in self._routes:
+                route = label
+        if not route and 'referer' in headers:
+            prefixed = self._prefix_route(urllib.parse.urlsplit(headers['referer']).path)
+            if prefixed:
+                route = prefixed[0]
+        if not route:
+            route = cookie_route
+
+        proxy = self._routes.get(route) if route else None
+        if proxy is None:
+            self.unrouted += 1
+            self._not_found(client_sock)
+        return proxy, data
+
+    def _prefix_route(self, path: str) -> Optional[Tuple[str, str]]:
+        """/kvm/<route><rest> → (route, rest) — 등록된 라우트가 아니면 None"""
+        if not path.startswith(self.PATH_PREFIX):
+            return None
+        route, sep, rest = path[len(self.PATH_PREFIX):].partition('/')
+        route, q, query = route.partition('?')
+        if route not in self._routes:
+            return None
+        return route, (sep + rest) if sep else (q + query)
+
+    def _redirect(self, client_sock: socket.socket, route: str, location: str):
+        resp = (
+            "HTTP/1.1 302 Found\r\n"
+            f"Location: {location}\r\n"
+            f"Set-Cookie: {self.COOKIE_NAME}={route}; Path=/\r\n"
+            "Content-Length: 0\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        client_sock.sendall(resp.encode('latin-1'))
+
+    def _not_found(self, client_sock: socket.socket):
+        body = ("WellcomLAND relay: KVM route not found\n"
+                + "".join(f"{self.PATH_PREFIX}{r}/\n" for r in sorted(self._routes)))
+        resp = (
+            "HTTP/1.1 404 Not Found\r\n"
+            "Content-Type: text/plain; charset=utf-8\r\n"
+            f"Content-Length: {len(body.encode())}\r\n"
+            "Connection: close\r\n\r\n"
+        ) + body
+        try:
+            client_sock.sendall(resp.encode())
+        except OSError:
+            pass
+
+
+class _UDPSession:
+    """UDPRelay 원격 뷰어 1명의 세션 — 전용 KVM측 소켓으로 응답 패킷 구분"""
+
+    __slots__ = ('peer', 'sock', 'last_seen')
+
+    def __init__(self, peer: Tuple[str, int], sock: socket.socket):
+        self.peer = peer
+        self.sock = sock
+        self.last_seen = time.monotonic()
+
 
 class UDPRelay:
     """WebRTC 미디어용 UDP 릴레이 (Tailscale → 로컬 KVM)
@@ -224,18 +754,31 @@ class UDPRelay:
     WebRTC는 DTLS/SRTP를 UDP로 전송.
     원격 클라이언트가 relay_ip:udp_port 로 보내면 → kvm_ip:kvm_udp_port 로 전달.
     KVM이 응답하면 → 원격 클라이언트에게 그대로 전달.
+
+    다중 뷰어: 원격 주소(ip, port)별 세션을 만들고 세션마다 KVM측 소켓을 따로 열어
+    KVM 입장에서 뷰어마다 다른 출발 포트로 보이게 함 → 응답 패킷이 뒤섞이지 않음.
+    유휴 세션은 SESSION_IDLE_TIMEOUT 후 정리.
     """
 
-    def __init__(self, listen_port: int, target_ip: str):
+    SESSION_IDLE_TIMEOUT = 30.0  # 초 — 이 시간 동안 패킷 없으면 세션 종료
+    MAX_SESSIONS = 16            # KVM당 동시 뷰어 상한
+    RECV_BATCH = 32              # 깨어날 때마다 소켓당 최대 수신 datagram 수
+
+    def __init__(self, listen_port: int, target_ip: str, limiter: Optional[RelayLimiter] = None):
         self.listen_port = listen_port
         self.target_ip = target_ip
+        # 하향(KVM → 뷰어) 대역폭 상한 — 초과 datagram은 버림 (WebRTC 혼잡 제어가 비트레이트를 낮춤)
+        self.limiter = limiter
         # KVM의 실제 UDP 포트는 ICE candidate에서 동적으로 결정됨
         self._target_port: Optional[int] = None
         self._sock: Optional[socket.socket] = None
+        self._sel: Optional[selectors.BaseSelector] = None
         self._running = False
         self._thread: Optional[threading.Thread] = None
-        # 원격 클라이언트 주소 (첫 패킷에서 학습)
-        self._remote_addr: Optional[Tuple[str, int]] = None
+        # 원격 뷰어 세션 테이블 (key: 원격 주소) — 릴레이 스레드에서만 변경
+        self._sessions: Dict[Tuple[str, int], _UDPSession] = {}
+        # 트래픽 카운터 (active = 현재 뷰어 세션 수)
+        self.stats = RelayCounters()
 
     def start(self) -> bool:
         """UDP 릴레이 시작"""
@@ -245,7 +788,9 @@ class UDPRelay:
             self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self._sock.bind(('0.0.0.0', self.listen_port))
-            self._sock.settimeout(1.0)
+            self._sock.setblocking(False)
+            self._sel = selectors.DefaultSelector()
+            self._sel.register(self._sock, selectors.EVENT_READ, None)
             self._running = True
             self._thread = threading.Thread(target=self._relay_loop, daemon=True)
             self._thread.start()
@@ -254,6 +799,7 @@ class UDPRelay:
         except Exception as e:
             logger.error(f"[UDPRelay] 포트 {self.listen_port} 바인드 실패: {e}")
             self._running = False
+            self._close_all()
             return False
 
     def set_target_port(self, port: int):
@@ -264,6 +810,35 @@ class UDPRelay:
 
     def stop(self):
         self._running = False
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._close_all()
+
+    def get_sessions(self) -> List[dict]:
+        """현재 뷰어 세션 목록"""
+        now = time.monotonic()
+        result = []
+        for peer, session in list(self._sessions.items()):
+            try:
+                local_port = session.sock.getsockname()[1]
+            except OSError:
+                local_port = None
+            result.append({
+                "peer": f"{peer[0]}:{peer[1]}",
+                "kvm_side_port": local_port,
+                "idle_seconds": round(now - session.last_seen, 1),
+            })
+        return result
+
+    def _close_all(self):
+        for session in list(self._sessions.values()):
+            self._close_session(session)
+        if self._sel:
+            try:
+                self._sel.close()
+            except Exception:
+                pass
+            self._sel = None
         if self._sock:
             try:
                 self._sock.close()
@@ -271,35 +846,129 @@ class UDPRelay:
                 pass
             self._sock = None
 
-    def _relay_loop(self):
-        """양방향 UDP 릴레이 루프"""
-        while self._running:
+    # ── 세션 관리 (릴레이 스레드 전용) ──
+
+    def _open_session(self, peer: Tuple[str, int]) -> Optional[_UDPSession]:
+        if len(self._sessions) >= self.MAX_SESSIONS:
+            # 가장 오래 조용한 세션을 밀어냄
+            oldest = min(self._sessions.values(), key=lambda s: s.last_seen)
+            logger.info(f"[UDPRelay] 세션 상한 초과 → {oldest.peer} 종료")
+            self._close_session(oldest)
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind(('0.0.0.0', 0))
+            sock.setblocking(False)
+        except OSError as e:
+            logger.error(f"[UDPRelay] 세션 소켓 생성 실패 ({peer}): {e}")
+            return None
+        session = _UDPSession(peer, sock)
+        self._sessions[peer] = session
+        self.stats.active += 1
+        self.stats.connections += 1
+        self._sel.register(sock, selectors.EVENT_READ, session)
+        logger.info(f"[UDPRelay] :{self.listen_port} 새 뷰어 {peer[0]}:{peer[1]} "
+                    f"(KVM측 :{sock.getsockname()[1]}, 세션 {len(self._sessions)}개)")
+        return session
+
+    def _close_session(self, session: _UDPSession):
+        if self._sessions.pop(session.peer, None) is not None:
+            self.stats.active -= 1
+        if self._sel:
+            try:
+                self._sel.unregister(session.sock)
+            except Exception:
+                pass
+        try:
+            session.sock.close()
+        except Exception:
+            pass
+
+    def _expire_sessions(self, now: float):
+        for session in [s for s in self._sessions.values()
+                        if now - s.last_seen > self.SESSION_IDLE_TIMEOUT]:
+            logger.info(f"[UDPRelay] :{self.listen_port} 유휴 세션 종료 {session.peer[0]}:{session.peer[1]}")
+            self._close_session(session)
+
+    # ── 수신 처리 ──
+
+    def _drain_listen(self, now: float):
+        """원격 클라이언트 → KVM (뷰어별 세션 소켓으로 전달)"""
+        for _ in range(self.RECV_BATCH):
             try:
                 data, addr = self._sock.recvfrom(65536)
-                if not data:
-                    continue
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionResetError:
+                continue  # Windows: 이전 sendto의 ICMP port unreachable
+            if not data:
+                continue
 
-                # KVM에서 온 패킷인지 원격 클라이언트에서 온 패킷인지 판별
-                if addr[0] == self.target_ip:
-                    # KVM → 원격 클라이언트
-                    if self._remote_addr:
-                        self._sock.sendto(data, self._remote_addr)
-                else:
-                    # 원격 클라이언트 → KVM
-                    self._remote_addr = addr
-                    if self._target_port:
-                        self._sock.sendto(data, (self.target_ip, self._target_port))
+            if addr[0] == self.target_ip:
+                # KVM이 릴레이 리슨 포트로 직접 보낸 패킷 → 가장 최근 뷰어에게
+                if self._sessions:
+                    latest = max(self._sessions.values(), key=lambda s: s.last_seen)
+                    self._sock.sendto(data, latest.peer)
+                continue
 
-            except socket.timeout:
+            session = self._sessions.get(addr) or self._open_session(addr)
+            if session is None:
+                continue
+            session.last_seen = now
+            if self._target_port:
+                try:
+                    session.sock.sendto(data, (self.target_ip, self._target_port))
+                    self.stats.add_up(len(data))
+                except OSError:
+                    self.stats.errors += 1
+
+    def _drain_session(self, session: _UDPSession, now: float):
+        """KVM → 해당 세션의 원격 클라이언트"""
+        for _ in range(self.RECV_BATCH):
+            try:
+                data, addr = session.sock.recvfrom(65536)
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionResetError:
                 continue
+            if not data or addr[0] != self.target_ip:
+                continue
+            session.last_seen = now
+            if self.limiter is not None and not self.limiter.allow(len(data)):
+                continue
+            try:
+                self._sock.sendto(data, session.peer)
+                self.stats.add_down(len(data))
             except OSError:
-                if self._running:
-                    continue
-                break
-            except Exception:
-                if self._running:
-                    continue
-                break
+                self.stats.errors += 1
+
+    def _relay_loop(self):
+        """양방향 UDP 릴레이 루프 (리슨 소켓 + 세션 소켓을 selector로 감시)"""
+        last_sweep = time.monotonic()
+        try:
+            while self._running:
+                try:
+                    events = self._sel.select(timeout=0.5)
+                except (OSError, ValueError):
+                    if self._running:
+                        continue
+                    break
+                now = time.monotonic()
+                for key, _ in events:
+                    try:
+                        if key.data is None:
+                            self._drain_listen(now)
+                        elif key.data.peer in self._sessions:
+                            self._drain_session(key.data, now)
+                    except OSError:
+                        if not self._running:
+                            break
+                if now - last_sweep >= 1.0:
+                    last_sweep = now
+                    self._expire_sessions(now)
+        except Exception as e:
+            logger.error(f"[UDPRelay] :{self.listen_port} 루프 오류: {e}")
+        finally:
+            self._running = False
 
 
 class KVMRelayManager:
@@ -310,12 +979,137 @@ class KVMRelayManager:
     # UDP 릴레이 포트 시작 번호 (28000 + KVM IP의 마지막 옥텟)
     UDP_BASE_PORT = 28000
 
-    def __init__(self):
+    # TCP 릴레이 엔진
+    ENGINE_THREAD = "thread"      # 연결당 스레드 (기존 방식)
+    ENGINE_SELECTOR = "selector"  # 단일 이벤트 루프 (core/relay_loop.py)
+
+    # TCP 포트 모드
+    MODE_PORT = "port"  # KVM마다 전용 포트 (18000 + 마지막 옥텟)
+    MODE_MUX = "mux"    # 포트 1개에서 Host/헤더/경로/토큰으로 KVM 라우팅
+    DEFAULT_MUX_PORT = 18000
+
+    REAP_INTERVAL = 10.0  # 유휴 연결 점검 주기 (초)
+
+    def __init__(self, engine: Optional[str] = None, zero_copy: Optional[bool] = None,
+                 http_cache: Optional[bool] = None, mode: Optional[str] = None,
+                 mux_port: Optional[int] = None, fanout: Optional[bool] = None,
+                 kvm_mbps: Optional[float] = None, site_mbps: Optional[float] = None):
         self._proxies: Dict[str, TCPProxy] = {}  # key: "kvm_ip:port"
         self._udp_relays: Dict[str, UDPRelay] = {}  # key: "kvm_ip"
+        self._names: Dict[str, str] = {}  # key: "kvm_ip:port" → 장치 이름 (서버 등록용)
         self._tailscale_ip: Optional[str] = None
         self._heartbeat_thread: Optional[threading.Thread] = None
         self._running = False
+        # 서버 등록 상태 (증분 등록) — 서버가 확인한 버전/장치 목록, 전송 후 응답 대기 중인 등록
+        self._reg_version = 0
+        self._reg_location = ""
+        self._registered: Dict[str, dict] = {}
+        self._reg_pending: Optional[Tuple[int, Dict[str, dict], str]] = None
+
+        if engine is None:
+            try:
+                from config import settings
+                engine = settings.get('relay.engine', self.ENGINE_THREAD)
+            except Exception:
+                engine = self.ENGINE_THREAD
+        if engine not in (self.ENGINE_THREAD, self.ENGINE_SELECTOR):
+            logger.warning(f"[Relay] 알 수 없는 엔진 '{engine}' — thread 사용")
+            engine = self.ENGINE_THREAD
+        self.engine = engine
+        # Linux splice 전달 모드 (다른 플랫폼에서는 무시)
+        if zero_copy is None:
+            try:
+                from config import settings
+                zero_copy = bool(settings.get('relay.zero_copy', True))
+            except Exception:
+                zero_copy = True
+        self.zero_copy = zero_copy and SPLICE_AVAILABLE
+        # selector 엔진: 모든 프록시가 공유하는 루프 1개
+        self._loop: Optional[RelayEventLoop] = None
+        if engine == self.ENGINE_SELECTOR:
+            self._loop = RelayEventLoop()
+        # 정적 자산 HTTP 캐시 — 모든 프록시가 공유 (같은 펌웨어 KVM끼리 재사용)
+        if http_cache is None:
+            try:
+                from config import settings
+                http_cache = bool(settings.get('relay.http_cache', False))
+            except Exception:
+                http_cache = False
+        self.asset_cache: Optional[AssetCache] = None
+        self._http_frontend: Optional[HTTPAssetFrontend] = None
+        if http_cache:
+            self.asset_cache = self._create_asset_cache()
+            self._http_frontend = HTTPAssetFrontend(self.asset_cache)
+        # MJPEG/HTTP 스트림 fan-out (KVM·경로별 업스트림 1개)
+        if fanout is None:
+            try:
+                from config import settings
+                fanout = bool(settings.get('relay.stream_fanout', True))
+            except Exception:
+                fanout = True
+        self.fanout = fanout
+        # 트래픽 셰이핑 — media 하향 상한 (Mbps, 0 = 무제한). 분류/소켓 튜닝은 항상 적용
+        if kvm_mbps is None or site_mbps is None:
+            try:
+                from config import settings
+                if kvm_mbps is None:
+                    kvm_mbps = float(settings.get('relay.kvm_mbps', 0))
+                if site_mbps is None:
+                    site_mbps = float(settings.get('relay.site_mbps', 0))
+            except Exception:
+                kvm_mbps = kvm_mbps or 0.0
+                site_mbps = site_mbps or 0.0
+        self.shaper = TrafficShaper(kvm_mbps, site_mbps)
+        # 연결 수명 관리 — KVM별 동시 연결 상한, 유휴 타임아웃(초), keepalive 탐지 시작(초)
+        self.max_connections = 64
+        self.idle_timeout = 300.0
+        self.control_idle_timeout = 3600.0
+        self.keepalive_idle = 30
+        try:
+            from config import settings
+            self.max_connections = int(settings.get('relay.max_connections', self.max_connections))
+            self.idle_timeout = float(settings.get('relay.idle_timeout', self.idle_timeout))
+            self.control_idle_timeout = float(settings.get('relay.control_idle_timeout',
+                                                           self.control_idle_timeout))
+            self.keepalive_idle = int(settings.get('relay.keepalive_idle', self.keepalive_idle))
+        except Exception:
+            pass
+        self._reaper_thread: Optional[threading.Thread] = None
+        self._reaping = False
+        # 멀티플렉스 모드: 리스닝 포트 1개 (KVM별 TCPProxy는 라우트로만 사용)
+        if mode is None or mux_port is None:
+            try:
+                from config import settings
+                if mode is None:
+                    mode = settings.get('relay.mode', self.MODE_PORT)
+                if mux_port is None:
+                    mux_port = int(settings.get('relay.mux_port', self.DEFAULT_MUX_PORT))
+            except Exception:
+                mode = mode or self.MODE_PORT
+                mux_port = mux_port or self.DEFAULT_MUX_PORT
+        if mode not in (self.MODE_PORT, self.MODE_MUX):
+            logger.warning(f"[Relay] 알 수 없는 모드 '{mode}' — port 사용")
+            mode = self.MODE_PORT
+        self.mode = mode
+        self._mux: Optional[MuxRelayProxy] = None
+        if mode == self.MODE_MUX:
+            self._mux = MuxRelayProxy(mux_port)
+        # 트래픽 메트릭 (1분/15분 이동 평균)
+        self.metrics = RelayMetrics(self._collect_counters)
+
+    @staticmethod
+    def _create_asset_cache() -> AssetCache:
+        """설정값으로 AssetCache 생성 (디스크 캐시: DATA_DIR/relay_cache)"""
+        memory_mb, disk_mb, cache_dir = 64, 256, None
+        try:
+            from config import settings, DATA_DIR
+            memory_mb = int(settings.get('relay.http_cache_memory_mb', memory_mb))
+            disk_mb = int(settings.get('relay.http_cache_disk_mb', disk_mb))
+            if disk_mb > 0:
+                cache_dir = os.path.join(DATA_DIR, 'relay_cache')
+        except Exception:
+            pass
+        return AssetCache(cache_dir, memory_mb * 1024 * 1024, disk_mb * 1024 * 1024)
 
     def get_tailscale_ip(self) -> Optional[str]:
         """이 PC의 Tailscale IP 가져오기 (100.x.x.x)"""
@@ -328,7 +1122,7 @@ class KVMRelayManager:
             r = subprocess.run(
                 [_tailscale_exe(), 'ip', '-4'],
                 capture_output=True, text=True, timeout=5,
-                creationflags=0x08000000
+                creationflags=0x08000000 if sys.platform == 'win32' else 0
             )
             if r.returncode == 0:
                 ip = r.stdout.strip().split('\n')[0].strip()
@@ -398,6 +1192,16 @@ class KVMRelayManager:
         key = f"{kvm_ip}:{kvm_port}"
         if key in self._proxies:
             return self._proxies[key].listen_port
+        if kvm_name:
+            self._names[key] = kvm_name
+
+        if self._loop is not None and not self._loop.is_running:
+            self._loop.start()
+        self.metrics.start()
+        self._start_reaper()
+
+        if self._mux is not None:
+            return self._start_mux_route(key, kvm_ip, kvm_port, kvm_name)
 
         relay_port = self.calc_relay_port(kvm_ip, kvm_port)
 
@@ -405,7 +1209,10 @@ class KVMRelayManager:
         for offset in [0, 1000, 2000]:
             port = relay_port + offset
             proxy = TCPProxy(port, kvm_ip, kvm_port,
-                             on_udp_port_detected=self.set_udp_target_port)
+                             on_udp_port_detected=self.set_udp_target_port,
+                             loop=self._loop, zero_copy=self.zero_copy,
+                             http_cache=self._http_frontend, fanout=self.fanout,
+                             limiter=self.shaper.limiter(kvm_ip), **self._lifecycle_options())
             proxy.start()
             if proxy._running:
                 self._proxies[key] = proxy
@@ -416,35 +1223,107 @@ class KVMRelayManager:
             logger.error(f"[Relay] {kvm_ip} TCP 프록시 포트 할당 실패")
             return None
 
-        # UDP 릴레이 (WebRTC 미디어용)
+        self._start_udp_relay(kvm_ip, kvm_name)
+        return self._proxies[key].listen_port
+
+    def _lifecycle_options(self) -> dict:
+        return {
+            "max_connections": self.max_connections,
+            "idle_timeout": self.idle_timeout,
+            "control_idle_timeout": self.control_idle_timeout,
+            "keepalive_idle": self.keepalive_idle,
+        }
+
+    def _start_reaper(self):
+        """유휴 연결 정리 스레드 (스레드 엔진 연결 — selector 엔진은 루프가 직접 정리)"""
+        if self._reaping:
+            return
+        self._reaping = True
+        if self._reaper_thread and self._reaper_thread.is_alive():
+            return
+
+        def _reaper_loop():
+            while self._reaping:
+                time.sleep(self.REAP_INTERVAL)
+                now = time.monotonic()
+                for proxy in list(self._proxies.values()):
+                    try:
+                        proxy.reap_idle(now)
+                    except Exception as e:
+                        logger.debug(f"[Relay] 유휴 연결 정리 오류: {e}")
+
+        self._reaper_thread = threading.Thread(target=_reaper_loop, daemon=True, name="RelayReaper")
+        self._reaper_thread.start()
+
+    def _start_mux_route(self, key: str, kvm_ip: str, kvm_port: int, kvm_name: str) -> Optional[int]:
+        """멀티플렉스 모드 — 공용 포트에 KVM 라우트 추가"""
+        if not self._mux._running:
+            self._mux.start()
+            if not self._mux._running:
+                logger.error(f"[Relay] 멀티플렉스 포트 {self._mux.listen_port} 사용 불가")
+                return None
+        proxy = TCPProxy(self._mux.listen_port, kvm_ip, kvm_port,
+                         on_udp_port_detected=self.set_udp_target_port,
+                         loop=self._loop, zero_copy=self.zero_copy,
+                         http_cache=self._http_frontend, fanout=self.fanout,
+                         limiter=self.shaper.limiter(kvm_ip), **self._lifecycle_options())
+        proxy.route = relay_route_id(kvm_ip, kvm_port)
+        self._mux.add_route(proxy)
+        self._proxies[key] = proxy
+        logger.info(f"[Relay] {kvm_name or kvm_ip} TCP :{self._mux.listen_port}/kvm/{proxy.route}/")
+        self._start_udp_relay(kvm_ip, kvm_name)
+        return proxy.listen_port
+
+    def _start_udp_relay(self, kvm_ip: str, kvm_name: str):
+        """UDP 릴레이 (WebRTC 미디어용) — KVM당 1개"""
         if kvm_ip not in self._udp_relays:
             udp_port = self.calc_udp_port(kvm_ip)
             for offset in [0, 1000, 2000]:
-                udp = UDPRelay(udp_port + offset, kvm_ip)
+                udp = UDPRelay(udp_port + offset, kvm_ip, limiter=self.shaper.limiter(kvm_ip))
                 if udp.start():
                     self._udp_relays[kvm_ip] = udp
                     logger.info(f"[Relay] {kvm_name or kvm_ip} UDP :{udp_port + offset}")
                     break
                 udp.stop()
 
-        return self._proxies[key].listen_port
-
     def stop_relay(self, kvm_ip: str, kvm_port: int = 80):
         """특정 KVM 프록시 중지"""
         key = f"{kvm_ip}:{kvm_port}"
+        self._names.pop(key, None)
         if key in self._proxies:
-            self._proxies[key].stop()
-            del self._proxies[key]
+            proxy = self._proxies.pop(key)
+            if self._mux is not None and proxy.route:
+                self._mux.remove_route(proxy.route)
+            proxy.stop()
 
     def stop_all(self):
         """모든 프록시 중지"""
         self._running = False
+        if self._mux is not None:
+            self._mux.stop()
+            for route in self._mux.routes:
+                self._mux.remove_route(route)
         for proxy in self._proxies.values():
             proxy.stop()
         self._proxies.clear()
+        self._names.clear()
         for udp in self._udp_relays.values():
             udp.stop()
         self._udp_relays.clear()
+        if self._loop is not None:
+            self._loop.stop()
+        self.metrics.stop()
+        self._reaping = False
+
+    def get_relay_route(self, kvm_ip: str, kvm_port: int = 80) -> str:
+        """멀티플렉스 라우팅 ID (전용 포트 모드면 빈 문자열)"""
+        proxy = self._proxies.get(f"{kvm_ip}:{kvm_port}")
+        return (proxy.route or "") if proxy else ""
+
+    @property
+    def mux_port(self) -> Optional[int]:
+        """멀티플렉스 모드 공용 포트 (전용 포트 모드면 None)"""
+        return self._mux.listen_port if self._mux is not None else None
 
     def get_udp_port(self, kvm_ip: str) -> Optional[int]:
         """특정 KVM에 대한 UDP 릴레이 포트 조회"""
@@ -468,46 +1347,223 @@ class KVMRelayManager:
                 "kvm_local_ip": kvm_ip,
                 "kvm_port": int(kvm_port),
                 "relay_port": proxy.listen_port,
+                "relay_route": proxy.route,
                 "udp_relay_port": udp_port,
                 "relay_ip": ts_ip or "",
-                "access_url": f"http://{ts_ip}:{proxy.listen_port}" if ts_ip else "",
+                "access_url": self._access_url(ts_ip, proxy) if ts_ip else "",
             })
         return result
 
-    def register_to_server(self, api_client, location: str = ""):
-        """서버에 현재 릴레이 중인 KVM들을 등록"""
-        ts_ip = self.get_tailscale_ip()
-        if not ts_ip:
-            logger.warning("[Relay] Tailscale IP 없음 — 서버 등록 건너뜀")
-            return
-
-        devices = []
-        for key, proxy in self._proxies.items():
+    @staticmethod
+    def _access_url(relay_ip: str, proxy: TCPProxy) -> str:
+        url = f"http://{relay_ip}:{proxy.listen_port}"
+        if proxy.route:
+            url += f"{MuxRelayProxy.PATH_PREFIX}{proxy.route}/"
+        return url
+
+    def _collect_counters(self) -> Dict[str, RelayCounters]:
+        """메트릭 샘플러용 — {"tcp:kvm_ip:port" / "udp:kvm_ip": RelayCounters}"""
+        counters = {f"tcp:{key}": proxy.stats for key, proxy in list(self._proxies.items())}
+        for kvm_ip, udp in list(self._udp_relays.items()):
+            counters[f"udp:{kvm_ip}"] = udp.stats
+        return counters
+
+    def get_relay_metrics(self) -> List[dict]:
+        """KVM별 릴레이 트래픽/지연 메트릭 (누적 카운터 + 1분/15분 초당 속도)"""
+        result = []
+        for key, proxy in list(self._proxies.items()):
             kvm_ip, kvm_port = key.rsplit(':', 1)
-            udp_port = self.get_udp_port(kvm_ip)
-            devices.append({
+            entry = {
                 "kvm_local_ip": kvm_ip,
                 "kvm_port": int(kvm_port),
-                "kvm_name": f"KVM-{kvm_ip.split('.')[-1]}",
                 "relay_port": proxy.listen_port,
-                "udp_relay_port": udp_port,
+                "relay_route": proxy.route,
+                "engine": self.engine,
+                "zero_copy": proxy.zero_copy,
+                "tcp": proxy.stats.to_dict(),
+                "tcp_rates": self.metrics.rates(f"tcp:{key}", proxy.stats),
+            }
+            if proxy.fanout is not None:
+                entry["fanout"] = proxy.fanout.get_stats()
+            if proxy.limiter is not None:
+                entry["shaping"] = proxy.limiter.to_dict()
+            if self.engine == self.ENGINE_THREAD:
+                entry["priority"] = {"up": proxy.up_queue.to_dict(), "down": proxy.down_queue.to_dict()}
+            if proxy.reaped_log:
+                entry["reaped_recent"] = list(proxy.reaped_log)
+            udp = self._udp_relays.get(kvm_ip)
+            if udp:
+                entry["udp_relay_port"] = udp.listen_port
+                entry["udp"] = udp.stats.to_dict()
+                entry["udp_rates"] = self.metrics.rates(f"udp:{kvm_ip}", udp.stats)
+                entry["udp_sessions"] = udp.get_sessions()
+            result.append(entry)
+        # 1분 하향 트래픽이 큰 순서 (업링크를 포화시키는 KVM이 먼저)
+        result.sort(key=lambda e: e["tcp_rates"]["1m"]["bytes_down"]
+                    + e.get("udp_rates", {}).get("1m", {}).get("bytes_down", 0), reverse=True)
+        return result
+
+    def get_status(self) -> dict:
+        """릴레이 상태 요약 (원격 디버그 /api/relay)"""
+        relays = []
+        for name, proxy in list(self._proxies.items()):
+            relays.append({
+                "name": name,
+                "type": "TCP",
+                "listen_port": proxy.listen_port,
+                "target": f"{proxy.target_ip}:{proxy.target_port}",
+                "route": proxy.route,
+                "running": proxy._running,
+                "active": proxy.stats.active,
             })
+        for name, udp in list(self._udp_relays.items()):
+            relays.append({
+                "name": name,
+                "type": "UDP",
+                "listen_port": udp.listen_port,
+                "target_port": udp._target_port,
+                "running": udp._running,
+                "sessions": len(udp._sessions),
+            })
+        return {
+            "relays": relays,
+            "engine": self.engine,
+            "mode": self.mode,
+            "mux_port": self.mux_port,
+            "heartbeat_running": self._running,
+        }
+
+    def get_metrics_report(self) -> dict:
+        """KVM별 메트릭 + 공용 HTTP 캐시/셰이핑 통계 (원격 디버그 /api/relay/metrics)"""
+        result = {"relays": self.get_relay_metrics()}
+        if self.asset_cache is not None:
+            result["http_cache"] = self.asset_cache.get_stats()
+        result["shaping"] = self.shaper.get_stats()
+        return result
+
+    def _registration_entries(self) -> Dict[str, dict]:
+        """현재 릴레이 중인 KVM → 서버 등록 항목 (key: "kvm_ip:port")"""
+        entries = {}
+        for key, proxy in list(self._proxies.items()):
+            kvm_ip, kvm_port = key.rsplit(':', 1)
+            entries[key] = {
+                "kvm_local_ip": kvm_ip,
+                "kvm_port": int(kvm_port),
+                "kvm_name": self._names.get(key) or f"KVM-{kvm_ip.split('.')[-1]}",
+                "relay_port": proxy.listen_port,
+                "relay_route": proxy.route or "",
+                "udp_relay_port": self.get_udp_port(kvm_ip),
+            }
+        return entries
+
+    def registration_payload(self, location: str = "") -> Optional[dict]:
+        """서버 등록 요청 본문 — 서버가 확인한 마지막 등록 이후 추가/변경/삭제된 KVM만 (변경 없으면 None)
+
+        최초 등록, 위치 변경, 서버의 재동기화 요청 후에는 전체 목록(full)을 보냄.
+        응답은 registration_result()로 전달해야 다음 증분의 기준이 갱신됨.
+        """
+        ts_ip = self.get_tailscale_ip()
+        if not ts_ip:
+            logger.warning("[Relay] Tailscale IP 없음 — 서버 등록 건너뜀")
+            return None
 
-        if not devices:
+        current = self._registration_entries()
+        version = self._reg_version + 1
+        payload = {
+            "relay_ip": ts_ip,
+            "location": location,
+            "version": version,
+        }
+        if self._mux is not None:
+            payload["mux_port"] = self.mux_port  # 사이트 단일 엔드포인트
+        if self._reg_version == 0 or location != self._reg_location:
+            if not current:
+                return None
+            payload["full"] = True
+            payload["devices"] = list(current.values())
+        else:
+            upsert = [e for key, e in current.items() if self._registered.get(key) != e]
+            remove = [{"relay_port": e["relay_port"], "relay_route": e["relay_route"]}
+                      for key, e in self._registered.items() if key not in current]
+            if not upsert and not remove:
+                return None
+            payload["base_version"] = self._reg_version
+            payload["upsert"] = upsert
+            payload["remove"] = remove
+        self._reg_pending = (version, current, location)
+        return payload
+
+    def registration_result(self, version: int, result: Optional[dict]):
+        """등록 응답 반영 — 실패/재동기화 요청이면 다음 등록은 전체 목록"""
+        pending, self._reg_pending = self._reg_pending, None
+        if pending is None or pending[0] != version:
             return
+        if isinstance(result, dict) and result.get("status") == "ok":
+            self._reg_version, self._registered, self._reg_location = pending
+        else:
+            self._reset_registration()
 
-        try:
-            result = api_client._post('/api/kvm/register', {
-                "devices": devices,
-                "relay_ip": ts_ip,
-                "location": location,
+    def _reset_registration(self):
+        self._reg_version = 0
+        self._registered = {}
+
+    def _health_stats(self) -> List[dict]:
+        """heartbeat용 KVM별 요약 (1분 평균) — 키를 짧게 유지"""
+        result = []
+        for key, proxy in list(self._proxies.items()):
+            kvm_ip = key.rsplit(':', 1)[0]
+            tcp = self.metrics.rates(f"tcp:{key}", proxy.stats)["1m"]
+            down, up, sessions = tcp["bytes_down"], tcp["bytes_up"], proxy.stats.active
+            udp = self._udp_relays.get(kvm_ip)
+            if udp:
+                udp_rates = self.metrics.rates(f"udp:{kvm_ip}", udp.stats)["1m"]
+                down += udp_rates["bytes_down"]
+                up += udp_rates["bytes_up"]
+                sessions += udp.stats.active
+            errors = tcp["errors"]
+            if errors and errors >= tcp["connections"]:
+                health = "down"        # 최근 연결이 모두 KVM 연결 실패
+            elif errors:
+                health = "degraded"
+            else:
+                health = "ok"
+            result.append({
+                "p": proxy.listen_port,
+                "r": proxy.route or "",
+                "h": health,
+                "a": sessions,
+                "dn": int(down),
+                "up": int(up),
+                "ms": round(proxy.stats.connect_ms_last, 1),
             })
-            logger.info(f"[Relay] 서버 등록: {result}")
-        except Exception as e:
-            logger.error(f"[Relay] 서버 등록 실패: {e}")
+        return result
 
-    def start_heartbeat(self, api_client, interval: int = 60):
-        """주기적 heartbeat 전송 시작"""
+    def heartbeat_payload(self) -> Optional[dict]:
+        """heartbeat 요청 본문 — 등록 버전 + KVM별 상태/트래픽 (Tailscale IP가 없으면 None)"""
+        ts_ip = self.get_tailscale_ip()
+        if not ts_ip:
+            return None
+        return {
+            "relay_ip": ts_ip,
+            "version": self._reg_version,
+            "kvms": self._health_stats(),
+        }
+
+    def heartbeat_result(self, result: Optional[dict]) -> bool:
+        """heartbeat 응답 반영 → 서버가 재동기화를 요청하면 True (전체 목록 재등록 필요)"""
+        if isinstance(result, dict) and result.get("resync"):
+            logger.info(f"[Relay] 서버 등록 버전 불일치 (서버 {result.get('version')}, "
+                        f"로컬 {self._reg_version}) — 전체 재등록")
+            self._reset_registration()
+            return True
+        return False
+
+    def register_to_server(self, api_client, location: str = ""):
+        """서버에 릴레이 중인 KVM 등록 (변경분만)"""
+        push_registration(self, api_client, location)
+
+    def start_heartbeat(self, api_client, interval: int = 60, location: str = ""):
+        """주기적 heartbeat 전송 시작 (변경된 KVM이 있으면 등록도 함께)"""
         if self._heartbeat_thread and self._heartbeat_thread.is_alive():
             return
 
@@ -515,15 +1571,42 @@ class KVMRelayManager:
 
         def _heartbeat_loop():
             while self._running:
-                ts_ip = self.get_tailscale_ip()
-                if ts_ip:
-                    try:
-                        api_client._post('/api/kvm/heartbeat', {
-                            "relay_ip": ts_ip,
-                        })
-                    except Exception:
-                        pass
+                push_registration(self, api_client, location)
+                push_heartbeat(self, api_client, location)
                 time.sleep(interval)
 
         self._heartbeat_thread = threading.Thread(target=_heartbeat_loop, daemon=True)
         self._heartbeat_thread.start()
+
+
+def push_registration(relay, api_client, location: str = "") -> bool:
+    """변경된 KVM 등록 전송 (KVMRelayManager / RelayProcessProxy 공용) → 전송했으면 True"""
+    payload = relay.registration_payload(location)
+    if not payload:
+        return False
+    result = None
+    try:
+        result = api_client._post('/api/kvm/register', payload)
+        if result.get("status") == "resync":
+            logger.info(f"[Relay] 서버 재동기화 요청 (서버 버전 {result.get('version')})")
+        else:
+            logger.info(f"[Relay] 서버 등록: {result}")
+    except Exception as e:
+        logger.error(f"[Relay] 서버 등록 실패: {e}")
+    relay.registration_result(payload["version"], result)
+    if result and result.get("status") == "resync":
+        return push_registration(relay, api_client, location)
+    return True
+
+
+def push_heartbeat(relay, api_client, location: str = ""):
+    """heartbeat 전송 — 서버가 재동기화를 요청하면 전체 목록 재등록"""
+    payload = relay.heartbeat_payload()
+    if not payload:
+        return
+    try:
+        result = api_client._post('/api/kvm/heartbeat', payload)
+    except Exception:
+        return
+    if relay.heartbeat_result(result):
+        push_registration(relay, api_client, location)
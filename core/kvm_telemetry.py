@@ -0,0 +1,125 @@
+"""
+KVM 텔레메트리 프로브 (SSH 1회 왕복 → JSON 1개)
+
+장치에 작은 sh 스크립트를 한 번 올려 두고(/tmp, 재부팅 시 자동 재설치),
+매 조회마다 그 스크립트만 실행한다.
+- 필드: uptime, 메모리, 온도, USB(UDC) 상태, MAC, hostname, /version, 앱 버전(/api/version 원문)
+- 델타 모드: 장치 쪽 상태 디렉터리에 필드별 마지막 값/변경 seq 저장 →
+  `since` 이후 바뀐 필드만 반환 (MAC/hostname/버전 같은 고정 필드는 처음 한 번만 전송)
+- epoch: 상태 디렉터리 생성 시각 — 재부팅/초기화로 seq가 다시 시작되면 epoch가 달라져 전체 응답
+- 앱 버전은 전체 조회 때만 장치 내부 wget으로 갱신 (델타 조회 비용에 포함되지 않음)
+"""
+
+import json
+from typing import Optional, Set
+
+PROBE_VERSION = 1
+PROBE_DIR = "/tmp/.wlprobe"
+PROBE_PATH = f"{PROBE_DIR}/probe-v{PROBE_VERSION}.sh"
+_MISSING = "__WLPROBE_MISSING__"
+
+# 조회마다 바뀌는 측정값 — 상태 스케줄러는 이 필드 변화를 "상태 변화"로 보지 않음
+VOLATILE_FIELDS = frozenset({'uptime', 'uptime_seconds', 'temperature', 'memory_used'})
+
+# busybox ash 호환 (local, bash 문법 사용 안 함)
+PROBE_SCRIPT = r'''#!/bin/sh
+# WellcomLAND telemetry probe — sh probe.sh EPOCH SINCE [WEB_PORT]
+D=/tmp/.wlprobe
+[ -f $D/epoch ] || { mkdir -p $D; echo "$(date +%s)$$" > $D/epoch; echo 0 > $D/seq; }
+epoch=$(cat $D/epoch); seq=$(cat $D/seq); seq=${seq:-0}
+since=$2; port=${3:-80}
+[ "$1" = "$epoch" ] || since=0
+[ "$since" -le "$seq" ] 2>/dev/null || since=0
+next=$((seq + 1)); changed=0; body=""
+esc() { printf '%s' "$1" | tr '\n\r\t' '   ' | sed 's/\\/\\\\/g; s/"/\\"/g'; }
+str() { printf '"%s"' "$(esc "$1")"; }
+num() { case "$1" in ''|*[!0-9-]*) echo null;; *) echo "$1";; esac; }
+put() {
+  if [ ! -f $D/$1.s ] || [ "$(cat $D/$1.v)" != "$2" ]; then
+    printf '%s' "$2" > $D/$1.v; echo $next > $D/$1.s; changed=1
+  fi
+  s=$(cat $D/$1.s); [ "${s:-0}" -gt "$since" ] && body="$body,\"$1\":$2"
+}
+put uptime "$(str "$(uptime)")"
+put uptime_seconds "$(num "$(cut -d. -f1 /proc/uptime)")"
+put temperature "$(num "$(cat /sys/class/thermal/thermal_zone*/temp 2>/dev/null | head -n 1)")"
+put usb_state "$(str "$(cat /sys/class/udc/*/state 2>/dev/null)")"
+put mac "$(str "$(cat /sys/class/net/eth0/address 2>/dev/null)")"
+put hostname "$(str "$(hostname 2>/dev/null)")"
+put system_version "$(str "$(cat /version 2>/dev/null)")"
+if [ "$since" = 0 ] || [ ! -f $D/version_api.v ]; then
+  put version_api "$(str "$(wget -q -T 2 -O - http://127.0.0.1:$port/api/version 2>/dev/null)")"
+fi
+set -- $(free -m | grep Mem)
+put memory_total "$(num "$2")"
+put memory_used "$(num "$3")"
+[ $changed = 1 ] && { seq=$next; echo $seq > $D/seq; }
+full=false; [ "$since" = 0 ] && full=true
+printf '{"v":1,"epoch":"%s","seq":%s,"full":%s,"fields":{%s}}\n' "$epoch" "$seq" "$full" "${body#,}"
+'''
+
+
+def probe_command(epoch: str = "", since: int = 0, web_port: int = 80, install: bool = False) -> str:
+    """프로브 실행 명령 (install=True: 스크립트 설치 후 실행 — 같은 왕복 안에서)"""
+    run = f"sh {PROBE_PATH} '{epoch or '-'}' {int(since)} {int(web_port)}"
+    if install:
+        return (f"mkdir -p {PROBE_DIR} && cat > {PROBE_PATH} <<'__WLPROBE__'\n"
+                f"{PROBE_SCRIPT}__WLPROBE__\n{run}")
+    return f"[ -f {PROBE_PATH} ] && {run} || echo {_MISSING}"
+
+
+def is_missing(out: str) -> bool:
+    return _MISSING in out
+
+
+def parse_probe(out: str) -> Optional[dict]:
+    """프로브 출력 → JSON dict (형식이 다르면 None)"""
+    line = out.strip().splitlines()[-1] if out.strip() else ""
+    try:
+        doc = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(doc, dict) or not isinstance(doc.get('fields'), dict):
+        return None
+    if type(doc.get('seq')) is not int:
+        return None
+    return doc
+
+
+class TelemetryState:
+    """장치 1대의 마지막 텔레메트리 (델타 응답을 누적)"""
+
+    def __init__(self):
+        self.epoch = ""
+        self.seq = 0
+        self.fields: dict = {}
+        self.changed: Set[str] = set()  # 마지막 조회에서 값이 바뀐 필드
+        self.probes = 0
+        self.full_probes = 0
+        self.bytes = 0  # 프로브 응답 누적 크기 (델타 효과 확인용)
+
+    def reset(self):
+        self.epoch = ""
+        self.seq = 0
+
+    def apply(self, doc: dict, size: int = 0):
+        new = doc['fields']
+        if doc.get('full'):
+            self.full_probes += 1
+            self.changed = {k for k in set(new) | set(self.fields) if self.fields.get(k) != new.get(k)}
+            self.fields = dict(new)
+        else:
+            self.changed = {k for k, v in new.items() if self.fields.get(k) != v}
+            self.fields.update(new)
+        self.epoch = str(doc.get('epoch', ''))
+        self.seq = int(doc['seq'])
+        self.probes += 1
+        self.bytes += size
+
+    def app_version(self) -> str:
+        """/api/version 원문에서 앱 버전 ('' = 알 수 없음)"""
+        raw = self.fields.get('version_api') or ""
+        try:
+            return json.loads(raw).get("app", "") if raw else ""
+        except (ValueError, AttributeError):
+            return ""
@@ -0,0 +1,574 @@
+"""
+KVM Relay HTTP 정적 자산 캐시
+
+썸네일/LiveView가 http://relay:18xxx/ 를 열 때마다 같은 JS/CSS/폰트 번들을
+Luckfox 보드에서 다시 받아오는 문제 해결.
+
+- AssetCache: 메모리 LRU + 디스크 LRU (DATA_DIR/relay_cache)
+  키 = (KVM 펌웨어 버전, 경로, gzip 여부) → 같은 펌웨어의 KVM끼리 캐시 공유
+- HTTPAssetFrontend: TCPProxy 첫 요청이 페이지/정적 자산 GET이면 keep-alive 연결을 맡아
+  요청마다 파싱 → 캐시 가능한 GET은 캐시에서 응답, 본문 없는 나머지 GET은 KVM에 요청 단위로 전달
+  (페이지 HTML 다음에 오는 자산 요청도 캐시 적중). ETag/Last-Modified 조건부 요청(304) 지원,
+  만료된 항목은 KVM에 조건부 요청으로 재검증.
+  WebSocket/스트림/API/본문 있는 요청이 오면 그 시점부터 일반 릴레이로 전환.
+"""
+
+import collections
+import hashlib
+import http.client
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .relay_fanout import STREAM_PATH_HINTS
+
+logger = logging.getLogger(__name__)
+
+# 캐시 대상 확장자 (KVM 웹 UI 정적 자산)
+STATIC_EXTENSIONS = (
+    '.js', '.mjs', '.css', '.woff', '.woff2', '.ttf', '.otf', '.eot',
+    '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.webp', '.map', '.wasm',
+)
+# 페이지 경로 (연결의 첫 요청이 이것이면 이후 자산 요청을 캐시로 처리)
+PAGE_SUFFIXES = ('/', '.html', '.htm')
+# 캐시하지 않는 경로 접두어
+BYPASS_PREFIXES = ('/api/', '/_wellcomland/', '/websockify', '/ws', '/stream', '/webrtc')
+# 응답에서 제거할 hop-by-hop 헤더
+_HOP_HEADERS = {'connection', 'keep-alive', 'transfer-encoding', 'content-length',
+                'proxy-connection', 'te', 'trailer', 'upgrade', 'date'}
+
+# KVM으로 전달할 때 제거할 요청 헤더
+_HOP_REQUEST_HEADERS = {'connection', 'keep-alive', 'proxy-connection', 'te', 'trailer', 'upgrade'}
+
+MAX_HEADER_BYTES = 16 * 1024
+RECV_SIZE = 65536
+
+
+class _HTTPRequest:
+    """파싱된 HTTP 요청 헤더 (본문 없는 GET만 처리)"""
+
+    __slots__ = ('method', 'path', 'version', 'headers', 'raw')
+
+    def __init__(self, method: str, path: str, version: str, headers: Dict[str, str], raw: bytes):
+        self.method = method
+        self.path = path
+        self.version = version
+        self.headers = headers
+        self.raw = raw
+
+    @classmethod
+    def parse(cls, raw: bytes) -> Optional['_HTTPRequest']:
+        try:
+            text = raw.decode('latin-1')
+            lines = text.split('\r\n')
+            method, path, version = lines[0].split(' ', 2)
+        except (UnicodeDecodeError, ValueError):
+            return None
+        headers = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, sep, value = line.partition(':')
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        return cls(method, path, version, headers, raw)
+
+    @property
+    def keep_alive(self) -> bool:
+        conn = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return 'keep-alive' in conn
+        return 'close' not in conn
+
+    @property
+    def gzip(self) -> bool:
+        return 'gzip' in self.headers.get('accept-encoding', '').lower()
+
+    def is_cacheable(self) -> bool:
+        if self.method != 'GET' or not self.version.startswith('HTTP/1.'):
+            return False
+        h = self.headers
+        if 'upgrade' in h or 'range' in h or 'authorization' in h or 'content-length' in h:
+            return False
+        if 'no-store' in h.get('cache-control', '').lower():
+            return False
+        path = self.path.split('?', 1)[0].lower()
+        if path.startswith(BYPASS_PREFIXES):
+            return False
+        return path.endswith(STATIC_EXTENSIONS)
+
+    def is_forwardable(self) -> bool:
+        """캐시 대상은 아니지만 요청 단위로 KVM에 전달할 수 있는 GET (본문/업그레이드/스트림 제외)"""
+        if self.method != 'GET' or not self.version.startswith('HTTP/1.'):
+            return False
+        h = self.headers
+        if 'upgrade' in h or 'content-length' in h or 'transfer-encoding' in h:
+            return False
+        path = self.path.split('?', 1)[0].lower()
+        if path.startswith(BYPASS_PREFIXES):
+            return False
+        return not any(hint in path for hint in STREAM_PATH_HINTS)
+
+
+class _CacheEntry:
+    """캐시된 응답 1건"""
+
+    __slots__ = ('digest', 'headers', 'body', 'etag', 'last_modified', 'fetched_at', 'max_age')
+
+    def __init__(self, digest: str, headers: List[Tuple[str, str]], body: bytes,
+                 fetched_at: float, max_age: float):
+        self.digest = digest
+        self.headers = headers
+        self.body = body
+        hmap = {k.lower(): v for k, v in headers}
+        self.etag = hmap.get('etag', '')
+        self.last_modified = hmap.get('last-modified', '')
+        self.fetched_at = fetched_at
+        self.max_age = max_age
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.fetched_at < self.max_age
+
+    def meta(self, key: str) -> dict:
+        return {"key": key, "headers": self.headers, "fetched_at": self.fetched_at,
+                "max_age": self.max_age}
+
+
+class AssetCache:
+    """메모리 + 디스크 LRU 캐시 (프록시 전체 공유, thread-safe)"""
+
+    DEFAULT_MAX_AGE = 3600.0        # Cache-Control 없을 때 신선도 (펌웨어 버전이 키에 포함됨)
+    MAX_OBJECT_BYTES = 8 * 1024 * 1024
+    VERSION_TTL = 300.0             # KVM 펌웨어 버전 재조회 주기
+
+    def __init__(self, cache_dir: Optional[str] = None,
+                 memory_bytes: int = 64 * 1024 * 1024, disk_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.memory_limit = memory_bytes
+        self.disk_limit = disk_bytes
+        self._lock = threading.Lock()
+        self._memory: 'collections.OrderedDict[str, _CacheEntry]' = collections.OrderedDict()
+        self._memory_bytes = 0
+        self._disk: 'collections.OrderedDict[str, int]' = collections.OrderedDict()  # digest → size
+        self._disk_bytes = 0
+        # KVM ip:port → (버전, 조회 시각)
+        self._versions: Dict[str, Tuple[str, float]] = {}
+        # requests: 프론트엔드가 받은 요청 수 (hits / requests = 실제 적중률)
+        self.stats = {"requests": 0, "hits": 0, "misses": 0, "revalidated": 0, "not_modified": 0,
+                      "stores": 0, "forwarded": 0, "bypass": 0, "errors": 0}
+        if cache_dir:
+            self._load_disk_index()
+
+    def count(self, key: str, n: int = 1):
+        """통계 카운터 증가 (여러 연결 스레드에서 동시에 호출됨)"""
+        with self._lock:
+            self.stats[key] += n
+
+    # ── 펌웨어 버전 ──
+
+    def firmware_version(self, host: str, port: int) -> str:
+        """KVM 펌웨어 버전 (/api/version "app") — 실패 시 빈 문자열 (캐시 사용 안 함)"""
+        key = f"{host}:{port}"
+        cached = self._versions.get(key)
+        now = time.time()
+        if cached and now - cached[1] < self.VERSION_TTL:
+            return cached[0]
+        version = ""
+        conn = None
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=5)
+            conn.request('GET', '/api/version')
+            resp = conn.getresponse()
+            if resp.status == 200:
+                data = json.loads(resp.read().decode('utf-8', errors='replace') or '{}')
+                version = str(data.get('app', '') or data.get('version', ''))
+        except Exception as e:
+            logger.debug(f"[RelayCache] 버전 조회 실패 ({key}): {e}")
+        finally:
+            if conn:
+                conn.close()
+        self._versions[key] = (version, now)
+        return version
+
+    # ── 조회 / 저장 ──
+
+    @staticmethod
+    def make_key(version: str, path: str, gzip: bool) -> str:
+        return f"{version}|{'gz' if gzip else 'id'}|{path}"
+
+    @staticmethod
+    def _digest(key: str) -> str:
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[_CacheEntry]:
+        digest = self._digest(key)
+        with self._lock:
+            entry = self._memory.get(digest)
+            if entry is not None:
+                self._memory.move_to_end(digest)
+                return entry
+            on_disk = digest in self._disk
+        if not on_disk:
+            return None
+        entry = self._read_disk(digest)
+        if entry is not None:
+            with self._lock:
+                self._disk.move_to_end(digest, last=True)
+                self._put_memory(entry)
+        return entry
+
+    def put(self, key: str, headers: List[Tuple[str, str]], body: bytes, max_age: float) -> _CacheEntry:
+        entry = _CacheEntry(self._digest(key), headers, body, time.time(), max_age)
+        with self._lock:
+            self._put_memory(entry)
+            self.stats["stores"] += 1
+        self._write_disk(key, entry)
+        return entry
+
+    def touch(self, entry: _CacheEntry, max_age: float):
+        """재검증 성공(304) — 신선도 갱신"""
+        entry.fetched_at = time.time()
+        entry.max_age = max_age
+
+    def _put_memory(self, entry: _CacheEntry):
+        old = self._memory.pop(entry.digest, None)
+        if old is not None:
+            self._memory_bytes -= len(old.body)
+        self._memory[entry.digest] = entry
+        self._memory_bytes += len(entry.body)
+        while self._memory_bytes > self.memory_limit and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted.body)
+
+    # ── 디스크 ──
+
+    def _load_disk_index(self):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            files = []
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.bin'):
+                    path = os.path.join(self.cache_dir, name)
+                    st = os.stat(path)
+                    files.append((st.st_mtime, name[:-4], st.st_size))
+            for _, digest, size in sorted(files):
+                self._disk[digest] = size
+                self._disk_bytes += size
+        except OSError as e:
+            logger.warning(f"[RelayCache] 디스크 캐시 초기화 실패: {e}")
+            self.cache_dir = None
+
+    def _read_disk(self, digest: str) -> Optional[_CacheEntry]:
+        base = os.path.join(self.cache_dir, digest)
+        try:
+            with open(base + '.json', 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(base + '.bin', 'rb') as f:
+                body = f.read()
+            os.utime(base + '.bin')  # LRU 순서 (재시작 후에도 유지)
+            headers = [tuple(h) for h in meta["headers"]]
+            return _CacheEntry(digest, headers, body, meta["fetched_at"], meta["max_age"])
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                size = self._disk.pop(digest, None)
+                if size is not None:
+                    self._disk_bytes -= size
+            return None
+
+    def _write_disk(self, key: str, entry: _CacheEntry):
+        if not self.cache_dir:
+            return
+        base = os.path.join(self.cache_dir, entry.digest)
+        try:
+            tmp = base + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(entry.body)
+            os.replace(tmp, base + '.bin')
+            with open(base + '.json', 'w', encoding='utf-8') as f:
+                json.dump(entry.meta(key), f, ensure_ascii=False)
+        except OSError as e:
+            logger.debug(f"[RelayCache] 디스크 저장 실패: {e}")
+            return
+        evict = []
+        with self._lock:
+            old = self._disk.pop(entry.digest, None)
+            if old is not None:
+                self._disk_bytes -= old
+            self._disk[entry.digest] = len(entry.body)
+            self._disk_bytes += len(entry.body)
+            while self._disk_bytes > self.disk_limit and len(self._disk) > 1:
+                digest, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                evict.append(digest)
+        for digest in evict:
+            for ext in ('.bin', '.json'):
+                try:
+                    os.remove(os.path.join(self.cache_dir, digest + ext))
+                except OSError:
+                    pass
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            requests = self.stats["requests"]
+            return dict(self.stats,
+                        hit_rate=round(self.stats["hits"] / requests, 3) if requests else 0.0,
+                        memory_entries=len(self._memory),
+                        memory_bytes=self._memory_bytes,
+                        disk_entries=len(self._disk),
+                        disk_bytes=self._disk_bytes)
+
+
+class HTTPAssetFrontend:
+    """TCPProxy 연결 앞단 — 요청마다 캐시 응답 / KVM 전달 / 릴레이로 넘김 중 선택"""
+
+    IDLE_TIMEOUT = 30.0  # keep-alive 연결에서 다음 요청 대기 시간
+
+    def __init__(self, cache: AssetCache):
+        self.cache = cache
+
+    @staticmethod
+    def wants(first_data: bytes) -> bool:
+        """첫 데이터만 보고 프론트엔드가 맡을 연결인지 빠르게 판별 (selector 엔진 hand-off 용)
+
+        페이지(/, .html)나 정적 자산 GET으로 시작하는 연결 — 브라우저는 같은 keep-alive
+        연결로 이어서 자산을 요청하므로 첫 요청이 자산이 아니어도 맡아야 캐시가 적중함
+        """
+        if not first_data.startswith(b'GET '):
+            return False
+        line_end = first_data.find(b'\r\n')
+        line = first_data[:line_end if line_end > 0 else 512]
+        parts = line.split(b' ')
+        if len(parts) < 2:
+            return False
+        path = parts[1].split(b'?', 1)[0].lower().decode('latin-1')
+        if path.startswith(BYPASS_PREFIXES) or any(hint in path for hint in STREAM_PATH_HINTS):
+            return False
+        return path.endswith(STATIC_EXTENSIONS) or path.endswith(PAGE_SUFFIXES)
+
+    def handle(self, client_sock: socket.socket, first_data: bytes,
+               target_ip: str, target_port: int) -> Optional[bytes]:
+        """연결 처리
+
+        Returns:
+            None  — 연결 처리 완료 (호출자가 소켓 닫음)
+            bytes — 아직 처리하지 않은 데이터 → 호출자가 KVM으로 일반 릴레이
+        """
+        buf = first_data
+        served = 0
+        client_sock.settimeout(10)
+        while True:
+            # 요청 헤더 끝까지 수신
+            while b'\r\n\r\n' not in buf:
+                if len(buf) > MAX_HEADER_BYTES:
+                    return buf
+                try:
+                    data = client_sock.recv(4096)
+                except socket.timeout:
+                    return buf if buf else None
+                if not data:
+                    return buf if buf else None
+                buf += data
+
+            end = buf.index(b'\r\n\r\n') + 4
+            req = _HTTPRequest.parse(buf[:end])
+            if req is None:
+                return buf
+            if req.is_cacheable():
+                self.cache.count("requests")
+                if not self._serve(client_sock, req, target_ip, target_port):
+                    return buf  # 캐시 실패 → 이 요청부터 일반 릴레이
+                keep = req.keep_alive
+            elif req.is_forwardable():
+                self.cache.count("requests")
+                keep = self._forward(client_sock, req, target_ip, target_port)
+                if keep is None:
+                    return buf  # KVM 요청 실패 (응답 전송 전) → 이 요청부터 일반 릴레이
+            else:
+                if served:
+                    self.cache.count("bypass")  # keep-alive 연결이 릴레이로 전환됨
+                return buf
+
+            served += 1
+            buf = buf[end:]
+            if not keep:
+                return None
+            if not buf:
+                client_sock.settimeout(self.IDLE_TIMEOUT)
+                try:
+                    buf = client_sock.recv(4096)
+                except socket.timeout:
+                    return None
+                if not buf:
+                    return None
+                client_sock.settimeout(10)
+
+    # ── 응답 ──
+
+    def _serve(self, client_sock: socket.socket, req: _HTTPRequest,
+               target_ip: str, target_port: int) -> bool:
+        version = self.cache.firmware_version(target_ip, target_port)
+        if not version:
+            return False
+        key = AssetCache.make_key(version, req.path, req.gzip)
+        entry = self.cache.get(key)
+        status = "HIT"
+        if entry is None:
+            self.cache.count("misses")
+            entry = self._fetch(req, key, target_ip, target_port, None)
+            if entry is None:
+                return False
+            status = "MISS"
+        elif not entry.fresh:
+            refreshed = self._fetch(req, key, target_ip, target_port, entry)
+            if refreshed is not None:
+                entry = refreshed
+                status = "REVALIDATED"
+            else:
+                status = "STALE"
+        else:
+            self.cache.count("hits")
+
+        if self._not_modified(req, entry):
+            self.cache.count("not_modified")
+            self._send(client_sock, req, "304 Not Modified", entry.headers, b'', status)
+        else:
+            self._send(client_sock, req, "200 OK", entry.headers, entry.body, status)
+        return True
+
+    @staticmethod
+    def _not_modified(req: _HTTPRequest, entry: _CacheEntry) -> bool:
+        inm = req.headers.get('if-none-match')
+        if inm is not None:
+            return bool(entry.etag) and (inm.strip() == '*' or entry.etag in [t.strip() for t in inm.split(',')])
+        ims = req.headers.get('if-modified-since')
+        return bool(ims) and bool(entry.last_modified) and ims == entry.last_modified
+
+    @staticmethod
+    def _send(client_sock: socket.socket, req: _HTTPRequest, status_line: str,
+              headers: List[Tuple[str, str]], body: bytes, cache_status: str,
+              keep_alive: Optional[bool] = None, length: bool = True):
+        """응답 전송 (length=False: 본문 길이 모름 → Content-Length 없이 헤더만, 연결 종료로 끝 표시)"""
+        if keep_alive is None:
+            keep_alive = req.keep_alive
+        lines = [f"HTTP/1.1 {status_line}"]
+        for name, value in headers:
+            if status_line.startswith('304') and name.lower().startswith('content-'):
+                continue
+            lines.append(f"{name}: {value}")
+        if length and not status_line.startswith('304'):
+            lines.append(f"Content-Length: {len(body)}")
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        lines.append(f"X-Wellcom-Cache: {cache_status}")
+        head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1', errors='replace')
+        client_sock.sendall(head + body)
+
+    def _forward(self, client_sock: socket.socket, req: _HTTPRequest,
+                 target_ip: str, target_port: int) -> Optional[bool]:
+        """캐시 대상이 아닌 GET 1건을 KVM에 전달하고 응답 중계
+
+        Returns:
+            None  — 응답을 보내기 전에 실패 (호출자가 이 요청부터 일반 릴레이)
+            True  — 완료, keep-alive 연결 계속
+            False — 완료, 연결 종료 (길이 모르는 응답은 연결 종료로 끝을 표시)
+        """
+        headers = {k: v for k, v in req.headers.items() if k not in _HOP_REQUEST_HEADERS}
+        conn = None
+        try:
+            conn = http.client.HTTPConnection(target_ip, target_port, timeout=10)
+            conn.request('GET', req.path, headers=headers)
+            resp = conn.getresponse()
+        except Exception as e:
+            if conn:
+                conn.close()
+            self.cache.count("errors")
+            logger.debug(f"[RelayCache] KVM 요청 전달 실패 ({target_ip}{req.path}): {e}")
+            return None
+        try:
+            self.cache.count("forwarded")
+            status_line = f"{resp.status} {resp.reason}"
+            resp_headers = [(k, v) for k, v in resp.getheaders() if k.lower() not in _HOP_HEADERS]
+            no_body = resp.status in (204, 304) or 100 <= resp.status < 200
+            if no_body or (resp.length is not None and resp.length <= AssetCache.MAX_OBJECT_BYTES):
+                body = resp.read()
+                self._send(client_sock, req, status_line, resp_headers, body, "BYPASS")
+                return req.keep_alive
+            # 길이를 모르거나 큰 응답 → 스트리밍 후 연결 종료
+            self._send(client_sock, req, status_line, resp_headers, b'', "BYPASS",
+                       keep_alive=False, length=False)
+            while True:
+                chunk = resp.read(RECV_SIZE)
+                if not chunk:
+                    return False
+                client_sock.sendall(chunk)
+        except (OSError, http.client.HTTPException) as e:
+            logger.debug(f"[RelayCache] 응답 중계 중단 ({target_ip}{req.path}): {e}")
+            return False
+        finally:
+            conn.close()
+
+    def _fetch(self, req: _HTTPRequest, key: str, target_ip: str, target_port: int,
+               stale: Optional[_CacheEntry]) -> Optional[_CacheEntry]:
+        """KVM에서 자산 가져오기 (stale이 있으면 조건부 요청으로 재검증)"""
+        headers = {}
+        for name in ('host', 'user-agent', 'accept', 'accept-encoding', 'accept-language', 'cookie'):
+            if name in req.headers:
+                headers[name] = req.headers[name]
+        if stale is not None:
+            if stale.etag:
+                headers['If-None-Match'] = stale.etag
+            if stale.last_modified:
+                headers['If-Modified-Since'] = stale.last_modified
+        conn = None
+        try:
+            conn = http.client.HTTPConnection(target_ip, target_port, timeout=10)
+            conn.request('GET', req.path, headers=headers)
+            resp = conn.getresponse()
+            if stale is not None and resp.status == 304:
+                resp.read()
+                self.cache.touch(stale, self._max_age(resp.getheaders()))
+                self.cache.count("revalidated")
+                return stale
+            if resp.status != 200:
+                return None
+            body = resp.read(AssetCache.MAX_OBJECT_BYTES + 1)
+            resp_headers = [(k, v) for k, v in resp.getheaders() if k.lower() not in _HOP_HEADERS]
+            if len(body) > AssetCache.MAX_OBJECT_BYTES or not self._storable(resp_headers):
+                return None
+            return self.cache.put(key, resp_headers, body, self._max_age(resp_headers))
+        except Exception as e:
+            self.cache.count("errors")
+            logger.debug(f"[RelayCache] KVM 자산 요청 실패 ({target_ip}{req.path}): {e}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def _storable(headers: List[Tuple[str, str]]) -> bool:
+        hmap = {k.lower(): v.lower() for k, v in headers}
+        cc = hmap.get('cache-control', '')
+        if 'no-store' in cc or 'private' in cc or 'set-cookie' in hmap:
+            return False
+        vary = {v.strip() for v in hmap.get('vary', '').split(',') if v.strip()}
+        return vary <= {'accept-encoding'}
+
+    @staticmethod
+    def _max_age(headers: List[Tuple[str, str]]) -> float:
+        for name, value in headers:
+            if name.lower() != 'cache-control':
+                continue
+            for part in value.lower().split(','):
+                part = part.strip()
+                if part == 'no-cache':
+                    return 0.0
+                if part.startswith('max-age='):
+                    try:
+                        return max(float(part[8:]), 0.0)
+                    except ValueError:
+                        pass
+        return AssetCache.DEFAULT_MAX_AGE
@@ -0,0 +1,364 @@
+"""
+KVM Relay MJPEG/HTTP 스트림 fan-out
+
+썸네일 그리드, LiveView, 다른 관리자 PC가 같은 KVM의 HTTP 스트림을 보면
+뷰어마다 KVM(Luckfox 보드)에 업스트림 연결을 따로 열어 보드 CPU/대역폭을 소모함.
+
+StreamFanout (TCPProxy당 1개):
+- 스트림 후보 GET 요청 → KVM 응답이 multipart/x-mixed-replace 이면
+  (경로, 자격 증명)별 업스트림 1개(_UpstreamStream)를 만들고 이후 뷰어는 여기에 구독만 추가
+  (Cookie/Authorization이 다른 뷰어는 스트림을 공유하지 않음 — 인증 없는 뷰어가
+   인증된 뷰어의 스트림을 받는 일 방지)
+- 업스트림 스레드가 boundary 단위로 프레임을 잘라 구독자 큐에 분배
+- 구독자 큐는 프레임 수 상한(QUEUE_FRAMES) — 느린 뷰어는 오래된 프레임부터 버림
+  (업스트림/다른 뷰어에 영향 없음)
+- 새 뷰어는 마지막 프레임을 즉시 받음 (빠른 첫 화면)
+- 스트림이 아닌 응답이면 연결된 KVM 소켓을 돌려줘 일반 릴레이로 계속 진행
+"""
+
+import collections
+import hashlib
+import logging
+import socket
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 스트림 후보 경로 (소문자 부분 일치) — 응답 Content-Type으로 최종 판별
+STREAM_PATH_HINTS = ('stream', 'mjpeg', 'mjpg', 'video')
+
+# 스트림 공유 키에 포함하는 요청 헤더 (자격 증명)
+CREDENTIAL_HEADERS = (b'cookie', b'authorization')
+
+MAX_HEADER_BYTES = 16 * 1024
+RECV_SIZE = 65536
+
+
+def share_key(path: str, head: bytes) -> str:
+    """업스트림 공유 키 = 경로 + 자격 증명 헤더 해시 (자격 증명 원문은 보관하지 않음)"""
+    digest = hashlib.sha256()
+    for line in head.split(b'\r\n')[1:]:
+        name, sep, value = line.partition(b':')
+        if sep and name.strip().lower() in CREDENTIAL_HEADERS:
+            digest.update(name.strip().lower() + b'=' + value.strip() + b'\n')
+    return f"{path}#{digest.hexdigest()[:16]}"
+
+
+class _Subscriber:
+    """스트림 뷰어 1명 — 프레임 큐 (가득 차면 가장 오래된 프레임 버림)"""
+
+    __slots__ = ('sock', 'frames', 'cond', 'closed', 'dropped', 'sent')
+
+    def __init__(self, sock: socket.socket, queue_frames: int):
+        self.sock = sock
+        self.frames: collections.deque = collections.deque(maxlen=queue_frames)
+        self.cond = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+        self.sent = 0
+
+    def push(self, frame: bytes):
+        with self.cond:
+            if len(self.frames) == self.frames.maxlen:
+                self.dropped += 1
+            self.frames.append(frame)
+            self.cond.notify()
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+
+
+class _UpstreamStream:
+    """KVM 스트림 업스트림 1개 — 프레임을 구독자에게 분배"""
+
+    LINGER = 5.0  # 마지막 뷰어가 떠난 뒤 업스트림 유지 시간 (뷰 전환 시 재연결 방지)
+
+    def __init__(self, owner: 'StreamFanout', key: str, path: str, sock: socket.socket,
+                 head: bytes, boundary: bytes, leftover: bytes):
+        self.owner = owner
+        self.key = key
+        self.path = path
+        self.sock = sock
+        self.head = head                      # 응답 상태줄 + 헤더 (새 뷰어에게 그대로 전송)
+        self.delimiter = b'--' + boundary
+        self.leftover = leftover
+        self.subscribers: List[_Subscriber] = []
+        self.last_frame: Optional[bytes] = None
+        self.frames = 0
+        self.bytes_in = 0
+        self.alive = True
+        self.idle_since = time.monotonic()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._read_loop, daemon=True,
+                                        name=f"Fanout-{owner.target_ip}")
+
+    def start(self):
+        self._thread.start()
+
+    def subscribe(self, sub: _Subscriber) -> bool:
+        with self._lock:
+            if not self.alive:
+                return False
+            self.subscribers.append(sub)
+            if self.last_frame is not None:
+                sub.push(self.last_frame)
+        return True
+
+    def unsubscribe(self, sub: _Subscriber):
+        with self._lock:
+            if sub in self.subscribers:
+                self.subscribers.remove(sub)
+            if not self.subscribers:
+                self.idle_since = time.monotonic()
+
+    def _publish(self, frame: bytes):
+        self.frames += 1
+        with self._lock:
+            self.last_frame = frame
+            subs = list(self.subscribers)
+        for sub in subs:
+            sub.push(frame)
+
+    def _read_loop(self):
+        buf = bytearray(self.leftover)
+        delim = self.delimiter
+        self.sock.settimeout(1.0)
+        try:
+            while True:
+                # 프레임 = 구분자부터 다음 구분자 직전까지 (part 헤더 + JPEG)
+                start = buf.find(delim)
+                if start > 0:
+                    del buf[:start]
+                while start >= 0:
+                    nxt = buf.find(delim, len(delim))
+                    if nxt < 0:
+                        break
+                    self._publish(bytes(buf[:nxt]))
+                    del buf[:nxt]
+                    start = 0
+
+                with self._lock:
+                    if not self.subscribers and time.monotonic() - self.idle_since > self.LINGER:
+                        self.alive = False  # 이후 구독 시도는 새 업스트림을 염
+                        break
+                try:
+                    data = self.sock.recv(RECV_SIZE)
+                except socket.timeout:
+                    continue
+                if not data:
+                    break
+                self.bytes_in += len(data)
+                buf += data
+                if len(buf) > self.owner.MAX_FRAME_BYTES:
+                    logger.warning(f"[Fanout] {self.owner.target_ip}{self.path} 프레임 구분 실패 — 스트림 종료")
+                    break
+        except OSError as e:
+            logger.debug(f"[Fanout] {self.owner.target_ip}{self.path} 업스트림 종료: {e}")
+        finally:
+            with self._lock:
+                self.alive = False
+                subs, self.subscribers = self.subscribers, []
+            for sub in subs:
+                sub.close()
+            self.owner._remove(self)
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            logger.info(f"[Fanout] {self.owner.target_ip}{self.path} 업스트림 종료 (프레임 {self.frames})")
+
+
+class StreamFanout:
+    """KVM 1대의 HTTP 스트림 fan-out (TCPProxy가 소유)"""
+
+    QUEUE_FRAMES = 3                   # 뷰어별 대기 프레임 상한
+    MAX_FRAME_BYTES = 4 * 1024 * 1024  # 구분자 없이 이만큼 쌓이면 스트림 아님으로 간주
+    SEND_TIMEOUT = 10.0                # 뷰어 소켓 송신 타임아웃 (멈춘 뷰어 정리)
+
+    def __init__(self, target_ip: str, target_port: int, stats=None, limiter=None):
+        self.target_ip = target_ip
+        self.target_port = target_port
+        self.stats = stats  # TCPProxy.stats (뷰어에게 보낸 바이트 집계)
+        self.limiter = limiter  # RelayLimiter — 대역폭 상한 초과 프레임은 버림
+        self._streams: Dict[str, _UpstreamStream] = {}  # share_key → 업스트림
+        self._lock = threading.Lock()
+        self._opening: Dict[str, threading.Event] = {}
+        self.dropped = 0
+        self.upstreams_opened = 0
+
+    @staticmethod
+    def wants(first_data: bytes) -> bool:
+        """스트림 후보 요청인지 첫 데이터로 빠르게 판별"""
+        if not first_data.startswith(b'GET '):
+            return False
+        line_end = first_data.find(b'\r\n')
+        line = first_data[:line_end if line_end > 0 else 512].lower()
+        if b'upgrade' in first_data[:MAX_HEADER_BYTES].lower().split(b'\r\n\r\n', 1)[0]:
+            return False
+        return any(h.encode() in line for h in STREAM_PATH_HINTS)
+
+    def subscribe(self, client_sock: socket.socket, first_data: bytes) -> Optional[socket.socket]:
+        """스트림 구독 (뷰어가 떠날 때까지 blocking)
+
+        Returns:
+            None — 처리 완료 (호출자가 클라이언트 소켓 닫음)
+            socket — 스트림이 아닌 응답: 요청 전달 + 응답 헤더 전송까지 끝난 KVM 소켓
+                     → 호출자가 일반 양방향 릴레이로 계속
+        """
+        data = first_data
+        client_sock.settimeout(10)
+        while b'\r\n\r\n' not in data and len(data) < MAX_HEADER_BYTES:
+            more = client_sock.recv(4096)
+            if not more:
+                return None
+            data += more
+        path = data.split(b'\r\n', 1)[0].split(b' ')[1].decode('latin-1')
+        key = share_key(path, data.split(b'\r\n\r\n', 1)[0])
+
+        stream = self._join_or_open(key, path, data, client_sock)
+        if isinstance(stream, socket.socket):
+            return stream
+        if stream is None:
+            return None
+        self._serve(stream, client_sock)
+        return None
+
+    def _join_or_open(self, key: str, path: str, request: bytes, client_sock: socket.socket):
+        # 같은 키를 동시에 여는 뷰어는 첫 연결 결과를 기다림 (업스트림 1개 보장)
+        while True:
+            with self._lock:
+                stream = self._streams.get(key)
+                if stream is not None and stream.alive:
+                    return stream
+                pending = self._opening.get(key)
+                if pending is None:
+                    self._opening[key] = threading.Event()
+                    break
+            pending.wait(10)
+        try:
+            return self._open(key, path, request, client_sock)
+        finally:
+            with self._lock:
+                self._opening.pop(key).set()
+
+    def _open(self, key: str, path: str, request: bytes, client_sock: socket.socket):
+        """KVM 연결 + 응답 헤더 확인 → 스트림이면 _UpstreamStream, 아니면 KVM 소켓"""
+        target = socket.create_connection((self.target_ip, self.target_port), timeout=10)
+        try:
+            target.sendall(request)
+            if self.stats is not None:
+                self.stats.add_up(len(request))
+            resp = b''
+            while b'\r\n\r\n' not in resp:
+                more = target.recv(RECV_SIZE)
+                if not more:
+                    break
+                resp += more
+                if len(resp) > MAX_HEADER_BYTES:
+                    break
+            head, sep, leftover = resp.partition(b'\r\n\r\n')
+            boundary = self._boundary(head) if sep else None
+            if boundary is None:
+                # 일반 응답 — 받은 만큼 전달하고 일반 릴레이로
+                client_sock.sendall(resp)
+                if self.stats is not None:
+                    self.stats.add_down(len(resp))
+                target.settimeout(None)
+                return target
+        except Exception:
+            target.close()
+            raise
+
+        stream = _UpstreamStream(self, key, path, target, head + sep, boundary, leftover)
+        with self._lock:
+            self._streams[key] = stream
+            self.upstreams_opened += 1
+        stream.start()
+        logger.info(f"[Fanout] {self.target_ip}{path} 업스트림 시작 (boundary={boundary.decode('latin-1')})")
+        return stream
+
+    @staticmethod
+    def _boundary(head: bytes) -> Optional[bytes]:
+        lines = head.split(b'\r\n')
+        if not lines[0].startswith(b'HTTP/1.') or b' 200 ' not in lines[0] + b' ':
+            return None
+        ctype = b''
+        for line in lines[1:]:
+            name, _, value = line.partition(b':')
+            name = name.strip().lower()
+            if name == b'transfer-encoding' and b'chunked' in value.lower():
+                return None
+            if name == b'content-type':
+                ctype = value.strip()
+        if not ctype.lower().startswith(b'multipart/x-mixed-replace'):
+            return None
+        for part in ctype.split(b';')[1:]:
+            key, _, val = part.strip().partition(b'=')
+            if key.lower() == b'boundary' and val:
+                val = val.strip(b'"')
+                return val[2:] if val.startswith(b'--') else val
+        return None
+
+    def _serve(self, stream: _UpstreamStream, client_sock: socket.socket):
+        """뷰어 송신 루프 — 큐에서 프레임을 꺼내 전송"""
+        sub = _Subscriber(client_sock, self.QUEUE_FRAMES)
+        if not stream.subscribe(sub):
+            return
+        client_sock.settimeout(self.SEND_TIMEOUT)
+        try:
+            client_sock.sendall(stream.head)
+            while True:
+                with sub.cond:
+                    while not sub.frames and not sub.closed:
+                        sub.cond.wait(1.0)
+                    if not sub.frames and sub.closed:
+                        break
+                    frame = sub.frames.popleft()
+                limiter = self.limiter
+                if limiter is not None and limiter.active and not limiter.allow(len(frame)):
+                    sub.dropped += 1
+                    continue
+                client_sock.sendall(frame)
+                sub.sent += 1
+                if self.stats is not None:
+                    self.stats.add_down(len(frame))
+        except OSError:
+            pass  # 뷰어 연결 종료 / 송신 타임아웃
+        finally:
+            stream.unsubscribe(sub)
+            self.dropped += sub.dropped
+
+    def _remove(self, stream: _UpstreamStream):
+        with self._lock:
+            if self._streams.get(stream.key) is stream:
+                del self._streams[stream.key]
+
+    def close(self):
+        """모든 업스트림 종료 (TCPProxy.stop)"""
+        with self._lock:
+            streams = list(self._streams.values())
+        for stream in streams:
+            try:
+                stream.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            streams = list(self._streams.values())
+        return {
+            "upstreams": len(streams),
+            "upstreams_opened": self.upstreams_opened,
+            "viewers": sum(len(s.subscribers) for s in streams),
+            "dropped_frames": self.dropped + sum(sub.dropped for s in streams for sub in list(s.subscribers)),
+            "streams": [{
+                "path": s.path,
+                "viewers": len(s.subscribers),
+                "frames": s.frames,
+                "bytes_in": s.bytes_in,
+            } for s in streams],
+        }
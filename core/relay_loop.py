@@ -0,0 +1,672 @@
+"""
+KVM Relay 이벤트 루프 — selectors 기반 단일 스레드 릴레이 엔진
+
+스레드 엔진(TCPProxy 기본)은 연결 1개당 스레드 3개(_relay + _pipe x2)를 사용.
+관제 PC 1대가 KVM 40대 이상을 중계하면 수백 개의 blocking 스레드가 생기고
+Qt UI와 GIL을 두고 경쟁하게 됨.
+
+이 모듈은 모든 리스닝 포트와 모든 연결을 스레드 1개에서 처리:
+- 리스닝 소켓: accept → 세션 생성
+- 세션: 첫 데이터 수신 → 특수 경로 확인 → KVM non-blocking connect → 양방향 전달
+- 방향별 송신 버퍼 + 상한(HIGH_WATER) 초과 시 읽기 중지 (backpressure)
+- zero_copy 프록시 (Linux): 방향별 커널 파이프를 버퍼로 사용, os.splice로 전달
+
+TCPProxy(loop=...) 로 생성하면 자동으로 이 루프에 등록됨.
+"""
+
+import collections
+import errno
+import logging
+import os
+import selectors
+import socket
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+from .relay_shaper import CLASS_CONTROL, CLASS_MEDIA, classify, enable_keepalive, tune_socket
+
+logger = logging.getLogger(__name__)
+
+# Linux splice: 소켓 ↔ 파이프 간 커널 내부 이동 (Python 3.10+)
+SPLICE_AVAILABLE = sys.platform.startswith('linux') and hasattr(os, 'splice')
+SPLICE_CHUNK = 65536
+
+_CONNECT_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY,
+                        getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)}
+
+
+class _RelaySession:
+    """클라이언트 ↔ KVM 연결 1쌍의 상태"""
+
+    __slots__ = (
+        'loop', 'proxy', 'client', 'target', 'state', 'deadline',
+        'to_target', 'to_client', 'client_eof', 'target_eof',
+        'client_mask', 'target_mask', 'closed',
+        'up_pipe', 'down_pipe', 'stats', 'connect_t0',
+        'traffic_class', 'limiter', 'resume_at', 'started', 'last_active', 'slot',
+    )
+
+    # 상태
+    FIRST = 0       # 첫 데이터 대기 (특수 경로 확인용)
+    CONNECTING = 1  # KVM non-blocking connect 진행 중
+    RELAY = 2       # 양방향 전달
+
+    def __init__(self, loop: 'RelayEventLoop', proxy, client: socket.socket):
+        self.loop = loop
+        self.proxy = proxy
+        self.client = client
+        self.target: Optional[socket.socket] = None
+        self.state = self.FIRST
+        self.deadline = time.monotonic() + loop.FIRST_DATA_TIMEOUT
+        self.to_target = bytearray()
+        self.to_client = bytearray()
+        self.client_eof = False
+        self.target_eof = False
+        self.client_mask = 0
+        self.target_mask = 0
+        self.closed = False
+        # splice용 커널 파이프 [r_fd, w_fd, 파이프에 남은 바이트] (up: 클라이언트→KVM)
+        self.up_pipe: Optional[list] = None
+        self.down_pipe: Optional[list] = None
+        # 트래픽 카운터 (TCPProxy.stats 공유)
+        self.stats = proxy.stats
+        self.stats.active += 1
+        self.stats.connections += 1
+        # proxy._admit으로 예약된 동시 연결 슬롯 — close에서 반납, hand-off 시 _relay 스레드로 넘김
+        self.slot = True
+        self.connect_t0 = 0.0
+        # 트래픽 셰이핑: control 세션은 이벤트 우선 처리, media 하향은 limiter로 읽기 일시 중지
+        self.traffic_class = CLASS_MEDIA
+        self.limiter = None
+        self.resume_at = 0.0
+        # 유휴 정리 (TCPProxy.idle_limit 초과 시 _check_deadlines에서 종료)
+        self.started = self.last_active = time.monotonic()
+
+    # ── 이벤트 처리 ──
+
+    def on_event(self, sock: socket.socket, mask: int):
+        if self.closed:
+            return
+        try:
+            if self.state == self.FIRST:
+                self._on_first_data()
+            elif self.state == self.CONNECTING:
+                self._on_connected()
+            else:
+                is_client = sock is self.client
+                if mask & selectors.EVENT_WRITE:
+                    self._flush(is_client)
+                if mask & selectors.EVENT_READ and not self.closed:
+                    self._read(is_client)
+            if not self.closed:
+                self._update_interest()
+        except (ConnectionResetError, ConnectionAbortedError):
+            self.stats.resets += 1
+            self.close()
+        except BrokenPipeError:
+            self.close()
+        except OSError:
+            self.stats.errors += 1
+            self.close()
+        except Exception as e:
+            self.stats.errors += 1
+            logger.debug(f"[RelayLoop] 세션 오류 ({self.proxy.target_ip}): {e}")
+            self.close()
+
+    def _on_first_data(self):
+        try:
+            data = self.client.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        if not data:
+            self.close()
+            return
+        self._start(data)
+
+    def _start(self, data: bytes):
+        """첫 데이터 처리 → KVM 연결 시작"""
+        # /_wellcomland/ 특수 경로 — 응답이 작으므로 잠시 blocking으로 전송
+        if b'/_wellcomland/' in data:
+            self.client.settimeout(2.0)
+            if self.proxy._handle_special_request(self.client, data):
+                self.close()
+                return
+            self.client.setblocking(False)
+
+        # 캐시 가능한 정적 자산 / 스트림 구독 요청 — 스레드 엔진 경로로 넘겨 blocking 처리
+        if self.proxy._wants_thread(data):
+            self._hand_off(data)
+            return
+
+        self.traffic_class = classify(data)
+        limiter = self.proxy.limiter
+        if self.traffic_class == CLASS_MEDIA and limiter is not None and limiter.active:
+            self.limiter = limiter
+
+        self.to_target += data
+        self.stats.add_up(len(data))
+        self.target = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.target.setblocking(False)
+        self.connect_t0 = time.perf_counter()
+        err = self.target.connect_ex((self.proxy.target_ip, self.proxy.target_port))
+        if err and err not in _CONNECT_IN_PROGRESS:
+            raise OSError(err, f"connect {self.proxy.target_ip}:{self.proxy.target_port}")
+        self.state = self.CONNECTING
+        self.deadline = time.monotonic() + self.loop.CONNECT_TIMEOUT
+
+    def _on_connected(self):
+        err = self.target.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if err:
+            logger.debug(f"[RelayLoop] KVM 연결 실패 ({self.proxy.target_ip}:{self.proxy.target_port}): "
+                         f"{errno.errorcode.get(err, err)}")
+            self.stats.errors += 1
+            self.close()
+            return
+        self.stats.add_connect_latency((time.perf_counter() - self.connect_t0) * 1000)
+        self.state = self.RELAY
+        self.deadline = 0.0
+        if self.proxy.zero_copy:
+            self.up_pipe = self._open_pipe()
+            self.down_pipe = self._open_pipe()
+        # control: 저지연 / media: 송신 큐 상한
+        for s in (self.client, self.target):
+            tune_socket(s, self.traffic_class)
+            if self.proxy.keepalive_idle:
+                enable_keepalive(s, self.proxy.keepalive_idle)
+        self._flush(False)
+
+    def _hand_off(self, first_data: bytes):
+        """클라이언트 소켓을 루프에서 떼어 TCPProxy._relay 스레드로 넘김"""
+        client, self.client = self.client, None
+        if self.client_mask:
+            try:
+                self.loop._sel.unregister(client)
+            except Exception:
+                pass
+            self.client_mask = 0
+        self.slot = False  # 슬롯은 _relay 스레드가 이어받아 반납
+        self.close()
+        try:
+            client.setblocking(True)
+            threading.Thread(target=self.proxy._relay, args=(client, first_data), daemon=True).start()
+        except Exception:
+            self.proxy._release()
+            client.close()
+            raise
+
+    @staticmethod
+    def _open_pipe() -> Optional[list]:
+        try:
+            r_fd, w_fd = os.pipe()
+        except OSError:
+            return None  # fd 부족 등 — 이 세션은 일반 복사로 전달
+        os.set_blocking(r_fd, False)
+        os.set_blocking(w_fd, False)
+        return [r_fd, w_fd, 0]
+
+    def _on_eof(self, from_client: bool):
+        if from_client:
+            self.client_eof = True
+        else:
+            self.target_eof = True
+        if self._pending(not from_client) == 0:
+            self._shutdown_wr(self.target if from_client else self.client)
+        self._maybe_close()
+
+    def _pending(self, to_client: bool) -> int:
+        """dst 방향으로 아직 보내지 못한 바이트 (버퍼 + 파이프)"""
+        buf = self.to_client if to_client else self.to_target
+        pipe = self.down_pipe if to_client else self.up_pipe
+        return len(buf) + (pipe[2] if pipe else 0)
+
+    def _read(self, from_client: bool):
+        src = self.client if from_client else self.target
+        dst = self.target if from_client else self.client
+        buf = self.to_target if from_client else self.to_client
+        pipe = self.up_pipe if from_client else self.down_pipe
+        if pipe is not None and not buf:
+            self._read_splice(src, dst, pipe, from_client)
+            return
+        try:
+            data = src.recv(self.loop.RECV_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        if not data:
+            self._on_eof(from_client)
+            return
+        self.last_active = time.monotonic()
+        if from_client:
+            self.stats.add_up(len(data))
+        else:
+            self.stats.add_down(len(data))
+            if self.limiter is not None:
+                self._throttle(len(data))
+
+        # 빠른 경로: 대기 버퍼가 없으면 바로 전송 시도
+        if not buf:
+            try:
+                sent = dst.send(data)
+            except (BlockingIOError, InterruptedError):
+                sent = 0
+            if sent < len(data):
+                buf += data[sent:]
+        else:
+            buf += data
+
+    def _read_splice(self, src: socket.socket, dst: socket.socket, pipe: list, from_client: bool):
+        """소켓 → 커널 파이프 → 소켓 (데이터가 파이썬 메모리를 거치지 않음)"""
+        try:
+            n = os.splice(src.fileno(), pipe[1], SPLICE_CHUNK,
+                          flags=os.SPLICE_F_MOVE | os.SPLICE_F_NONBLOCK)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            if e.errno not in (errno.EINVAL, errno.ENOSYS) or pipe[2]:
+                raise
+            # splice 미지원 소켓 → 이 방향은 일반 복사로 전환
+            for fd in pipe[:2]:
+                os.close(fd)
+            if from_client:
+                self.up_pipe = None
+            else:
+                self.down_pipe = None
+            return
+        if n == 0:
+            self._on_eof(from_client)
+            return
+        self.last_active = time.monotonic()
+        if from_client:
+            self.stats.add_up(n)
+        else:
+            self.stats.add_down(n)
+            if self.limiter is not None:
+                self._throttle(n)
+        pipe[2] += n
+        self._drain_pipe(dst, pipe)
+
+    def _throttle(self, n: int):
+        """대역폭 상한 초과 → 지연 시간 동안 KVM 쪽 읽기 중지 (TCP 윈도우로 역압)"""
+        delay = self.limiter.consume(n)
+        if delay:
+            self.resume_at = time.monotonic() + min(delay, 1.0)
+            self.loop._throttled.add(self)
+
+    @staticmethod
+    def _drain_pipe(dst: socket.socket, pipe: list):
+        while pipe[2] > 0:
+            try:
+                n = os.splice(pipe[0], dst.fileno(), pipe[2],
+                              flags=os.SPLICE_F_MOVE | os.SPLICE_F_NONBLOCK)
+            except (BlockingIOError, InterruptedError):
+                return
+            if n == 0:
+                return
+            pipe[2] -= n
+
+    def _flush(self, to_client: bool):
+        dst = self.client if to_client else self.target
+        buf = self.to_client if to_client else self.to_target
+        if buf:
+            try:
+                sent = dst.send(buf)
+            except (BlockingIOError, InterruptedError):
+                return
+            del buf[:sent]
+        pipe = self.down_pipe if to_client else self.up_pipe
+        if not buf and pipe is not None and pipe[2]:
+            self._drain_pipe(dst, pipe)
+        if self._pending(to_client) == 0:
+            src_eof = self.target_eof if to_client else self.client_eof
+            if src_eof:
+                self._shutdown_wr(dst)
+                self._maybe_close()
+
+    @staticmethod
+    def _shutdown_wr(sock: socket.socket):
+        """상대방에게 EOF 알림"""
+        try:
+            sock.shutdown(socket.SHUT_WR)
+        except Exception:
+            pass
+
+    def _maybe_close(self):
+        if self.client_eof and self.target_eof and not self._pending(True) and not self._pending(False):
+            self.close()
+
+    # ── selector 등록 관리 ──
+
+    def _desired_masks(self):
+        high = self.loop.HIGH_WATER
+        if self.state == self.FIRST:
+            return selectors.EVENT_READ, 0
+        if self.state == self.CONNECTING:
+            return 0, selectors.EVENT_WRITE
+
+        client_mask = 0
+        target_mask = 0
+        # splice 방향은 파이프가 비었을 때만 읽음 (가득 찬 파이프에 splice → EAGAIN busy loop 방지)
+        up_limit = 1 if self.up_pipe is not None else high
+        down_limit = 1 if self.down_pipe is not None else high
+        to_target = self._pending(False)
+        to_client = self._pending(True)
+        if not self.client_eof and to_target < up_limit:
+            client_mask |= selectors.EVENT_READ
+        if not self.target_eof and to_client < down_limit and not self.resume_at:
+            target_mask |= selectors.EVENT_READ
+        if to_client:
+            client_mask |= selectors.EVENT_WRITE
+        if to_target:
+            target_mask |= selectors.EVENT_WRITE
+        return client_mask, target_mask
+
+    def _update_interest(self):
+        client_mask, target_mask = self._desired_masks()
+        self.client_mask = self.loop._set_interest(self.client, self.client_mask, client_mask, self)
+        if self.target is not None:
+            self.target_mask = self.loop._set_interest(self.target, self.target_mask, target_mask, self)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.stats.active -= 1
+        if self.slot:
+            self.slot = False
+            self.proxy._release()
+        self.loop._sessions.discard(self)
+        self.loop._throttled.discard(self)
+        for sock, mask in ((self.client, self.client_mask), (self.target, self.target_mask)):
+            if sock is None:
+                continue
+            if mask:
+                try:
+                    self.loop._sel.unregister(sock)
+                except Exception:
+                    pass
+            try:
+                sock.close()
+            except Exception:
+                pass
+        for pipe in (self.up_pipe, self.down_pipe):
+            if pipe is not None:
+                for fd in pipe[:2]:
+                    try:
+                        os.close(fd)
+                    except OSError:
+                        pass
+        self.up_pipe = self.down_pipe = None
+        self.client_mask = self.target_mask = 0
+
+
+class RelayEventLoop:
+    """selectors 기반 릴레이 루프 — 스레드 1개로 모든 TCPProxy 처리"""
+
+    RECV_SIZE = 65536
+    HIGH_WATER = 256 * 1024     # 방향별 송신 대기 버퍼 상한 (초과 시 읽기 중지)
+    FIRST_DATA_TIMEOUT = 10.0   # 첫 데이터 대기 (스레드 엔진의 settimeout(10)과 동일)
+    CONNECT_TIMEOUT = 10.0      # KVM 연결 타임아웃
+
+    def __init__(self, name: str = "RelayLoop"):
+        self.name = name
+        self._sel: Optional[selectors.BaseSelector] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._calls = collections.deque()
+        self._sessions = set()
+        self._throttled = set()  # 대역폭 상한으로 KVM 읽기를 멈춘 세션
+        self._wake_r: Optional[socket.socket] = None
+        self._wake_w: Optional[socket.socket] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    @property
+    def session_count(self) -> int:
+        return len(self._sessions)
+
+    def start(self):
+        """루프 스레드 시작"""
+        if self._running:
+            return
+        self._sel = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._sel.register(self._wake_r, selectors.EVENT_READ, None)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+        self._thread.start()
+        logger.info(f"[RelayLoop] 시작 ({type(self._sel).__name__})")
+
+    def stop(self):
+        """루프 중지 — 모든 세션 종료"""
+        if not self._running:
+            return
+        self._running = False
+        self._wakeup()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=3)
+        self._thread = None
+
+    def call_soon(self, func: Callable, *args):
+        """루프 스레드에서 func(*args) 실행 (thread-safe)"""
+        self._calls.append((func, args))
+        self._wakeup()
+
+    def _wakeup(self):
+        try:
+            if self._wake_w:
+                self._wake_w.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    # ── 리스너 관리 (TCPProxy에서 호출) ──
+
+    def add_listener(self, proxy):
+        """TCPProxy의 리스닝 소켓을 루프에 등록"""
+        proxy._server.setblocking(False)
+        self.call_soon(self._register_listener, proxy, proxy._server)
+
+    def remove_listener(self, proxy, server: socket.socket):
+        """TCPProxy 리스닝 소켓 해제 + 해당 프록시의 세션 종료"""
+        if not self._running:
+            try:
+                server.close()
+            except Exception:
+                pass
+            return
+        self.call_soon(self._unregister_listener, proxy, server)
+
+    def _register_listener(self, proxy, server: socket.socket):
+        if proxy._server is server:
+            self._sel.register(server, selectors.EVENT_READ, proxy)
+
+    def _unregister_listener(self, proxy, server: socket.socket):
+        try:
+            self._sel.unregister(server)
+        except Exception:
+            pass
+        try:
+            server.close()
+        except Exception:
+            pass
+        self._close_sessions(proxy)
+
+    def adopt(self, proxy, client: socket.socket, first_data: bytes):
+        """다른 스레드에서 이미 첫 데이터를 읽은 연결을 proxy 세션으로 인수 (멀티플렉스 라우터용)"""
+        self.call_soon(self._adopt, proxy, client, first_data)
+
+    def close_sessions(self, proxy):
+        """리스닝 소켓 없는 proxy(멀티플렉스 라우트)의 세션 종료"""
+        if self._running:
+            self.call_soon(self._close_sessions, proxy)
+
+    def _adopt(self, proxy, client: socket.socket, first_data: bytes):
+        """라우터가 proxy._admit으로 예약한 슬롯은 세션이 이어받음"""
+        try:
+            client.setblocking(False)
+        except OSError:
+            proxy._release()
+            client.close()
+            return
+        session = _RelaySession(self, proxy, client)
+        self._sessions.add(session)
+        try:
+            session._start(first_data)
+        except Exception as e:
+            session.stats.errors += 1
+            logger.debug(f"[RelayLoop] 세션 인수 실패 ({proxy.target_ip}): {e}")
+            session.close()
+            return
+        if not session.closed:
+            session._update_interest()
+
+    def _close_sessions(self, proxy):
+        for session in [s for s in self._sessions if s.proxy is proxy]:
+            session.close()
+
+    def _set_interest(self, sock: socket.socket, old: int, new: int, session) -> int:
+        if old == new:
+            return new
+        if not new:
+            self._sel.unregister(sock)
+        elif not old:
+            self._sel.register(sock, new, session)
+        else:
+            self._sel.modify(sock, new, session)
+        return new
+
+    # ── 메인 루프 ──
+
+    def _accept(self, server: socket.socket, proxy):
+        while True:
+            try:
+                client, _ = server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            if not proxy._admit(client):
+                continue
+            client.setblocking(False)
+            session = _RelaySession(self, proxy, client)
+            self._sessions.add(session)
+            try:
+                session._update_interest()
+            except (OSError, ValueError, KeyError) as e:
+                # 등록 직전에 닫힌 소켓 (fd -1 / 이미 해제) — 세션만 정리하고 다음 accept 계속
+                session.stats.errors += 1
+                logger.debug(f"[RelayLoop] 세션 등록 실패 ({proxy.target_ip}): {e}")
+                session.close()
+
+    def _select_timeout(self) -> float:
+        if not self._throttled:
+            return 1.0
+        earliest = min(s.resume_at for s in self._throttled)
+        return min(1.0, max(0.0, earliest - time.monotonic()))
+
+    def _resume_throttled(self, now: float):
+        for session in [s for s in self._throttled if s.resume_at <= now]:
+            self._throttled.discard(session)
+            session.resume_at = 0.0
+            if not session.closed:
+                try:
+                    session._update_interest()
+                except (OSError, ValueError, KeyError):
+                    session.close()
+
+    def _check_deadlines(self):
+        now = time.monotonic()
+        for session in [s for s in self._sessions if s.deadline and s.deadline < now]:
+            logger.debug(f"[RelayLoop] 타임아웃 ({session.proxy.target_ip}:{session.proxy.target_port})")
+            if session.state == session.CONNECTING:
+                session.stats.errors += 1
+            session.close()
+        # 유휴 연결 정리 (스레드 엔진의 TCPProxy.reap_idle과 같은 기준)
+        for session in [s for s in self._sessions if s.state == s.RELAY]:
+            limit = session.proxy.idle_limit(session.traffic_class)
+            idle = now - session.last_active
+            if limit and idle > limit:
+                try:
+                    peer = '%s:%s' % session.client.getpeername()[:2]
+                except OSError:
+                    peer = '?'
+                session.proxy.record_reaped(peer, session.traffic_class, idle, now - session.started)
+                session.close()
+
+    def _run(self):
+        last_check = time.monotonic()
+        try:
+            while self._running:
+                while self._calls:
+                    func, args = self._calls.popleft()
+                    try:
+                        func(*args)
+                    except Exception as e:
+                        logger.debug(f"[RelayLoop] call_soon 오류: {e}")
+
+                events = self._sel.select(timeout=self._select_timeout())
+                if len(events) > 1:
+                    # control(WebSocket 입력) 세션을 먼저 처리
+                    events.sort(key=lambda ev: not (isinstance(ev[0].data, _RelaySession)
+                                                    and ev[0].data.traffic_class == CLASS_CONTROL))
+                for key, mask in events:
+                    data = key.data
+                    if data is None:
+                        try:
+                            while self._wake_r.recv(4096):
+                                pass
+                        except (BlockingIOError, OSError):
+                            pass
+                    elif isinstance(data, _RelaySession):
+                        data.on_event(key.fileobj, mask)
+                    else:
+                        self._accept(key.fileobj, data)
+
+                now = time.monotonic()
+                if self._throttled:
+                    self._resume_throttled(now)
+                if now - last_check >= 1.0:
+                    last_check = now
+                    self._check_deadlines()
+        except Exception as e:
+            logger.error(f"[RelayLoop] 루프 오류: {e}")
+        finally:
+            # stop() 직전에 들어온 호출 (remove_listener → _unregister_listener 등) 마저 처리
+            while self._calls:
+                func, args = self._calls.popleft()
+                try:
+                    func(*args)
+                except Exception as e:
+                    logger.debug(f"[RelayLoop] call_soon 오류 (종료 중): {e}")
+            # 아직 등록된 리스닝 소켓 닫기 — 포트가 남아 같은 포트로 재시작이 실패하지 않도록
+            try:
+                listeners = [key.fileobj for key in self._sel.get_map().values()
+                             if key.data is not None and not isinstance(key.data, _RelaySession)]
+            except Exception:
+                listeners = []
+            for server in listeners:
+                try:
+                    self._sel.unregister(server)
+                except Exception:
+                    pass
+                try:
+                    server.close()
+                except Exception:
+                    pass
+            for session in list(self._sessions):
+                session.close()
+            try:
+                self._sel.close()
+            except Exception:
+                pass
+            for s in (self._wake_r, self._wake_w):
+                try:
+                    s.close()
+                except Exception:
+                    pass
+            self._wake_r = self._wake_w = None
+            self._running = False
@@ -0,0 +1,149 @@
+"""
+KVM Relay 트래픽/지연 메트릭
+
+- RelayCounters: TCPProxy / UDPRelay 하나당 1개. 핫패스에서는 정수 += 만 수행 (락 없음).
+  여러 스레드가 동시에 더하면 드물게 몇 건이 누락될 수 있으나 통계 용도로는 충분.
+- RelayMetrics: 5초마다 모든 카운터의 스냅샷을 기록 → 1분/15분 이동 평균 속도 계산.
+"""
+
+import collections
+import threading
+import time
+import logging
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RelayCounters:
+    """릴레이 1개의 누적 카운터 (up: 클라이언트→KVM, down: KVM→클라이언트)"""
+
+    # 속도(초당) 계산 대상 누적 필드
+    RATE_FIELDS = ('connections', 'bytes_up', 'bytes_down', 'packets_up', 'packets_down',
+                   'errors', 'resets')
+
+    __slots__ = ('active', 'connections', 'bytes_up', 'bytes_down', 'packets_up', 'packets_down',
+                 'errors', 'resets', 'connect_count', 'connect_ms_total', 'connect_ms_last',
+                 'connect_ms_max', 'rejected', 'reaped')
+
+    def __init__(self):
+        self.active = 0           # 현재 활성 연결(TCP) / 세션(UDP)
+        self.connections = 0      # 누적 연결/세션 수
+        self.bytes_up = 0
+        self.bytes_down = 0
+        self.packets_up = 0       # TCP: recv 청크 수 / UDP: datagram 수
+        self.packets_down = 0
+        self.errors = 0           # KVM 연결 실패, 예외
+        self.resets = 0           # RST / 비정상 종료
+        self.connect_count = 0    # KVM 연결 지연 샘플
+        self.connect_ms_total = 0.0
+        self.connect_ms_last = 0.0
+        self.connect_ms_max = 0.0
+        self.rejected = 0         # 동시 연결 상한 초과로 거절
+        self.reaped = 0           # 유휴/끊긴 연결 정리
+
+    def add_up(self, n: int):
+        self.bytes_up += n
+        self.packets_up += 1
+
+    def add_down(self, n: int):
+        self.bytes_down += n
+        self.packets_down += 1
+
+    def add_connect_latency(self, ms: float):
+        self.connect_count += 1
+        self.connect_ms_total += ms
+        self.connect_ms_last = ms
+        if ms > self.connect_ms_max:
+            self.connect_ms_max = ms
+
+    def snapshot(self) -> tuple:
+        return tuple(getattr(self, f) for f in self.RATE_FIELDS)
+
+    def to_dict(self) -> dict:
+        avg = self.connect_ms_total / self.connect_count if self.connect_count else 0.0
+        return {
+            "active": self.active,
+            "connections": self.connections,
+            "bytes_up": self.bytes_up,
+            "bytes_down": self.bytes_down,
+            "packets_up": self.packets_up,
+            "packets_down": self.packets_down,
+            "errors": self.errors,
+            "resets": self.resets,
+            "rejected": self.rejected,
+            "reaped": self.reaped,
+            "connect_ms_last": round(self.connect_ms_last, 2),
+            "connect_ms_avg": round(avg, 2),
+            "connect_ms_max": round(self.connect_ms_max, 2),
+        }
+
+
+class RelayMetrics:
+    """주기적 스냅샷 기반 이동 평균 속도 (1분 / 15분)"""
+
+    SAMPLE_INTERVAL = 5.0
+    WINDOWS = (('1m', 60), ('15m', 900))
+
+    def __init__(self, source: Callable[[], Dict[str, RelayCounters]]):
+        """source: {이름: RelayCounters} 를 돌려주는 함수 (샘플링 시마다 호출)"""
+        self._source = source
+        maxlen = int(max(w for _, w in self.WINDOWS) / self.SAMPLE_INTERVAL) + 2
+        self._history: Dict[str, collections.deque] = collections.defaultdict(
+            lambda: collections.deque(maxlen=maxlen))
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        if self._thread and self._thread.is_alive():
+            return  # stop() 직후 재시작 — 기존 스레드가 계속 동작
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="RelayMetrics")
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+
+    def _loop(self):
+        while self._running:
+            try:
+                self.sample()
+            except Exception as e:
+                logger.debug(f"[RelayMetrics] 샘플링 오류: {e}")
+            time.sleep(self.SAMPLE_INTERVAL)
+
+    def sample(self):
+        """모든 카운터 스냅샷 기록 (사라진 릴레이의 기록은 삭제)"""
+        now = time.monotonic()
+        counters = self._source()
+        with self._lock:
+            for name, c in counters.items():
+                self._history[name].append((now, c.snapshot()))
+            for name in [n for n in self._history if n not in counters]:
+                del self._history[name]
+
+    def rates(self, name: str, counters: RelayCounters) -> dict:
+        """{'1m': {field: 초당 값}, '15m': {...}} — 기록이 부족하면 가능한 구간으로 계산"""
+        now = time.monotonic()
+        current = counters.snapshot()
+        with self._lock:
+            history = list(self._history.get(name, ()))
+        result = {}
+        for label, window in self.WINDOWS:
+            base = None
+            for ts, snap in history:
+                if now - ts <= window:
+                    base = (ts, snap)
+                    break
+            if base is None or now - base[0] < 1.0:
+                result[label] = {f: 0.0 for f in RelayCounters.RATE_FIELDS}
+                continue
+            dt = now - base[0]
+            result[label] = {
+                f: round((cur - old) / dt, 2)
+                for f, cur, old in zip(RelayCounters.RATE_FIELDS, current, base[1])
+            }
+        return result
@@ -0,0 +1,654 @@
+"""
+KVM Relay 워커 프로세스 — Qt UI 프로세스와 분리 실행
+
+GUI 프로세스 안의 릴레이 스레드는 WebEngine 렌더링/시그널 처리와 GIL을 두고 경쟁하여
+UI가 멈추면 원격 뷰어 영상도 끊기고, UI 크래시 시 모든 원격 관리자 세션이 함께 끊김.
+
+- RelayProcessProxy: KVMRelayManager와 같은 API — 호출을 워커 프로세스로 전달
+- 워커 실행: 'python -m core.relay_process' (frozen EXE: 'WellcomLAND.exe --relay-worker', launcher.py)
+- 제어 채널: 127.0.0.1 소켓 + authkey (multiprocessing.connection, pickle 메시지)
+    요청 (id, method, args, kwargs) → 응답 (id, "ok", 값) / (id, "error", 메시지)
+    요청 id로 응답을 짝지음 → 느린 요청(start_relay 등)이 있어도 다른 스레드의 조회는 기다리지 않음
+    (워커는 요청마다 스레드에서 처리, 상태를 바꾸는 요청끼리는 순서대로)
+- 서버 등록/heartbeat는 워커가 직접 전송 (GUI는 서버 주소/토큰만 넘김) → GUI가 멈추거나 죽어도 계속
+- 릴레이 정지는 명시적 "shutdown" 요청(GUI 정상 종료)에서만.
+  GUI 프로세스가 죽어 채널 EOF가 나면 relay.worker_grace 초 동안 릴레이를 유지하며 재접속 대기
+  (재접속 주소/authkey: DATA_DIR/relay_worker.json) → 새 GUI는 워커를 새로 띄우지 않고 다시 연결
+- 워커가 죽으면 다음 호출에서 재시작 + 열려 있던 릴레이/UDP 타겟 포트/heartbeat 복원
+- 워커를 띄울 수 없으면 (구버전 런처 등) GUI 프로세스 내 KVMRelayManager로 대체
+"""
+
+import itertools
+import json
+import logging
+import os
+import queue
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Connection, Listener, answer_challenge, deliver_challenge
+from typing import Any, Dict, Optional, Tuple
+
+from .kvm_relay import KVMRelayManager, push_registration
+
+logger = logging.getLogger(__name__)
+
+WORKER_FLAG = "--relay-worker"
+ENV_ADDRESS = "WELLCOMLAND_RELAY_ADDRESS"
+ENV_AUTHKEY = "WELLCOMLAND_RELAY_AUTHKEY"
+
+# 워커에서 호출 가능한 KVMRelayManager 메서드/속성
+WORKER_METHODS = frozenset({
+    "start_relay", "stop_relay", "stop_all", "get_tailscale_ip",
+    "get_udp_port", "set_udp_target_port", "get_relay_route",
+    "get_relay_info", "get_relay_metrics", "get_status", "get_metrics_report",
+    "registration_payload", "registration_result", "heartbeat_payload", "heartbeat_result",
+    "engine", "mode", "mux_port",
+})
+# 워커 프로세스에서만 처리하는 요청 (GUI 프로세스 내 대체 실행에는 없음)
+WORKER_ONLY = frozenset({"attach", "start_heartbeat", "register_to_server"})
+# 상태를 바꾸지 않는 조회 — 워커에서 다른 요청과 동시에 처리
+QUERY_METHODS = frozenset({
+    "get_tailscale_ip", "get_udp_port", "get_relay_route", "get_relay_info", "get_relay_metrics",
+    "get_status", "get_metrics_report", "heartbeat_payload", "engine", "mode", "mux_port",
+})
+
+
+def _relay_setting(key: str, default):
+    try:
+        from config import settings
+        return settings.get(f'relay.{key}', default)
+    except Exception:
+        return default
+
+
+def _state_path() -> Optional[str]:
+    """워커 재접속 정보 파일 (설정 모듈을 못 읽으면 None — 재접속 사용 안 함)"""
+    try:
+        from config import DATA_DIR
+        return os.path.join(DATA_DIR, "relay_worker.json")
+    except Exception:
+        return None
+
+
+# ─── 워커 (자식 프로세스) ────────────────────────────
+
+def _setup_worker_logging():
+    """워커 로그 → logs/relay_worker.log (GUI의 app.log와 분리)"""
+    try:
+        from config import LOG_DIR
+        os.makedirs(LOG_DIR, exist_ok=True)
+        logging.basicConfig(
+            filename=os.path.join(LOG_DIR, "relay_worker.log"), level=logging.INFO,
+            format="%(asctime)s %(levelname)s %(name)s: %(message)s", encoding='utf-8')
+    except Exception:
+        logging.basicConfig(level=logging.INFO)
+
+
+class _ServerClient:
+    """워커용 서버 API 클라이언트 — GUI 로그인 세션의 서버 주소/토큰으로 등록·heartbeat 전송"""
+
+    def __init__(self):
+        self.base_url = ""
+        self.token = ""
+
+    def update(self, base_url: str, token: str):
+        self.base_url = base_url
+        self.token = token
+
+    def _post(self, path: str, data: dict) -> dict:
+        import requests
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        r = requests.post(f'{self.base_url}{path}', json=data, headers=headers, timeout=10)
+        r.raise_for_status()
+        return r.json()
+
+
+class _Worker:
+    """워커 프로세스 본체 — 제어 채널 처리 + GUI 재접속 대기"""
+
+    def __init__(self, relay: KVMRelayManager, authkey: bytes):
+        self.relay = relay
+        self.server = _ServerClient()
+        self._authkey = authkey
+        self._conn: Optional[Connection] = None
+        self._incoming: "queue.Queue[Connection]" = queue.Queue()
+        self._send_lock = threading.Lock()    # 요청 스레드들의 응답 전송
+        self._update_lock = threading.Lock()  # 상태를 바꾸는 요청은 한 번에 하나씩
+        self._closing = False
+        self._listener = Listener(('127.0.0.1', 0), authkey=authkey)
+        self._state = _state_path()
+        self._write_state()
+        threading.Thread(target=self._accept_loop, daemon=True, name="RelayWorkerAttach").start()
+
+    def _write_state(self):
+        if not self._state:
+            return
+        host, port = self._listener.address
+        state = {"pid": os.getpid(), "address": f"{host}:{port}", "authkey": self._authkey.hex()}
+        try:
+            os.makedirs(os.path.dirname(self._state), exist_ok=True)
+            fd = os.open(self._state, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+        except OSError as e:
+            logger.warning(f"[RelayWorker] 재접속 정보 저장 실패: {e}")
+            self._state = None
+
+    def _remove_state(self):
+        if not self._state:
+            return
+        try:
+            with open(self._state, 'r', encoding='utf-8') as f:
+                if json.load(f).get("pid") != os.getpid():
+                    return  # 다른 워커가 덮어씀
+            os.remove(self._state)
+        except (OSError, ValueError):
+            pass
+
+    def _accept_loop(self):
+        """재접속 수락 — GUI가 연결돼 있는 동안 들어온 연결은 거절 (중복 GUI)"""
+        while not self._closing:
+            try:
+                conn = self._listener.accept()
+            except Exception:
+                if self._closing:
+                    break
+                continue  # 인증 실패 등
+            if self._conn is not None:
+                conn.close()
+                continue
+            self._incoming.put(conn)
+
+    def run(self, conn: Connection):
+        grace = float(_relay_setting('worker_grace', 300))
+        try:
+            while True:
+                self._conn = conn
+                if self._serve(conn):
+                    break  # 명시적 shutdown
+                self._conn = None
+                conn.close()
+                if grace <= 0:
+                    break
+                logger.warning(f"[RelayWorker] GUI 연결 끊김 — {grace:.0f}초 동안 릴레이 유지, 재접속 대기")
+                try:
+                    conn = self._incoming.get(timeout=grace)
+                except queue.Empty:
+                    logger.info("[RelayWorker] 재접속 없음 — 릴레이 종료")
+                    break
+                logger.info("[RelayWorker] GUI 재접속")
+        finally:
+            self._closing = True
+            self.relay.stop_all()
+            try:
+                self._listener.close()
+            except OSError:
+                pass
+            if self._conn is not None:
+                self._conn.close()
+            self._remove_state()
+
+    def _serve(self, conn: Connection) -> bool:
+        """요청 수신 → 명시적 shutdown이면 True, 채널 끊김이면 False (처리는 요청별 스레드)"""
+        while True:
+            try:
+                req_id, method, args, kwargs = conn.recv()
+            except (EOFError, OSError):
+                return False
+            if method == "shutdown":
+                with self._update_lock:  # 처리 중인 요청이 끝난 뒤 응답
+                    self._reply(conn, req_id, ("ok", None))
+                return True
+            if method not in WORKER_METHODS and method not in WORKER_ONLY:
+                self._reply(conn, req_id, ("error", f"unknown method: {method}"))
+                continue
+            threading.Thread(target=self._handle, args=(conn, req_id, method, args, kwargs),
+                             daemon=True).start()
+
+    def _handle(self, conn: Connection, req_id: int, method: str, args: tuple, kwargs: dict):
+        try:
+            if method in QUERY_METHODS:
+                reply = ("ok", self._invoke(method, args, kwargs))
+            else:
+                with self._update_lock:
+                    reply = ("ok", self._invoke(method, args, kwargs))
+        except Exception as e:
+            logger.error(f"[RelayWorker] {method} 실패: {e}")
+            reply = ("error", f"{type(e).__name__}: {e}")
+        self._reply(conn, req_id, reply)
+
+    def _invoke(self, method: str, args: tuple, kwargs: dict):
+        if method in WORKER_ONLY:
+            return getattr(self, f"_{method}")(*args, **kwargs)
+        attr = getattr(self.relay, method)
+        return attr(*args, **kwargs) if callable(attr) else attr
+
+    def _reply(self, conn: Connection, req_id: int, reply: tuple):
+        try:
+            with self._send_lock:
+                conn.send((req_id, *reply))
+        except (EOFError, OSError):
+            pass  # 채널 끊김은 _serve의 recv에서 처리
+
+    # ── 워커 전용 요청 ──
+
+    def _attach(self) -> int:
+        return os.getpid()
+
+    def _start_heartbeat(self, base_url: str, token: str, interval: int = 60, location: str = ""):
+        self.server.update(base_url, token)  # 이미 실행 중이면 토큰만 갱신
+        self.relay.start_heartbeat(self.server, interval, location)
+
+    def _register_to_server(self, base_url: str, token: str, location: str = ""):
+        self.server.update(base_url, token)
+        # 서버 응답을 기다리지 않음 (제어 채널 응답 지연 방지)
+        threading.Thread(target=push_registration, args=(self.relay, self.server, location),
+                         daemon=True).start()
+
+
+def worker_main() -> int:
+    """워커 진입점 — 부모가 환경 변수로 넘긴 제어 채널에 접속해 요청 처리"""
+    address = os.environ.get(ENV_ADDRESS, "")
+    authkey = os.environ.get(ENV_AUTHKEY, "")
+    if not address or not authkey:
+        print(f"[RelayWorker] {ENV_ADDRESS}/{ENV_AUTHKEY} 없음 — GUI 프로세스가 실행해야 합니다")
+        return 2
+    _setup_worker_logging()
+    host, port = address.rsplit(':', 1)
+    key = bytes.fromhex(authkey)
+    conn = Client((host, int(port)), authkey=key)
+    relay = KVMRelayManager(**conn.recv())
+    worker = _Worker(relay, key)
+    conn.send(("ok", os.getpid()))
+    logger.info(f"[RelayWorker] 시작 (pid={os.getpid()}, engine={relay.engine}, mode={relay.mode})")
+    worker.run(conn)
+    logger.info("[RelayWorker] 종료")
+    return 0
+
+
+# ─── GUI 프로세스 측 프록시 ──────────────────────────
+
+class RelayProcessProxy:
+    """KVMRelayManager API를 워커 프로세스로 전달하는 프록시 (thread-safe)"""
+
+    START_TIMEOUT = 20.0    # 워커 접속 대기 (초)
+    ATTACH_TIMEOUT = 3.0    # 실행 중인 워커 재접속 대기 (초)
+    CALL_TIMEOUT = 15.0     # 요청당 응답 대기 (초) — 초과 시 워커가 멈춘 것으로 보고 재시작
+    RESTART_BACKOFF = 5.0   # 재시작 최소 간격 (초)
+
+    def __init__(self, **options):
+        # KVMRelayManager 생성 인자 (None = 워커에서 설정값 사용)
+        self._options = options
+        self._lock = threading.RLock()  # 워커 수명(실행/재접속/종료) + 복원 — 응답 대기 중에는 잡지 않음
+        self._send_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, list] = {}  # 요청 id → [Event, 응답]
+        self._proc: Optional[subprocess.Popen] = None  # 재접속한 워커면 None (pid만 앎)
+        self._pid: Optional[int] = None
+        self._conn: Optional[Connection] = None
+        self._local: Optional[KVMRelayManager] = None  # 워커 실행 불가 시 대체
+        self._last_start = 0.0
+        self.restarts = 0
+        # 워커 재시작 시 복원할 상태
+        self._relays: Dict[str, Tuple[str, int, str]] = {}  # key: "kvm_ip:port"
+        self._udp_targets: Dict[str, int] = {}
+        self._tailscale_ip: Optional[str] = None
+        self._heartbeat: Optional[tuple] = None  # (서버 주소, 토큰, 주기, 위치) — 워커 재시작 시 복원
+
+    # ── 워커 수명 ──
+
+    @staticmethod
+    def _worker_command() -> list:
+        if getattr(sys, 'frozen', False):
+            return [sys.executable, WORKER_FLAG]
+        return [sys.executable, "-m", "core.relay_process"]
+
+    def _spawn(self) -> bool:
+        """워커 실행 + 제어 채널 접속 (lock 보유 상태에서 호출)"""
+        self._last_start = time.monotonic()
+        authkey = os.urandom(32)
+        srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            srv.bind(('127.0.0.1', 0))
+            srv.listen(1)
+            srv.settimeout(self.START_TIMEOUT)
+            env = dict(os.environ)
+            env[ENV_ADDRESS] = f"127.0.0.1:{srv.getsockname()[1]}"
+            env[ENV_AUTHKEY] = authkey.hex()
+            self._proc = subprocess.Popen(
+                self._worker_command(), env=env,
+                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                creationflags=0x08000000 if sys.platform == 'win32' else 0)
+            sock, _ = srv.accept()
+            sock.settimeout(None)
+            conn = Connection(sock.detach())
+            deliver_challenge(conn, authkey)
+            answer_challenge(conn, authkey)
+            conn.send(self._options)
+            if not conn.poll(self.START_TIMEOUT):
+                raise TimeoutError("워커 초기화 응답 없음")
+            conn.recv()
+            self._attach_conn(conn)
+            self._pid = self._proc.pid
+        except Exception as e:
+            logger.error(f"[Relay] 워커 프로세스 시작 실패: {e}")
+            self._kill()
+            return False
+        finally:
+            srv.close()
+        logger.info(f"[Relay] 워커 프로세스 시작 (pid={self._proc.pid})")
+        self._restore()
+        return True
+
+    def _reattach(self) -> bool:
+        """이전 GUI가 남긴 워커(재접속 대기 중)에 연결 (lock 보유 상태에서 호출)"""
+        path = _state_path()
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            host, port = state["address"].rsplit(':', 1)
+            authkey = bytes.fromhex(state["authkey"])
+        except (OSError, ValueError, KeyError):
+            return False
+        # 주소가 다른 프로그램에 재사용된 경우 핸드셰이크가 멈출 수 있음 → 별도 스레드 + 시간 제한
+        result = {}
+
+        def _connect():
+            try:
+                conn = Client((host, int(port)), authkey=authkey)
+                conn.send((0, "attach", (), {}))
+                if conn.poll(self.ATTACH_TIMEOUT):
+                    result["conn"], result["reply"] = conn, conn.recv()[1:]
+                else:
+                    conn.close()
+            except Exception as e:
+                result["error"] = e
+
+        t = threading.Thread(target=_connect, daemon=True)
+        t.start()
+        t.join(self.ATTACH_TIMEOUT * 2)
+        reply = result.get("reply")
+        if not reply or reply[0] != "ok":
+            if "conn" in result:
+                result["conn"].close()
+            logger.debug(f"[Relay] 워커 재접속 실패: {result.get('error', 'no reply')}")
+            return False
+        self._attach_conn(result["conn"])
+        self._proc = None
+        self._pid = reply[1]
+        self._last_start = time.monotonic()
+        logger.info(f"[Relay] 실행 중인 워커 프로세스에 재접속 (pid={self._pid})")
+        self._restore()
+        return True
+
+    def _restore(self):
+        """새로 띄우거나 재접속한 워커에 이 GUI가 연 릴레이/heartbeat 반영"""
+        try:
+            for kvm_ip, kvm_port, kvm_name in list(self._relays.values()):
+                self._request("start_relay", (kvm_ip, kvm_port, kvm_name), {})
+            for kvm_ip, udp_port in list(self._udp_targets.items()):
+                self._request("set_udp_target_port", (kvm_ip, udp_port), {})
+            if self._heartbeat is not None:
+                self._request("start_heartbeat", self._heartbeat, {})
+        except Exception as e:
+            logger.error(f"[Relay] 워커 릴레이 복원 실패: {e}")
+
+    def _connect(self) -> bool:
+        return self._reattach() or self._spawn()
+
+    def _attach_conn(self, conn: Connection):
+        """제어 채널 사용 시작 — 응답은 수신 스레드가 요청 id별로 전달"""
+        self._conn = conn
+        threading.Thread(target=self._read_replies, args=(conn,), daemon=True,
+                         name="RelayProxyReader").start()
+
+    def _read_replies(self, conn: Connection):
+        reason = "worker channel closed"
+        try:
+            while self._conn is conn:
+                if not conn.poll(0.5):  # 채널 교체/종료 확인 주기
+                    continue
+                req_id, status, value = conn.recv()
+                slot = self._pending.get(req_id)
+                if slot is not None:
+                    slot[1] = (status, value)
+                    slot[0].set()
+        except (EOFError, OSError, TypeError, ValueError) as e:
+            reason = f"worker channel closed: {e}"
+        # 이 채널로 보낸 요청 중 응답 못 받은 것은 모두 실패 처리
+        for slot in list(self._pending.values()):
+            if slot[2] is conn and slot[1] is None:
+                slot[1] = ("closed", reason)
+                slot[0].set()
+
+    def _kill(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+            self._conn = None
+        if self._proc is not None:
+            if self._proc.poll() is None:
+                self._proc.kill()
+                try:
+                    self._proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    pass
+            self._proc = None
+        elif self._pid is not None:
+            # 재접속한 워커 (자식 프로세스 아님)
+            try:
+                os.kill(self._pid, signal.SIGTERM)
+            except OSError:
+                pass
+        self._pid = None
+
+    @property
+    def is_alive(self) -> bool:
+        if self._conn is None:
+            return False
+        return self._proc is None or self._proc.poll() is None
+
+    def _ensure_worker(self) -> bool:
+        if self._local is not None:
+            return False
+        if self.is_alive:
+            return True
+        if self._last_start:
+            if time.monotonic() - self._last_start < self.RESTART_BACKOFF:
+                return False
+            self.restarts += 1
+            logger.warning(f"[Relay] 워커 프로세스 재시작 ({self.restarts}회)")
+            self._kill()
+            return self._connect()
+        if self._connect():
+            return True
+        # 최초 실행 실패 → GUI 프로세스 내에서 릴레이
+        logger.warning("[Relay] 워커 프로세스 사용 불가 — GUI 프로세스 내에서 릴레이 실행")
+        self._local = KVMRelayManager(**self._options)
+        return False
+
+    def _request(self, method: str, args: tuple, kwargs: dict, conn: Optional[Connection] = None) -> Any:
+        """요청 전송 후 응답 대기 (전송만 직렬화 — 응답은 요청 id로 받음)"""
+        conn = conn or self._conn
+        if conn is None:
+            raise EOFError("worker channel closed")
+        req_id = next(self._ids)
+        slot = [threading.Event(), None, conn]
+        self._pending[req_id] = slot
+        try:
+            with self._send_lock:
+                conn.send((req_id, method, args, kwargs))
+            if not slot[0].wait(self.CALL_TIMEOUT):
+                raise TimeoutError(f"워커 응답 없음: {method}")
+        finally:
+            self._pending.pop(req_id, None)
+        status, value = slot[1]
+        if status == "closed":
+            raise EOFError(value)
+        if status != "ok":
+            raise RuntimeError(value)
+        return value
+
+    def _call(self, method: str, *args, **kwargs) -> Any:
+        with self._lock:
+            if not self._ensure_worker():
+                if self._local is None or method in WORKER_ONLY:
+                    raise RuntimeError("릴레이 워커 프로세스 없음")
+                attr = getattr(self._local, method)
+                return attr(*args, **kwargs) if callable(attr) else attr
+            conn = self._conn
+        try:
+            return self._request(method, args, kwargs, conn)
+        except (EOFError, OSError, TimeoutError) as e:
+            logger.error(f"[Relay] 워커 통신 실패 ({method}): {e}")
+            with self._lock:
+                if self._conn is conn:  # 다른 스레드가 이미 재시작했으면 새 워커는 유지
+                    self._kill()
+            raise RuntimeError(f"relay worker unavailable: {e}") from e
+
+    def _call_or(self, default, method: str, *args, **kwargs):
+        """조회용 — 워커 장애 시 기본값 (UI/디버그 서버가 예외로 멈추지 않도록)"""
+        try:
+            return self._call(method, *args, **kwargs)
+        except RuntimeError as e:
+            logger.debug(f"[Relay] {method} 실패: {e}")
+            return default
+
+    def close(self):
+        """워커 프로세스 종료 (명시적 shutdown — 릴레이/heartbeat 정지)"""
+        with self._lock:
+            if self.is_alive:
+                try:
+                    self._request("shutdown", (), {})
+                    if self._proc is not None:
+                        self._proc.wait(timeout=5)
+                    self._pid = None  # 스스로 종료함
+                except Exception:
+                    pass
+            self._kill()
+
+    # ── KVMRelayManager API ──
+
+    def start_relay(self, kvm_ip: str, kvm_port: int = 80, kvm_name: str = "") -> Optional[int]:
+        port = self._call_or(None, "start_relay", kvm_ip, kvm_port, kvm_name)
+        if port:
+            self._relays[f"{kvm_ip}:{kvm_port}"] = (kvm_ip, kvm_port, kvm_name)
+        return port
+
+    def stop_relay(self, kvm_ip: str, kvm_port: int = 80):
+        self._relays.pop(f"{kvm_ip}:{kvm_port}", None)
+        self._call_or(None, "stop_relay", kvm_ip, kvm_port)
+
+    def stop_all(self):
+        self._heartbeat = None
+        self._relays.clear()
+        self._udp_targets.clear()
+        if self._local is not None:
+            self._local.stop_all()
+        else:
+            self.close()
+
+    def get_tailscale_ip(self) -> Optional[str]:
+        if not self._tailscale_ip:
+            self._tailscale_ip = self._call_or(None, "get_tailscale_ip")
+        return self._tailscale_ip
+
+    def get_udp_port(self, kvm_ip: str) -> Optional[int]:
+        return self._call_or(None, "get_udp_port", kvm_ip)
+
+    def set_udp_target_port(self, kvm_ip: str, kvm_udp_port: int):
+        self._udp_targets[kvm_ip] = kvm_udp_port
+        self._call_or(None, "set_udp_target_port", kvm_ip, kvm_udp_port)
+
+    def get_relay_route(self, kvm_ip: str, kvm_port: int = 80) -> str:
+        return self._call_or("", "get_relay_route", kvm_ip, kvm_port)
+
+    @property
+    def engine(self) -> Optional[str]:
+        return self._call_or(None, "engine")
+
+    @property
+    def mode(self) -> Optional[str]:
+        return self._call_or(None, "mode")
+
+    @property
+    def mux_port(self) -> Optional[int]:
+        return self._call_or(None, "mux_port")
+
+    def get_relay_info(self) -> list:
+        return self._call_or([], "get_relay_info")
+
+    def get_relay_metrics(self) -> list:
+        return self._call_or([], "get_relay_metrics")
+
+    def get_metrics_report(self) -> dict:
+        return self._call_or({"relays": [], "error": "relay worker unavailable"}, "get_metrics_report")
+
+    def get_status(self) -> dict:
+        status = self._call_or({"relays": [], "error": "relay worker unavailable"}, "get_status")
+        status["process"] = {
+            "isolated": self._local is None,
+            "pid": self._pid,
+            "reattached": self._local is None and self._proc is None and self._pid is not None,
+            "alive": self.is_alive,
+            "restarts": self.restarts,
+        }
+        return status
+
+    def registration_payload(self, location: str = "") -> Optional[dict]:
+        return self._call_or(None, "registration_payload", location)
+
+    def registration_result(self, version: int, result: Optional[dict]):
+        self._call_or(None, "registration_result", version, result)
+
+    def heartbeat_payload(self) -> Optional[dict]:
+        return self._call_or(None, "heartbeat_payload")
+
+    def heartbeat_result(self, result: Optional[dict]) -> bool:
+        return bool(self._call_or(False, "heartbeat_result", result))
+
+    @staticmethod
+    def _server_auth(api_client) -> Tuple[str, str]:
+        """워커에 넘길 서버 주소/토큰 (GUI 로그인 세션)"""
+        return api_client._base_url, api_client._token
+
+    def register_to_server(self, api_client, location: str = ""):
+        """서버 등록 — 워커가 직접 전송 (GUI 프로세스 내 대체 실행이면 여기서 전송)"""
+        self._call_or(None, "register_to_server", *self._server_auth(api_client), location)
+        if self._local is not None:
+            self._local.register_to_server(api_client, location)
+
+    def start_heartbeat(self, api_client, interval: int = 60, location: str = ""):
+        """주기적 heartbeat 시작 — 워커 스레드가 전송하므로 GUI가 멈추거나 재시작돼도 계속"""
+        self._heartbeat = (*self._server_auth(api_client), interval, location)
+        self._call_or(None, "start_heartbeat", *self._heartbeat)
+        if self._local is not None:
+            self._local.start_heartbeat(api_client, interval, location)
+
+
+def create_relay_manager():
+    """설정(relay.process)에 따라 워커 프로세스 프록시 또는 GUI 프로세스 내 KVMRelayManager"""
+    use_process = True
+    try:
+        from config import settings
+        use_process = bool(settings.get('relay.process', True))
+    except Exception:
+        pass
+    if use_process:
+        return RelayProcessProxy()
+    return KVMRelayManager()
+
+
+if __name__ == '__main__':
+    sys.exit(worker_main())
@@ -0,0 +1,274 @@
+"""
+KVM Relay 트래픽 셰이핑 — 입력(제어) 트래픽 우선
+
+Tailscale 링크가 혼잡하면 키보드/마우스 이벤트가 영상 뒤에 줄을 서서 입력이 늦어짐.
+
+- classify(): 연결 첫 요청으로 분류
+    control — WebSocket 업그레이드 (HID 입력/시그널링), /_wellcomland/
+    media   — 그 외 (MJPEG/HTTP 스트림, 웹 UI 자산, API 응답 등 대량 전송)
+- tune_socket(): control은 저지연(TCP_NODELAY + IP_TOS lowdelay),
+  media는 송신 버퍼 상한(MEDIA_SNDBUF)으로 커널 송신 큐를 짧게 유지
+- TokenBucket / RelayLimiter: KVM별 + 사이트(관제 PC 전체) 대역폭 상한.
+  media 하향(KVM → 원격 뷰어) 트래픽에만 적용 → 상한 아래로 남는 대역을 control이 사용.
+  TCP는 지연(읽기 일시 중지), UDP/MJPEG 프레임은 초과분을 버림.
+  상한 0 = 무제한 (분류/소켓 튜닝만 적용)
+- PrioritySendQueue: 스레드 엔진의 방향별(상향/하향) 송신 대기열 — KVM 1대의 모든 연결이 공유.
+  control 송신이 있으면 media 송신은 양보하고, 동시에 전송 중인 media 바이트는 상한으로 제한
+- enable_keepalive(): TCP keepalive 탐지 — half-open 연결(Tailscale 경로 끊김)을 커널이 감지
+"""
+
+import socket
+import threading
+import time
+from typing import Dict, Optional
+
+CLASS_CONTROL = "control"
+CLASS_MEDIA = "media"
+
+MEDIA_SNDBUF = 256 * 1024   # media 연결 송신 버퍼 상한 (bytes)
+MEDIA_QUEUE_BYTES = 512 * 1024  # 방향별 동시 전송 media 바이트 상한
+MEDIA_YIELD = 0.02          # media 송신이 control에 양보하는 최대 시간 (초, 기아 방지)
+_TOS_LOWDELAY = 0x10
+_TOS_THROUGHPUT = 0x08
+
+
+def classify(first_data: bytes) -> str:
+    """연결 첫 데이터(HTTP 요청 헤더)로 트래픽 종류 판별"""
+    head = first_data.split(b'\r\n\r\n', 1)[0].lower()
+    if b'\r\nupgrade: websocket' in head or b'/_wellcomland/' in head:
+        return CLASS_CONTROL
+    return CLASS_MEDIA
+
+
+def tune_socket(sock: socket.socket, traffic_class: str):
+    """트래픽 종류별 소켓 옵션 (지원하지 않는 플랫폼에서는 무시)"""
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError:
+        pass
+    if traffic_class == CLASS_CONTROL:
+        tos = _TOS_LOWDELAY
+    else:
+        tos = _TOS_THROUGHPUT
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, MEDIA_SNDBUF)
+        except OSError:
+            pass
+    if hasattr(socket, 'IP_TOS'):
+        try:
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_TOS, tos)
+        except OSError:
+            pass
+
+
+def enable_keepalive(sock: socket.socket, idle: int = 30, interval: int = 10, count: int = 3):
+    """TCP keepalive — idle초 무응답 후 interval초 간격 count회 탐지 실패 시 연결 끊김으로 처리
+
+    Linux는 TCP_USER_TIMEOUT도 설정 → 미확인 송신 데이터가 있는 half-open 연결도 같은 시간에 정리.
+    """
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, count)
+        elif hasattr(socket, 'SIO_KEEPALIVE_VALS'):
+            sock.ioctl(socket.SIO_KEEPALIVE_VALS, (1, idle * 1000, interval * 1000))
+        elif hasattr(socket, 'TCP_KEEPALIVE'):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle)
+        if hasattr(socket, 'TCP_USER_TIMEOUT'):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT,
+                            (idle + interval * count) * 1000)
+    except (OSError, ValueError):
+        pass
+
+
+class TokenBucket:
+    """바이트 토큰 버킷 (thread-safe) — rate 0이면 무제한"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self._lock = threading.Lock()
+        self.rate = 0.0
+        self.burst = 0.0
+        self._tokens = 0.0
+        self._last = time.monotonic()
+        self.set_rate(rate, burst)
+
+    def set_rate(self, rate: float, burst: Optional[float] = None):
+        """rate: bytes/s, burst: 기본 0.25초 분량 (최소 64KB)"""
+        with self._lock:
+            self.rate = max(float(rate), 0.0)
+            self.burst = float(burst) if burst else max(self.rate * 0.25, 65536.0)
+            self._tokens = min(self._tokens, self.burst) if self._tokens else self.burst
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def consume(self, n: int) -> float:
+        """n 바이트 사용 (부채 허용) → 다음 전송까지 기다릴 시간(초)"""
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= n
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def allow(self, n: int) -> bool:
+        """토큰이 충분할 때만 n 바이트 사용 (부족하면 버릴 것)"""
+        if not self.rate:
+            return True
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < n:
+                return False
+            self._tokens -= n
+            return True
+
+    def refund(self, n: int):
+        """allow로 쓴 토큰 되돌림 (다른 버킷이 거절해 실제로 보내지 않은 경우)"""
+        if not self.rate:
+            return
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + n)
+
+
+class PrioritySendQueue:
+    """한 방향 송신 대기열 (스레드 엔진, KVM 1대의 연결들이 공유)
+
+    송신 스레드가 곧 대기열 항목 — enter()에서 차례를 기다리고 leave()로 자리를 반납.
+    - control: 기다리지 않음. 전송 중인 동안 media 송신은 대기
+    - media: control 전송이 없고 전송 중 media 바이트가 상한 이하일 때 진행
+      (최대 MEDIA_YIELD초 기다린 뒤에는 진행 — media 기아 방지)
+    """
+
+    def __init__(self, limit: int = MEDIA_QUEUE_BYTES, max_yield: float = MEDIA_YIELD):
+        self.limit = limit
+        self.max_yield = max_yield
+        self._cond = threading.Condition()
+        self._control = 0       # 전송 중 control 청크 수
+        self._media_bytes = 0   # 전송 중 media 바이트
+        self.yields = 0         # media 송신이 기다린 횟수
+        self.yield_seconds = 0.0
+
+    def enter(self, n: int, traffic_class: str):
+        with self._cond:
+            if traffic_class == CLASS_CONTROL:
+                self._control += 1
+                return
+            if self._control or (self._media_bytes and self._media_bytes + n > self.limit):
+                self.yields += 1
+                start = time.monotonic()
+                deadline = start + self.max_yield
+                while self._control or (self._media_bytes and self._media_bytes + n > self.limit):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                self.yield_seconds += time.monotonic() - start
+            self._media_bytes += n
+
+    def leave(self, n: int, traffic_class: str):
+        with self._cond:
+            if traffic_class == CLASS_CONTROL:
+                self._control -= 1
+            else:
+                self._media_bytes -= n
+            self._cond.notify_all()
+
+    def send(self, sock: socket.socket, data: bytes, traffic_class: str):
+        """차례를 기다려 sock.sendall(data)"""
+        n = len(data)
+        self.enter(n, traffic_class)
+        try:
+            sock.sendall(data)
+        finally:
+            self.leave(n, traffic_class)
+
+    def to_dict(self) -> dict:
+        return {"media_yields": self.yields, "media_yield_seconds": round(self.yield_seconds, 3)}
+
+
+class RelayLimiter:
+    """KVM 1대의 media 하향 상한 (KVM 버킷 + 사이트 공용 버킷)"""
+
+    __slots__ = ('kvm', 'site', 'delayed_seconds', 'dropped_bytes', 'dropped_units')
+
+    def __init__(self, kvm: TokenBucket, site: TokenBucket):
+        self.kvm = kvm
+        self.site = site
+        self.delayed_seconds = 0.0  # TCP 읽기 일시 중지 누적 시간
+        self.dropped_bytes = 0      # UDP/MJPEG 프레임 폐기
+        self.dropped_units = 0
+
+    @property
+    def active(self) -> bool:
+        return bool(self.kvm.rate or self.site.rate)
+
+    def consume(self, n: int) -> float:
+        delay = max(self.kvm.consume(n), self.site.consume(n))
+        if delay:
+            self.delayed_seconds += delay
+        return delay
+
+    def allow(self, n: int) -> bool:
+        if self.kvm.allow(n):
+            if self.site.allow(n):
+                return True
+            self.kvm.refund(n)  # 사이트 버킷이 거절 → KVM 버킷 토큰은 쓰지 않은 것으로
+        self.dropped_bytes += n
+        self.dropped_units += 1
+        return False
+
+    def to_dict(self) -> dict:
+        return {
+            "kvm_mbps": round(self.kvm.rate * 8 / 1e6, 2),
+            "site_mbps": round(self.site.rate * 8 / 1e6, 2),
+            "delayed_seconds": round(self.delayed_seconds, 2),
+            "dropped_bytes": self.dropped_bytes,
+            "dropped_units": self.dropped_units,
+        }
+
+
+class TrafficShaper:
+    """관제 PC 전체 셰이핑 설정 — KVM별 RelayLimiter 발급"""
+
+    def __init__(self, kvm_mbps: float = 0.0, site_mbps: float = 0.0):
+        self.kvm_mbps = kvm_mbps
+        self.site = TokenBucket(self._bytes_per_sec(site_mbps))
+        self._limiters: Dict[str, RelayLimiter] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bytes_per_sec(mbps: float) -> float:
+        return max(float(mbps or 0), 0.0) * 1e6 / 8
+
+    def limiter(self, kvm_ip: str) -> RelayLimiter:
+        """KVM별 limiter (TCP 프록시와 UDP 릴레이가 공유)"""
+        with self._lock:
+            lim = self._limiters.get(kvm_ip)
+            if lim is None:
+                lim = RelayLimiter(TokenBucket(self._bytes_per_sec(self.kvm_mbps)), self.site)
+                self._limiters[kvm_ip] = lim
+            return lim
+
+    def set_limits(self, kvm_mbps: Optional[float] = None, site_mbps: Optional[float] = None):
+        """실행 중 상한 변경"""
+        if site_mbps is not None:
+            self.site.set_rate(self._bytes_per_sec(site_mbps))
+        if kvm_mbps is not None:
+            self.kvm_mbps = kvm_mbps
+            with self._lock:
+                for lim in self._limiters.values():
+                    lim.kvm.set_rate(self._bytes_per_sec(kvm_mbps))
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {
+            "kvm_mbps": self.kvm_mbps,
+            "site_mbps": round(self.site.rate * 8 / 1e6, 2),
+            "kvms": {ip: lim.to_dict() for ip, lim in limiters.items()},
+        }
@@ -0,0 +1,254 @@
+"""
+장치별 SSH 트랜스포트 풀
+
+KVM 1대당 인증된 paramiko Transport 1개를 유지하고, 명령/SFTP마다 그 위에 채널을 새로 연다.
+- 채널은 동시에 여러 개 열 수 있음 → 상태 조회, dmesg, UI 명령, 파일 전송이 서로 기다리지 않음
+- SSH 레벨 keepalive (config.SSH_KEEPALIVE_INTERVAL) 로 NAT/방화벽 유휴 끊김 방지 + 끊김 감지
+- 트랜스포트가 끊겼으면 다음 요청에서 다시 연결 (호출자는 재연결을 신경 쓰지 않음)
+- 같은 (ip, port, username)을 쓰는 장치들이 세션 1개를 공유 → acquire/release 보유 수로
+  마지막 장치가 반납할 때만 트랜스포트 종료
+- 카운터는 RelayCounters와 같이 락 없이 += (통계 용도)
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import paramiko
+
+
+def _keepalive_interval() -> int:
+    try:
+        from config import SSH_KEEPALIVE_INTERVAL
+        return int(SSH_KEEPALIVE_INTERVAL)
+    except Exception:
+        return 30
+
+
+class SSHSession:
+    """장치 1대의 공유 SSH 트랜스포트"""
+
+    def __init__(self, ip: str, port: int = 22, username: str = "root", password: str = "luckfox"):
+        self.ip = ip
+        self.port = port
+        self.username = username
+        self.password = password
+        self._client: Optional[paramiko.SSHClient] = None
+        self._lock = threading.Lock()  # 연결 생성/교체만 보호 (채널 사용 중에는 잡지 않음)
+        self.holders = 0  # acquire한 장치 수 (SSHTransportPool 락으로 보호)
+
+        self.connects = 0
+        self.reconnects = 0
+        self.connect_errors = 0
+        self.channels_opened = 0
+        self.active_channels = 0
+        self.exec_count = 0
+        self.exec_errors = 0
+        self.sftp_opened = 0
+        self.last_connect_ms = 0.0
+        self.connected_at = 0.0
+
+    # ── 트랜스포트 ──
+
+    def is_active(self) -> bool:
+        client = self._client
+        transport = client.get_transport() if client else None
+        return transport is not None and transport.is_active()
+
+    def transport(self, timeout: float = 10) -> paramiko.Transport:
+        """살아 있는 트랜스포트 (없으면 연결 — 실패 시 예외)"""
+        client = self._client
+        transport = client.get_transport() if client else None
+        if transport is not None and transport.is_active():
+            return transport
+        with self._lock:
+            client = self._client
+            transport = client.get_transport() if client else None
+            if transport is not None and transport.is_active():
+                return transport  # 다른 스레드가 먼저 연결함
+            if client is not None:
+                self.reconnects += 1
+                self._close_client()
+            started = time.perf_counter()
+            client = paramiko.SSHClient()
+            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            try:
+                client.connect(self.ip, port=self.port, username=self.username,
+                               password=self.password, timeout=timeout)
+            except Exception:
+                self.connect_errors += 1
+                client.close()
+                raise
+            transport = client.get_transport()
+            transport.set_keepalive(_keepalive_interval())
+            self._client = client
+            self.connects += 1
+            self.last_connect_ms = (time.perf_counter() - started) * 1000.0
+            self.connected_at = time.time()
+            return transport
+
+    def connect(self, timeout: float = 10):
+        self.transport(timeout)
+
+    def _close_client(self):
+        client, self._client = self._client, None
+        if client is not None:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+    def invalidate(self):
+        """트랜스포트 폐기 (다음 요청에서 재연결)"""
+        with self._lock:
+            self._close_client()
+
+    close = invalidate
+
+    # ── 채널 ──
+
+    def _drop_if_dead(self, transport: paramiko.Transport):
+        """채널 열기 실패 후 — 트랜스포트가 죽었으면 폐기, 살아 있으면 (채널 수 제한 등) 다른 채널을 위해 유지"""
+        if transport.is_active():
+            return False
+        with self._lock:
+            client = self._client
+            if client is not None and client.get_transport() is transport:
+                self._close_client()  # 그 사이 다른 스레드가 재연결했으면 새 트랜스포트는 유지
+        return True
+
+    def open_channel(self, timeout: float = 10) -> paramiko.Channel:
+        """새 세션 채널 — 트랜스포트가 죽어 있으면 1회 재연결 후 재시도"""
+        for attempt in range(2):
+            transport = self.transport(timeout)
+            try:
+                channel = transport.open_session(timeout=timeout)
+                self.channels_opened += 1
+                return channel
+            except (paramiko.SSHException, EOFError, OSError):
+                if not self._drop_if_dead(transport) or attempt:
+                    raise
+
+    def exec(self, cmd: str, timeout: float = 10) -> Tuple[str, str]:
+        """명령 실행 → (stdout, stderr) (strip된 문자열). 연결/실행 실패 시 예외"""
+        channel = self.open_channel(timeout)
+        self.active_channels += 1
+        self.exec_count += 1
+        try:
+            channel.settimeout(timeout)
+            channel.exec_command(cmd)
+            stdout = channel.makefile('rb').read()
+            stderr = channel.makefile_stderr('rb').read()
+            return stdout.decode(errors='replace').strip(), stderr.decode(errors='replace').strip()
+        except Exception:
+            self.exec_errors += 1
+            raise
+        finally:
+            self.active_channels -= 1
+            channel.close()
+
+    def open_sftp(self, timeout: float = 10) -> paramiko.SFTPClient:
+        """같은 트랜스포트 위의 SFTP 채널 (사용 후 close)"""
+        for attempt in range(2):
+            transport = self.transport(timeout)
+            try:
+                sftp = paramiko.SFTPClient.from_transport(transport)
+                self.channels_opened += 1
+                self.sftp_opened += 1
+                return sftp
+            except (paramiko.SSHException, EOFError, OSError):
+                if not self._drop_if_dead(transport) or attempt:
+                    raise
+
+    def stats(self) -> dict:
+        active = self.is_active()
+        return {
+            "ip": self.ip,
+            "port": self.port,
+            "active": active,
+            "holders": self.holders,
+            "connected_for": round(time.time() - self.connected_at, 1) if active else 0,
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "connect_errors": self.connect_errors,
+            "last_connect_ms": round(self.last_connect_ms, 1),
+            "channels_opened": self.channels_opened,
+            "active_channels": self.active_channels,
+            "exec_count": self.exec_count,
+            "exec_errors": self.exec_errors,
+            "sftp_opened": self.sftp_opened,
+        }
+
+
+class SSHTransportPool:
+    """(ip, port, username) → SSHSession"""
+
+    def __init__(self):
+        self._sessions: Dict[Tuple[str, int, str], SSHSession] = {}
+        self._lock = threading.Lock()
+
+    def get(self, ip: str, port: int = 22, username: str = "root",
+            password: str = "luckfox") -> SSHSession:
+        """장치 세션 (연결은 첫 사용 시)"""
+        with self._lock:
+            return self._get_locked(ip, port, username, password)
+
+    def _get_locked(self, ip: str, port: int, username: str, password: str) -> SSHSession:
+        key = (ip, int(port), username)
+        session = self._sessions.get(key)
+        if session is None:
+            session = SSHSession(ip, int(port), username, password)
+            self._sessions[key] = session
+        elif session.password != password:
+            session.password = password
+            session.invalidate()  # 비밀번호 변경 → 다음 요청에서 재인증
+        return session
+
+    def acquire(self, ip: str, port: int = 22, username: str = "root",
+                password: str = "luckfox") -> SSHSession:
+        """get + 보유 수 증가 (장치 연결용, 끝나면 release)"""
+        with self._lock:
+            session = self._get_locked(ip, port, username, password)
+            session.holders += 1
+            return session
+
+    def release(self, session: SSHSession):
+        """acquire 반납 — 다른 장치가 보유 중이거나 사용 중인 채널이 있으면 트랜스포트 유지"""
+        with self._lock:
+            session.holders = max(session.holders - 1, 0)
+            if session.holders or session.active_channels:
+                return
+            key = (session.ip, session.port, session.username)
+            if self._sessions.get(key) is session:
+                del self._sessions[key]
+        session.close()
+
+    def close(self, ip: str, port: int = 22, username: str = "root"):
+        with self._lock:
+            session = self._sessions.pop((ip, int(port), username), None)
+        if session is not None:
+            session.close()
+
+    def close_all(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def stats(self) -> dict:
+        """풀 메트릭 (mcp_debug /api/ssh)"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+        items = [s.stats() for s in sessions]
+        return {
+            "sessions": len(items),
+            "active": sum(1 for s in items if s["active"]),
+            "active_channels": sum(s["active_channels"] for s in items),
+            "connects": sum(s["connects"] for s in items),
+            "reconnects": sum(s["reconnects"] for s in items),
+            "devices": items,
+        }
+
+
+ssh_pool = SSHTransportPool()
@@ -0,0 +1,191 @@
+"""
+KVM 상태 조회 스케줄러 (KVMManager 모니터링 루프용)
+
+장치마다 "다음 조회 시각"을 따로 관리 → 매 주기 전체 장치를 조회하지 않음.
+- 화면에 보이는 장치 / 상태가 자주 바뀌는(flapping) 장치: fast 간격
+- 온라인 + 변화 없음: base 간격에서 시작해 online_max 까지 2배씩 늘림
+- 오프라인 유지: fast 간격에서 시작해 offline_max 까지 지수 백오프
+- LiveView 중인 장치: 가장 느리게 (liveview_interval — 이미 실시간 연결로 상태를 알 수 있음)
+- 상태 전환 / 의미 있는 필드 변경: 즉시 fast 간격으로 복귀
+- 모든 간격에 ±jitter 비율 무작위 → 조회가 한 시점에 몰리지 않음
+- pop_due로 꺼낸 장치는 probe_lease초 안에 record가 없으면 (조회 스레드 멈춤/취소) 다시 조회 대상
+→ SSH 부하가 장치 수가 아니라 상태 변화량에 비례
+"""
+
+import heapq
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+MAX_BACKOFF_STEPS = 16  # 지수 백오프 지수 상한 (오래 유지된 장치의 2**streak 오버플로 방지)
+
+
+def _monitor_setting(key: str, default):
+    try:
+        from config import settings
+        return settings.get(f'monitor.{key}', default)
+    except Exception:
+        return default
+
+
+class _Entry:
+    __slots__ = ('name', 'due', 'interval', 'online', 'streak', 'transitions', 'probes', 'in_flight')
+
+    def __init__(self, name: str, due: float):
+        self.name = name
+        self.due = due
+        self.in_flight = False  # pop_due 후 record 전 (due = 임대 만료 시각)
+        self.interval = 0.0
+        self.online: Optional[bool] = None
+        self.streak = 0  # 같은 상태 + 변화 없음 연속 횟수
+        self.transitions: deque = deque(maxlen=8)  # 상태 전환 시각
+        self.probes = 0
+
+
+class StatusScheduler:
+    """장치별 조회 시각 관리 (스레드 안전)"""
+
+    def __init__(self, fast_interval: Optional[float] = None):
+        self.fast = float(fast_interval or _monitor_setting('fast_interval', 5))
+        self.base = float(_monitor_setting('base_interval', 30))
+        self.online_max = float(_monitor_setting('online_max', 120))
+        self.offline_max = float(_monitor_setting('offline_max', 600))
+        self.liveview_interval = float(_monitor_setting('liveview_interval', 300))
+        self.jitter = float(_monitor_setting('jitter', 0.2))
+        self.flap_window = float(_monitor_setting('flap_window', 300))
+        self.flap_count = int(_monitor_setting('flap_count', 3))
+        self.probe_lease = float(_monitor_setting('probe_lease', 120))
+        self._entries: Dict[str, _Entry] = {}
+        self._heap: list = []  # (due, name) — 항목 due와 다르면 오래된 값 (지연 삭제)
+        self._visible: frozenset = frozenset()
+        self._liveview: frozenset = frozenset()
+        self._lock = threading.Lock()
+        self.probes = 0
+
+    # ── 장치 목록 / 관심도 ──
+
+    def sync(self, names: Iterable[str]):
+        """장치 추가/삭제 반영 (새 장치는 시작 시각을 흩어서 바로 조회)"""
+        now = time.monotonic()
+        names = set(names)
+        with self._lock:
+            for name in list(self._entries):
+                if name not in names:
+                    del self._entries[name]
+            for name in names - set(self._entries):
+                self._schedule(_Entry(name, 0.0), now + random.uniform(0, self.fast))
+
+    def set_visible(self, names: Iterable[str]):
+        """화면에 표시 중인 장치 — fast 간격 (새로 보이게 된 장치는 곧바로 조회)"""
+        names = frozenset(names)
+        with self._lock:
+            added = names - self._visible
+            self._visible = names
+            now = time.monotonic()
+            for name in added:
+                entry = self._entries.get(name)
+                if entry is not None and not entry.in_flight and now + self.fast < entry.due:
+                    self._schedule(entry, now + random.uniform(0, self.fast * self.jitter))
+
+    def set_liveview(self, names: Iterable[str]):
+        with self._lock:
+            self._liveview = frozenset(names)
+
+    def touch(self, name: str):
+        """다음 루프에서 바로 조회 (사용자 조작 등)"""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and not entry.in_flight:
+                self._schedule(entry, time.monotonic())
+
+    # ── 스케줄 ──
+
+    def _schedule(self, entry: _Entry, due: float):
+        entry.due = due
+        self._entries[entry.name] = entry
+        heapq.heappush(self._heap, (due, entry.name))
+
+    def pop_due(self, now: Optional[float] = None) -> List[str]:
+        """조회 시각이 된 장치 이름
+
+        반환된 장치는 record 전까지 다시 나오지 않음 — 단 probe_lease초가 지나도 record가 없으면
+        조회가 유실된 것으로 보고 다시 반환 (예외/취소로 record가 빠져도 장치가 영구히 빠지지 않음)
+        """
+        now = time.monotonic() if now is None else now
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                when, name = heapq.heappop(self._heap)
+                entry = self._entries.get(name)
+                if entry is None or entry.due != when:
+                    continue
+                entry.in_flight = True
+                self._schedule(entry, now + self.probe_lease)
+                due.append(name)
+        return due
+
+    def next_wait(self, now: Optional[float] = None) -> float:
+        """다음 조회까지 남은 시간 (초)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            while self._heap:
+                when, name = self._heap[0]
+                entry = self._entries.get(name)
+                if entry is not None and entry.due == when:
+                    return max(0.0, when - now)
+                heapq.heappop(self._heap)
+        return self.fast
+
+    def record(self, name: str, online: bool, changed: bool = False):
+        """조회 결과 반영 → 다음 조회 시각 계산
+
+        changed: 상태 외에 의미 있는 필드(USB, 버전 등)가 바뀌었는지
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return
+            entry.in_flight = False
+            entry.probes += 1
+            self.probes += 1
+            if entry.online is not None and entry.online != online:
+                entry.transitions.append(now)
+                entry.streak = 0
+            elif changed:
+                entry.streak = 0
+            else:
+                entry.streak += 1
+            entry.online = online
+            entry.interval = self._interval(entry, now)
+            spread = entry.interval * self.jitter
+            self._schedule(entry, now + entry.interval + random.uniform(-spread, spread))
+
+    def _interval(self, entry: _Entry, now: float) -> float:
+        if entry.name in self._liveview:
+            return self.liveview_interval
+        flapping = sum(1 for t in entry.transitions if now - t <= self.flap_window) >= self.flap_count
+        if flapping or entry.name in self._visible or entry.streak == 0:
+            return self.fast
+        steps = min(entry.streak, MAX_BACKOFF_STEPS)
+        if entry.online:
+            return min(self.online_max, self.base * 2 ** (steps - 1))
+        return min(self.offline_max, self.fast * 2 ** steps)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            entries = list(self._entries.values())
+            visible, liveview = len(self._visible), len(self._liveview)
+        flapping = sum(1 for e in entries
+                       if sum(1 for t in e.transitions if now - t <= self.flap_window) >= self.flap_count)
+        return {
+            "devices": len(entries),
+            "visible": visible,
+            "liveview": liveview,
+            "flapping": flapping,
+            "probes": self.probes,
+            "mean_interval": round(sum(e.interval for e in entries) / len(entries), 1) if entries else 0,
+        }
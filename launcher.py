@@ -307,11 +307,27 @@ def load_and_run_app():
     main_module.main()
 
 
+def run_relay_worker():
+    """KVM 릴레이 워커 프로세스 실행 (GUI 프로세스가 '--relay-worker'로 실행)
+
+    관리자 권한/업데이트/GUI 초기화 없이 app/core/relay_process.py만 로드.
+    """
+    app_path = str(APP_DIR)
+    if app_path not in sys.path:
+        sys.path.insert(0, app_path)
+    os.environ.setdefault('WELLCOMLAND_BASE_DIR', str(INSTALL_DIR))
+    from core.relay_process import worker_main
+    sys.exit(worker_main())
+
+
 # ───────────────────────────────────────────
 # 메인
 # ───────────────────────────────────────────
 def main():
     """런처 메인"""
+    if '--relay-worker' in sys.argv:
+        run_relay_worker()
+        return
     setup_logging()
     logger = logging.getLogger('Launcher')
     logger.info(f"WellcomLAND Launcher v{LAUNCHER_VERSION}")
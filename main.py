@@ -388,10 +388,12 @@ def main():
     window.show()
 
     # KVM 릴레이 시작 (로컬 KVM을 Tailscale로 중계 + 서버 등록)
+    _kvm_relay = None
     try:
-        from core.kvm_relay import KVMRelayManager
+        from core.relay_process import create_relay_manager
         from api_client import api_client
-        _kvm_relay = KVMRelayManager()
+        # 릴레이 워커 프로세스 (relay.process=False면 GUI 프로세스 내 실행)
+        _kvm_relay = create_relay_manager()
 
         def _start_kvm_relay():
             """로그인 후 백그라운드에서 KVM 릴레이 시작"""
@@ -414,7 +416,7 @@ def main():
 
             # 로컬 KVM 장치에 대해 TCP 프록시 시작 (Tailscale 릴레이 IP는 제외)
             manager = window.manager if hasattr(window, 'manager') else None
-            relay_devices = []
+            relayed = 0
             if manager:
                 devices = manager.get_all_devices()
                 for dev in devices:
@@ -429,21 +431,15 @@ def main():
 
                     relay_port = _kvm_relay.start_relay(kvm_ip, kvm_port, dev.name)
                     if relay_port:
+                        relayed += 1
                         udp_port = _kvm_relay.get_udp_port(kvm_ip)
-                        relay_devices.append({
-                            "kvm_local_ip": kvm_ip,
-                            "kvm_port": kvm_port,
-                            "kvm_name": dev.name,
-                            "relay_port": relay_port,
-                            "udp_relay_port": udp_port,
-                        })
                         udp_info = f" UDP:{udp_port}" if udp_port else ""
                         print(f"[Relay] {dev.name} ({kvm_ip}:{kvm_port}) → TCP:{relay_port}{udp_info}")
 
             # 관제 PC 판별: 릴레이할 로컬 KVM이 1개 이상이면 관제 PC
-            is_control_pc = len(relay_devices) > 0
+            is_control_pc = relayed > 0
             if is_control_pc:
-                print(f"[Relay] 관제 PC 모드 — {len(relay_devices)}개 로컬 KVM 릴레이 중")
+                print(f"[Relay] 관제 PC 모드 — {relayed}개 로컬 KVM 릴레이 중")
                 try:
                     if lan_ip and not lan_ip.startswith('100.'):
                         from core.network_fixer import auto_setup_tailscale_forwarding
@@ -451,14 +447,11 @@ def main():
                 except Exception as e:
                     print(f"[Relay] Tailscale 서브넷 라우팅 설정 실패 (무시): {e}")
 
-                # 서버에 릴레이 KVM 등록
-                try:
-                    api_client.register_kvm_devices(relay_devices, ts_ip)
-                    print(f"[Relay] 서버에 {len(relay_devices)}개 KVM 등록 완료")
-                except Exception as e:
-                    print(f"[Relay] 서버 등록 실패: {e}")
+                # 서버에 릴레이 KVM 등록 (최초 전체 목록, 이후 heartbeat 주기마다 변경분만)
+                _kvm_relay.register_to_server(api_client)
+                print(f"[Relay] 서버에 {relayed}개 KVM 등록 요청")
 
-                # heartbeat 시작
+                # heartbeat 시작 (KVM별 상태/트래픽 포함)
                 _kvm_relay.start_heartbeat(api_client, interval=120)
             else:
                 print(f"[Relay] 클라이언트 PC 모드 — 로컬 KVM 없음, 서브넷 라우팅 생략")
@@ -474,12 +467,22 @@ def main():
     try:
         from mcp_debug import start_server, install_log_capture
         install_log_capture()
-        start_server(window, port=5111)
+        start_server(window, port=5111, relay_manager=_kvm_relay)
         print(f"[Debug] 원격 디버그 서버 시작: http://0.0.0.0:5111/")
     except Exception as e:
         print(f"[Debug] 디버그 서버 시작 실패 (무시): {e}")
 
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    if _kvm_relay is not None and hasattr(_kvm_relay, 'close'):
+        _kvm_relay.close()  # 릴레이 워커 프로세스 종료
+    try:
+        from core.hid_pool import hid_pool
+        from core.ssh_pool import ssh_pool
+        hid_pool.close_all()  # 유휴 대기 중인 HID SSH 연결 종료
+        ssh_pool.close_all()  # 장치별 공유 SSH 트랜스포트 종료
+    except Exception:
+        pass
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
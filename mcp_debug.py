@@ -10,6 +10,8 @@ WellcomLAND 원격 디버그 서버 (내장 HTTP)
   3. curl http://<IP>:5111/api/logs?n=200
   4. curl http://<IP>:5111/api/devices
   5. curl http://<IP>:5111/api/status
+  6. curl http://<IP>:5111/api/hid          (HID 큐/지연 p50/p95/p99, ?reset=1 로 초기화)
+  7. curl http://<IP>:5111/api/ssh          (장치별 SSH 트랜스포트 풀: 재연결/채널 수)
 """
 
 import sys
@@ -25,6 +27,7 @@ from urllib.parse import urlparse, parse_qs
 
 # ─── 전역 상태 ───────────────────────────────────────
 _main_window = None
+_relay_manager = None  # KVMRelayManager 또는 RelayProcessProxy (main.py에서 등록)
 _log_buffer = collections.deque(maxlen=2000)  # 최근 2000줄 로그
 _server_thread = None
 _start_time = time.time()
@@ -119,7 +122,7 @@ def _get_devices():
             "status": d.status.name if hasattr(d.status, 'name') else str(d.status),
             "group": getattr(d.info, 'group', 'default') or 'default',
             "is_relay": d.ip.startswith('100.'),
-            "kvm_local_ip": getattr(d.info, '_kvm_local_ip', None),
+            "kvm_local_ip": d.info._kvm_local_ip or None,
         } for d in devices]
     return _run_on_main_thread(_get) or []
 
@@ -265,34 +268,51 @@ def _get_gpu_info():
     return info
 
 
+def set_relay_manager(relay_manager):
+    """KVM 릴레이 관리자 등록 (/api/relay, /api/relay/metrics 용)"""
+    global _relay_manager
+    _relay_manager = relay_manager
+
+
 def _get_relay_info():
-    """릴레이 상태"""
-    def _get():
-        result = {"relays": []}
-        try:
-            from main import _kvm_relay
-            if _kvm_relay:
-                for name, proxy in getattr(_kvm_relay, '_tcp_proxies', {}).items():
-                    result["relays"].append({
-                        "name": name,
-                        "type": "TCP",
-                        "listen_port": getattr(proxy, '_listen_port', None),
-                        "target": f"{getattr(proxy, '_target_host', '?')}:{getattr(proxy, '_target_port', '?')}",
-                        "running": getattr(proxy, '_running', None),
-                    })
-                for name, relay in getattr(_kvm_relay, '_udp_relays', {}).items():
-                    result["relays"].append({
-                        "name": name,
-                        "type": "UDP",
-                        "listen_port": getattr(relay, '_listen_port', None),
-                        "running": getattr(relay, '_running', None),
-                    })
-                result["heartbeat_running"] = getattr(_kvm_relay, '_running', None)
-        except Exception as e:
-            result["error"] = str(e)
-        return result
+    """릴레이 상태 (릴레이 스레드/워커 프로세스 데이터만 읽으므로 Qt 메인 스레드 불필요)"""
+    relay = _relay_manager
+    if relay is None or not hasattr(relay, 'get_status'):
+        return {"relays": []}
+    try:
+        return relay.get_status()
+    except Exception as e:
+        return {"relays": [], "error": str(e)}
+
+
+def _get_relay_metrics():
+    """KVM별 릴레이 트래픽/지연 메트릭 (1분/15분 이동 평균, 하향 트래픽 큰 순)"""
+    relay = _relay_manager
+    if relay is None or not hasattr(relay, 'get_metrics_report'):
+        return {"relays": []}
+    try:
+        return relay.get_metrics_report()
+    except Exception as e:
+        return {"relays": [], "error": str(e)}
+
 
-    return _run_on_main_thread(_get) or {"relays": []}
+def _get_hid_stats(reset=False):
+    """HID 컨트롤러별 큐 깊이/coalescing + 장치별 지연 히스토그램 (워커 스레드 카운터만 읽음)"""
+    try:
+        from core.hid_controller import get_hid_report
+        from core.hid_pool import hid_pool
+        return {"controllers": get_hid_report(reset), "pool": hid_pool.stats()}
+    except Exception as e:
+        return {"controllers": [], "error": str(e)}
+
+
+def _get_ssh_pool_stats():
+    """장치별 공유 SSH 트랜스포트 상태 (연결/재연결/동시 채널/명령 수)"""
+    try:
+        from core.ssh_pool import ssh_pool
+        return ssh_pool.stats()
+    except Exception as e:
+        return {"devices": [], "error": str(e)}
 
 
 def _get_network_info():
@@ -445,9 +465,19 @@ class DebugHandler(BaseHTTPRequestHandler):
             elif path == '/api/relay':
                 self._send_json(_get_relay_info())
 
+            elif path == '/api/relay/metrics':
+                self._send_json(_get_relay_metrics())
+
             elif path == '/api/network':
                 self._send_json(_get_network_info())
 
+            elif path == '/api/ssh':
+                self._send_json(_get_ssh_pool_stats())
+
+            elif path == '/api/hid':
+                reset = params.get('reset', ['0'])[0] in ('1', 'true')
+                self._send_json(_get_hid_stats(reset))
+
             elif path == '/api/logs':
                 n = int(params.get('n', ['200'])[0])
                 logs = list(_log_buffer)
@@ -633,13 +663,17 @@ class DebugHandler(BaseHTTPRequestHandler):
                     "threads": _get_threads(),
                     "gpu": _get_gpu_info(),
                     "relay": _get_relay_info(),
+                    "relay_metrics": _get_relay_metrics(),
+                    "hid": _get_hid_stats(),
+                    "ssh": _get_ssh_pool_stats(),
                     "network": _get_network_info(),
                 })
 
             else:
                 self._send_json({"error": "not found", "endpoints": [
                     "/", "/api/status", "/api/devices", "/api/threads",
-                    "/api/thumbnails", "/api/gpu", "/api/relay", "/api/network",
+                    "/api/thumbnails", "/api/gpu", "/api/relay", "/api/relay/metrics",
+                    "/api/network", "/api/hid", "/api/ssh",
                     "/api/logs?n=200", "/api/logs/file?f=app.log&n=200",
                     "/api/logs/fault", "/api/all",
                     "/api/js?code=...", "/api/webrtc_diag",
@@ -675,6 +709,7 @@ pre {{ background: #0f3460; padding: 10px; border-radius: 5px; overflow-x: auto;
 <div class="endpoint"><a href="/api/thumbnails">/api/thumbnails</a> — 썸네일 WebView 상태</div>
 <div class="endpoint"><a href="/api/gpu">/api/gpu</a> — GPU 설정/크래시 정보</div>
 <div class="endpoint"><a href="/api/relay">/api/relay</a> — 릴레이 프록시 상태</div>
+<div class="endpoint"><a href="/api/relay/metrics">/api/relay/metrics</a> — KVM별 릴레이 트래픽/지연 (1분/15분 속도)</div>
 <div class="endpoint"><a href="/api/network">/api/network</a> — 네트워크 정보</div>
 <div class="endpoint"><a href="/api/logs?n=200">/api/logs?n=200</a> — 최근 로그 (메모리 버퍼)</div>
 <div class="endpoint"><a href="/api/logs/file?f=app.log&n=200">/api/logs/file</a> — 로그 파일 직접 읽기</div>
@@ -705,15 +740,18 @@ setInterval(refresh, 5000);
 
 # ─── 서버 시작 ──────────────────────────────────────
 
-def start_server(main_window, port=5111):
+def start_server(main_window, port=5111, relay_manager=None):
     """디버그 HTTP 서버를 별도 스레드에서 시작
 
     Args:
         main_window: MainWindow 인스턴스
         port: HTTP 포트 (기본 5111)
+        relay_manager: KVMRelayManager 인스턴스 (없으면 릴레이 정보 비어 있음)
     """
     global _main_window, _server_thread
     _main_window = main_window
+    if relay_manager is not None:
+        set_relay_manager(relay_manager)
 
     def _run():
         try:
@@ -0,0 +1,157 @@
+"""
+WellcomLAND 헤드리스 릴레이 서비스 — Qt 없이 KVM 발견 + 릴레이 + 서버 등록 + heartbeat
+
+상시 켜 둔 소형 Linux 박스 한 대가 사이트 전체 KVM을 중계할 때 사용.
+GUI(main.py)와 같은 core/kvm_relay.py, core/discovery.NetworkScanner, api_client를 사용하며
+PyQt6/paramiko는 import하지 않음 (core 패키지 지연 로드).
+
+사용법:
+  python3 relay_service.py --username admin --password ****   (최초 1회 — 토큰은 data/settings.json에 저장)
+  python3 relay_service.py                                     (저장된 토큰 사용)
+  python3 relay_service.py --kvm 192.168.68.100 --kvm 192.168.68.101:8080 --no-scan
+  환경 변수 WELLCOMLAND_USERNAME / WELLCOMLAND_PASSWORD 도 사용 가능 (systemd EnvironmentFile)
+
+릴레이 엔진/모드/셰이핑 등은 GUI와 같은 settings.json 'relay' 항목을 따름.
+
+systemd 예:
+  [Service]
+  ExecStart=/usr/bin/python3 /opt/wellcomland/relay_service.py
+  Restart=always
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api_client import api_client  # noqa: E402
+from core.discovery import NetworkScanner  # noqa: E402
+from core.kvm_relay import KVMRelayManager  # noqa: E402
+
+logger = logging.getLogger("relay_service")
+
+
+def _parse_kvm(spec: str):
+    """'ip' 또는 'ip:port' → (ip, port)"""
+    ip, _, port = spec.partition(':')
+    return ip, int(port or 80)
+
+
+def _login(args) -> bool:
+    """저장된 토큰 확인 → 실패 시 계정으로 로그인"""
+    if api_client.verify_token():
+        return True
+    username = args.username or os.environ.get('WELLCOMLAND_USERNAME', '')
+    password = args.password or os.environ.get('WELLCOMLAND_PASSWORD', '')
+    if not username or not password:
+        logger.error("[Service] 저장된 토큰 없음 — --username/--password 필요")
+        return False
+    try:
+        api_client.login(username, password)
+        return True
+    except Exception as e:
+        logger.error(f"[Service] 로그인 실패: {e}")
+        return False
+
+
+class RelayService:
+    """KVM 발견 → 릴레이 시작 → 서버 등록 주기 실행"""
+
+    def __init__(self, args):
+        self.args = args
+        self.relay = KVMRelayManager()
+        self._stop = threading.Event()
+        self._static = [_parse_kvm(spec) for spec in args.kvm]
+
+    def stop(self):
+        self._stop.set()
+
+    def _wait_tailscale(self) -> str:
+        """Tailscale IP 대기 (부팅 직후 tailscaled가 늦게 올라오는 경우)"""
+        while not self._stop.is_set():
+            ts_ip = self.relay.get_tailscale_ip()
+            if ts_ip:
+                return ts_ip
+            logger.warning("[Service] Tailscale IP 없음 — 10초 후 재시도")
+            self._stop.wait(10)
+        return ""
+
+    def _discover(self) -> list:
+        """정적 KVM 목록 + 네트워크 스캔 결과 → [(ip, port, name)]"""
+        found = [(ip, port, "") for ip, port in self._static]
+        if self.args.no_scan:
+            return found
+        local_ip = NetworkScanner.get_local_ip()
+        ip_range = NetworkScanner.get_network_range(local_ip, self.args.prefix)
+        ports = [int(p) for p in self.args.ports.split(',')] if self.args.ports else None
+        for dev in NetworkScanner.scan_network(ip_range, ports):
+            if dev.ip == local_ip or dev.ip.startswith('100.'):
+                continue  # 자기 자신 / 다른 사이트 릴레이(Tailscale)
+            found.append((dev.ip, dev.port, dev.name))
+        return found
+
+    def _sync_once(self) -> int:
+        """새로 발견된 KVM 릴레이 시작 → 추가된 수"""
+        added = 0
+        active = {f"{r['kvm_local_ip']}:{r['kvm_port']}" for r in self.relay.get_relay_info()}
+        for kvm_ip, kvm_port, name in self._discover():
+            if f"{kvm_ip}:{kvm_port}" in active:
+                continue
+            relay_port = self.relay.start_relay(kvm_ip, kvm_port, name)
+            if relay_port:
+                added += 1
+                udp_port = self.relay.get_udp_port(kvm_ip)
+                logger.info(f"[Service] {name or kvm_ip} ({kvm_ip}:{kvm_port}) → TCP:{relay_port} UDP:{udp_port}")
+        return added
+
+    def run(self) -> int:
+        ts_ip = self._wait_tailscale()
+        if not ts_ip:
+            return 0
+        logger.info(f"[Service] Tailscale IP: {ts_ip}")
+        heartbeat_started = False
+        while not self._stop.is_set():
+            try:
+                if self._sync_once():
+                    self.relay.register_to_server(api_client, self.args.location)
+                    logger.info(f"[Service] {len(self.relay.get_relay_info())}개 KVM 릴레이 등록")
+                if not heartbeat_started and self.relay.get_relay_info():
+                    self.relay.start_heartbeat(api_client, interval=self.args.heartbeat)
+                    heartbeat_started = True
+            except Exception as e:
+                logger.error(f"[Service] 동기화 오류: {e}")
+            self._stop.wait(self.args.rescan)
+        self.relay.stop_all()
+        logger.info("[Service] 종료")
+        return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="WellcomLAND 헤드리스 KVM 릴레이 서비스")
+    parser.add_argument('--username', default='', help="서버 계정 (토큰 저장 후에는 생략)")
+    parser.add_argument('--password', default='')
+    parser.add_argument('--kvm', action='append', default=[], help="고정 KVM 주소 ip[:port] (반복 가능)")
+    parser.add_argument('--no-scan', action='store_true', help="네트워크 스캔 없이 --kvm 목록만 릴레이")
+    parser.add_argument('--ports', default='', help="스캔 포트 (쉼표 구분, 기본 80,8080,443)")
+    parser.add_argument('--prefix', type=int, default=24, help="스캔 범위 프리픽스 (로컬 IP 기준)")
+    parser.add_argument('--rescan', type=float, default=600, help="재스캔 주기 (초)")
+    parser.add_argument('--heartbeat', type=int, default=120, help="heartbeat 주기 (초)")
+    parser.add_argument('--location', default='', help="서버에 표시할 위치 이름")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if not _login(args):
+        return 1
+
+    service = RelayService(args)
+    signal.signal(signal.SIGTERM, lambda *_: service.stop())
+    signal.signal(signal.SIGINT, lambda *_: service.stop())
+    return service.run()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
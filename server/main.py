@@ -771,12 +771,13 @@ def init_kvm_registry():
                     kvm_name VARCHAR(100) DEFAULT '',
                     relay_ip VARCHAR(45) NOT NULL COMMENT '관제PC의 Tailscale IP',
                     relay_port INT NOT NULL COMMENT '관제PC의 TCP 프록시 포트',
+                    relay_route VARCHAR(64) NOT NULL DEFAULT '' COMMENT '멀티플렉스 릴레이 라우트 (전용 포트면 빈 값)',
                     udp_relay_port INT DEFAULT NULL COMMENT 'WebRTC UDP 릴레이 포트',
                     owner_username VARCHAR(50) NOT NULL COMMENT '등록한 관제PC 사용자',
                     location VARCHAR(100) DEFAULT '' COMMENT '관제 위치명',
                     last_seen DATETIME DEFAULT CURRENT_TIMESTAMP,
                     is_online BOOLEAN DEFAULT TRUE,
-                    UNIQUE KEY uq_relay (relay_ip, relay_port)
+                    UNIQUE KEY uq_relay (relay_ip, relay_port, relay_route)
                 )
             """)
             # udp_relay_port 컬럼 추가 (기존 테이블 호환)
@@ -788,66 +789,197 @@ def init_kvm_registry():
                 print("[Init] kvm_registry: udp_relay_port 컬럼 추가")
             except Exception:
                 pass  # 이미 존재
+            # relay_route 컬럼 추가 + 유니크 키 확장 (멀티플렉스 릴레이: 포트 1개에 KVM 여러 대)
+            try:
+                cur.execute("""
+                    ALTER TABLE kvm_registry ADD COLUMN relay_route VARCHAR(64) NOT NULL DEFAULT ''
+                    COMMENT '멀티플렉스 릴레이 라우트 (전용 포트면 빈 값)' AFTER relay_port
+                """)
+                cur.execute("""
+                    ALTER TABLE kvm_registry DROP INDEX uq_relay,
+                    ADD UNIQUE KEY uq_relay (relay_ip, relay_port, relay_route)
+                """)
+                print("[Init] kvm_registry: relay_route 컬럼 추가")
+            except Exception:
+                pass  # 이미 존재
+            # heartbeat 통계 컬럼 추가 (릴레이가 KVM별 상태/트래픽을 heartbeat에 포함)
+            try:
+                cur.execute("""
+                    ALTER TABLE kvm_registry
+                    ADD COLUMN health VARCHAR(16) NOT NULL DEFAULT '' COMMENT 'ok / degraded / down',
+                    ADD COLUMN active_sessions INT NOT NULL DEFAULT 0 COMMENT 'TCP 연결 + UDP 세션',
+                    ADD COLUMN down_bps BIGINT NOT NULL DEFAULT 0 COMMENT 'KVM→뷰어 1분 평균 bytes/s',
+                    ADD COLUMN up_bps BIGINT NOT NULL DEFAULT 0 COMMENT '뷰어→KVM 1분 평균 bytes/s',
+                    ADD COLUMN connect_ms FLOAT DEFAULT NULL COMMENT '최근 KVM 연결 지연'
+                """)
+                print("[Init] kvm_registry: heartbeat 통계 컬럼 추가")
+            except Exception:
+                pass  # 이미 존재
+            # 릴레이(관제 PC)별 등록 버전 — 증분 등록의 기준
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS kvm_relay_state (
+                    relay_ip VARCHAR(45) NOT NULL,
+                    owner_username VARCHAR(50) NOT NULL,
+                    version INT NOT NULL DEFAULT 0,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (relay_ip, owner_username)
+                )
+            """)
             print("[Init] kvm_registry 테이블 확인 완료")
 
 
+def _kvm_rows(devices: list, relay_ip: str, owner: str, location: str, mux_port) -> list:
+    """등록 요청 장치 목록 → kvm_registry INSERT 값 튜플 (필수값 없는 항목 제외)"""
+    rows = []
+    for dev in devices:
+        kvm_local_ip = dev.get("kvm_local_ip", "")
+        relay_port = dev.get("relay_port", 0) or mux_port or 0
+        if not kvm_local_ip or not relay_port:
+            continue
+        rows.append((
+            kvm_local_ip,
+            dev.get("kvm_port", 80),
+            dev.get("kvm_name") or f"KVM-{kvm_local_ip.split('.')[-1]}",
+            relay_ip,
+            relay_port,
+            dev.get("relay_route") or "",
+            dev.get("udp_relay_port"),
+            owner,
+            location,
+        ))
+    return rows
+
+
+def _bulk_upsert_kvms(cur, rows: list) -> int:
+    """kvm_registry UPSERT — 장치 수와 무관하게 INSERT 1회"""
+    if not rows:
+        return 0
+    placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), TRUE)"] * len(rows))
+    cur.execute(f"""
+        INSERT INTO kvm_registry
+            (kvm_local_ip, kvm_port, kvm_name, relay_ip, relay_port, relay_route,
+             udp_relay_port, owner_username, location, last_seen, is_online)
+        VALUES {placeholders}
+        ON DUPLICATE KEY UPDATE
+            kvm_local_ip = VALUES(kvm_local_ip),
+            kvm_port = VALUES(kvm_port),
+            kvm_name = VALUES(kvm_name),
+            udp_relay_port = VALUES(udp_relay_port),
+            owner_username = VALUES(owner_username),
+            location = VALUES(location),
+            last_seen = NOW(),
+            is_online = TRUE
+    """, [v for row in rows for v in row])
+    return len(rows)
+
+
+def _delete_superseded_kvms(cur, rows: list) -> int:
+    """같은 KVM(kvm_local_ip, kvm_port)이 다른 (relay_port, relay_route)로 남아 있는 이전 행 삭제
+
+    전용 포트 ↔ 멀티플렉스 전환이나 포트 재할당으로 릴레이 키가 바뀌면 UPSERT가 새 행을 만들고
+    이전 행은 그대로 남아 목록에 같은 KVM이 두 번 나옴.
+    """
+    if not rows:
+        return 0
+    relay_ip, owner = rows[0][3], rows[0][7]
+    conds = " OR ".join(
+        ["(kvm_local_ip = %s AND kvm_port = %s AND NOT (relay_port = %s AND relay_route = %s))"] * len(rows))
+    return cur.execute(f"""
+        DELETE FROM kvm_registry
+        WHERE relay_ip = %s AND owner_username = %s AND ({conds})
+    """, [relay_ip, owner] + [v for row in rows for v in (row[0], row[1], row[4], row[5])])
+
+
+def _relay_version(cur, relay_ip: str, owner: str) -> int:
+    cur.execute("""
+        SELECT version FROM kvm_relay_state WHERE relay_ip = %s AND owner_username = %s
+    """, (relay_ip, owner))
+    row = cur.fetchone()
+    return row["version"] if row else 0
+
+
 @app.post("/api/kvm/register")
 def register_kvm(data: dict, user: dict = Depends(get_current_user)):
     """관제 PC가 발견한 KVM 장치를 서버에 등록
 
+    전체 등록 (최초/재동기화, 구버전 클라이언트):
     Body: {
         "devices": [
             {
                 "kvm_local_ip": "192.168.68.100",
                 "kvm_port": 80,
                 "kvm_name": "KVM-100",
-                "relay_port": 18100
+                "relay_port": 18100,
+                "relay_route": ""
             }
         ],
         "relay_ip": "100.64.0.2",
-        "location": "본사 관제실"
+        "location": "본사 관제실",
+        "mux_port": 18000,         (선택: 멀티플렉스 릴레이 — relay_route로 KVM 구분)
+        "full": true,              (선택: 목록에 없는 이 릴레이의 KVM 삭제)
+        "version": 1               (선택: 릴레이 등록 버전)
     }
+
+    증분 등록: {"relay_ip", "location", "mux_port", "version": 5, "base_version": 4,
+               "upsert": [추가/변경 장치], "remove": [{"relay_port", "relay_route"}]}
+    서버 버전이 base_version과 다르면 아무것도 적용하지 않고 {"status": "resync"} 응답
+    → 릴레이가 전체 목록을 다시 보냄.
     """
-    devices = data.get("devices", [])
     relay_ip = data.get("relay_ip", "").strip() or data.get("relay_zt_ip", "").strip()
     location = data.get("location", "")
+    mux_port = data.get("mux_port")
+    version = data.get("version")
+    delta = "upsert" in data or "remove" in data
+    devices = data.get("upsert", []) if delta else data.get("devices", [])
 
-    if not relay_ip or not devices:
+    if not relay_ip or (not delta and not devices):
         raise HTTPException(status_code=400, detail="relay_ip와 devices 필수")
 
-    registered = 0
+    owner = user["username"]
+    rows = _kvm_rows(devices, relay_ip, owner, location, mux_port)
+    removed = 0
     with get_db() as conn:
-        with conn.cursor() as cur:
-            for dev in devices:
-                kvm_local_ip = dev.get("kvm_local_ip", "")
-                kvm_port = dev.get("kvm_port", 80)
-                kvm_name = dev.get("kvm_name", f"KVM-{kvm_local_ip.split('.')[-1]}")
-                relay_port = dev.get("relay_port", 0)
-                udp_relay_port = dev.get("udp_relay_port")
-
-                if not kvm_local_ip or not relay_port:
-                    continue
-
-                # UPSERT: 이미 있으면 업데이트
-                cur.execute("""
-                    INSERT INTO kvm_registry
-                        (kvm_local_ip, kvm_port, kvm_name, relay_ip, relay_port,
-                         udp_relay_port, owner_username, location, last_seen, is_online)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW(), TRUE)
-                    ON DUPLICATE KEY UPDATE
-                        kvm_local_ip = VALUES(kvm_local_ip),
-                        kvm_port = VALUES(kvm_port),
-                        kvm_name = VALUES(kvm_name),
-                        udp_relay_port = VALUES(udp_relay_port),
-                        owner_username = VALUES(owner_username),
-                        location = VALUES(location),
-                        last_seen = NOW(),
-                        is_online = TRUE
-                """, (kvm_local_ip, kvm_port, kvm_name, relay_ip, relay_port,
-                      udp_relay_port, user["username"], location))
-                registered += 1
-
-    return {"status": "ok", "registered": registered}
+        conn.begin()
+        try:
+            with conn.cursor() as cur:
+                if delta:
+                    current = _relay_version(cur, relay_ip, owner)
+                    if current != data.get("base_version"):
+                        conn.rollback()
+                        return {"status": "resync", "version": current}
+                registered = _bulk_upsert_kvms(cur, rows)
+                removed += _delete_superseded_kvms(cur, rows)
+
+                if delta and data.get("remove"):
+                    keys = [(r.get("relay_port", 0) or mux_port or 0, r.get("relay_route") or "")
+                            for r in data["remove"]]
+                    removed += cur.execute(f"""
+                        DELETE FROM kvm_registry
+                        WHERE relay_ip = %s AND owner_username = %s
+                          AND (relay_port, relay_route) IN ({", ".join(["(%s, %s)"] * len(keys))})
+                    """, [relay_ip, owner] + [v for k in keys for v in k])
+                elif data.get("full"):
+                    keys = [(row[4], row[5]) for row in rows]
+                    keep = ""
+                    if keys:
+                        keep = f"AND (relay_port, relay_route) NOT IN ({', '.join(['(%s, %s)'] * len(keys))})"
+                    removed += cur.execute(f"""
+                        DELETE FROM kvm_registry
+                        WHERE relay_ip = %s AND owner_username = %s {keep}
+                    """, [relay_ip, owner] + [v for k in keys for v in k])
+
+                if version is not None:
+                    cur.execute("""
+                        INSERT INTO kvm_relay_state (relay_ip, owner_username, version, updated_at)
+                        VALUES (%s, %s, %s, NOW())
+                        ON DUPLICATE KEY UPDATE version = VALUES(version), updated_at = NOW()
+                    """, (relay_ip, owner, version))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    return {"status": "ok", "registered": registered, "removed": removed, "version": version}
 
 
 @app.get("/api/kvm/list")
@@ -874,19 +1006,30 @@ def list_kvm_devices(user: dict = Depends(get_current_user)):
 
     result = []
     for r in rows:
+        relay_ip = r.get("relay_ip", r.get("relay_zt_ip", ""))
+        relay_route = r.get("relay_route") or ""
+        access_url = f"http://{relay_ip}:{r['relay_port']}"
+        if relay_route:
+            access_url += f"/kvm/{relay_route}/"
         result.append({
             "id": r["id"],
             "kvm_name": r["kvm_name"],
             "kvm_local_ip": r["kvm_local_ip"],
             "kvm_port": r["kvm_port"],
-            "relay_ip": r.get("relay_ip", r.get("relay_zt_ip", "")),
+            "relay_ip": relay_ip,
             "relay_port": r["relay_port"],
+            "relay_route": relay_route,
             "udp_relay_port": r.get("udp_relay_port"),
-            "access_url": f"http://{r.get('relay_ip', r.get('relay_zt_ip', ''))}:{r['relay_port']}",
+            "access_url": access_url,
             "owner": r["owner_username"],
             "location": r["location"],
             "is_online": bool(r["is_online"]),
             "last_seen": str(r["last_seen"]) if r["last_seen"] else None,
+            "health": r.get("health") or "",
+            "active_sessions": r.get("active_sessions") or 0,
+            "down_bps": r.get("down_bps") or 0,
+            "up_bps": r.get("up_bps") or 0,
+            "connect_ms": r.get("connect_ms"),
         })
 
     return {"devices": result}
@@ -894,22 +1037,54 @@ def list_kvm_devices(user: dict = Depends(get_current_user)):
 
 @app.post("/api/kvm/heartbeat")
 def kvm_heartbeat(data: dict, user: dict = Depends(get_current_user)):
-    """관제 PC가 주기적으로 온라인 상태 갱신
+    """관제 PC가 주기적으로 온라인 상태 + KVM별 상태/트래픽 갱신
 
-    Body: {"relay_ip": "100.64.0.2"}
+    Body: {
+        "relay_ip": "100.64.0.2",
+        "version": 5,                (선택: 릴레이 등록 버전 — 서버와 다르면 resync 응답)
+        "kvms": [                    (선택: KVM별 1분 통계)
+            {"p": 18100, "r": "", "h": "ok", "a": 2, "dn": 1250000, "up": 3000, "ms": 1.2}
+        ]
+    }
+    p: relay_port, r: relay_route, h: ok/degraded/down, a: 활성 연결+세션,
+    dn/up: bytes/s, ms: 최근 KVM 연결 지연
     """
     relay_ip = data.get("relay_ip", "").strip() or data.get("relay_zt_ip", "").strip()
     if not relay_ip:
         raise HTTPException(status_code=400, detail="relay_ip 필수")
 
+    owner = user["username"]
+    kvms = [k for k in data.get("kvms", []) if k.get("p")]
     with get_db() as conn:
         with conn.cursor() as cur:
             cur.execute("""
                 UPDATE kvm_registry SET last_seen = NOW(), is_online = TRUE
                 WHERE relay_ip = %s AND owner_username = %s
-            """, (relay_ip, user["username"]))
-
-    return {"status": "ok"}
+            """, (relay_ip, owner))
+            if kvms:
+                # KVM 수와 무관하게 UPDATE 1회 (통계 행을 파생 테이블로 JOIN)
+                stats = " UNION ALL ".join(
+                    ["SELECT %s AS relay_port, %s AS relay_route, %s AS health, %s AS active_sessions, "
+                     "%s AS down_bps, %s AS up_bps, %s AS connect_ms"] * len(kvms))
+                params = [v for k in kvms for v in (
+                    k["p"], k.get("r") or "", str(k.get("h") or "")[:16], int(k.get("a") or 0),
+                    int(k.get("dn") or 0), int(k.get("up") or 0), k.get("ms"))]
+                cur.execute(f"""
+                    UPDATE kvm_registry k
+                    JOIN ({stats}) s ON k.relay_port = s.relay_port AND k.relay_route = s.relay_route
+                    SET k.health = s.health, k.active_sessions = s.active_sessions,
+                        k.down_bps = s.down_bps, k.up_bps = s.up_bps, k.connect_ms = s.connect_ms,
+                        k.is_online = (s.health <> 'down')
+                    WHERE k.relay_ip = %s AND k.owner_username = %s
+                """, params + [relay_ip, owner])
+            version = data.get("version")
+            current = _relay_version(cur, relay_ip, owner) if version is not None else None
+
+    result = {"status": "ok"}
+    if version is not None:
+        result["version"] = current
+        result["resync"] = current != version
+    return result
 
 
 @app.delete("/api/kvm/{kvm_id}")
@@ -0,0 +1,151 @@
+"""DeviceRegistry — 필드 감시자 인덱스 갱신, 스냅샷 불변, 이름 변경/분리/병합 추가"""
+
+import pytest
+
+pytest.importorskip("paramiko")
+pytest.importorskip("requests")
+
+from core.device_registry import DeviceRegistry  # noqa: E402
+from core.kvm_device import DeviceStatus, KVMDevice, KVMInfo  # noqa: E402
+
+
+def _device(name, ip, group="default"):
+    return KVMDevice(KVMInfo(name=name, ip=ip, group=group))
+
+
+def _names(index, key):
+    return set(index.get(key, {}))
+
+
+@pytest.fixture
+def registry():
+    registry = DeviceRegistry()
+    registry.replace([
+        _device("kvm-1", "10.0.0.1", "floor1"),
+        _device("kvm-2", "10.0.0.2", "floor1"),
+        _device("kvm-3", "10.0.0.1", "floor2"),
+    ])
+    return registry
+
+
+def test_replace_builds_indexes(registry):
+    snap = registry.snapshot()
+    assert set(snap.by_name) == {"kvm-1", "kvm-2", "kvm-3"}
+    assert _names(snap.by_ip, "10.0.0.1") == {"kvm-1", "kvm-3"}
+    assert _names(snap.by_group, "floor1") == {"kvm-1", "kvm-2"}
+    assert _names(snap.by_status, DeviceStatus.UNKNOWN) == {"kvm-1", "kvm-2", "kvm-3"}
+
+
+def test_watcher_moves_ip_group_status(registry):
+    device = registry.get("kvm-1")
+    device.info.ip = "100.64.0.9"
+    device.info.group = "floor2"
+    device.status = DeviceStatus.ONLINE
+
+    snap = registry.snapshot()
+    assert _names(snap.by_ip, "10.0.0.1") == {"kvm-3"}
+    assert _names(snap.by_ip, "100.64.0.9") == {"kvm-1"}
+    assert _names(snap.by_group, "floor1") == {"kvm-2"}
+    assert _names(snap.by_group, "floor2") == {"kvm-1", "kvm-3"}
+    assert _names(snap.by_status, DeviceStatus.UNKNOWN) == {"kvm-2", "kvm-3"}
+    assert _names(snap.by_status, DeviceStatus.ONLINE) == {"kvm-1"}
+    assert registry.first_by_ip("100.64.0.9") is device
+    assert registry.with_status(DeviceStatus.ONLINE) == [device]
+
+    # 마지막 장치가 빠진 키는 인덱스에서 사라짐
+    registry.get("kvm-2").info.group = "floor2"
+    assert "floor1" not in registry.snapshot().by_group
+
+
+def test_old_snapshot_is_unchanged(registry):
+    before = registry.snapshot()
+    registry.get("kvm-2").status = DeviceStatus.OFFLINE
+    registry.get("kvm-2").info.ip = "10.0.0.7"
+    after = registry.snapshot()
+
+    assert after.version == before.version + 2
+    assert _names(before.by_status, DeviceStatus.UNKNOWN) == {"kvm-1", "kvm-2", "kvm-3"}
+    assert DeviceStatus.OFFLINE not in before.by_status
+    assert _names(before.by_ip, "10.0.0.2") == {"kvm-2"}
+    assert "10.0.0.7" not in before.by_ip
+    # 바뀌지 않은 인덱스는 이전 스냅샷과 공유
+    assert after.by_group is before.by_group
+    assert after.by_name is before.by_name
+
+
+def test_same_value_does_not_publish(registry):
+    version = registry.snapshot().version
+    device = registry.get("kvm-1")
+    device.info.ip = "10.0.0.1"
+    device.status = DeviceStatus.UNKNOWN
+    assert registry.snapshot().version == version
+
+
+def test_rename_reattaches_watcher(registry):
+    device = registry.get("kvm-1")
+    assert registry.rename("kvm-1", "kvm-1a")
+    assert not registry.rename("kvm-2", "kvm-3")
+    assert device.name == "kvm-1a"
+
+    device.status = DeviceStatus.ONLINE
+    device.info.group = "floor3"
+    snap = registry.snapshot()
+    assert set(snap.by_name) == {"kvm-1a", "kvm-2", "kvm-3"}
+    assert _names(snap.by_status, DeviceStatus.ONLINE) == {"kvm-1a"}
+    assert _names(snap.by_group, "floor3") == {"kvm-1a"}
+    assert _names(snap.by_group, "floor1") == {"kvm-2"}
+    assert _names(snap.by_ip, "10.0.0.1") == {"kvm-1a", "kvm-3"}
+
+
+def test_detached_devices_are_ignored(registry):
+    removed = registry.remove("kvm-2")
+    replaced = registry.get("kvm-3")
+    registry.add(_device("kvm-3", "10.0.0.3", "floor2"))  # 같은 이름 교체 → 이전 장치 분리
+    version = registry.snapshot().version
+
+    removed.status = DeviceStatus.ONLINE
+    removed.info.ip = "10.0.0.99"
+    replaced.status = DeviceStatus.ERROR
+    replaced.info.group = "floor9"
+
+    snap = registry.snapshot()
+    assert snap.version == version
+    assert "kvm-2" not in snap.by_name
+    assert registry.get("kvm-3") is not replaced
+    assert DeviceStatus.ONLINE not in snap.by_status and DeviceStatus.ERROR not in snap.by_status
+    assert "10.0.0.99" not in snap.by_ip and "floor9" not in snap.by_group
+    assert _names(snap.by_ip, "10.0.0.1") == {"kvm-1"}
+    assert _names(snap.by_ip, "10.0.0.3") == {"kvm-3"}
+
+
+def test_replace_detaches_previous_devices(registry):
+    old = registry.get("kvm-1")
+    registry.replace([_device("kvm-9", "10.0.0.9")])
+    old.status = DeviceStatus.ONLINE
+    snap = registry.snapshot()
+    assert set(snap.by_name) == {"kvm-9"}
+    assert set(snap.by_status) == {DeviceStatus.UNKNOWN}
+
+
+def test_add_many_merges_and_skips_existing(registry):
+    existing = registry.get("kvm-1")
+    duplicate = _device("kvm-1", "10.0.0.50", "dup")
+    new = _device("kvm-4", "10.0.0.2", "floor3")
+    version = registry.snapshot().version
+
+    registry.add_many([duplicate, new])
+    snap = registry.snapshot()
+    assert snap.version == version + 1
+    assert snap.by_name["kvm-1"] is existing
+    assert set(snap.by_name) == {"kvm-1", "kvm-2", "kvm-3", "kvm-4"}
+    assert _names(snap.by_ip, "10.0.0.2") == {"kvm-2", "kvm-4"}
+    assert "10.0.0.50" not in snap.by_ip and "dup" not in snap.by_group
+    assert _names(snap.by_group, "floor3") == {"kvm-4"}
+
+    # 건너뛴 장치는 감시자가 연결되지 않고, 추가된 장치는 연결됨
+    duplicate.status = DeviceStatus.ERROR
+    new.status = DeviceStatus.ONLINE
+    snap = registry.snapshot()
+    assert DeviceStatus.ERROR not in snap.by_status
+    assert _names(snap.by_status, DeviceStatus.ONLINE) == {"kvm-4"}
+    assert _names(snap.by_status, DeviceStatus.UNKNOWN) == {"kvm-1", "kvm-2", "kvm-3"}
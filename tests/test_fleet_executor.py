@@ -0,0 +1,75 @@
+"""FleetExecutor — 완료 순서, 취소, 타임아웃 기준 시점"""
+
+import threading
+import time
+
+from core.fleet_executor import FleetExecutor
+
+
+class _Device:
+    def __init__(self, name, ip="192.168.0.10"):
+        self.name = name
+        self.ip = ip
+
+
+def _sleep(device, seconds):
+    time.sleep(seconds[device.name])
+    return device.name
+
+
+def test_results_stream_in_completion_order():
+    executor = FleetExecutor(max_concurrency=8, per_site=8, per_relay=8)
+    delays = {"slow": 0.3, "mid": 0.15, "fast": 0.0}
+    run = executor.submit([_Device(n) for n in delays], _sleep, (delays,), timeout=5)
+    order = [name for name, _ in run.as_completed(timeout=5)]
+    assert order == ["fast", "mid", "slow"]
+    assert run.done and run.results == {n: n for n in delays}
+
+
+def test_cancel_marks_unfinished_devices():
+    executor = FleetExecutor(max_concurrency=1, per_site=1, per_relay=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def block(device):
+        started.set()
+        release.wait(5)
+        return "ok"
+
+    run = executor.submit([_Device("a"), _Device("b"), _Device("c")], block, timeout=10)
+    assert started.wait(5)
+    run.cancel()
+    results = run.wait(5)
+    release.set()
+    assert run.done
+    assert results == {"a": {"error": "cancelled"}, "b": {"error": "cancelled"},
+                       "c": {"error": "cancelled"}}
+
+
+def test_cancel_keeps_finished_results():
+    executor = FleetExecutor(max_concurrency=1, per_site=1, per_relay=1)
+    release = threading.Event()
+
+    def work(device):
+        if device.name != "first":
+            release.wait(5)
+        return device.name
+
+    run = executor.submit([_Device("first"), _Device("second")], work, timeout=10)
+    name, result = next(run.as_completed(timeout=5))
+    assert (name, result) == ("first", "first")
+    run.cancel()
+    assert run.wait(5) == {"first": "first", "second": {"error": "cancelled"}}
+    release.set()
+
+
+def test_timeout_excludes_pool_queue_wait():
+    executor = FleetExecutor(max_concurrency=1, per_site=1, per_relay=1)
+    delays = {"stuck": 0.6, "next": 0.2}
+    # stuck는 타임아웃되지만 블로킹 호출이 풀 스레드 1개를 0.6초 붙잡음
+    first = executor.submit([_Device("stuck")], _sleep, (delays,), timeout=0.1)
+    assert first.wait(5) == {"stuck": {"error": "timeout"}}
+    # next는 풀 대기열에서 ~0.5초 기다린 뒤 0.2초 실행 — 실행 시간만 0.4초 제한에 들어감
+    second = executor.submit([_Device("next")], _sleep, (delays,), timeout=0.4)
+    assert second.wait(5) == {"next": "next"}
+    assert second.timeouts == 0
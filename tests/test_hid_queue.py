@@ -0,0 +1,108 @@
+"""HIDReportQueue — 이동 병합/분할, 버튼 전이 보존, 가득 참 처리, 전송 중 카운트"""
+
+import queue
+import struct
+
+import pytest
+
+pytest.importorskip("paramiko")
+
+from core.hid_controller import HIDReportQueue  # noqa: E402
+
+KBD = '/dev/hidg0'
+MOUSE = '/dev/hidg2'
+PRESS_A = struct.pack('BBBBBBBB', 0, 0, 0x04, 0, 0, 0, 0, 0)
+RELEASE = bytes(8)
+
+
+def _mouse(buttons, dx, dy):
+    return MOUSE, struct.pack('Bbb', buttons, dx, dy)
+
+
+def _drain(q: HIDReportQueue, max_step: int = 127):
+    out = []
+    while True:
+        try:
+            dev, report, _ = q.get_nowait(max_step)
+        except queue.Empty:
+            return out
+        q.done()
+        out.append((dev, report))
+
+
+def test_consecutive_moves_coalesce():
+    q = HIDReportQueue(MOUSE)
+    q.put_move(10, 5)
+    q.put_move(20, -3)
+    q.put_move(-5, 0)
+    assert len(q) == 1
+    assert _drain(q) == [_mouse(0, 25, 2)]
+    stats = q.stats()
+    assert stats['enqueued'] == 3 and stats['coalesced'] == 2 and stats['sent'] == 1
+
+
+def test_large_move_splits_within_int8_keeping_direction():
+    q = HIDReportQueue(MOUSE)
+    q.put_move(300, -150)
+    assert _drain(q) == [_mouse(0, 100, -50)] * 3
+    assert q.stats()['split'] == 2
+
+
+def test_max_step_limits_each_report():
+    q = HIDReportQueue(MOUSE)
+    q.put_move(-200, 7)
+    moves = [struct.unpack('Bbb', r)[1:] for _, r in _drain(q, max_step=50)]
+    assert len(moves) == 4
+    assert all(abs(dx) <= 50 and abs(dy) <= 50 for dx, dy in moves)
+    assert (sum(dx for dx, _ in moves), sum(dy for _, dy in moves)) == (-200, 7)
+
+
+def test_button_edges_are_not_merged():
+    q = HIDReportQueue(MOUSE)
+    q.put_move(5, 0, 0)
+    q.put_move(0, 0, 1)        # 버튼 누름 — 앞 이동과 병합하지 않음
+    q.put_move(3, 0, 1)        # 누름 직후 이동 — 누름 리포트에 합치지 않음
+    q.put_move(2, 1, 1)        # 드래그 이동끼리는 병합
+    q.put_report(MOUSE, struct.pack('Bbb', 0, 0, 0))  # 버튼 놓음 (원본 리포트)
+    q.put_move(4, 0, 0)
+    assert _drain(q) == [
+        _mouse(0, 5, 0), _mouse(1, 0, 0), _mouse(1, 5, 1), _mouse(0, 0, 0), _mouse(0, 4, 0),
+    ]
+
+
+def test_keyboard_report_separates_moves():
+    q = HIDReportQueue(MOUSE)
+    q.put_move(1, 1)
+    q.put_report(KBD, PRESS_A)
+    q.put_report(KBD, RELEASE)
+    q.put_move(2, 2)
+    assert _drain(q) == [_mouse(0, 1, 1), (KBD, PRESS_A), (KBD, RELEASE), _mouse(0, 2, 2)]
+
+
+def test_full_queue_drops_oldest_move_but_keeps_transitions():
+    q = HIDReportQueue(MOUSE, maxsize=2)
+    q.put_report(KBD, PRESS_A)
+    q.put_move(1, 0)
+    q.put_report(KBD, RELEASE)  # 전이는 한도를 넘어도 들어감
+    q.put_move(5, 0)            # 가득 참 → 가장 오래된 순수 이동 (1, 0) 폐기
+    assert _drain(q) == [(KBD, PRESS_A), (KBD, RELEASE), _mouse(0, 5, 0)]
+    assert q.stats()['dropped_moves'] == 1
+
+
+def test_in_flight_until_done():
+    q = HIDReportQueue(MOUSE)
+    q.put_move(300, 0)
+    assert q.pending() == 1
+    q.get_nowait()              # 분할 — 남은 이동은 큐에 유지
+    assert len(q) == 1 and q.pending() == 2
+    q.done()
+    assert q.pending() == 1
+    q.get_nowait()
+    q.get_nowait()
+    assert len(q) == 0 and q.pending() == 2
+    q.done()
+    q.done()
+    assert q.pending() == 0 and q.stats()['in_flight'] == 0
+    with pytest.raises(queue.Empty):
+        q.get_nowait()
+    assert q.pending() == 0     # 빈 큐에서 실패한 get은 전송 중으로 세지 않음
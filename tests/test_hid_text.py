@@ -0,0 +1,52 @@
+"""text_to_reports — Shift, 한/영 전환, 겹모음/겹받침 분해"""
+
+import struct
+
+from core.hid_text import HANGUL_TOGGLE_HOLD, MOD_LSHIFT, MOD_RALT, RELEASE, text_to_reports
+
+TOGGLE = [(struct.pack('BBBBBBBB', MOD_RALT, 0, 0, 0, 0, 0, 0, 0), HANGUL_TOGGLE_HOLD), (RELEASE, 0.0)]
+
+
+def _keys(items):
+    """(modifier, keycode) 누름 목록 — 각 누름 뒤에 RELEASE가 오는지도 확인"""
+    presses = items[0::2]
+    assert all(report == RELEASE for report, _ in items[1::2])
+    return [(report[0], report[2]) for report, _ in presses]
+
+
+def test_shift_for_upper_case_and_symbols():
+    items, skipped = text_to_reports('aA!1')
+    assert skipped == ''
+    assert _keys(items) == [(0, 0x04), (MOD_LSHIFT, 0x04), (MOD_LSHIFT, 0x1E), (0, 0x1E)]
+
+
+def test_hangul_toggles_in_and_back_out():
+    items, _ = text_to_reports('한a')
+    assert items[:2] == TOGGLE
+    # 한 = ㅎ(g) ㅏ(k) ㄴ(s) → 영문 a 앞에서 다시 전환
+    assert _keys(items[2:8]) == [(0, 0x0A), (0, 0x0E), (0, 0x16)]
+    assert items[8:10] == TOGGLE
+    assert _keys(items[10:]) == [(0, 0x04)]
+
+
+def test_hangul_left_in_korean_mode_is_toggled_back():
+    items, _ = text_to_reports('가 1')
+    assert items[:2] == TOGGLE
+    assert items[-2:] == TOGGLE
+    # 공백/숫자는 한글 모드에서도 그대로 입력 → 중간 전환 없음
+    assert items.count(TOGGLE[0]) == 2
+
+
+def test_compound_vowel_and_final_consonant_are_split():
+    # 왔 = ㅇ ㅘ(ㅗㅏ) ㅆ(Shift+t), 닭 = ㄷ ㅏ ㄺ(ㄹㄱ)
+    items, _ = text_to_reports('왔닭')
+    assert _keys(items[2:-2]) == [
+        (0, 0x07), (0, 0x0B), (0, 0x0E), (MOD_LSHIFT, 0x17),
+        (0, 0x08), (0, 0x0E), (0, 0x09), (0, 0x15),
+    ]
+
+
+def test_unsupported_characters_are_skipped():
+    items, skipped = text_to_reports('a€b')
+    assert skipped == '€'
+    assert _keys(items) == [(0, 0x04), (0, 0x05)]
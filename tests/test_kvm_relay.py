@@ -0,0 +1,121 @@
+"""TCPProxy 동시 연결 상한 — 한꺼번에 몰린 연결 중 정확히 초과분만 503"""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from core.kvm_relay import TCPProxy
+from core.relay_loop import RelayEventLoop
+
+MAX_CONNECTIONS = 4
+EXTRA = 3
+REQUEST = b'GET / HTTP/1.1\r\nHost: kvm\r\n\r\n'
+
+
+class _HoldingKVM:
+    """요청을 읽기만 하고 응답하지 않는 KVM 대역 (릴레이 연결이 계속 살아 있도록) — 클라이언트 EOF에 닫음"""
+
+    def __init__(self):
+        self._server = socket.create_server(('127.0.0.1', 0))
+        self.port = self._server.getsockname()[1]
+        self._conns = []
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            self._conns.append(conn)
+            threading.Thread(target=self._drain, args=(conn,), daemon=True).start()
+
+    @staticmethod
+    def _drain(conn: socket.socket):
+        try:
+            while conn.recv(4096):
+                pass
+        except OSError:
+            pass
+        conn.close()
+
+    def close(self):
+        self._server.close()
+        for conn in self._conns:
+            conn.close()
+
+
+def _free_port() -> int:
+    with socket.create_server(('127.0.0.1', 0)) as s:
+        return s.getsockname()[1]
+
+
+def _wait_for(cond, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(0.02)
+    return cond()
+
+
+@pytest.fixture(params=['thread', 'selector'])
+def proxy(request):
+    kvm = _HoldingKVM()
+    loop = None
+    if request.param == 'selector':
+        loop = RelayEventLoop()
+        loop.start()
+    proxy = TCPProxy(_free_port(), '127.0.0.1', kvm.port, loop=loop, max_connections=MAX_CONNECTIONS)
+    proxy.start()
+    yield proxy
+    proxy.stop()
+    if loop is not None:
+        loop.stop()
+    kvm.close()
+
+
+def _burst(port: int, n: int):
+    clients = [socket.create_connection(('127.0.0.1', port), timeout=5) for _ in range(n)]
+    for client in clients:
+        client.sendall(REQUEST)
+    return clients
+
+
+def _count_busy(clients, wait: float = 1.0) -> int:
+    """503을 받은 클라이언트 수 (수락된 연결은 KVM 대역이 응답하지 않으므로 받을 데이터 없음)"""
+    deadline = time.monotonic() + wait
+    busy = 0
+    for client in clients:
+        client.settimeout(max(0.05, deadline - time.monotonic()))
+        try:
+            busy += client.recv(4096).startswith(b'HTTP/1.1 503')
+        except socket.timeout:
+            pass
+    return busy
+
+
+def test_burst_rejects_exactly_the_excess(proxy):
+    clients = _burst(proxy.listen_port, MAX_CONNECTIONS + EXTRA)
+    try:
+        assert _count_busy(clients) == EXTRA
+        assert proxy.stats.rejected == EXTRA
+        assert proxy.admitted == MAX_CONNECTIONS
+    finally:
+        for client in clients:
+            client.close()
+
+
+def test_slots_return_after_clients_close(proxy):
+    clients = _burst(proxy.listen_port, MAX_CONNECTIONS)
+    for client in clients:
+        client.close()
+    assert _wait_for(lambda: proxy.admitted == 0)
+    clients = _burst(proxy.listen_port, MAX_CONNECTIONS + 1)
+    try:
+        assert _count_busy(clients) == 1
+    finally:
+        for client in clients:
+            client.close()
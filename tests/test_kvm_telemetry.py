@@ -0,0 +1,92 @@
+"""텔레메트리 — 프로브 출력 파싱과 전체/델타 응답 누적"""
+
+import json
+
+import pytest
+
+from core.kvm_telemetry import TelemetryState, is_missing, parse_probe, probe_command
+
+FULL = {
+    'uptime': ' 10:00:00 up 1 day', 'uptime_seconds': 86400, 'temperature': 45000,
+    'usb_state': 'configured', 'mac': '02:00:00:00:00:01', 'hostname': 'kvm-01',
+    'memory_total': 512, 'memory_used': 200,
+}
+
+
+def _doc(epoch, seq, full, fields):
+    return {'v': 1, 'epoch': epoch, 'seq': seq, 'full': full, 'fields': fields}
+
+
+def test_full_then_delta_then_new_epoch():
+    state = TelemetryState()
+
+    state.apply(_doc('1700000000123', 1, True, dict(FULL)), size=300)
+    assert state.fields == FULL
+    assert state.changed == set(FULL)
+    assert (state.epoch, state.seq) == ('1700000000123', 1)
+
+    # 델타 — 바뀐 필드만 오고 나머지는 유지
+    state.apply(_doc('1700000000123', 2, False, {'uptime_seconds': 86460, 'usb_state': 'suspended'}), size=80)
+    assert state.fields == dict(FULL, uptime_seconds=86460, usb_state='suspended')
+    assert state.changed == {'uptime_seconds', 'usb_state'}
+    assert state.seq == 2
+
+    # 같은 값을 다시 보낸 델타는 변화로 치지 않음
+    state.apply(_doc('1700000000123', 3, False, {'usb_state': 'suspended'}))
+    assert state.changed == set()
+    assert state.seq == 3
+
+    # 재부팅 — 새 epoch의 전체 응답이 상태를 통째로 교체 (사라진 필드도 변화)
+    rebooted = dict(FULL, uptime_seconds=30, temperature=40000)
+    del rebooted['memory_used']
+    state.apply(_doc('1700009999456', 1, True, rebooted))
+    assert state.fields == rebooted
+    assert state.changed == {'uptime_seconds', 'usb_state', 'temperature', 'memory_used'}
+    assert (state.epoch, state.seq) == ('1700009999456', 1)
+    assert (state.probes, state.full_probes, state.bytes) == (4, 2, 380)
+
+
+def test_reset_keeps_fields():
+    state = TelemetryState()
+    state.apply(_doc('e1', 5, True, {'mac': 'aa'}))
+    state.reset()
+    assert (state.epoch, state.seq) == ('', 0)
+    assert state.fields == {'mac': 'aa'}
+
+
+def test_parse_probe_takes_last_line():
+    doc = _doc('e1', 7, False, {'temperature': 41000})
+    out = "motd noise\n" + json.dumps(doc) + "\n"
+    assert parse_probe(out) == doc
+
+
+@pytest.mark.parametrize('out', [
+    '',
+    '\n  \n',
+    'sh: /tmp/.wlprobe/probe-v1.sh: not found',
+    '{"v":1,"epoch":"e1","seq":3,"full":true,"fields":{"mac":"aa:bb',   # 잘린 출력
+    '{"v":1,"epoch":"e1","seq":3,"full":true,"fields":{"mac":"aa"}}\n{"v":1,"ep',
+    '[1, 2, 3]',
+    '{"v":1,"epoch":"e1","seq":3,"fields":[]}',
+    '{"v":1,"epoch":"e1","full":true,"fields":{}}',
+    '{"v":1,"epoch":"e1","seq":"3","fields":{}}',
+    '{"v":1,"epoch":"e1","seq":null,"fields":{}}',
+])
+def test_parse_probe_rejects_malformed(out):
+    assert parse_probe(out) is None
+
+
+def test_missing_marker():
+    cmd = probe_command(epoch='e1', since=4)
+    assert "'e1' 4 80" in cmd
+    marker = cmd.rsplit('echo ', 1)[1]
+    assert is_missing(marker + "\n")
+    assert parse_probe(marker) is None
+
+
+def test_app_version():
+    state = TelemetryState()
+    state.apply(_doc('e1', 1, True, {'version_api': '{"app": "2.3.1"}'}))
+    assert state.app_version() == '2.3.1'
+    state.apply(_doc('e1', 2, False, {'version_api': '<html>404</html>'}))
+    assert state.app_version() == ''
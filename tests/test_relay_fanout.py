@@ -0,0 +1,140 @@
+"""StreamFanout 스트림 공유 — 자격 증명이 다른 뷰어끼리 업스트림을 공유하지 않는지 확인"""
+
+import socket
+import threading
+
+import pytest
+
+from core.relay_fanout import StreamFanout, share_key
+
+BOUNDARY = b'frame'
+
+
+class _StandInKVM:
+    """MJPEG 대역 — 프레임 본문에 요청의 Cookie/Authorization 값을 담아 보냄"""
+
+    def __init__(self):
+        self._server = socket.create_server(('127.0.0.1', 0))
+        self.port = self._server.getsockname()[1]
+        self.connections = 0
+        self._stop = threading.Event()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._stream, args=(conn,), daemon=True).start()
+
+    def _stream(self, conn: socket.socket):
+        buf = b''
+        while b'\r\n\r\n' not in buf:
+            data = conn.recv(4096)
+            if not data:
+                return
+            buf += data
+        creds = b'anonymous'
+        for line in buf.split(b'\r\n')[1:]:
+            name, _, value = line.partition(b':')
+            if name.strip().lower() in (b'cookie', b'authorization'):
+                creds = value.strip()
+        try:
+            conn.sendall(b'HTTP/1.1 200 OK\r\n'
+                         b'Content-Type: multipart/x-mixed-replace; boundary=' + BOUNDARY + b'\r\n\r\n')
+            while not self._stop.wait(0.02):
+                conn.sendall(b'--' + BOUNDARY + b'\r\nContent-Type: image/jpeg\r\n\r\n' + creds + b'\r\n')
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def close(self):
+        self._stop.set()
+        self._server.close()
+
+
+class _Viewer:
+    """fanout.subscribe 를 별도 스레드에서 실행하는 뷰어 (socketpair 한쪽 끝)"""
+
+    def __init__(self, fanout: StreamFanout, headers: bytes = b''):
+        self.sock, remote = socket.socketpair()
+        request = b'GET /stream HTTP/1.1\r\nHost: kvm\r\n' + headers + b'\r\n'
+        self._thread = threading.Thread(target=fanout.subscribe, args=(remote, request), daemon=True)
+        self._thread.start()
+        self.sock.settimeout(5)
+
+    def read_frame(self) -> bytes:
+        buf = b''
+        while buf.count(b'--' + BOUNDARY) < 2:
+            data = self.sock.recv(4096)
+            assert data, "stream closed"
+            buf += data
+        return buf.split(b'--' + BOUNDARY)[1]
+
+    def close(self):
+        self.sock.close()
+
+
+@pytest.fixture
+def kvm():
+    server = _StandInKVM()
+    yield server
+    server.close()
+
+
+def _open_viewers(kvm, *headers):
+    fanout = StreamFanout('127.0.0.1', kvm.port)
+    viewers = []
+    for h in headers:
+        viewer = _Viewer(fanout, h)
+        viewer.read_frame()  # 업스트림이 열린 뒤 다음 뷰어 (동시 열기 경쟁 제외)
+        viewers.append(viewer)
+    return fanout, viewers
+
+
+def test_same_credentials_share_upstream(kvm):
+    fanout, viewers = _open_viewers(kvm, b'Cookie: session=alice\r\n', b'Cookie: session=alice\r\n')
+    try:
+        assert fanout.upstreams_opened == 1
+        assert kvm.connections == 1
+        assert b'session=alice' in viewers[1].read_frame()
+    finally:
+        for v in viewers:
+            v.close()
+        fanout.close()
+
+
+def test_different_cookie_gets_own_upstream(kvm):
+    fanout, viewers = _open_viewers(kvm, b'Cookie: session=alice\r\n', b'Cookie: session=mallory\r\n')
+    try:
+        assert fanout.upstreams_opened == 2
+        assert b'session=mallory' in viewers[1].read_frame()
+        assert b'session=alice' in viewers[0].read_frame()
+    finally:
+        for v in viewers:
+            v.close()
+        fanout.close()
+
+
+def test_missing_credentials_do_not_join_authenticated_stream(kvm):
+    fanout, viewers = _open_viewers(kvm, b'Authorization: Basic YWRtaW46YWRtaW4=\r\n', b'')
+    try:
+        assert fanout.upstreams_opened == 2
+        frame = viewers[1].read_frame()
+        assert b'anonymous' in frame
+        assert b'Basic' not in frame
+    finally:
+        for v in viewers:
+            v.close()
+        fanout.close()
+
+
+def test_share_key_ignores_non_credential_headers():
+    a = share_key('/stream', b'GET /stream HTTP/1.1\r\nUser-Agent: a\r\nCookie: s=1')
+    b = share_key('/stream', b'GET /stream HTTP/1.1\r\nUser-Agent: b\r\ncookie:  s=1 ')
+    assert a == b
+    assert a != share_key('/stream', b'GET /stream HTTP/1.1\r\nCookie: s=2')
+    assert a != share_key('/other', b'GET /other HTTP/1.1\r\nCookie: s=1')
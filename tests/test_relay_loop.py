@@ -0,0 +1,200 @@
+"""RelayEventLoop — selector 엔진 전달/종료/hand-off/리스너 해제"""
+
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from core.kvm_relay import TCPProxy
+from core.relay_loop import SPLICE_AVAILABLE, RelayEventLoop
+
+REQUEST = b'GET /ws HTTP/1.1\r\nHost: kvm\r\n\r\n'
+
+
+class _EchoKVM:
+    """받은 바이트를 그대로 돌려보내는 KVM 대역 — 클라이언트 EOF에 닫음
+
+    close_after: 첫 데이터를 받으면 이 바이트를 보내고 먼저 닫음 (KVM 쪽 종료 확인용)
+    """
+
+    def __init__(self, close_after: bytes = b''):
+        self._server = socket.create_server(('127.0.0.1', 0))
+        self.port = self._server.getsockname()[1]
+        self.close_after = close_after
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._echo, args=(conn,), daemon=True).start()
+
+    def _echo(self, conn: socket.socket):
+        try:
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    break
+                if self.close_after:
+                    conn.sendall(self.close_after)
+                    break
+                conn.sendall(data)
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def close(self):
+        self._server.close()
+
+
+def _free_port() -> int:
+    with socket.create_server(('127.0.0.1', 0)) as s:
+        return s.getsockname()[1]
+
+
+def _wait_for(cond, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(0.02)
+    return cond()
+
+
+def _recv_all(sock: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        data = sock.recv(65536)
+        if not data:
+            return b''.join(chunks)
+        chunks.append(data)
+
+
+@pytest.fixture
+def loop():
+    loop = RelayEventLoop()
+    loop.start()
+    yield loop
+    loop.stop()
+
+
+def _proxy(loop, kvm, **kwargs) -> TCPProxy:
+    proxy = TCPProxy(_free_port(), '127.0.0.1', kvm.port, loop=loop, **kwargs)
+    proxy.start()
+    return proxy
+
+
+@pytest.mark.parametrize('zero_copy', [False, pytest.param(True, marks=pytest.mark.skipif(
+    not SPLICE_AVAILABLE, reason="os.splice 미지원"))])
+def test_forwards_bytes_exactly_both_ways(loop, zero_copy):
+    kvm = _EchoKVM()
+    proxy = _proxy(loop, kvm, zero_copy=zero_copy)
+    # HIGH_WATER보다 훨씬 크게 → 부분 전송 / 송신 버퍼 상한(읽기 중지) 경로를 지나감
+    payload = REQUEST + os.urandom(8 * RelayEventLoop.HIGH_WATER)
+    client = socket.create_connection(('127.0.0.1', proxy.listen_port), timeout=10)
+
+    def send():
+        client.sendall(payload)
+        client.shutdown(socket.SHUT_WR)
+
+    sender = threading.Thread(target=send)
+    sender.start()
+    try:
+        assert _recv_all(client) == payload
+    finally:
+        sender.join()
+        client.close()
+        proxy.stop()
+        kvm.close()
+    assert proxy.stats.bytes_up == len(payload) == proxy.stats.bytes_down
+
+
+def test_client_shutdown_closes_session(loop):
+    kvm = _EchoKVM()
+    proxy = _proxy(loop, kvm)
+    client = socket.create_connection(('127.0.0.1', proxy.listen_port), timeout=5)
+    try:
+        client.sendall(REQUEST)
+        assert client.recv(4096) == REQUEST
+        assert loop.session_count == 1 and proxy.stats.active == 1
+        client.shutdown(socket.SHUT_WR)
+        assert _recv_all(client) == b''
+        assert _wait_for(lambda: loop.session_count == 0)
+        assert proxy.stats.active == 0 and proxy.admitted == 0
+    finally:
+        client.close()
+        proxy.stop()
+        kvm.close()
+
+
+def test_kvm_close_reaches_client(loop):
+    kvm = _EchoKVM(close_after=b'bye')
+    proxy = _proxy(loop, kvm)
+    client = socket.create_connection(('127.0.0.1', proxy.listen_port), timeout=5)
+    try:
+        client.sendall(REQUEST)
+        assert _recv_all(client) == b'bye'
+        client.close()
+        assert _wait_for(lambda: loop.session_count == 0)
+        assert proxy.stats.active == 0
+    finally:
+        client.close()
+        proxy.stop()
+        kvm.close()
+
+
+def test_hand_off_counts_connection_once(loop):
+    kvm = _EchoKVM()
+    proxy = _proxy(loop, kvm)
+    proxy._wants_thread = lambda data: b'/handoff' in data
+    request = b'GET /handoff HTTP/1.1\r\nHost: kvm\r\n\r\n'
+    client = socket.create_connection(('127.0.0.1', proxy.listen_port), timeout=5)
+    try:
+        client.sendall(request)
+        assert client.recv(4096) == request  # _relay 스레드가 전달
+        assert loop.session_count == 0
+        assert proxy.stats.active == 1 and proxy.stats.connections == 1
+        assert proxy.admitted == 1
+        client.shutdown(socket.SHUT_WR)
+        assert _recv_all(client) == b''
+        assert _wait_for(lambda: proxy.stats.active == 0 and proxy.admitted == 0)
+        assert proxy.stats.connections == 1
+    finally:
+        client.close()
+        proxy.stop()
+        kvm.close()
+
+
+def test_stop_unregisters_listener(loop):
+    kvm = _EchoKVM()
+    proxy = _proxy(loop, kvm)
+    port = proxy.listen_port
+    assert _wait_for(lambda: any(key.data is proxy for key in loop._sel.get_map().values()))
+    client = socket.create_connection(('127.0.0.1', port), timeout=5)
+    client.sendall(REQUEST)
+    assert client.recv(4096) == REQUEST
+
+    proxy.stop()
+    assert _wait_for(lambda: all(key.data is not proxy for key in loop._sel.get_map().values()))
+    assert _wait_for(lambda: loop.session_count == 0)
+    assert _recv_all(client) == b''  # 프록시 세션도 함께 종료
+    client.close()
+    with pytest.raises(ConnectionRefusedError):
+        socket.create_connection(('127.0.0.1', port), timeout=2).close()
+
+    # 같은 포트로 다시 시작 가능 (닫힌 fd가 selector에 남지 않음)
+    again = TCPProxy(port, '127.0.0.1', kvm.port, loop=loop)
+    again.start()
+    try:
+        client = socket.create_connection(('127.0.0.1', port), timeout=5)
+        client.sendall(REQUEST)
+        assert client.recv(4096) == REQUEST
+        client.close()
+    finally:
+        again.stop()
+        kvm.close()
@@ -0,0 +1,73 @@
+"""RelayLimiter / PrioritySendQueue"""
+
+import threading
+import time
+
+from core.relay_shaper import CLASS_CONTROL, CLASS_MEDIA, PrioritySendQueue, RelayLimiter, TokenBucket
+
+
+def test_site_denial_does_not_consume_kvm_tokens():
+    kvm = TokenBucket(1e6, burst=100_000)
+    site = TokenBucket(1e6, burst=10_000)
+    limiter = RelayLimiter(kvm, site)
+    for _ in range(20):
+        assert not limiter.allow(50_000)  # 사이트 버킷보다 큰 프레임 — 항상 거절
+    assert limiter.dropped_units == 20
+    assert kvm.allow(100_000)  # KVM 버킷은 그대로 가득 차 있음
+
+
+def test_kvm_denial_does_not_consume_site_tokens():
+    kvm = TokenBucket(1e6, burst=10_000)
+    site = TokenBucket(1e6, burst=100_000)
+    limiter = RelayLimiter(kvm, site)
+    assert not limiter.allow(50_000)
+    assert site.allow(100_000)
+
+
+def test_media_waits_for_control():
+    queue = PrioritySendQueue(max_yield=5.0)
+    queue.enter(10, CLASS_CONTROL)
+    entered = threading.Event()
+
+    def media():
+        queue.enter(1000, CLASS_MEDIA)
+        entered.set()
+        queue.leave(1000, CLASS_MEDIA)
+
+    t = threading.Thread(target=media)
+    t.start()
+    assert not entered.wait(0.1)
+    queue.leave(10, CLASS_CONTROL)
+    assert entered.wait(1.0)
+    t.join()
+    assert queue.yields == 1
+
+
+def test_media_in_flight_is_bounded_and_control_bypasses():
+    queue = PrioritySendQueue(limit=1000, max_yield=5.0)
+    queue.enter(800, CLASS_MEDIA)
+    entered = threading.Event()
+
+    def media():
+        queue.enter(800, CLASS_MEDIA)
+        entered.set()
+        queue.leave(800, CLASS_MEDIA)
+
+    t = threading.Thread(target=media)
+    t.start()
+    assert not entered.wait(0.1)
+    start = time.monotonic()
+    queue.enter(10, CLASS_CONTROL)  # 상한과 무관하게 바로 진행
+    assert time.monotonic() - start < 0.05
+    queue.leave(10, CLASS_CONTROL)
+    queue.leave(800, CLASS_MEDIA)
+    assert entered.wait(1.0)
+    t.join()
+
+
+def test_media_yield_is_bounded():
+    queue = PrioritySendQueue(max_yield=0.05)
+    queue.enter(10, CLASS_CONTROL)
+    start = time.monotonic()
+    queue.enter(1000, CLASS_MEDIA)  # control이 끝나지 않아도 max_yield 후 진행 (기아 방지)
+    assert time.monotonic() - start < 1.0
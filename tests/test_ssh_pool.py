@@ -0,0 +1,76 @@
+"""SSHSession 채널 실패 처리 / SSHTransportPool 보유 수"""
+
+import pytest
+
+paramiko = pytest.importorskip("paramiko")
+
+from core.ssh_pool import SSHSession, SSHTransportPool  # noqa: E402
+
+
+class _Transport:
+    def __init__(self, active=True, fail=False):
+        self.active = active
+        self.fail = fail
+        self.opened = 0
+
+    def is_active(self):
+        return self.active
+
+    def open_session(self, timeout=None):
+        if self.fail:
+            raise paramiko.SSHException("administratively prohibited")
+        self.opened += 1
+        return object()
+
+
+class _Client:
+    def __init__(self, transport):
+        self.transport = transport
+        self.closed = False
+
+    def get_transport(self):
+        return None if self.closed else self.transport
+
+    def close(self):
+        self.closed = True
+
+
+def _session(transport):
+    session = SSHSession("10.0.0.1")
+    session._client = _Client(transport)
+    return session
+
+
+def test_channel_refusal_keeps_live_transport():
+    transport = _Transport(fail=True)
+    session = _session(transport)
+    with pytest.raises(paramiko.SSHException):
+        session.open_channel()
+    assert session._client is not None and not session._client.closed
+    transport.fail = False
+    session.open_channel()
+    assert transport.opened == 1
+
+
+def test_dead_transport_is_dropped_before_retry(monkeypatch):
+    dead = _Transport(active=False, fail=True)
+    fresh = _Transport()
+    session = _session(dead)
+    client = session._client
+    calls = iter([dead, fresh])
+    monkeypatch.setattr(session, "transport", lambda timeout=10: next(calls))
+    session.open_channel()
+    assert client.closed and fresh.opened == 1
+
+
+def test_release_closes_only_after_last_holder():
+    pool = SSHTransportPool()
+    a = pool.acquire("10.0.0.1")
+    b = pool.acquire("10.0.0.1")
+    assert a is b and a.holders == 2
+    client = a._client = _Client(_Transport())
+    pool.release(a)
+    assert not client.closed and pool.get("10.0.0.1") is a
+    pool.release(b)
+    assert client.closed
+    assert pool.get("10.0.0.1") is not a
@@ -0,0 +1,60 @@
+"""StatusScheduler — 장기 백오프 상한, 유실된 조회 재시도"""
+
+import time
+
+from core.status_scheduler import StatusScheduler
+
+
+def _scheduler(**overrides):
+    scheduler = StatusScheduler(fast_interval=5)
+    scheduler.jitter = 0.0
+    for key, value in overrides.items():
+        setattr(scheduler, key, value)
+    scheduler.sync(["kvm"])
+    return scheduler
+
+
+def test_long_offline_backoff_stays_at_cap():
+    scheduler = _scheduler()
+    for _ in range(5000):  # 2 ** 5000은 float 범위 초과 — 지수 상한 없으면 OverflowError
+        scheduler.record("kvm", False)
+    entry = scheduler._entries["kvm"]
+    assert entry.interval == scheduler.offline_max
+    assert scheduler.next_wait() > scheduler.offline_max - 1
+
+
+def test_long_online_backoff_stays_at_cap():
+    scheduler = _scheduler()
+    for _ in range(5000):
+        scheduler.record("kvm", True)
+    assert scheduler._entries["kvm"].interval == scheduler.online_max
+
+
+def test_transition_after_long_backoff_returns_to_fast():
+    scheduler = _scheduler()
+    for _ in range(5000):
+        scheduler.record("kvm", False)
+    scheduler.record("kvm", True)
+    assert scheduler._entries["kvm"].interval == scheduler.fast
+
+
+def test_popped_device_not_returned_again_until_recorded():
+    scheduler = _scheduler()
+    now = time.monotonic() + scheduler.fast
+    assert scheduler.pop_due(now) == ["kvm"]
+    assert scheduler.pop_due(now + 1) == []
+    scheduler.touch("kvm")  # 조회 중에는 즉시 재조회 요청도 무시
+    assert scheduler.pop_due(now + 1) == []
+    scheduler.record("kvm", True)
+    interval = scheduler._entries["kvm"].interval
+    assert scheduler.pop_due(now + 1) == []
+    assert scheduler.pop_due(time.monotonic() + interval + 1) == ["kvm"]
+
+
+def test_lost_probe_is_retried_after_lease():
+    scheduler = _scheduler(probe_lease=10)
+    now = time.monotonic() + scheduler.fast
+    assert scheduler.pop_due(now) == ["kvm"]
+    # record 없이 (예외/취소) 임대 만료 → 다시 조회 대상
+    assert scheduler.pop_due(now + 9) == []
+    assert scheduler.pop_due(now + 10) == ["kvm"]
@@ -0,0 +1,543 @@
+"""
+KVM Relay 벤치마크 (오프라인) — 로컬 KVM 대역 + KVMRelayManager
+
+KVM 장비/네트워크 없이 core/kvm_relay.py 변경의 성능 회귀를 잡기 위한 도구.
+로컬 KVM 대역(_StandInKVM) 하나가 실제 KVM 웹 서버처럼 동작:
+  GET /                 HTML 페이지
+  GET /assets/app.js    정적 자산 (ETag, Cache-Control — HTTP 캐시 대상)
+  GET /api/version      펌웨어 버전 JSON
+  GET /stream           MJPEG (multipart/x-mixed-replace), ?chunked=1 이면 chunked 전송
+  GET /bulk/<MB>        대량 전송
+  GET /ws               WebSocket 에코 (HID 입력 채널 대역)
+  UDP                   에코 (WebRTC 미디어 대역)
+
+릴레이는 별도 프로세스(부하 생성기와 GIL 공유 방지)에서 실행하고 엔진별로 측정:
+  - HTTP 페이지 / WebSocket / UDP 왕복 지연 p50·p99 (직접 연결 대비 추가 지연)
+  - ':cache' 엔진: keep-alive 연결(페이지 → 자산 반복)의 실제 캐시 적중률 (hits / 요청 수)
+  - WebSocket 지연 (MJPEG·대량 전송 부하 중) — 입력 우선 처리 확인
+  - MJPEG: 뷰어 N명의 평균 fps, KVM 업스트림 연결 수 (fan-out 확인)
+  - 대량 전송 처리량 (MB/s)
+  - 릴레이 프로세스 CPU 시간, 최대 스레드 수
+
+사용법:
+  python tools/relay_bench.py
+  python tools/relay_bench.py --clients 40 --duration 5 --engines thread,selector:splice
+  python tools/relay_bench.py --json result.json   (회귀 비교용)
+
+엔진 표기: thread / selector, 옵션 접미사 ':splice' ':fanout' ':cache' (예: selector:splice:fanout)
+"""
+import argparse
+import base64
+import hashlib
+import io
+import json
+import os
+import socket
+import statistics
+import struct
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Windows cp949 encoding fix
+if sys.stdout and hasattr(sys.stdout, 'buffer'):
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+from core.kvm_relay import KVMRelayManager  # noqa: E402
+from core.relay_loop import SPLICE_AVAILABLE  # noqa: E402
+
+CHUNK = 64 * 1024
+KVM_IP = '127.0.0.1'
+CLIENT_IP = '127.0.0.2'  # UDPRelay는 KVM IP에서 온 패킷을 KVM 응답으로 취급 → 클라이언트는 다른 주소 사용
+_WS_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+# ─── 로컬 KVM 대역 ──────────────────────────────────
+
+class _StandInKVM:
+    """KVM 웹 서버 + UDP 에코 대역 (스레드 서버)"""
+
+    PAGE = b'<!doctype html><html><head><script src="/assets/app.js"></script></head><body>' + b'x' * 8192 + b'</body></html>'
+    ASSET = b'/* app bundle */' + b'a' * (200 * 1024)
+
+    def __init__(self, frame_kb: int = 40, fps: int = 30):
+        self.frame = b'\xff\xd8' + b'\x00' * (frame_kb * 1024) + b'\xff\xd9'
+        self.fps = fps
+        self.stream_upstreams = 0   # /stream 요청 수 (fan-out 시 뷰어 수와 무관하게 1)
+        self.asset_requests = 0
+        self._srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._srv.bind((KVM_IP, 0))
+        self._srv.listen(256)
+        self.port = self._srv.getsockname()[1]
+        self._udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._udp.bind((KVM_IP, 0))
+        self.udp_port = self._udp.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+        threading.Thread(target=self._udp_echo, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._srv.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _udp_echo(self):
+        while True:
+            try:
+                data, addr = self._udp.recvfrom(65536)
+                self._udp.sendto(data, addr)
+            except OSError:
+                return
+
+    def _handle(self, conn: socket.socket):
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        buf = b''
+        try:
+            while True:
+                while b'\r\n\r\n' not in buf:
+                    data = conn.recv(CHUNK)
+                    if not data:
+                        return
+                    buf += data
+                head, _, buf = buf.partition(b'\r\n\r\n')
+                lines = head.decode('latin-1').split('\r\n')
+                path = lines[0].split(' ')[1]
+                headers = {k.strip().lower(): v.strip() for k, _, v in
+                           (line.partition(':') for line in lines[1:])}
+                if path == '/ws':
+                    self._websocket(conn, headers, buf)
+                    return
+                if path.startswith('/stream'):
+                    self._mjpeg(conn, chunked='chunked=1' in path)
+                    return
+                if path.startswith('/bulk/'):
+                    self._bulk(conn, int(path.split('/')[2] or 1))
+                    return
+                self._respond(conn, path, headers)
+        except (OSError, ValueError, IndexError):
+            pass
+        finally:
+            conn.close()
+
+    def _respond(self, conn: socket.socket, path: str, headers: dict):
+        extra = ''
+        if path == '/assets/app.js':
+            self.asset_requests += 1
+            if headers.get('if-none-match') == '"bench-1"':
+                conn.sendall(b'HTTP/1.1 304 Not Modified\r\nETag: "bench-1"\r\n\r\n')
+                return
+            body, ctype = self.ASSET, 'application/javascript'
+            extra = 'ETag: "bench-1"\r\nCache-Control: max-age=3600\r\n'
+        elif path == '/api/version':
+            body, ctype = b'{"app":"bench-1.0"}', 'application/json'
+        else:
+            body, ctype = self.PAGE, 'text/html'
+        conn.sendall((f'HTTP/1.1 200 OK\r\nContent-Type: {ctype}\r\n{extra}'
+                      f'Content-Length: {len(body)}\r\n\r\n').encode() + body)
+
+    def _mjpeg(self, conn: socket.socket, chunked: bool):
+        self.stream_upstreams += 1
+        head = 'HTTP/1.1 200 OK\r\nContent-Type: multipart/x-mixed-replace; boundary=frame\r\n'
+        conn.sendall((head + ('Transfer-Encoding: chunked\r\n' if chunked else '') + '\r\n').encode())
+        interval = 1.0 / self.fps
+        part = (b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n' % len(self.frame)
+                + self.frame + b'\r\n')
+        if chunked:
+            part = b'%x\r\n' % len(part) + part + b'\r\n'
+        next_t = time.perf_counter()
+        while True:
+            conn.sendall(part)
+            next_t += interval
+            delay = next_t - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    @staticmethod
+    def _bulk(conn: socket.socket, mb: int):
+        conn.sendall(b'HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n' % (mb * 1024 * 1024))
+        payload = b'\xff' * CHUNK
+        for _ in range(mb * 1024 * 1024 // CHUNK):
+            conn.sendall(payload)
+
+    @staticmethod
+    def _websocket(conn: socket.socket, headers: dict, buf: bytes):
+        key = headers.get('sec-websocket-key', '').encode()
+        accept = base64.b64encode(hashlib.sha1(key + _WS_GUID).digest()).decode()
+        conn.sendall(('HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n'
+                      f'Connection: Upgrade\r\nSec-WebSocket-Accept: {accept}\r\n\r\n').encode())
+        while True:
+            while len(buf) < 6:
+                data = conn.recv(4096)
+                if not data:
+                    return
+                buf += data
+            n = buf[1] & 0x7f  # 벤치 클라이언트는 125바이트 이하 마스킹 프레임만 전송
+            while len(buf) < 6 + n:
+                data = conn.recv(4096)
+                if not data:
+                    return
+                buf += data
+            mask, payload, buf = buf[2:6], buf[6:6 + n], buf[6 + n:]
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+            conn.sendall(bytes((0x82, n)) + payload)
+
+
+# ─── 릴레이 프로세스 ─────────────────────────────────
+
+def _relay_worker(engine: str, kvm_port: int, kvm_udp_port: int, conn):
+    """자식 프로세스: KVMRelayManager 실행 + 통계 요청 응답"""
+    import logging
+    logging.disable(logging.ERROR)
+    name, *opts = engine.split(':')
+    relay = KVMRelayManager(engine=name, zero_copy='splice' in opts, http_cache='cache' in opts,
+                            mode=KVMRelayManager.MODE_PORT, fanout='fanout' in opts,
+                            kvm_mbps=0, site_mbps=0)
+    relay.max_connections = 0  # 벤치 부하에서 503 거절 방지
+    if relay.asset_cache is not None:
+        relay.asset_cache.cache_dir = None  # 디스크 캐시 제외 (메모리만)
+    tcp_port = relay.start_relay(KVM_IP, kvm_port, 'bench')
+    relay.set_udp_target_port(KVM_IP, kvm_udp_port)
+    conn.send((tcp_port, relay.get_udp_port(KVM_IP)))
+    try:
+        while True:
+            cmd = conn.recv()
+            if cmd == 'stats':
+                conn.send((threading.active_count(), time.process_time()))
+            elif cmd == 'cache':
+                conn.send(relay.asset_cache.get_stats() if relay.asset_cache is not None else None)
+            else:
+                break
+    finally:
+        relay.stop_all()
+
+
+class _RelayProcess:
+    """릴레이 자식 프로세스 제어 + 최대 스레드 수 추적"""
+
+    def __init__(self, engine: str, kvm: _StandInKVM):
+        import multiprocessing
+        self._conn, child = multiprocessing.Pipe()
+        self._proc = multiprocessing.Process(target=_relay_worker,
+                                             args=(engine, kvm.port, kvm.udp_port, child), daemon=True)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.peak_threads = 0
+        self.tcp_port = self.udp_port = None
+
+    def stats(self):
+        with self._lock:
+            self._conn.send('stats')
+            return self._conn.recv()
+
+    def cache_stats(self):
+        with self._lock:
+            self._conn.send('cache')
+            return self._conn.recv()
+
+    def _watch(self):
+        while not self._stop.wait(0.05):
+            self.peak_threads = max(self.peak_threads, self.stats()[0])
+
+    def __enter__(self):
+        self._proc.start()
+        self.tcp_port, self.udp_port = self._conn.recv()
+        self._watcher = threading.Thread(target=self._watch, daemon=True)
+        self._watcher.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._watcher.join()
+        with self._lock:
+            self._conn.send('stop')
+        self._proc.join(timeout=5)
+
+
+# ─── 클라이언트 ──────────────────────────────────────
+
+def _connect(port: int) -> socket.socket:
+    s = socket.create_connection((KVM_IP, port), timeout=10)
+    s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return s
+
+
+def _read_response(s: socket.socket, buf: bytes = b'') -> bytes:
+    """HTTP 응답 1개 수신 (Content-Length 기준) → 남은 데이터"""
+    while b'\r\n\r\n' not in buf:
+        data = s.recv(CHUNK)
+        if not data:
+            raise ConnectionError("closed")
+        buf += data
+    head, _, buf = buf.partition(b'\r\n\r\n')
+    length = 0
+    for line in head.split(b'\r\n')[1:]:
+        if line.lower().startswith(b'content-length:'):
+            length = int(line.split(b':')[1])
+    while len(buf) < length:
+        data = s.recv(CHUNK)
+        if not data:
+            raise ConnectionError("closed")
+        buf += data
+    return buf[length:]
+
+
+def measure_http(port: int, rounds: int) -> list:
+    """keep-alive 연결에서 페이지 + 자산 요청 왕복 (ms 리스트)"""
+    s = _connect(port)
+    samples, buf = [], b''
+    try:
+        for i in range(rounds):
+            path = '/assets/app.js' if i % 2 else '/'
+            t0 = time.perf_counter()
+            s.sendall(f'GET {path} HTTP/1.1\r\nHost: kvm\r\nAccept-Encoding: gzip\r\n\r\n'.encode())
+            buf = _read_response(s, buf)
+            samples.append((time.perf_counter() - t0) * 1000)
+    finally:
+        s.close()
+    return samples
+
+
+class _WebSocketClient:
+    def __init__(self, port: int):
+        self.sock = _connect(port)
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.sock.sendall((f'GET /ws HTTP/1.1\r\nHost: kvm\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+                           f'Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n').encode())
+        buf = b''
+        while b'\r\n\r\n' not in buf:
+            buf += self.sock.recv(4096)
+
+    def echo(self, payload: bytes) -> float:
+        mask = os.urandom(4)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        t0 = time.perf_counter()
+        self.sock.sendall(bytes((0x82, 0x80 | len(payload))) + mask + masked)
+        need, got = 2 + len(payload), b''
+        while len(got) < need:
+            data = self.sock.recv(4096)
+            if not data:
+                raise ConnectionError("closed")
+            got += data
+        return (time.perf_counter() - t0) * 1000
+
+    def close(self):
+        self.sock.close()
+
+
+def measure_ws(port: int, rounds: int) -> list:
+    """WebSocket 8바이트(HID 리포트 크기) 에코 왕복 (ms 리스트)"""
+    ws = _WebSocketClient(port)
+    try:
+        return [ws.echo(b'\x00\x00\x04\x00\x00\x00\x00\x00') for _ in range(rounds)]
+    finally:
+        ws.close()
+
+
+def measure_udp(port: int, rounds: int) -> list:
+    """UDP 에코 왕복 (ms 리스트, 유실 시 제외)"""
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    s.bind((CLIENT_IP, 0))
+    s.settimeout(1.0)
+    samples = []
+    try:
+        for i in range(rounds):
+            msg = struct.pack('!I', i) + b'r' * 1100  # RTP 패킷 크기
+            t0 = time.perf_counter()
+            s.sendto(msg, (KVM_IP, port))
+            try:
+                while s.recv(65536)[:4] != msg[:4]:
+                    pass
+            except socket.timeout:
+                continue
+            samples.append((time.perf_counter() - t0) * 1000)
+    finally:
+        s.close()
+    return samples
+
+
+def run_mjpeg(port: int, viewers: int, duration: float, stop: threading.Event = None) -> float:
+    """MJPEG 뷰어 N명 → 뷰어당 평균 fps"""
+    frames = [0] * viewers
+
+    def _viewer(i):
+        try:
+            s = _connect(port)
+            s.sendall(b'GET /stream HTTP/1.1\r\nHost: kvm\r\n\r\n')
+            end = time.perf_counter() + duration
+            tail = b''
+            while time.perf_counter() < end and not (stop and stop.is_set()):
+                data = s.recv(CHUNK)
+                if not data:
+                    break
+                frames[i] += (tail + data).count(b'--frame')
+                tail = data[-8:]
+            s.close()
+        except OSError:
+            pass
+
+    threads = [threading.Thread(target=_viewer, args=(i,), daemon=True) for i in range(viewers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(frames) / viewers / duration if viewers else 0.0
+
+
+def measure_bulk(port: int, clients: int, mb: int) -> float:
+    """동시 대량 전송 총 처리량 (MB/s)"""
+    totals = [0] * clients
+
+    def _client(i):
+        try:
+            s = _connect(port)
+            s.sendall(f'GET /bulk/{mb} HTTP/1.1\r\nHost: kvm\r\n\r\n'.encode())
+            while True:
+                data = s.recv(CHUNK)
+                if not data:
+                    break
+                totals[i] += len(data)
+                if totals[i] >= mb * 1024 * 1024:
+                    break
+            s.close()
+        except OSError:
+            pass
+
+    threads = [threading.Thread(target=_client, args=(i,), daemon=True) for i in range(clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    return sum(totals) / (1024 * 1024) / elapsed if elapsed > 0 else 0.0
+
+
+def _percentile(samples: list, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _summary(samples: list, baseline: list) -> dict:
+    p50 = statistics.median(samples) if samples else 0.0
+    base = statistics.median(baseline) if baseline else 0.0
+    return {"p50_ms": p50, "p99_ms": _percentile(samples, 99), "added_p50_ms": p50 - base,
+            "samples": len(samples)}
+
+
+# ─── 실행 ────────────────────────────────────────────
+
+def measure_direct(kvm: _StandInKVM, args) -> dict:
+    """릴레이 없이 KVM 대역에 직접 — 추가 지연 계산 기준"""
+    return {
+        "http": measure_http(kvm.port, args.rounds),
+        "ws": measure_ws(kvm.port, args.rounds),
+        "udp": measure_udp(kvm.udp_port, args.rounds),
+    }
+
+
+def run_engine(engine: str, kvm: _StandInKVM, args, direct: dict) -> dict:
+    with _RelayProcess(engine, kvm) as relay:
+        tcp, udp = relay.tcp_port, relay.udp_port
+        if not tcp or not udp:
+            raise RuntimeError("릴레이 포트 할당 실패")
+
+        cpu0 = relay.stats()[1]
+        http = measure_http(tcp, args.rounds)
+        cache = relay.cache_stats()
+        ws = measure_ws(tcp, args.rounds)
+        udp_lat = measure_udp(udp, args.rounds)
+
+        # 부하 중 입력 지연: MJPEG 뷰어 + 대량 전송이 흐르는 동안 WebSocket 에코
+        upstreams0 = kvm.stream_upstreams
+        stop = threading.Event()
+        result = {}
+        mjpeg_t = threading.Thread(target=lambda: result.setdefault(
+            "fps", run_mjpeg(tcp, args.clients, args.duration, stop)), daemon=True)
+        bulk_t = threading.Thread(target=lambda: result.setdefault(
+            "bulk", measure_bulk(tcp, max(1, args.clients // 4), args.mb)), daemon=True)
+        mjpeg_t.start()
+        bulk_t.start()
+        time.sleep(0.5)
+        ws_loaded = measure_ws(tcp, args.rounds)
+        mjpeg_t.join()
+        stop.set()
+        bulk_t.join()
+        upstreams = kvm.stream_upstreams - upstreams0
+
+        cpu = relay.stats()[1] - cpu0
+        peak = relay.peak_threads
+
+    return {
+        "engine": engine,
+        "http": _summary(http, direct["http"]),
+        "ws": _summary(ws, direct["ws"]),
+        "ws_loaded": _summary(ws_loaded, direct["ws"]),
+        "udp": _summary(udp_lat, direct["udp"]),
+        "udp_loss": 1 - len(udp_lat) / args.rounds,
+        "cache_hit_rate": cache["hit_rate"] if cache else None,
+        "mjpeg_fps": result.get("fps", 0.0),
+        "mjpeg_upstreams": upstreams,
+        "bulk_mbps": result.get("bulk", 0.0),
+        "relay_cpu_s": cpu,
+        "peak_threads": peak,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KVM Relay 벤치마크 (오프라인, 로컬 KVM 대역)")
+    parser.add_argument('--clients', type=int, default=20, help="동시 MJPEG 뷰어 수 (대량 전송은 1/4)")
+    parser.add_argument('--duration', type=float, default=3.0, help="MJPEG 부하 시간 (초)")
+    parser.add_argument('--mb', type=int, default=20, help="대량 전송 클라이언트당 MB")
+    parser.add_argument('--rounds', type=int, default=500, help="지연 측정 왕복 횟수")
+    parser.add_argument('--fps', type=int, default=30, help="MJPEG 대역 fps")
+    parser.add_argument('--frame-kb', type=int, default=40, help="MJPEG 프레임 크기 (KB)")
+    parser.add_argument('--engines', default='',
+                        help="비교할 엔진 (쉼표 구분, 예: thread,selector:splice:fanout)")
+    parser.add_argument('--json', default='', help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+    if not args.engines:
+        args.engines = 'thread,selector,selector:fanout'
+        if SPLICE_AVAILABLE:
+            args.engines += ',thread:splice,selector:splice'
+
+    kvm = _StandInKVM(frame_kb=args.frame_kb, fps=args.fps)
+    direct = measure_direct(kvm, args)
+
+    print("=" * 100)
+    print(f"KVM Relay 벤치마크 — viewers={args.clients}, {args.duration}s, bulk {args.mb}MB x "
+          f"{max(1, args.clients // 4)}, rounds={args.rounds}, MJPEG {args.fps}fps/{args.frame_kb}KB")
+    print(f"직접 연결 p50: http={statistics.median(direct['http']):.3f}ms "
+          f"ws={statistics.median(direct['ws']):.3f}ms udp={statistics.median(direct['udp']):.3f}ms")
+    print("=" * 100)
+    print(f"{'engine':<22} {'+http':>7} {'+ws':>7} {'ws99':>7} {'ws99*':>7} {'+udp':>7} "
+          f"{'hit':>5} {'fps':>6} {'up':>4} {'bulkMB/s':>9} {'cpu(s)':>7} {'thr':>5}")
+    results = []
+    for engine in args.engines.split(','):
+        r = run_engine(engine.strip(), kvm, args, direct)
+        results.append(r)
+        hit = '-' if r['cache_hit_rate'] is None else f"{r['cache_hit_rate']:.2f}"
+        print(f"{r['engine']:<22} {r['http']['added_p50_ms']:>7.3f} {r['ws']['added_p50_ms']:>7.3f} "
+              f"{r['ws']['p99_ms']:>7.3f} {r['ws_loaded']['p99_ms']:>7.3f} {r['udp']['added_p50_ms']:>7.3f} "
+              f"{hit:>5} {r['mjpeg_fps']:>6.1f} {r['mjpeg_upstreams']:>4} {r['bulk_mbps']:>9.1f} "
+              f"{r['relay_cpu_s']:>7.2f} {r['peak_threads']:>5}")
+    print("-" * 100)
+    print("+http/+ws/+udp: 직접 연결 대비 추가 p50 (ms), ws99*: 부하 중 WebSocket p99, "
+          "hit: HTTP 캐시 적중률, up: KVM 스트림 업스트림 수")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"args": vars(args), "direct_p50_ms": {k: statistics.median(v) for k, v in direct.items()},
+                       "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
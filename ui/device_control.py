@@ -2,6 +2,8 @@
 WellcomLAND 장치 제어 패널
 """
 
+import threading
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
     QPushButton, QLabel, QLineEdit, QTextEdit,
@@ -18,6 +20,7 @@ class KeyboardWidget(QWidget):
     """가상 키보드 위젯"""
 
     key_pressed = pyqtSignal(str, int)  # key, modifiers
+    text_entered = pyqtSignal(str)  # 텍스트 일괄 입력
 
     def __init__(self):
         super().__init__()
@@ -121,8 +124,7 @@ class KeyboardWidget(QWidget):
         """텍스트 전송"""
         text = self.text_input.text()
         if text:
-            for char in text:
-                self.key_pressed.emit(char, 0)
+            self.text_entered.emit(text)
             self.text_input.clear()
 
 
@@ -216,6 +218,7 @@ class DeviceControlPanel(QWidget):
 
         self.keyboard_widget = KeyboardWidget()
         self.keyboard_widget.key_pressed.connect(self._on_key_pressed)
+        self.keyboard_widget.text_entered.connect(self._on_text_entered)
         keyboard_layout.addWidget(self.keyboard_widget)
 
         layout.addWidget(keyboard_group)
@@ -273,6 +276,14 @@ class DeviceControlPanel(QWidget):
 
         self.device.send_key(key, modifiers)
 
+    def _on_text_entered(self, text: str):
+        """텍스트 일괄 입력 (채널 1개로 연속 전송 — UI 스레드 차단 방지)"""
+        if not self.device or not self.device.is_connected():
+            return
+
+        device = self.device
+        threading.Thread(target=device.send_text, args=(text,), daemon=True).start()
+
     def _on_mouse_move(self, dx: int, dy: int):
         """마우스 이동 처리"""
         if not self.device or not self.device.is_connected():
@@ -5,7 +5,6 @@ WellcomLAND 메인 윈도우
 
 import math
 import os
-import struct
 import sys
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
@@ -21,14 +20,17 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QThread, QUrl, QPoint, QRect, QByteArray
 from PyQt6.QtGui import QAction, QIcon, QColor, QDesktopServices, QCursor, QPainter, QBrush, QPen, QPixmap, QShortcut, QKeySequence
-from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply, QNetworkCookie
 from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineSettings, QWebEnginePage, QWebEngineScript
+from PyQt6.QtWebEngineCore import (QWebEngineSettings, QWebEnginePage, QWebEngineProfile, QWebEngineScript,
+                                   QWebEngineUrlRequestInterceptor)
 from PyQt6.QtWebChannel import QWebChannel
 
 from core import KVMManager, KVMDevice
 from core.kvm_device import DeviceStatus, USBStatus
 from core.hid_controller import FastHIDController
+from core.hid_pool import hid_pool
+from core.hid_broadcast import HIDBroadcaster
 from .dialogs import AddDeviceDialog, DeviceSettingsDialog, AutoDiscoveryDialog, AppSettingsDialog
 from config import settings as app_settings, ICON_PATH, LOG_DIR
 from .device_control import DeviceControlPanel
@@ -41,6 +43,58 @@ except ImportError:
     VISION_AVAILABLE = False
 
 
+class RelayRouteInterceptor(QWebEngineUrlRequestInterceptor):
+    """멀티플렉스 릴레이 경유 시 모든 요청에 X-Wellcom-KVM 헤더 추가 (대상 KVM 라우팅)"""
+
+    def __init__(self, route: str, parent=None):
+        super().__init__(parent)
+        self._route = QByteArray(route.encode('ascii'))
+
+    def interceptRequest(self, info):
+        info.setHttpHeader(QByteArray(b'X-Wellcom-KVM'), self._route)
+
+
+_relay_profiles = {}  # 라우트 → QWebEngineProfile
+
+
+def relay_profile(device):
+    """멀티플렉스 릴레이 경유 장치의 라우트 전용 프로필 (직접 접속이면 None)
+
+    멀티플렉스 포트의 KVM들은 모두 같은 origin(릴레이:포트)이라 기본 프로필을 같이 쓰면
+    KVM 웹 UI의 쿠키/localStorage/캐시가 섞임 → 라우트마다 별도 저장소 프로필 사용.
+    - 프로필 인터셉터: 모든 요청에 X-Wellcom-KVM 헤더
+    - 라우트 쿠키(wellcom_kvm): 인터셉터를 거치지 않는 WebSocket 업그레이드도 같은 KVM으로 라우팅
+    """
+    route = getattr(device.info, '_relay_route', '')
+    if not route:
+        return None
+    profile = _relay_profiles.get(route)
+    if profile is None:
+        profile = QWebEngineProfile(f"relay-{route}", QApplication.instance())
+        profile.setUrlRequestInterceptor(RelayRouteInterceptor(route, profile))
+        cookie = QNetworkCookie(b'wellcom_kvm', route.encode('ascii'))
+        cookie.setPath('/')
+        profile.cookieStore().setCookie(cookie, QUrl(f"http://{device.ip}:{device.info.web_port}"))
+        _relay_profiles[route] = profile
+    return profile
+
+
+def new_relay_page(device, parent, page_class=QWebEnginePage) -> QWebEnginePage:
+    """device용 WebEngine 페이지 (멀티플렉스 릴레이 경유면 라우트 전용 프로필)"""
+    profile = relay_profile(device)
+    if profile is None:
+        return page_class(parent)
+    return page_class(profile, parent)
+
+
+def relay_web_url(device, path: str = '/') -> str:
+    """KVM 웹 UI URL (멀티플렉스 릴레이 경유면 /kvm/<route>/ 접두어 포함)"""
+    web_port = getattr(device.info, 'web_port', 80)
+    route = getattr(device.info, '_relay_route', '')
+    prefix = f"/kvm/{route}" if route else ""
+    return f"http://{device.ip}:{web_port}{prefix}{path}"
+
+
 class InitialStatusCheckThread(QThread):
     """최초 상태 체크 스레드 (병렬 TCP 체크)
 
@@ -131,22 +185,29 @@ class StatusUpdateThread(QThread):
     1. 로컬 KVM (192.168.x): TCP 포트 체크 (1초 타임아웃)
     2. 릴레이 KVM (100.x): TCP 포트 체크 (3초 타임아웃) + 서버 API 병행
     3. 서버 heartbeat 정보로 보완 (TCP 실패 시 서버 is_online 참조)
-    4. 50개+ 장치: ThreadPoolExecutor로 병렬 처리 (순차→병렬, 최대 20 워커)
+    4. 20개 초과: ThreadPoolExecutor로 병렬 처리 (최대 20 워커)
+    5. 전체 장치를 고정 주기로 훑지 않고 manager의 StatusScheduler가 정한 장치만 조회
+       (화면 표시/상태 변동 장치는 빠르게, 안정/오프라인 장치는 백오프, LiveView 장치는 가장 느리게)
     """
     status_updated = pyqtSignal(dict)
 
+    SERVER_REFRESH = 30  # 서버 API 온라인 상태 갱신 주기 (초)
+
     def __init__(self, manager: KVMManager):
         super().__init__()
         self.manager = manager
+        self.scheduler = manager.get_scheduler(interval=5.0)
         self.running = True
         self._paused = False  # v1.10.45: LiveView 중 일시정지
         self._server_status_cache = {}  # kvm_name → is_online (서버 API 캐시)
-        self._server_check_counter = 0  # 서버 API 호출 주기 카운터
+        self._server_checked = 0.0  # 마지막 서버 API 조회 (monotonic)
 
     def run(self):
+        import time as _t
         # 첫 실행 시 충분히 대기 (UI/WebEngine 초기화 완료 후)
         self.msleep(5000)
 
+        scheduler = self.scheduler
         while self.running:
             # v1.10.45: LiveView 활성 중 일시정지
             # TCP 체크 + signal emit이 메인 스레드 UI 갱신을 트리거하여
@@ -156,25 +217,38 @@ class StatusUpdateThread(QThread):
                 continue
 
             try:
-                # 매 6회(30초)마다 서버 API에서 온라인 상태 갱신
-                self._server_check_counter += 1
-                if self._server_check_counter >= 6:
-                    self._server_check_counter = 0
+                now = _t.monotonic()
+                if now - self._server_checked >= self.SERVER_REFRESH:
+                    self._server_checked = now
                     self._refresh_server_status()
 
-                # TCP 포트 체크 (병렬)
-                status = self._check_status_parallel()
-
-                # 일시정지 상태면 emit 스킵 (pause 호출과 emit 사이 경합 방지)
-                if not self._paused:
-                    self.status_updated.emit(status)
+                devices = self.manager.devices
+                scheduler.sync(devices)
+                # 곧 도래할 장치까지 묶어서 한 번에 (signal/UI 갱신 횟수 절감)
+                due = [devices[n] for n in scheduler.pop_due(now + 0.25) if n in devices]
+                if due:
+                    # TCP 포트 체크 (병렬) — 결과는 장치별 다음 조회 시각에 반영
+                    status = self._check_status_parallel(due)
+
+                    # 상태가 바뀐 장치가 있을 때만 emit — 일시정지 상태면 스킵
+                    # (pause 호출과 emit 사이 경합 방지)
+                    if not self._paused and self._has_changes(status):
+                        self.status_updated.emit(status)
             except Exception as e:
                 print(f"상태 업데이트 오류: {e}")
 
-            # 장치 수에 따라 모니터링 간격 조정 (20대 이하: 5초, 50대 이상: 10초)
-            device_count = len(self.manager.get_all_devices())
-            interval = 5000 if device_count <= 20 else (8000 if device_count <= 50 else 10000)
-            self.msleep(interval)
+            # 다음 조회 시각까지 (최대 1초 — 화면 표시 장치 변경을 빨리 반영)
+            self.msleep(max(50, int(min(scheduler.next_wait(), 1.0) * 1000)))
+
+    def _has_changes(self, status: dict) -> bool:
+        for name, result in status.items():
+            device = self.manager.get_device(name)
+            if device is None:
+                continue
+            new_status = DeviceStatus.ONLINE if result.get('online', False) else DeviceStatus.OFFLINE
+            if device.status != new_status:  # UNKNOWN → OFFLINE 첫 반영 포함
+                return True
+        return False
 
     def _refresh_server_status(self):
         """서버 API에서 KVM 온라인 상태 가져오기 (heartbeat 기반)"""
@@ -217,37 +291,41 @@ class StatusUpdateThread(QThread):
             server_online = self._server_status_cache.get(device.name, False)
             return device.name, {'online': bool(server_online)}
 
-    def _check_status_parallel(self) -> dict:
+    def _check_status_parallel(self, devices: list) -> dict:
         """병렬 TCP 상태 체크 (50개+ 장치 대응)
 
-        ThreadPoolExecutor로 모든 장치를 병렬 TCP 체크.
+        ThreadPoolExecutor로 조회 시각이 된 장치를 병렬 TCP 체크.
         20대 이하: 순차 (오버헤드 최소화)
         20대 초과: 병렬 (최대 20 워커)
+        체크하지 못한 장치(중지/예외)도 스케줄러에 결과를 남겨 조회 대상에서 빠지지 않게 함.
         """
-        devices = self.manager.get_all_devices()
         results = {}
-
-        if len(devices) <= 20:
-            # 소규모: 순차 처리 (스레드풀 오버헤드 회피)
-            for device in devices:
-                if not self.running:
-                    break
-                name, status = self._check_single_device(device)
-                results[name] = status
-        else:
-            # 대규모: 병렬 처리
-            workers = min(20, len(devices))
-            with ThreadPoolExecutor(max_workers=workers) as executor:
-                futures = {executor.submit(self._check_single_device, d): d for d in devices}
-                for future in futures:
+        try:
+            if len(devices) <= 20:
+                # 소규모: 순차 처리 (스레드풀 오버헤드 회피)
+                for device in devices:
                     if not self.running:
                         break
-                    try:
-                        name, status = future.result(timeout=5)
-                        results[name] = status
-                    except Exception:
-                        device = futures[future]
-                        results[device.name] = {'online': False}
+                    name, status = self._check_single_device(device)
+                    results[name] = status
+            else:
+                # 대규모: 병렬 처리
+                workers = min(20, len(devices))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = {executor.submit(self._check_single_device, d): d for d in devices}
+                    for future in futures:
+                        if not self.running:
+                            break
+                        try:
+                            name, status = future.result(timeout=5)
+                            results[name] = status
+                        except Exception:
+                            device = futures[future]
+                            results[device.name] = {'online': False}
+        finally:
+            for device in devices:
+                online = results.get(device.name, {}).get('online', device.status == DeviceStatus.ONLINE)
+                self.scheduler.record(device.name, online)
 
         return results
 
@@ -850,7 +928,7 @@ class KVMThumbnailWidget(QFrame):
             self._webview.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
 
             # WebRTC 권한 자동 허용을 위한 커스텀 Page
-            page = QWebEnginePage(self._webview)
+            page = new_relay_page(self.device, self._webview)
             page.featurePermissionRequested.connect(self._on_permission_requested)
             self._webview.setPage(page)
 
@@ -974,7 +1052,7 @@ class KVMThumbnailWidget(QFrame):
                 self._create_webview()
                 if self._webview:
                     self._webview.show()
-                    url = f"http://{self.device.ip}:{self.device.info.web_port}/"
+                    url = relay_web_url(self.device)
                     print(f"[Thumbnail] start_capture: {self.device.name} → {url} (crop={self._crop_region})")
                     # 릴레이 접속 시 ICE 패치 주입
                     if self.device.ip.startswith('100.'):
@@ -2054,8 +2132,8 @@ class PartialControlDialog(QDialog):
         self.devices = devices
         self.region = region  # (x, y, w, h) 0~1 비율
         self.hid_controllers: list[FastHIDController] = []
+        self._broadcaster: HIDBroadcaster | None = None
         self.web_views: list[QWebEngineView] = []
-        self._executor = ThreadPoolExecutor(max_workers=len(devices))
 
         self.setWindowTitle(f"부분제어 — {len(devices)}대")
         self.resize(1600, 900)
@@ -2084,6 +2162,14 @@ class PartialControlDialog(QDialog):
         hbox.addWidget(info_label)
         hbox.addStretch()
 
+        # 장치 간 입력 도착 차이 (HIDBroadcaster skew)
+        self._skew_label = QLabel("")
+        self._skew_label.setStyleSheet("color:#aaa; font-size:10px;")
+        hbox.addWidget(self._skew_label)
+        self._skew_timer = QTimer(self)
+        self._skew_timer.timeout.connect(self._update_skew_label)
+        self._skew_timer.start(1000)
+
         btn_close = QPushButton("X")
         btn_close.setStyleSheet("padding:2px 7px; font-size:11px; border-radius:3px; background-color:#333; color:#f44;")
         btn_close.clicked.connect(self.close)
@@ -2118,7 +2204,7 @@ class PartialControlDialog(QDialog):
 
             # WebView
             wv = QWebEngineView()
-            page = QWebEnginePage(wv)
+            page = new_relay_page(device, wv)
             page.featurePermissionRequested.connect(
                 lambda origin, feature, p=page: p.setFeaturePermission(
                     origin, feature, QWebEnginePage.PermissionPolicy.PermissionGrantedByUser
@@ -2137,7 +2223,7 @@ class PartialControlDialog(QDialog):
                 lambda ok, view=wv, js=crop_js: view.page().runJavaScript(js) if ok else None
             )
 
-            url = f"http://{device.ip}:{device.info.web_port}/"
+            url = relay_web_url(device)
             wv.setUrl(QUrl(url))
 
             container_layout.addWidget(wv, 1)
@@ -2154,23 +2240,24 @@ class PartialControlDialog(QDialog):
         layout.addWidget(grid_widget, 1)
 
     def _connect_hids(self):
-        """모든 기기의 HID 컨트롤러 연결 (백그라운드)"""
+        """모든 기기의 HID 컨트롤러 확보 (공용 풀 — 미연결 기기는 백그라운드 연결)"""
         for device in self.devices:
-            hid = FastHIDController(
+            hid = hid_pool.acquire(
                 device.ip, device.info.port,
                 device.info.username, device.info.password
             )
             self.hid_controllers.append(hid)
+        self._broadcaster = HIDBroadcaster(self.hid_controllers)
 
-        # 병렬 연결
-        def connect_hid(hid):
-            try:
-                hid.connect()
-            except Exception as e:
-                print(f"[PartialControl] HID 연결 실패: {e}")
-
-        for hid in self.hid_controllers:
-            self._executor.submit(connect_hid, hid)
+    def _update_skew_label(self):
+        if self._broadcaster is None:
+            return
+        stats = self._broadcaster.get_stats()
+        skew = stats['skew']
+        text = f"HID {stats['connected']}/{stats['devices']}"
+        if skew['count']:
+            text += f" | skew p50 {skew['p50_ms']:.2f} / p95 {skew['p95_ms']:.2f} ms"
+        self._skew_label.setText(text)
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key.Key_Escape:
@@ -2192,21 +2279,9 @@ class PartialControlDialog(QDialog):
         if qt_mods & Qt.KeyboardModifier.AltModifier:
             mods |= 0x04
 
-        report_down = struct.pack('BBBBBBBB', mods, 0, hid_code, 0, 0, 0, 0, 0)
-        report_up = struct.pack('BBBBBBBB', 0, 0, 0, 0, 0, 0, 0, 0)
-
-        def send_key(hid):
-            try:
-                hex_down = ''.join(f'\\x{b:02x}' for b in report_down)
-                hex_up = ''.join(f'\\x{b:02x}' for b in report_up)
-                hid._cmd_queue.put(f"echo -ne '{hex_down}' > /dev/hidg0")
-                hid._cmd_queue.put(f"echo -ne '{hex_up}' > /dev/hidg0")
-            except Exception:
-                pass
-
-        for hid in self.hid_controllers:
-            if hid.is_connected():
-                self._executor.submit(send_key, hid)
+        # 리포트 1회 인코딩 → 디스패처 스레드 1개가 모든 기기에 연속 write
+        if self._broadcaster is not None:
+            self._broadcaster.send_hid_code(hid_code, mods)
 
     def closeEvent(self, event):
         # WebView 정리
@@ -2218,23 +2293,25 @@ class PartialControlDialog(QDialog):
                 pass
         self.web_views.clear()
 
-        # HID 연결 해제
+        # HID 반환 (유휴 타임아웃까지 연결 유지)
+        self._skew_timer.stop()
+        if self._broadcaster is not None:
+            stats = self._broadcaster.get_stats()
+            print(f"[PartialControl] 입력 {stats['events']}건, skew {stats['skew']}")
+            self._broadcaster.close()
+            self._broadcaster = None
         for hid in self.hid_controllers:
-            try:
-                hid.disconnect()
-            except Exception:
-                pass
+            hid_pool.release(hid)
         self.hid_controllers.clear()
 
-        self._executor.shutdown(wait=False)
         super().closeEvent(event)
 
 
 class Aion2WebPage(QWebEnginePage):
     """아이온2 모드 지원 웹 페이지 - Pointer Lock API 활성화"""
 
-    def __init__(self, parent=None):
-        super().__init__(parent)
+    def __init__(self, *args):
+        super().__init__(*args)  # (parent) 또는 (profile, parent)
         # Pointer Lock 권한 자동 허용
         self.featurePermissionRequested.connect(self._on_permission_requested)
 
@@ -2596,13 +2673,14 @@ class LiveViewDialog(QDialog):
         self._is_relay = device.ip.startswith('100.')
         if self._is_relay:
             # 릴레이 접속: SSH HID 사용 불가 → 웹 기반 입력만 사용
-            hid_ip = getattr(device.info, '_kvm_local_ip', device.ip)
+            hid_ip = device.info._kvm_local_ip or device.ip
             self.hid = FastHIDController(hid_ip, device.info.port,
                                          device.info.username, device.info.password)
             # SSH 연결은 시도하지 않음 (접근 불가)
             print(f"[LiveView] 릴레이 접속 — SSH HID 비활성 (웹 입력만 사용)")
         else:
-            self.hid = FastHIDController(
+            # 공용 풀 — 이전에 연 LiveView/부분제어의 연결을 그대로 사용 (없으면 백그라운드 연결)
+            self.hid = hid_pool.acquire(
                 device.ip,
                 device.info.port,
                 device.info.username,
@@ -2838,7 +2916,7 @@ class LiveViewDialog(QDialog):
         else:
             # 새 WebView 생성 (기존 로직)
             self.web_view = QWebEngineView()
-            self.aion2_page = Aion2WebPage(self.web_view)
+            self.aion2_page = new_relay_page(self.device, self.web_view, Aion2WebPage)
             self.web_view.setPage(self.aion2_page)
 
         # 설정 적용 (새 WebView든 재사용이든 동일하게)
@@ -2936,10 +3014,51 @@ class LiveViewDialog(QDialog):
         sc_hangul.setContext(Qt.ShortcutContext.WindowShortcut)
         sc_hangul.activated.connect(self._send_hangul_toggle)
 
+        sc_hid_stats = QShortcut(QKeySequence("Ctrl+F3"), self)
+        sc_hid_stats.setContext(Qt.ShortcutContext.WindowShortcut)
+        sc_hid_stats.activated.connect(self._toggle_hid_stats_overlay)
+
+        # HID 지연 오버레이 (WebView 좌상단, Ctrl+F3 토글)
+        self._hid_stats_label = QLabel(self.web_view)
+        self._hid_stats_label.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 160); color: #8BC34A; font-size: 11px; padding: 2px 6px;")
+        self._hid_stats_label.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self._hid_stats_label.hide()
+        self._hid_stats_timer = QTimer(self)
+        self._hid_stats_timer.timeout.connect(self._update_hid_stats_overlay)
+        if app_settings.get('hid.latency_overlay', False):
+            self._toggle_hid_stats_overlay()
+
+    def _toggle_hid_stats_overlay(self):
+        """HID 지연 오버레이 on/off"""
+        if self._hid_stats_label.isVisible():
+            self._hid_stats_timer.stop()
+            self._hid_stats_label.hide()
+            return
+        self._update_hid_stats_overlay()
+        self._hid_stats_label.show()
+        self._hid_stats_label.raise_()
+        self._hid_stats_timer.start(1000)
+
+    def _update_hid_stats_overlay(self):
+        """HID 지연 요약 갱신 (total p50/p95/p99 + 큐 깊이)"""
+        summary = self.hid.latency.summary() or "입력 없음"
+        queue_stats = self.hid.get_queue_stats()
+        self._hid_stats_label.setText(
+            f"HID [{queue_stats['transport']}] {summary} | 큐 {queue_stats['depth']} "
+            f"(병합 {queue_stats['coalesced']})")
+        self._hid_stats_label.adjustSize()
+        self._hid_stats_label.move(6, 6)
+
     def _send_hangul_toggle(self):
-        """한/영 전환 — Right Alt (독립 SSH exec_command로 전송)"""
+        """한/영 전환 — Right Alt (공용 HID 연결, 미연결 시 독립 SSH exec_command로 전송)"""
         import threading
 
+        if not self._is_relay and self.hid.is_connected():
+            self.hid.send_hid_code_hold(0, 0x40, hold=0.15)
+            print("[HID] 한/영 전환 (Right Alt)")
+            return
+
         def _do_send():
             try:
                 import paramiko
@@ -3039,7 +3158,7 @@ class LiveViewDialog(QDialog):
         UserScript로 주입하여 미디어 스트림이 릴레이를 통과하도록 함.
         """
         web_port = self.device.info.web_port if hasattr(self.device.info, 'web_port') else 80
-        url = f"http://{self.device.ip}:{web_port}"
+        url = relay_web_url(self.device)
         print(f"[LiveView] URL 로드: {url}")
 
         # GPU 크래시 방어: URL 로드 전 플래그 생성
@@ -4797,6 +4916,8 @@ class LiveViewDialog(QDialog):
         self._max_reconnect = 0
 
         self._stop_game_mode()
+        self._hid_stats_timer.stop()
+        self._hid_stats_label.deleteLater()  # 재사용 WebView에 남지 않도록
         if self._recording:
             self._stop_recording()
         if self.vision_controller:
@@ -4864,7 +4985,10 @@ class LiveViewDialog(QDialog):
     def _safe_hid_disconnect(self):
         """HID 연결 해제 (백그라운드 스레드에서 안전하게 실행)"""
         try:
-            self.hid.disconnect()
+            if self._is_relay:
+                self.hid.disconnect()
+            else:
+                hid_pool.release(self.hid)  # 유휴 타임아웃까지 연결 유지
             print("[LiveView] HID 연결 해제 완료")
         except Exception as e:
             print(f"[LiveView] HID 연결 해제 오류 (무시): {e}")
@@ -5389,6 +5513,11 @@ class MainWindow(QMainWindow):
             #    (이전 탭의 WebRTC 해제가 완료될 시간 확보)
             if isinstance(current_widget, GridViewTab):
                 QTimer.singleShot(300, current_widget.on_tab_activated)
+
+            # 3. 화면에 보이는 장치 → 상태 스케줄러 우선 조회 대상
+            visible = [t.device.name for t in current_widget.thumbnails] \
+                if isinstance(current_widget, GridViewTab) else []
+            self.manager.set_visible_devices(visible)
         except Exception as e:
             print(f"[MainWindow] _on_tab_changed 오류: {e}")
 
@@ -5619,7 +5748,7 @@ class MainWindow(QMainWindow):
                         self.manager.load_devices_from_server(devices)
                         print(f"[MainWindow] 사용자: 할당된 {len(devices)}개 기기 로드")
                     else:
-                        self.manager.devices.clear()
+                        self.manager.clear_devices()
                         print("[MainWindow] 사용자: 할당된 기기 없음")
 
                 # 원격 KVM 릴레이 정보로 접근 불가 기기의 IP/포트 자동 치환
@@ -5672,6 +5801,7 @@ class MainWindow(QMainWindow):
                     relay_map[local_ip] = {
                         'relay_ip': relay_ip,
                         'relay_port': relay_port,
+                        'relay_route': rkvm.get('relay_route') or '',
                         'udp_relay_port': udp_port,
                         'kvm_name': rkvm.get('kvm_name', ''),
                     }
@@ -5704,6 +5834,8 @@ class MainWindow(QMainWindow):
                     device.info.web_port = info['relay_port']
                     # UDP 릴레이 포트 정보 저장 (ICE 패치에서 사용)
                     device.info._udp_relay_port = info.get('udp_relay_port')
+                    # 멀티플렉스 릴레이 라우트 (WebView 요청 헤더로 전달)
+                    device.info._relay_route = info.get('relay_route', '')
                     device.info._kvm_local_ip = orig_ip  # 원본 IP 보존
                     substituted += 1
                     print(f"[RelaySubst] {name}: {orig_ip}:80 → {info['relay_ip']}:{info['relay_port']}"
@@ -6304,6 +6436,7 @@ class MainWindow(QMainWindow):
         print(f"[LiveView] 활성 스레드 ({len(thread_names)}): {', '.join(thread_names)}")
 
         self._live_control_device = device.name
+        self.manager.set_liveview_device(device.name)
 
         # 대상 장치의 썸네일에서 WebView 분리 시도 (WebRTC 재사용)
         detached_wv = None
@@ -6362,6 +6495,7 @@ class MainWindow(QMainWindow):
             import traceback
             traceback.print_exc()
             self._live_control_device = None
+            self.manager.set_liveview_device(device.name, False)
             # 에러 시 StatusThread 재개
             if hasattr(self, 'status_thread') and self.status_thread:
                 self.status_thread.resume()
@@ -6388,6 +6522,8 @@ class MainWindow(QMainWindow):
             device_name = dialog.device.name if hasattr(dialog, 'device') else None
 
         # 1:1 제어 종료 — 플래그 해제 + 메인 윈도우 활성화
+        if self._live_control_device:
+            self.manager.set_liveview_device(self._live_control_device, False)
         self._live_control_device = None
         self.activateWindow()
         self.raise_()
@@ -6658,8 +6794,7 @@ class MainWindow(QMainWindow):
     def _on_open_web_browser(self):
         if not self.current_device:
             return
-        web_port = getattr(self.current_device.info, 'web_port', 80)
-        QDesktopServices.openUrl(QUrl(f"http://{self.current_device.ip}:{web_port}"))
+        QDesktopServices.openUrl(QUrl(relay_web_url(self.current_device)))
 
     def _on_file_transfer(self):
         """파일 전송: SFTP(KVM) 또는 클라우드 업로드 선택"""